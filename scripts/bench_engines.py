@@ -0,0 +1,356 @@
+"""Benchmark the hot read queries on stdlib sqlite3 vs pyturso.
+
+Turso and stock SQLite can differ by orders of magnitude on the same SQL
+(docs/turso-subquery-materialization.md). This runs the queries the pipeline
+and CLI actually issue — imported from the modules that own them, so the SQL
+cannot drift — against the same DB file through both drivers, checks the two
+return the same rows, and reports turso/sqlite3 timing ratios.
+
+Exits 1 if any query's ratio exceeds ``--max-ratio``, if turso does not finish
+a query within ``--timeout`` seconds, or if the engines disagree on row counts.
+Run it after every pyturso bump.
+
+Usage:
+    python scripts/bench_engines.py                              # synthetic data
+    python scripts/bench_engines.py --db wcmkt.db --sde sde.db   # copies of real DBs
+    python scripts/bench_engines.py --max-ratio 5 --json bench.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from time import perf_counter
+
+os.environ.setdefault("MKTS_QUIET", "1")
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import pandas as pd  # noqa: E402
+import turso  # noqa: E402
+from sqlalchemy import create_engine, text  # noqa: E402
+
+from bench_pragma_profiles import build_synthetic_market_db  # noqa: E402
+from mkts_backend.cli_tools.fit_check_module import MODULE_USAGE_QUERY  # noqa: E402
+from mkts_backend.cli_tools.fit_check_needed import NEEDED_ITEMS_QUERY  # noqa: E402
+from mkts_backend.db.type_fingerprints import FINGERPRINT_SCAN_QUERY  # noqa: E402
+from mkts_backend.processing.data_processing import (  # noqa: E402
+    DOCTRINE_STATS_DOCTRINES_QUERY,
+    DOCTRINE_STATS_MARKETSTATS_QUERY,
+    FIVE_PERCENTILE_QUERY,
+    MARKET_STATS_QUERY,
+)
+
+ENGINES = ("sqlite3", "turso")
+
+
+@dataclass(frozen=True)
+class BenchQuery:
+    """One production query and the DB it runs against."""
+
+    name: str
+    db: str  # "market" or "sde"
+    sql: str
+    params: dict = field(default_factory=dict)
+
+
+def bench_queries(module_type_id: int) -> list[BenchQuery]:
+    return [
+        BenchQuery("market_stats", "market", MARKET_STATS_QUERY),
+        BenchQuery("five_percentile", "market", FIVE_PERCENTILE_QUERY),
+        BenchQuery("doctrine_stats_doctrines", "market", DOCTRINE_STATS_DOCTRINES_QUERY),
+        BenchQuery("doctrine_stats_marketstats", "market", DOCTRINE_STATS_MARKETSTATS_QUERY),
+        BenchQuery("fit_check_needed", "market", NEEDED_ITEMS_QUERY),
+        BenchQuery("fit_check_module", "market", MODULE_USAGE_QUERY, {"type_id": module_type_id}),
+        BenchQuery("type_fingerprint_scan", "sde", FINGERPRINT_SCAN_QUERY),
+    ]
+
+
+@dataclass
+class QueryResult:
+    name: str
+    seconds: dict[str, float | None] = field(default_factory=dict)
+    rows: dict[str, int | None] = field(default_factory=dict)
+    error: str | None = None
+
+    @property
+    def ratio(self) -> float | None:
+        base, candidate = self.seconds.get("sqlite3"), self.seconds.get("turso")
+        if not base or candidate is None:
+            return None
+        return candidate / base
+
+
+# ---- synthetic data ----------------------------------------------------------
+
+
+def add_synthetic_doctrines(
+    path: Path, n_fits: int = 60, items_per_fit: int = 25, seed: int = 42
+) -> int:
+    """Add marketstats/doctrines/doctrine_fits/ship_targets to a synthetic market DB.
+
+    Returns a type_id used by many fits (the ``fit_check_module`` probe).
+    """
+    rng = random.Random(seed)
+    engine = create_engine(f"sqlite:///{path}")
+    with engine.connect() as conn:
+        type_ids = [r[0] for r in conn.execute(text("SELECT type_id FROM watchlist")).fetchall()]
+    now = pd.Timestamp.now(tz="UTC").tz_localize(None)
+
+    stats = pd.DataFrame(
+        {
+            "type_id": type_ids,
+            "total_volume_remain": [rng.randint(0, 5000) for _ in type_ids],
+            "min_price": [rng.uniform(1e3, 1e8) for _ in type_ids],
+            "price": [rng.uniform(1e3, 1e8) for _ in type_ids],
+            "avg_price": [rng.uniform(1e3, 1e8) for _ in type_ids],
+            "avg_volume": [rng.uniform(0, 100) for _ in type_ids],
+            "group_id": [t % 50 for t in type_ids],
+            "type_name": [f"Type {t}" for t in type_ids],
+            "group_name": [f"Group {t % 50}" for t in type_ids],
+            "category_id": [7] * len(type_ids),
+            "category_name": ["Module"] * len(type_ids),
+            "days_remaining": [rng.uniform(0, 30) for _ in type_ids],
+            "last_update": [now] * len(type_ids),
+        }
+    )
+
+    popular = type_ids[0]
+    doctrine_rows, fit_rows, target_rows = [], [], []
+    for fit_id in range(1, n_fits + 1):
+        ship_id = type_ids[-fit_id]
+        items = [popular] + rng.sample(type_ids[1:-n_fits], items_per_fit - 1)
+        for type_id in items:
+            doctrine_rows.append(
+                {
+                    "fit_id": fit_id,
+                    "ship_id": ship_id,
+                    "ship_name": f"Ship {ship_id}",
+                    "type_id": type_id,
+                    "type_name": f"Type {type_id}",
+                    "fit_qty": rng.randint(1, 8),
+                    "fits_on_mkt": round(rng.uniform(0, 40), 1),
+                    "total_stock": rng.randint(0, 500),
+                    "price": rng.uniform(1e3, 1e8),
+                    "timestamp": now,
+                }
+            )
+        fit_rows.append(
+            {
+                "doctrine_name": f"Doctrine {fit_id % 8}",
+                "fit_name": f"Fit {fit_id}",
+                "ship_type_id": ship_id,
+                "doctrine_id": fit_id % 8,
+                "fit_id": fit_id,
+                "ship_name": f"Ship {ship_id}",
+                "target": 20,
+            }
+        )
+        target_rows.append(
+            {
+                "fit_id": fit_id,
+                "fit_name": f"Fit {fit_id}",
+                "ship_id": ship_id,
+                "ship_name": f"Ship {ship_id}",
+                "ship_target": 20,
+                "created_at": now,
+            }
+        )
+
+    with engine.begin() as conn:
+        stats.to_sql("marketstats", conn, if_exists="append", index=False)
+        pd.DataFrame(doctrine_rows).to_sql("doctrines", conn, if_exists="append", index=False)
+        pd.DataFrame(fit_rows).to_sql("doctrine_fits", conn, if_exists="append", index=False)
+        pd.DataFrame(target_rows).to_sql("ship_targets", conn, if_exists="append", index=False)
+    engine.dispose()
+    return popular
+
+
+def build_synthetic_sde_db(
+    path: Path, n_types: int = 5000, attrs_per_type: int = 30, seed: int = 42
+) -> int:
+    """Create sdetypes + dgmTypeAttributes with families sharing a fingerprint.
+
+    Returns a type_id that has equivalents.
+    """
+    rng = random.Random(seed)
+    conn = sqlite3.connect(path)
+    conn.execute(
+        """
+        CREATE TABLE sdetypes (
+            typeID INTEGER PRIMARY KEY, typeName TEXT, groupID INTEGER,
+            groupName TEXT, categoryID INTEGER, categoryName TEXT,
+            volume REAL, metaGroupID INTEGER, metaGroupName TEXT
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE dgmTypeAttributes (
+            typeID INTEGER, attributeID INTEGER, valueInt INTEGER, valueFloat REAL,
+            PRIMARY KEY (typeID, attributeID)
+        )
+        """
+    )
+    types, attributes = [], []
+    family_size = 5
+    for type_id in range(1, n_types + 1):
+        family = (type_id - 1) // family_size
+        types.append(
+            (type_id, f"Type {type_id}", family % 200, f"Group {family % 200}",
+             7, "Module", 5.0, type_id % 6, f"Meta {type_id % 6}")
+        )
+        family_rng = random.Random(seed + family)
+        for attribute_id in sorted(family_rng.sample(range(1, 2000), attrs_per_type)):
+            attributes.append((type_id, attribute_id, family_rng.randint(0, 100), rng.random()))
+    conn.executemany("INSERT INTO sdetypes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", types)
+    conn.executemany("INSERT INTO dgmTypeAttributes VALUES (?, ?, ?, ?)", attributes)
+    conn.commit()
+    conn.close()
+    return 1
+
+
+# ---- timing ------------------------------------------------------------------
+
+
+def _connect(engine: str, path: str):
+    if engine == "sqlite3":
+        return sqlite3.connect(path)
+    return turso.connect(path)
+
+
+def time_query(engine: str, path: str, sql: str, params: dict, repeat: int) -> tuple[float, int]:
+    """Median seconds over ``repeat`` runs (after one warm-up) and the row count."""
+    conn = _connect(engine, path)
+    try:
+        cur = conn.cursor()
+        cur.execute(sql, params)
+        rows = len(cur.fetchall())
+        timings = []
+        for _ in range(repeat):
+            start = perf_counter()
+            cur.execute(sql, params)
+            cur.fetchall()
+            timings.append(perf_counter() - start)
+        return statistics.median(timings), rows
+    finally:
+        conn.close()
+
+
+def run_query(query: BenchQuery, paths: dict[str, str], repeat: int, timeout: float) -> QueryResult:
+    """Time ``query`` on each engine in a child process so a runaway query can be killed."""
+    result = QueryResult(query.name)
+    for engine in ENGINES:
+        with multiprocessing.get_context("spawn").Pool(1) as pool:
+            job = pool.apply_async(
+                time_query, (engine, paths[query.db], query.sql, query.params, repeat)
+            )
+            try:
+                seconds, rows = job.get(timeout=timeout)
+            except multiprocessing.TimeoutError:
+                result.seconds[engine] = None
+                result.rows[engine] = None
+                result.error = f"{engine} exceeded {timeout:.0f}s"
+                pool.terminate()
+                continue
+            except Exception as exc:
+                result.seconds[engine] = None
+                result.rows[engine] = None
+                result.error = f"{engine}: {exc}"
+                continue
+        result.seconds[engine] = seconds
+        result.rows[engine] = rows
+    return result
+
+
+def failures(results: list[QueryResult], max_ratio: float) -> list[str]:
+    """Every reason the run should fail; empty when all queries are within budget."""
+    problems: list[str] = []
+    for r in results:
+        if r.error:
+            problems.append(f"{r.name}: {r.error}")
+            continue
+        if r.rows["sqlite3"] != r.rows["turso"]:
+            problems.append(
+                f"{r.name}: row count differs (sqlite3={r.rows['sqlite3']}, turso={r.rows['turso']})"
+            )
+        if r.ratio is not None and r.ratio > max_ratio:
+            problems.append(f"{r.name}: turso is {r.ratio:.1f}x sqlite3 (limit {max_ratio:.1f}x)")
+    return problems
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db", help="Market DB to copy (default: synthetic data)")
+    parser.add_argument("--sde", help="SDE DB to copy (default: synthetic data)")
+    parser.add_argument("--module-type-id", type=int, help="type_id for fit_check_module")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--max-ratio", type=float, default=10.0, help="Fail above this turso/sqlite3 ratio")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Per-query, per-engine limit in seconds")
+    parser.add_argument("--types", type=int, default=2500, help="Synthetic watchlist size")
+    parser.add_argument("--json", help="Also write results to this JSON file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        market, sde = Path(tmp) / "market.db", Path(tmp) / "sde.db"
+        if args.db:
+            shutil.copy(args.db, market)
+            module_type_id = args.module_type_id or 0
+        else:
+            print(f"Building synthetic market DB ({args.types} types)...")
+            build_synthetic_market_db(market, n_types=args.types)
+            module_type_id = add_synthetic_doctrines(market)
+        if args.sde:
+            shutil.copy(args.sde, sde)
+        else:
+            print("Building synthetic SDE DB...")
+            build_synthetic_sde_db(sde)
+        module_type_id = args.module_type_id or module_type_id
+
+        paths = {"market": str(market), "sde": str(sde)}
+        results = []
+        for query in bench_queries(module_type_id):
+            print(f"  {query.name}...", flush=True)
+            results.append(run_query(query, paths, args.repeat, args.timeout))
+
+    def fmt(seconds):
+        return f"{seconds:>9.4f}s" if seconds is not None else f"{'-':>10}"
+
+    print(f"\n{'query':<28} {'sqlite3':>10} {'turso':>10} {'ratio':>8} {'rows':>8}")
+    for r in results:
+        ratio = f"{r.ratio:>7.2f}x" if r.ratio is not None else f"{'-':>8}"
+        print(
+            f"{r.name:<28} {fmt(r.seconds.get('sqlite3'))} {fmt(r.seconds.get('turso'))} "
+            f"{ratio} {r.rows.get('sqlite3') or 0:>8}"
+        )
+
+    if args.json:
+        Path(args.json).write_text(
+            json.dumps(
+                {
+                    "turso_version": getattr(turso, "__version__", None),
+                    "sqlite_version": sqlite3.sqlite_version,
+                    "max_ratio": args.max_ratio,
+                    "results": [asdict(r) | {"ratio": r.ratio} for r in results],
+                },
+                indent=2,
+            )
+        )
+
+    problems = failures(results, args.max_ratio)
+    for problem in problems:
+        print(f"FAIL {problem}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,212 @@
+"""Benchmark fit-check data assembly for ``fitcheck --file`` and ``--fit``.
+
+Times the two paths the CLI takes to build a fit's market table:
+
+- ``--file``: ``get_fit_market_status`` on a parsed EFT fit (marketstats,
+  marketorders fallback, ship_targets and SDE lookups);
+- ``--fit``: ``get_fit_market_status_by_id`` (precomputed doctrines rows).
+
+and, for every doctrine fit, ``fitcheck --all-fits`` (one union load,
+``fit_check_bulk.check_fits``) against calling ``get_fit_market_status``
+once per fit.
+
+and reports the median latency plus the SQL statements and new DB
+connections per call, so a regression back to per-item queries shows up as
+a count, not just a slower number.
+
+Runs in a scratch directory where the configured market and SDE file names
+point at synthetic data, so the real databases are never opened. Refuses to
+run if either alias is sync-managed or configured with an absolute path.
+Jita prices are served from local tables in offline mode unless ``--jita``.
+
+Usage:
+    python scripts/bench_fit_check.py
+    python scripts/bench_fit_check.py --items 80 --repeat 20
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+os.environ.setdefault("MKTS_QUIET", "1")
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from sqlalchemy import create_engine, event, text  # noqa: E402
+from sqlalchemy.engine import Engine  # noqa: E402
+from sqlalchemy.pool import Pool  # noqa: E402
+
+from bench_engines import add_synthetic_doctrines  # noqa: E402
+from bench_pragma_profiles import build_synthetic_market_db  # noqa: E402
+from mkts_backend.cli_tools import fit_check, fit_check_bulk  # noqa: E402
+from mkts_backend.config import DatabaseConfig  # noqa: E402
+from mkts_backend.db.sde_index import clear_sde_index  # noqa: E402
+from mkts_backend.utils.eft_parser import FitParseResult  # noqa: E402
+
+
+class Counter:
+    """SQL statements and pool connections opened while ``active``."""
+
+    def __init__(self):
+        self.active = False
+        self.statements = 0
+        self.connections = 0
+        event.listen(Engine, "before_cursor_execute", self._statement)
+        event.listen(Pool, "connect", self._connect)
+
+    def _statement(self, *args):
+        if self.active:
+            self.statements += 1
+
+    def _connect(self, *args):
+        if self.active:
+            self.connections += 1
+
+
+def build_synthetic_sde(path: Path, market: Path) -> None:
+    """sdetypes rows for every watchlist type; doctrine hulls are ships."""
+    conn = sqlite3.connect(market)
+    type_ids = [r[0] for r in conn.execute("SELECT type_id FROM watchlist")]
+    ships = {r[0] for r in conn.execute("SELECT DISTINCT ship_id FROM doctrines")}
+    conn.close()
+
+    conn = sqlite3.connect(path)
+    conn.execute(
+        """
+        CREATE TABLE sdetypes (
+            typeID INTEGER PRIMARY KEY, typeName TEXT, groupID INTEGER,
+            groupName TEXT, categoryID INTEGER, categoryName TEXT,
+            volume REAL, metaGroupID INTEGER, metaGroupName TEXT
+        )
+        """
+    )
+    conn.executemany(
+        "INSERT INTO sdetypes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        [
+            (t, f"Type {t}", t % 50, f"Group {t % 50}",
+             6 if t in ships else 7, "Ship" if t in ships else "Module", 5.0, 1, "Tech I")
+            for t in type_ids
+        ],
+    )
+    conn.commit()
+    conn.close()
+
+
+def drop_marketstats(market: Path, fit_id: int, share: float, seed: int = 7) -> int:
+    """Remove ``share`` of a fit's items from marketstats so they take the fallback path."""
+    rng = random.Random(seed)
+    engine = create_engine(f"sqlite:///{market}")
+    with engine.begin() as conn:
+        type_ids = [
+            r[0] for r in conn.execute(
+                text("SELECT type_id FROM doctrines WHERE fit_id = :fit_id"), {"fit_id": fit_id}
+            )
+        ]
+        dropped = rng.sample(type_ids, int(len(type_ids) * share))
+        for type_id in dropped:
+            conn.execute(text("DELETE FROM marketstats WHERE type_id = :t"), {"t": type_id})
+    engine.dispose()
+    return len(dropped)
+
+
+def parsed_fit(market: Path, fit_id: int) -> FitParseResult:
+    """The doctrine fit as ``parse_eft_file`` would return it."""
+    conn = sqlite3.connect(market)
+    rows = conn.execute(
+        "SELECT ship_id, ship_name, type_id, type_name, fit_qty FROM doctrines WHERE fit_id = ?",
+        (fit_id,),
+    ).fetchall()
+    conn.close()
+    return FitParseResult(
+        items=[{"type_id": r[2], "type_name": r[3], "quantity": r[4]} for r in rows],
+        ship_name=rows[0][1],
+        ship_type_id=rows[0][0],
+        fit_name=f"Fit {fit_id}",
+        missing_types=[],
+    )
+
+
+def time_calls(fn, counter: Counter, repeat: int) -> dict:
+    fn()  # warm-up: SDE index, imports
+    timings = []
+    counter.statements = counter.connections = 0
+    for _ in range(repeat):
+        counter.active = True
+        start = perf_counter()
+        fn()
+        timings.append(perf_counter() - start)
+        counter.active = False
+    return {
+        "median_ms": statistics.median(timings) * 1000,
+        "statements": counter.statements / repeat,
+        "connections": counter.connections / repeat,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=40, help="Distinct items per fit")
+    parser.add_argument("--types", type=int, default=1000, help="Synthetic watchlist size")
+    parser.add_argument("--fallback-share", type=float, default=0.25,
+                        help="Share of the fit's items missing from marketstats")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--jita", action="store_true", help="Allow Jita price fetches")
+    args = parser.parse_args()
+
+    market_db, sde_db = DatabaseConfig("wcmkt"), DatabaseConfig("sde")
+    for db in (market_db, sde_db):
+        if db.turso_url or os.path.isabs(db.path):
+            print(f"Refusing to run: '{db.alias}' is sync-managed or has an absolute path")
+            return 2
+    if not args.jita:
+        os.environ["MKTS_JITA_OFFLINE"] = "1"
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            market, sde = Path(market_db.path), Path(sde_db.path)
+            print(f"Building synthetic market DB ({args.types} types, {args.items}-item fits)...")
+            build_synthetic_market_db(market, n_types=args.types, orders_per_type=10, history_days=1)
+            add_synthetic_doctrines(market, n_fits=5, items_per_fit=args.items)
+            build_synthetic_sde(sde, market)
+            dropped = drop_marketstats(market, 1, args.fallback_share)
+            parse_result = parsed_fit(market, 1)
+            all_fits = [parsed_fit(market, fit_id) for fit_id in range(1, 6)]
+            clear_sde_index()
+
+            counter = Counter()
+            results = {
+                "--file": time_calls(
+                    lambda: fit_check.get_fit_market_status(parse_result), counter, args.repeat
+                ),
+                "--fit": time_calls(
+                    lambda: fit_check.get_fit_market_status_by_id(1), counter, args.repeat
+                ),
+                "5 x --file": time_calls(
+                    lambda: [fit_check.get_fit_market_status(f) for f in all_fits],
+                    counter, args.repeat,
+                ),
+                "--all-fits": time_calls(
+                    lambda: fit_check_bulk.check_fits(fit_check_bulk.load_doctrine_fits()),
+                    counter, args.repeat,
+                ),
+            }
+        finally:
+            os.chdir(cwd)
+
+    print(f"\n{len(parse_result.items)} items, {dropped} without marketstats\n")
+    print(f"{'path':<12} {'median':>10} {'statements':>11} {'connections':>12}")
+    for path, r in results.items():
+        print(f"{path:<12} {r['median_ms']:>8.2f}ms {r['statements']:>11.1f} {r['connections']:>12.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
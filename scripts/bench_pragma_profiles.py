@@ -0,0 +1,207 @@
+"""Benchmark SQLite pragma profiles on the market-stats and upsert workloads.
+
+Runs the real pipeline code paths — ``calculate_market_stats`` (the
+watchlist/orders/history join + 5th-percentile read) and ``upsert_database``
+for ``marketorders`` (ON CONFLICT path) and ``marketstats`` (wipe/replace
+path) — once per pragma profile against a throwaway local copy of a market
+database. Never touches the sync-managed file itself: with ``--db`` the file
+is copied into a temp dir first, otherwise a synthetic DB is generated.
+
+Usage:
+    python scripts/bench_pragma_profiles.py                  # synthetic data
+    python scripts/bench_pragma_profiles.py --db wcmkt.db    # copy of a real DB
+    python scripts/bench_pragma_profiles.py --profiles read bulk --repeat 5
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import shutil
+import statistics
+import tempfile
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from time import perf_counter
+
+os.environ.setdefault("MKTS_QUIET", "1")
+
+import pandas as pd  # noqa: E402
+from sqlalchemy import create_engine  # noqa: E402
+
+from mkts_backend.config.market_context import MarketContext  # noqa: E402
+from mkts_backend.config.sqlite_pragmas import (  # noqa: E402
+    PRAGMA_PROFILES,
+    use_pragma_profile,
+)
+from mkts_backend.db.db_handlers import upsert_database  # noqa: E402
+from mkts_backend.db.models import Base, MarketOrders, MarketStats  # noqa: E402
+from mkts_backend.processing.data_processing import calculate_market_stats  # noqa: E402
+
+
+def build_synthetic_market_db(
+    path: Path,
+    n_types: int = 2500,
+    orders_per_type: int = 20,
+    history_days: int = 60,
+    seed: int = 42,
+) -> None:
+    """Create a market DB at ``path`` with watchlist/marketorders/market_history rows."""
+    rng = random.Random(seed)
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+
+    type_ids = list(range(1000, 1000 + n_types))
+    watchlist = pd.DataFrame(
+        {
+            "type_id": type_ids,
+            "group_id": [t % 50 for t in type_ids],
+            "type_name": [f"Type {t}" for t in type_ids],
+            "group_name": [f"Group {t % 50}" for t in type_ids],
+            "category_id": [7] * n_types,
+            "category_name": ["Module"] * n_types,
+        }
+    )
+
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    order_rows = []
+    order_id = 1
+    for type_id in type_ids:
+        for _ in range(orders_per_type):
+            order_rows.append(
+                {
+                    "order_id": order_id,
+                    "is_buy_order": rng.random() < 0.3,
+                    "type_id": type_id,
+                    "type_name": f"Type {type_id}",
+                    "duration": 90,
+                    "issued": now,
+                    "price": round(rng.uniform(1e3, 1e8), 2),
+                    "volume_remain": rng.randint(1, 500),
+                }
+            )
+            order_id += 1
+
+    history_rows = []
+    for type_id in type_ids:
+        for day in range(history_days):
+            history_rows.append(
+                {
+                    "date": (now - timedelta(days=day)).replace(
+                        hour=0, minute=0, second=0, microsecond=0
+                    ),
+                    "type_id": str(type_id),
+                    "type_name": f"Type {type_id}",
+                    "average": round(rng.uniform(1e3, 1e8), 2),
+                    "volume": rng.randint(1, 1000),
+                    "highest": 0.0,
+                    "lowest": 0.0,
+                    "order_count": rng.randint(1, 50),
+                    "timestamp": now,
+                }
+            )
+
+    with engine.begin() as conn:
+        watchlist.to_sql("watchlist", conn, if_exists="append", index=False)
+        pd.DataFrame(order_rows).to_sql(
+            "marketorders", conn, if_exists="append", index=False, chunksize=5000
+        )
+        pd.DataFrame(history_rows).to_sql(
+            "market_history", conn, if_exists="append", index=False, chunksize=5000
+        )
+    engine.dispose()
+
+
+def _bench_context(db_file: Path) -> MarketContext:
+    # No turso env vars -> DatabaseConfig builds a plain local engine.
+    return MarketContext(
+        alias="bench",
+        name="pragma benchmark",
+        region_id=0,
+        system_id=0,
+        structure_id=0,
+        database_alias="bench",
+        database_file=str(db_file),
+        turso_url_env="MKTS_BENCH_NO_TURSO_URL",
+        turso_token_env="MKTS_BENCH_NO_TURSO_TOKEN",
+        gsheets_url="",
+        gsheets_worksheets={},
+    )
+
+
+def _reshuffle_orders(orders: pd.DataFrame, rng: random.Random) -> pd.DataFrame:
+    """Perturb ~half the prices so the ON CONFLICT ... WHERE changed path updates rows."""
+    df = orders.copy()
+    mask = [rng.random() < 0.5 for _ in range(len(df))]
+    df.loc[mask, "price"] = df.loc[mask, "price"] * 1.01
+    return df
+
+
+def run_profile(source: Path, profile: str, repeat: int) -> dict[str, float]:
+    """Run every workload ``repeat`` times under ``profile``; return median seconds."""
+    timings: dict[str, list[float]] = {"stats": [], "upsert_orders": [], "upsert_stats": []}
+    rng = random.Random(7)
+    with tempfile.TemporaryDirectory() as tmp:
+        for _ in range(repeat):
+            db_file = Path(tmp) / "bench.db"
+            shutil.copy(source, db_file)
+            ctx = _bench_context(db_file)
+            orders = pd.read_sql_table("marketorders", f"sqlite:///{db_file}")
+
+            with use_pragma_profile(profile):
+                start = perf_counter()
+                stats = calculate_market_stats(market_ctx=ctx)
+                timings["stats"].append(perf_counter() - start)
+
+                start = perf_counter()
+                upsert_database(MarketOrders, _reshuffle_orders(orders, rng), market_ctx=ctx)
+                timings["upsert_orders"].append(perf_counter() - start)
+
+                start = perf_counter()
+                upsert_database(MarketStats, stats, market_ctx=ctx)
+                timings["upsert_stats"].append(perf_counter() - start)
+
+            db_file.unlink()
+    return {name: statistics.median(values) for name, values in timings.items()}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db", help="Market DB to copy (default: synthetic data)")
+    parser.add_argument(
+        "--profiles",
+        nargs="+",
+        default=list(PRAGMA_PROFILES.keys()),
+        choices=list(PRAGMA_PROFILES.keys()),
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--types", type=int, default=2500, help="Synthetic watchlist size")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.db:
+            source = Path(tmp) / "source.db"
+            shutil.copy(args.db, source)
+        else:
+            source = Path(tmp) / "synthetic.db"
+            print(f"Building synthetic market DB ({args.types} types)...")
+            build_synthetic_market_db(source, n_types=args.types)
+
+        results = {p: run_profile(source, p, args.repeat) for p in args.profiles}
+
+    baseline_name = "default" if "default" in results else next(iter(results))
+    baseline = results[baseline_name]
+    print(f"\n{'profile':<12} {'stats':>10} {'upsert_orders':>15} {'upsert_stats':>14}")
+    for profile, r in results.items():
+        print(
+            f"{profile:<12} "
+            f"{r['stats']:>9.3f}s {r['upsert_orders']:>14.3f}s {r['upsert_stats']:>13.3f}s"
+            f"   ({r['stats'] / baseline['stats']:.2f}x / "
+            f"{r['upsert_orders'] / baseline['upsert_orders']:.2f}x / "
+            f"{r['upsert_stats'] / baseline['upsert_stats']:.2f}x vs {baseline_name})"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
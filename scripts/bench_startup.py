@@ -0,0 +1,228 @@
+"""Startup-time budget for the interactive CLI entry points.
+
+Runs each scenario in a fresh interpreter under ``python -X importtime`` and
+reports the import time it spent on top of a bare interpreter, the wall
+time of a normal run (median of ``--repeat``), and any *heavy* module it
+loaded that the scenario should not need:
+
+- ``fitcheck --help``: the launcher and the help text, nothing else;
+- ``fitcheck --fit``: dispatch to ``fit-check`` plus the fit_check module
+  (SQLAlchemy is expected; the command itself is stubbed, so no DB is read);
+- ``registry dispatch``: ``mkts-backend <command>`` through args_parser, the
+  command registry and the sync batch, with every handler stubbed;
+- ``mkts-backend --help``.
+
+A scenario fails when its import time exceeds its budget or a forbidden
+module shows up. Budgets are generous multiples of a warm-cache laptop run;
+the forbidden-module lists are the deterministic part and are also checked
+by ``tests/test_import_time.py``.
+
+Usage:
+    python scripts/bench_startup.py
+    python scripts/bench_startup.py --repeat 10 --scale 2
+    python scripts/bench_startup.py --json startup.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from time import perf_counter
+
+# Never needed before a command runs.
+HEAVY = ("pandas", "numpy", "turso", "httpx", "requests", "requests_oauthlib", "prompt_toolkit")
+
+_STUB_HANDLERS = (
+    "from mkts_backend.cli_tools.command_registry import get_registry\n"
+    "for _entry in get_registry().all_commands():\n"
+    "    _entry.handler = lambda args, market: True\n"
+)
+
+
+@dataclass
+class Scenario:
+    name: str
+    code: str
+    budget_ms: float
+    forbidden: tuple[str, ...] = HEAVY
+
+
+@dataclass
+class Result:
+    name: str
+    import_ms: float
+    wall_ms: float
+    budget_ms: float
+    heavy: list[str] = field(default_factory=list)
+    exit_code: int = 0
+
+
+def _entry(func: str, argv: list[str], prelude: str = "") -> str:
+    return (
+        "import sys\n"
+        f"{prelude}"
+        f"sys.argv = {argv!r}\n"
+        f"from mkts_backend.cli_tools.launcher import {func}\n"
+        "try:\n"
+        f"    {func}()\n"
+        "except SystemExit as e:\n"
+        "    sys.exit(e.code)\n"
+    )
+
+
+SCENARIOS = [
+    Scenario(
+        "fitcheck --help",
+        _entry("fitcheck_main", ["fitcheck", "--help"]),
+        budget_ms=250,
+        forbidden=HEAVY + ("sqlalchemy",),
+    ),
+    Scenario(
+        "fitcheck --fit",
+        _entry(
+            "fitcheck_main",
+            ["fitcheck", "--fit=42"],
+            prelude=(
+                "import mkts_backend.cli_tools.fit_check as _fc\n"
+                "_fc.fit_check_command = lambda **kwargs: True\n"
+            ),
+        ),
+        budget_ms=600,
+    ),
+    Scenario(
+        "registry dispatch",
+        _entry("main", ["mkts-backend", "needed", "--market=primary"], prelude=_STUB_HANDLERS),
+        budget_ms=250,
+        forbidden=HEAVY + ("sqlalchemy",),
+    ),
+    Scenario(
+        "mkts-backend --help",
+        _entry("main", ["mkts-backend", "--help"]),
+        budget_ms=250,
+        forbidden=HEAVY + ("sqlalchemy",),
+    ),
+]
+
+
+def parse_importtime(stderr: str) -> dict[str, int]:
+    """``{module: cumulative_us}`` for the top-level imports in ``-X importtime`` output."""
+    top: dict[str, int] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|", 2)
+        if name.startswith("  "):  # nested under another import
+            continue
+        try:
+            top[name.strip()] = int(cumulative)
+        except ValueError:  # the header row
+            continue
+    return top
+
+
+def loaded_modules(stderr: str) -> set[str]:
+    """Every module named in ``-X importtime`` output."""
+    names = set()
+    for line in stderr.splitlines():
+        if line.startswith("import time:") and line.count("|") == 2 and "[us]" not in line:
+            names.add(line.rsplit("|", 1)[1].strip())
+    return names
+
+
+def _run(code: str, cwd: str, importtime: bool) -> subprocess.CompletedProcess:
+    cmd = [sys.executable] + (["-X", "importtime"] if importtime else []) + ["-c", code]
+    env = dict(os.environ, MKTS_QUIET="1")
+    return subprocess.run(cmd, cwd=cwd, env=env, capture_output=True, text=True)
+
+
+def measure(scenario: Scenario, baseline: set[str], cwd: str, repeat: int) -> Result:
+    traced = _run(scenario.code, cwd, importtime=True)
+    top = parse_importtime(traced.stderr)
+    import_us = sum(us for name, us in top.items() if name not in baseline)
+    modules = loaded_modules(traced.stderr)
+    heavy = sorted(m for m in scenario.forbidden if m in modules)
+
+    walls = []
+    for _ in range(repeat):
+        t0 = perf_counter()
+        _run(scenario.code, cwd, importtime=False)
+        walls.append((perf_counter() - t0) * 1000)
+
+    return Result(
+        name=scenario.name,
+        import_ms=import_us / 1000,
+        wall_ms=statistics.median(walls),
+        budget_ms=scenario.budget_ms,
+        heavy=heavy,
+        exit_code=traced.returncode,
+    )
+
+
+def failures(results: list[Result], scale: float = 1.0) -> list[str]:
+    problems = []
+    for r in results:
+        if r.heavy:
+            problems.append(f"{r.name}: imports {', '.join(r.heavy)}")
+        if r.import_ms > r.budget_ms * scale:
+            problems.append(
+                f"{r.name}: {r.import_ms:.0f} ms of imports (budget {r.budget_ms * scale:.0f} ms)"
+            )
+    return problems
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="Wall-time runs per scenario")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply every budget (slow machines, CI)")
+    parser.add_argument("--json", help="Also write results to this JSON file")
+    args = parser.parse_args()
+
+    # A scratch cwd: nothing a scenario might create (cli_cache.db, ...) lands in the repo.
+    with tempfile.TemporaryDirectory() as tmp:
+        baseline = set(parse_importtime(_run("pass", tmp, importtime=True).stderr))
+        t0 = perf_counter()
+        _run("pass", tmp, importtime=False)
+        interpreter_ms = (perf_counter() - t0) * 1000
+        results = []
+        for scenario in SCENARIOS:
+            print(f"  {scenario.name}...", flush=True)
+            results.append(measure(scenario, baseline, tmp, args.repeat))
+
+    print(f"\nbare interpreter: {interpreter_ms:.0f} ms")
+    print(f"{'scenario':<22} {'imports':>10} {'budget':>8} {'wall':>9}  heavy modules")
+    for r in results:
+        print(
+            f"{r.name:<22} {r.import_ms:>8.0f}ms {r.budget_ms * args.scale:>6.0f}ms "
+            f"{r.wall_ms:>7.0f}ms  {', '.join(r.heavy) or '-'}"
+        )
+
+    if args.json:
+        Path(args.json).write_text(
+            json.dumps(
+                {
+                    "python": sys.version.split()[0],
+                    "interpreter_ms": interpreter_ms,
+                    "scale": args.scale,
+                    "results": [asdict(r) for r in results],
+                },
+                indent=2,
+            )
+        )
+
+    problems = failures(results, args.scale)
+    for r in results:
+        if r.exit_code != 0:
+            problems.append(f"{r.name}: exited with {r.exit_code}")
+    for problem in problems:
+        print(f"FAIL {problem}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,137 @@
+"""Staleness tiers for the incremental builder-costs refresh.
+
+Each run re-requests from EverRef only the items that are *due*:
+
+- never fetched (no ``builder_costs`` row);
+- Jita price moved more than ``price_move_pct`` since the cost was fetched
+  (the price snapshot lives in ``builder_cost_refresh``);
+- older than their tier's max age: the *high-value* tier (T2/T3 items,
+  ships, anything priced at or above ``HIGH_VALUE_THRESHOLD``) daily by
+  default, cheap T1 weekly.
+
+Due items are ordered new → price-moved → most overdue (age / tier max age),
+ties broken by Jita price, so a run cut short by its time budget has spent
+its requests on the stalest, most valuable rows. Whatever it did not reach
+is still due next run.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Mapping
+
+from mkts_backend.esi.async_everref import HIGH_VALUE_THRESHOLD
+
+HIGH_VALUE_TIER = "high_value"
+LOW_VALUE_TIER = "low_value"
+
+REASON_NEW = "new"
+REASON_PRICE = "price_moved"
+REASON_AGE = "stale"
+_REASON_RANK = {REASON_NEW: 2, REASON_PRICE: 1, REASON_AGE: 0}
+
+
+@dataclass(frozen=True)
+class CostState:
+    """What is known about an item's current ``builder_costs`` row."""
+
+    fetched_at: datetime
+    jita_price: float | None = None  # Jita sell price when it was fetched
+
+
+@dataclass(frozen=True)
+class RefreshPolicy:
+    high_value_max_age: timedelta = timedelta(hours=24)
+    low_value_max_age: timedelta = timedelta(days=7)
+    price_move_pct: float = 10.0
+    # Wall-clock cap on EverRef fetching per run; 0 disables it.
+    time_budget_seconds: float = 180.0
+
+    @classmethod
+    def from_settings(cls) -> "RefreshPolicy":
+        from mkts_backend.config.settings_service import SettingsService
+
+        settings = SettingsService()
+        return cls(
+            high_value_max_age=timedelta(hours=settings.builder_costs_high_value_max_age_hours),
+            low_value_max_age=timedelta(hours=settings.builder_costs_low_value_max_age_hours),
+            price_move_pct=settings.builder_costs_price_move_pct,
+            time_budget_seconds=settings.builder_costs_time_budget_seconds,
+        )
+
+    def max_age(self, tier: str) -> timedelta:
+        return self.high_value_max_age if tier == HIGH_VALUE_TIER else self.low_value_max_age
+
+
+@dataclass(frozen=True)
+class DueItem:
+    type_id: int
+    reason: str
+    tier: str
+    overdue: float  # age / tier max age; inf for items never fetched
+    jita_price: float
+
+
+def refresh_tier(
+    meta_group_id: int | None,
+    category_id: int | None,
+    jita_price: float | None,
+) -> str:
+    """High-value tier: T2/T3 items, ships, and anything priced above the threshold."""
+    if meta_group_id not in (None, 1) or category_id == 6:
+        return HIGH_VALUE_TIER
+    if jita_price is not None and jita_price >= HIGH_VALUE_THRESHOLD:
+        return HIGH_VALUE_TIER
+    return LOW_VALUE_TIER
+
+
+def _price_moved(then: float | None, now: float | None, pct: float) -> bool:
+    if not then or now is None:
+        return False
+    return abs(now - then) / then * 100 > pct
+
+
+def _aware(value: datetime) -> datetime:
+    # SQLite DateTime columns read back naive; every stamp is written in UTC.
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+
+
+def select_due(
+    type_ids: list[int],
+    meta_groups: Mapping[int, int],
+    categories: Mapping[int, int | None],
+    jita_prices: Mapping[int, float],
+    state: Mapping[int, CostState],
+    policy: RefreshPolicy,
+    now: datetime | None = None,
+) -> list[DueItem]:
+    """Return the due subset of ``type_ids``, highest priority first."""
+    now = now or datetime.now(timezone.utc)
+    due: list[DueItem] = []
+    for type_id in type_ids:
+        price = jita_prices.get(type_id)
+        tier = refresh_tier(meta_groups.get(type_id), categories.get(type_id), price)
+        current = state.get(type_id)
+        if current is None:
+            reason, overdue = REASON_NEW, float("inf")
+        else:
+            age = now - _aware(current.fetched_at)
+            overdue = age / policy.max_age(tier)
+            if _price_moved(current.jita_price, price, policy.price_move_pct):
+                reason = REASON_PRICE
+            elif overdue >= 1:
+                reason = REASON_AGE
+            else:
+                continue
+        due.append(DueItem(type_id, reason, tier, overdue, price or 0.0))
+
+    due.sort(key=lambda d: (-_REASON_RANK[d.reason], -d.overdue, -d.jita_price))
+    return due
+
+
+def budget_item_count(policy: RefreshPolicy, requests_per_minute: int) -> int | None:
+    """Most requests the rate limit lets through in the time budget (None = no cap)."""
+    if policy.time_budget_seconds <= 0:
+        return None
+    return max(1, int(policy.time_budget_seconds * requests_per_minute / 60))
@@ -3,6 +3,10 @@
 Owns reads and writes against ``buildcost.db`` (and its Turso remote). Writes
 target the remote engine; the local mirror is refreshed via
 ``DatabaseConfig.sync()`` separately.
+
+Writers request a push through the sync orchestrator rather than pushing
+themselves: inside a CLI command the requests coalesce into one push of
+buildcost.db when the command finishes.
 """
 
 from __future__ import annotations
@@ -10,14 +14,21 @@ from __future__ import annotations
 from datetime import datetime, timezone
 
 import pandas as pd
-from sqlalchemy import text
+from sqlalchemy import select, text
 from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 
+from mkts_backend.builder_costs.refresh_policy import CostState
 from mkts_backend.config.db_config import DatabaseConfig
 from mkts_backend.config.logging_config import configure_logging
-from mkts_backend.db.build_cost_models import BuildWatchlist, BuilderCosts, UpdateLog
+from mkts_backend.config.sync_orchestrator import get_sync_orchestrator
+from mkts_backend.db.build_cost_models import (
+    BuildWatchlist,
+    BuilderCostRefresh,
+    BuilderCosts,
+    UpdateLog,
+)
 
 logger = configure_logging(__name__)
 
@@ -27,14 +38,14 @@ _UPSERT_CHUNK_SIZE = 500
 
 
 def init_buildcost_tables(db: DatabaseConfig) -> None:
-    """Idempotently create build_watchlist, builder_costs and updatelog locally and push to remote.
+    """Idempotently create build_watchlist, builder_costs, builder_cost_refresh and updatelog.
 
     ``checkfirst=True`` is per-table — the existing structures/rigs/industry_index
     tables are untouched. Each create is logged on failure so a partial init
     surfaces *which* table the libsql remote rejected, not just a raw stack.
     """
     engine = db.engine
-    for model in (BuildWatchlist, BuilderCosts, UpdateLog):
+    for model in (BuildWatchlist, BuilderCosts, BuilderCostRefresh, UpdateLog):
         try:
             model.__table__.create(engine, checkfirst=True)
         except SQLAlchemyError:
@@ -43,7 +54,8 @@ def init_buildcost_tables(db: DatabaseConfig) -> None:
             )
             raise
     logger.info(
-        "Confirmed buildcost.db schema for build_watchlist, builder_costs, updatelog"
+        "Confirmed buildcost.db schema for build_watchlist, builder_costs, "
+        "builder_cost_refresh, updatelog"
     )
 
 
@@ -121,8 +133,8 @@ def delete_build_watchlist_rows(db: DatabaseConfig, type_ids: list[int]) -> int:
                 deleted += result.rowcount or 0
     finally:
         session.close()
-    logger.debug("Pushing changes to remote db.")
-    db.push()
+    logger.debug("Requesting push of build_watchlist deletes.")
+    get_sync_orchestrator().request_push(db)
     logger.info(f"Deleted {deleted} rows from build_watchlist")
     return deleted
 
@@ -157,8 +169,8 @@ def upsert_build_watchlist(db: DatabaseConfig, items: list[dict]) -> int:
                 session.execute(stmt)
     finally:
         session.close()
-    logger.debug(f"pushing batched changes for {len(items)} to remote")
-    db.push()
+    logger.debug(f"Requesting push of {len(items)} build_watchlist rows")
+    get_sync_orchestrator().request_push(db)
     logger.info(f"Upserted {len(items)} rows to build_watchlist")
     return len(items)
 
@@ -171,7 +183,8 @@ def delete_orphan_builder_costs(db: DatabaseConfig) -> int:
     build_watchlist (via ``build-watchlist remove``) would otherwise leave its
     cost row behind and the frontend would keep displaying it. Caller must
     ensure build_watchlist is non-empty before invoking — the runner enforces
-    this in ``run()`` before reaching the prune step.
+    this in ``run()`` before reaching the prune step. Requests no push of its
+    own: the updatelog stamp that follows a prune does.
     """
     engine = db.remote_engine
     deleted = 0
@@ -185,6 +198,12 @@ def delete_orphan_builder_costs(db: DatabaseConfig) -> int:
                 )
             )
             deleted = result.rowcount or 0
+            session.execute(
+                text(
+                    "DELETE FROM builder_cost_refresh "
+                    "WHERE type_id NOT IN (SELECT type_id FROM build_watchlist)"
+                )
+            )
     finally:
         session.close()
     if deleted:
@@ -218,12 +237,69 @@ def upsert_builder_costs(db: DatabaseConfig, records: list[dict]) -> int:
                 session.execute(stmt)
     finally:
         session.close()
-    logger.debug(f"pushing builder_costs to remote: {db.turso_url}")
-    db.push()
+    logger.debug(f"Requesting push of builder_costs to {db.turso_url}")
+    get_sync_orchestrator().request_push(db)
     logger.info(f"Upserted {len(records)} rows to builder_costs")
     return len(records)
 
 
+def read_builder_cost_state(db: DatabaseConfig) -> dict[int, CostState]:
+    """Return ``{type_id: CostState}`` for every builder_costs row.
+
+    ``fetched_at`` comes from builder_costs; ``jita_price`` is the snapshot in
+    builder_cost_refresh, None for rows fetched before it was recorded (those
+    fall back to their age tier only).
+    """
+    query = select(
+        BuilderCosts.type_id, BuilderCosts.fetched_at, BuilderCostRefresh.jita_price
+    ).outerjoin(BuilderCostRefresh, BuilderCostRefresh.type_id == BuilderCosts.type_id)
+    with db.engine.connect() as conn:
+        rows = conn.execute(query).all()
+    return {
+        int(row.type_id): CostState(fetched_at=row.fetched_at, jita_price=row.jita_price)
+        for row in rows
+    }
+
+
+def upsert_builder_cost_refresh(
+    db: DatabaseConfig,
+    records: list[dict],
+    jita_prices: dict[int, float],
+) -> int:
+    """Record the Jita price each freshly fetched cost was computed against."""
+    if not records:
+        return 0
+
+    rows = [
+        {
+            "type_id": record["type_id"],
+            "jita_price": jita_prices.get(record["type_id"]),
+            "fetched_at": record["fetched_at"],
+        }
+        for record in records
+    ]
+    table = BuilderCostRefresh.__table__
+    session = Session(bind=db.engine)
+    try:
+        with session.begin():
+            for start in range(0, len(rows), _UPSERT_CHUNK_SIZE):
+                chunk = rows[start : start + _UPSERT_CHUNK_SIZE]
+                stmt = sqlite_insert(table).values(chunk)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=["type_id"],
+                    set_={
+                        "jita_price": stmt.excluded.jita_price,
+                        "fetched_at": stmt.excluded.fetched_at,
+                    },
+                )
+                session.execute(stmt)
+    finally:
+        session.close()
+    get_sync_orchestrator().request_push(db)
+    logger.info(f"Recorded refresh prices for {len(rows)} builder_costs rows")
+    return len(rows)
+
+
 def log_buildcost_update(db: DatabaseConfig, table_name: str = "buildcost") -> datetime:
     """Stamp the remote ``updatelog`` so the wcmkts_new frontend detects the change.
 
@@ -244,7 +320,7 @@ def log_buildcost_update(db: DatabaseConfig, table_name: str = "buildcost") -> d
     )
     with Session(bind=engine) as session, session.begin():
         session.execute(stmt)
-    logger.debug("Pushing timestamps to builder_costs updatelog.")
-    db.push()
+    logger.debug("Requesting push of the buildcost updatelog stamp.")
+    get_sync_orchestrator().request_push(db)
     logger.info(f"Stamped buildcost updatelog for table_name={table_name!r}")
     return stamped_at
@@ -5,8 +5,12 @@ Steps:
     2. Verify local mirrors of buildcost / sde / primary market exist.
     3. Read build_watchlist from the buildcost local mirror.
     4. Read jita_prices from the primary market local mirror.
-    5. Fetch costs from EverRef for the buildable set.
-    6. Upsert builder_costs to the buildcost remote.
+    5. Fetch costs from EverRef for the buildable items that are due under
+       the staleness tiers (``refresh_policy``), within the time budget.
+    6. Upsert builder_costs (and the price snapshots in
+       builder_cost_refresh) to the buildcost remote.
+    7. Prune rows for items no longer on the watchlist (also when no item
+       was due) and stamp updatelog if anything changed.
 
 build_watchlist is now an independent table — see
 ``docs/superpowers/specs/2026-05-03-independent-build-watchlist-design.md``.
@@ -20,12 +24,15 @@ from dataclasses import dataclass
 
 from sqlalchemy.exc import SQLAlchemyError
 
+from mkts_backend.builder_costs.refresh_policy import RefreshPolicy
 from mkts_backend.builder_costs.repository import (
     delete_orphan_builder_costs,
     init_buildcost_tables,
     log_buildcost_update,
     read_build_watchlist,
+    read_builder_cost_state,
     read_jita_prices,
+    upsert_builder_cost_refresh,
     upsert_builder_costs,
 )
 from mkts_backend.config.db_config import DatabaseConfig
@@ -43,10 +50,46 @@ class RunResult:
     watchlist_size: int = 0
     log_stamped: bool = False
     pruned: int = 0
+    fresh: int = 0
+    deferred: int = 0
 
 
-def run() -> RunResult:
-    """Run a single end-to-end refresh of builder_costs in buildcost.db."""
+def _prune_orphans(buildcost_db: DatabaseConfig, context: str) -> int:
+    """Prune builder_costs rows whose type_id is no longer in build_watchlist.
+
+    Rows removed via ``build-watchlist remove`` would otherwise persist
+    forever under the upsert-only writer and the frontend keeps displaying
+    them. Returns the rows deleted (0 on failure).
+    """
+    try:
+        return delete_orphan_builder_costs(buildcost_db)
+    except SQLAlchemyError as exc:
+        logger.error(
+            f"orphan prune failed {context}; "
+            f"stale builder_costs rows may persist. error={exc}"
+        )
+        return 0
+
+
+def _stamp_update(buildcost_db: DatabaseConfig, context: str) -> bool:
+    """Stamp the buildcost updatelog; False if the write failed."""
+    try:
+        log_buildcost_update(buildcost_db)
+        return True
+    except SQLAlchemyError as exc:
+        logger.error(
+            f"buildcost updatelog stamp failed {context}; "
+            f"frontend will not detect the refresh. error={exc}"
+        )
+        return False
+
+
+def run(full: bool = False) -> RunResult:
+    """Run a single end-to-end refresh of builder_costs in buildcost.db.
+
+    Only items due under the staleness tiers are fetched; ``full=True``
+    treats every item as due (still stalest first, within the time budget).
+    """
     buildcost_db = DatabaseConfig("buildcost")
     sde_db = DatabaseConfig("sde")
     primary_db = DatabaseConfig("primary")
@@ -80,25 +123,42 @@ def run() -> RunResult:
     }
 
     jita_prices = read_jita_prices(primary_db)
+    state = {} if full else read_builder_cost_state(buildcost_db)
 
     summary = run_async_fetch_builder_costs(
         type_ids,
         jita_prices,
         sde_db.engine,
         watchlist_metadata=watchlist_metadata,
+        state=state,
+        policy=RefreshPolicy.from_settings(),
     )
 
     if summary.attempted == 0:
-        # Nothing eligible to fetch — every item filtered out by SDE buildable
-        # join or the meta-group/category scope filters. Treat as success;
-        # the watchlist is just full of non-fetchable items.
+        # Nothing to fetch — every item is either still fresh for its tier or
+        # filtered out by the SDE buildable join or the meta-group/category
+        # scope filters. Items removed from the watchlist still need their
+        # rows pruned; stamp updatelog only if that changed anything, so the
+        # frontend never sees a new timestamp without a change behind it.
+        pruned = _prune_orphans(buildcost_db, "with no items due")
+        log_stamped = False
+        if pruned:
+            log_stamped = _stamp_update(buildcost_db, f"after pruning {pruned} rows")
         logger.info(
-            f"No items eligible for cost fetch "
-            f"(unbuildable={summary.filtered_unbuildable}, "
+            f"No items due for cost fetch "
+            f"(fresh={summary.fresh}, "
+            f"unbuildable={summary.filtered_unbuildable}, "
             f"out_of_scope={summary.filtered_out_of_scope}, "
-            f"watchlist_size={len(items)})"
+            f"watchlist_size={len(items)}, pruned={pruned})"
+        )
+        return RunResult(
+            success=log_stamped or not pruned,
+            watchlist_size=len(items),
+            log_stamped=log_stamped,
+            pruned=pruned,
+            fresh=summary.fresh,
+            deferred=summary.deferred,
         )
-        return RunResult(success=True, watchlist_size=len(items))
 
     if not summary.records:
         logger.error(
@@ -108,34 +168,22 @@ def run() -> RunResult:
         return RunResult(success=False, watchlist_size=len(items))
 
     written = upsert_builder_costs(buildcost_db, summary.records)
-
-    # Prune builder_costs rows whose type_id is no longer in build_watchlist
-    # (e.g. removed via `build-watchlist remove`). Without this pass the
-    # upsert-only writer leaves orphans behind forever and the frontend keeps
-    # displaying them. Done before the updatelog stamp so the stamp reflects
-    # a fully reconciled state.
-    pruned = 0
     try:
-        pruned = delete_orphan_builder_costs(buildcost_db)
+        upsert_builder_cost_refresh(buildcost_db, summary.records, jita_prices)
     except SQLAlchemyError as exc:
-        logger.error(
-            f"orphan prune failed after upserting {written} rows; "
-            f"stale builder_costs rows may persist. error={exc}"
-        )
+        # Costs are written; without the snapshot these rows just fall back
+        # to their age tier next run.
+        logger.error(f"builder_cost_refresh upsert failed: {exc}")
+
+    # Done before the updatelog stamp so the stamp reflects a fully
+    # reconciled state.
+    pruned = _prune_orphans(buildcost_db, f"after upserting {written} rows")
 
     # The frontend probe depends on this stamp being current after every
     # successful refresh. If it fails *after* the upsert committed, the data
     # is fresh but the frontend will see the old timestamp and skip syncing —
     # report success=False so the cron exit code surfaces the mismatch.
-    log_stamped = False
-    try:
-        log_buildcost_update(buildcost_db)
-        log_stamped = True
-    except SQLAlchemyError as exc:
-        logger.error(
-            f"buildcost updatelog stamp failed after upserting {written} rows; "
-            f"frontend will not detect the refresh. error={exc}"
-        )
+    log_stamped = _stamp_update(buildcost_db, f"after upserting {written} rows")
 
     missing = summary.attempted - written
     logger.info(
@@ -143,6 +191,7 @@ def run() -> RunResult:
         f"missing={missing}, attempted={summary.attempted}, "
         f"filtered_unbuildable={summary.filtered_unbuildable}, "
         f"filtered_out_of_scope={summary.filtered_out_of_scope}, "
+        f"fresh={summary.fresh}, deferred={summary.deferred}, "
         f"watchlist_size={len(items)}, pruned={pruned}, "
         f"log_stamped={log_stamped}"
     )
@@ -153,4 +202,6 @@ def run() -> RunResult:
         watchlist_size=len(items),
         log_stamped=log_stamped,
         pruned=pruned,
+        fresh=summary.fresh,
+        deferred=summary.deferred,
     )
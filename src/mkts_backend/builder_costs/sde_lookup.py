@@ -3,7 +3,9 @@
 Uses ``sdetypes`` (the current canonical SDE type table per the Feb 2026
 switch from ``inv_info``). ``lookup_type_metadata`` returns the columns
 build_watchlist needs (type_name, group_name, category_id) keyed by type_id.
-``lookup_type_ids_by_name`` resolves user-pasted type names to type_ids.
+``lookup_type_ids_by_name`` resolves user-pasted type names to type_ids
+through the in-memory SDE name index; ``suggest_type_names`` offers the
+closest names for the ones it could not resolve.
 """
 
 from __future__ import annotations
@@ -12,6 +14,7 @@ from sqlalchemy import text
 
 from mkts_backend.config.db_config import DatabaseConfig
 from mkts_backend.config.logging_config import configure_logging
+from mkts_backend.db.sde_index import get_sde_index
 
 logger = configure_logging(__name__)
 
@@ -73,27 +76,18 @@ def lookup_type_ids_by_name(
     if not cleaned:
         return [], []
 
+    names = get_sde_index(sde_db).name_index()
     resolved: list[int] = []
-    seen_lower: set[str] = set()
-    with sde_db.engine.connect() as conn:
-        for start in range(0, len(cleaned), _LOOKUP_CHUNK_SIZE):
-            chunk = cleaned[start : start + _LOOKUP_CHUNK_SIZE]
-            placeholders = ", ".join(f":n_{i}" for i, _ in enumerate(chunk))
-            params = {f"n_{i}": n.lower() for i, n in enumerate(chunk)}
-            query = text(
-                f"""
-                SELECT typeID, typeName
-                FROM sdetypes
-                WHERE LOWER(typeName) IN ({placeholders})
-                """
-            )
-            for row in conn.execute(query, params).mappings():
-                tid = row.get("typeID")
-                tname = (row.get("typeName") or "").lower()
-                if tid is None or not tname:
-                    continue
-                resolved.append(int(tid))
-                seen_lower.add(tname)
-
-    unresolved = [n for n in cleaned if n.lower() not in seen_lower]
+    unresolved: list[str] = []
+    for name in cleaned:
+        type_id = names.lookup(name)
+        if type_id is None:
+            unresolved.append(name)
+        else:
+            resolved.append(int(type_id))
     return resolved, unresolved
+
+
+def suggest_type_names(name: str, sde_db: DatabaseConfig, limit: int = 3) -> list[str]:
+    """Closest ``sdetypes`` names to an unresolved ``name`` (typos)."""
+    return [n for _, n in get_sde_index(sde_db).name_index().suggest(name, limit)]
@@ -2,17 +2,20 @@ import sys
 import json
 import time
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, cast
 
-from mkts_backend.config.logging_config import configure_logging
+from mkts_backend.config.logging_config import configure_logging, market_log_context
 from mkts_backend.db.db_queries import get_table_length
 from mkts_backend.db.db_handlers import (
+    ensure_model_columns,
     upsert_database,
     update_history,
     update_market_orders,
     log_update,
 )
-from mkts_backend.db.models import MarketStats, Doctrines, JitaPrices
+from mkts_backend.db.models import MarketStats, Doctrines, JitaPrices, NeededItems
 from mkts_backend.utils.utils import (
     validate_columns,
     convert_datetime_columns,
@@ -21,17 +24,23 @@ from mkts_backend.utils.utils import (
 from mkts_backend.processing.data_processing import (
     calculate_market_stats,
     calculate_doctrine_stats,
+    calculate_needed_items,
 )
+from mkts_backend.processing.stage_graph import Stage, StageFailed, StageReport, run_stages
+from mkts_backend.processing.checkpoints import PARTIAL, CheckpointStore
 from mkts_backend.config.esi_config import ESIConfig
 from mkts_backend.esi.esi_requests import (
     fetch_market_orders,
+    FetchMarketOrdersResult,
     FetchMarketOrdersSuccess,
 )
 from mkts_backend.esi.async_history import run_async_history
 from mkts_backend.utils.validation import validate_all
 from mkts_backend.config.db_config import DatabaseConfig
 from mkts_backend.config.settings_service import SettingsService
-from mkts_backend.cli_tools.args_parser import parse_args
+from mkts_backend.config.sqlite_pragmas import use_pragma_profile
+from mkts_backend.config.sync_orchestrator import get_sync_orchestrator
+from mkts_backend.cli_tools.launcher import main  # noqa: F401  (mkts-backend entry point)
 from mkts_backend.config.gsheets_config import GoogleSheetConfig
 from mkts_backend.config.market_context import MarketContext
 
@@ -41,49 +50,59 @@ QUIET = os.environ.get("MKTS_QUIET", "0") == "1"
 logger = configure_logging(__name__)
 
 
-def process_market_orders(
-    esi: ESIConfig,
-    order_type: str = "all",
-    test_mode: bool = False,
-    market_ctx: Optional[MarketContext] = None,
-) -> bool:
-    """Fetches market orders from ESI and updates the database.
+class MarketPipelineError(RuntimeError):
+    """A market's pipeline cannot continue; other markets are unaffected."""
 
-    Uses two-layer caching:
-    1. Expires header — skip fetch entirely if within ESI cache window
-    2. Per-page etags — skip DB write if all pages return 304
-    """
-    from mkts_backend.db.db_handlers import load_orders_cache, save_orders_cache
+
+def _debug_dump_path(name: str, market_ctx: Optional[MarketContext]) -> str:
+    """Per-market path for the raw ESI JSON dumps (markets may run concurrently)."""
+    if market_ctx is None or market_ctx.alias == "primary":
+        return f"data/{name}.json"
+    return f"data/{name}_{market_ctx.alias}.json"
+
+
+def _orders_cache_is_fresh(cache: dict) -> bool:
+    """True if the cached Expires header says ESI has nothing new yet."""
     from datetime import datetime, timezone
     from email.utils import parsedate_to_datetime
 
-    structure_id = market_ctx.structure_id if market_ctx else esi.structure_id
-    cache = load_orders_cache(structure_id, market_ctx=market_ctx)
-
-    # Layer 1: Expires check — skip fetch entirely if within cache window
     expires_str = cache.get("expires")
-    if expires_str:
-        try:
-            expires_dt = parsedate_to_datetime(expires_str)
-            if datetime.now(timezone.utc) < expires_dt:
-                logger.info(
-                    f"Market orders cache valid until {expires_str}, skipping fetch"
-                )
-                return True
-        except (ValueError, TypeError) as e:
-            logger.warning(
-                f"Invalid Expires value in orders cache: {expires_str!r} ({e}), proceeding with fetch"
-            )
+    if not expires_str:
+        return False
+    try:
+        expires_dt = parsedate_to_datetime(expires_str)
+    except (ValueError, TypeError) as e:
+        logger.warning(
+            f"Invalid Expires value in orders cache: {expires_str!r} ({e}), proceeding with fetch"
+        )
+        return False
+    if datetime.now(timezone.utc) < expires_dt:
+        logger.info(f"Market orders cache valid until {expires_str}, skipping fetch")
+        return True
+    return False
 
-    # Layer 2: Per-page etag check
+
+def _fetch_orders(
+    esi: ESIConfig, cache: dict, order_type: str = "all", test_mode: bool = False
+) -> FetchMarketOrdersResult | None:
+    """Network half of the orders update: ESI fetch with per-page etags."""
     page_etags = cache.get("pages", {})
-    result = fetch_market_orders(
+    return fetch_market_orders(
         esi,
         order_type=order_type,
         page_etags=page_etags if page_etags else None,
         test_mode=test_mode,
     )
 
+
+def _write_orders(
+    result: FetchMarketOrdersResult | None,
+    structure_id: int,
+    market_ctx: Optional[MarketContext] = None,
+) -> bool:
+    """DB half of the orders update: upsert orders and the page-etag cache."""
+    from mkts_backend.db.db_handlers import save_orders_cache
+
     if result is None:
         logger.error("no data returned from ESI call.")
         return False
@@ -95,7 +114,7 @@ def process_market_orders(
     # 200 — process new data
     success_result = cast(FetchMarketOrdersSuccess, result)
     data = success_result["data"]
-    save_path = "data/market_orders_new.json"
+    save_path = _debug_dump_path("market_orders_new", market_ctx)
     if data:
         with open(save_path, "w") as f:
             json.dump(data, f)
@@ -124,26 +143,67 @@ def process_market_orders(
         return False
 
 
+def process_market_orders(
+    esi: ESIConfig,
+    order_type: str = "all",
+    test_mode: bool = False,
+    market_ctx: Optional[MarketContext] = None,
+) -> bool:
+    """Fetches market orders from ESI and updates the database.
+
+    Uses two-layer caching:
+    1. Expires header — skip fetch entirely if within ESI cache window
+    2. Per-page etags — skip DB write if all pages return 304
+    """
+    from mkts_backend.db.db_handlers import load_orders_cache
+
+    structure_id = market_ctx.structure_id if market_ctx else esi.structure_id
+    cache = load_orders_cache(structure_id, market_ctx=market_ctx)
+    if _orders_cache_is_fresh(cache):
+        return True
+    result = _fetch_orders(esi, cache, order_type=order_type, test_mode=test_mode)
+    return _write_orders(result, structure_id, market_ctx=market_ctx)
+
+
+def _write_history(
+    data: list[dict] | None,
+    region_id: int,
+    market_ctx: Optional[MarketContext] = None,
+) -> bool:
+    """DB half of the history update: upsert rows and the conditional-request cache."""
+    from mkts_backend.db.db_handlers import save_esi_cache
+
+    if not data:
+        logger.error("No history data returned")
+        return False
+    save_esi_cache(data, region_id, market_ctx)
+    # Only write results with actual data to the debug JSON file
+    data_with_content = [r for r in data if r and r.get("data") is not None]
+    if data_with_content:
+        with open(_debug_dump_path("market_history_new", market_ctx), "w") as f:
+            json.dump(data_with_content, f)
+    status = update_history(data, market_ctx=market_ctx)
+    if status:
+        log_update("market_history", market_ctx=market_ctx)
+        logger.info(
+            f"History updated:{get_table_length('market_history', market_ctx=market_ctx)} items"
+        )
+        return True
+    else:
+        logger.error("Failed to update market history")
+        return False
+
+
 def process_history(market_ctx: Optional[MarketContext] = None) -> bool:
     logger.info("History mode enabled")
     logger.info("Processing history")
-    data = run_async_history(market_ctx=market_ctx)
-    if data:
-        # Only write results with actual data to the debug JSON file
-        data_with_content = [r for r in data if r and r.get("data") is not None]
-        if data_with_content:
-            with open("data/market_history_new.json", "w") as f:
-                json.dump(data_with_content, f)
-        status = update_history(data, market_ctx=market_ctx)
-        if status:
-            log_update("market_history", market_ctx=market_ctx)
-            logger.info(
-                f"History updated:{get_table_length('market_history', market_ctx=market_ctx)} items"
-            )
-            return True
-        else:
-            logger.error("Failed to update market history")
-            return False
+    region_id = (
+        market_ctx.region_id
+        if market_ctx
+        else MarketContext.from_settings("primary").region_id
+    )
+    data = run_async_history(market_ctx=market_ctx, persist_cache=False)
+    return _write_history(data, region_id, market_ctx=market_ctx)
 
 
 def process_market_stats(market_ctx: Optional[MarketContext] = None) -> bool:
@@ -176,6 +236,7 @@ def process_market_stats(market_ctx: Optional[MarketContext] = None) -> bool:
         return False
     try:
         logger.info("Updating market stats in database")
+        ensure_model_columns(MarketStats, market_ctx=market_ctx)
         status = upsert_database(MarketStats, market_stats_df, market_ctx=market_ctx)
         if status:
             log_update("marketstats", market_ctx=market_ctx)
@@ -194,6 +255,7 @@ def process_doctrine_stats(market_ctx: Optional[MarketContext] = None) -> bool:
     logger.info("Calculating doctrines stats")
     doctrine_stats_df = calculate_doctrine_stats(market_ctx=market_ctx)
     doctrine_stats_df = convert_datetime_columns(doctrine_stats_df, ["timestamp"])
+    ensure_model_columns(Doctrines, market_ctx=market_ctx)
     status = upsert_database(Doctrines, doctrine_stats_df, market_ctx=market_ctx)
     if status:
         log_update("doctrines", market_ctx=market_ctx)
@@ -206,6 +268,27 @@ def process_doctrine_stats(market_ctx: Optional[MarketContext] = None) -> bool:
         return False
 
 
+def process_needed_items(market_ctx: Optional[MarketContext] = None) -> bool:
+    """Rebuild ``needed_items`` from the doctrines stats just written."""
+    logger.info("Calculating needed items")
+    db = DatabaseConfig(market_context=market_ctx) if market_ctx else DatabaseConfig("wcmkt")
+    NeededItems.__table__.create(db.engine, checkfirst=True)  # pyright: ignore[reportAttributeAccessIssue]
+    needed_df = calculate_needed_items(market_ctx=market_ctx)
+    if needed_df.empty:
+        # Every fit is at target; upsert_database refuses an empty frame.
+        with db.engine.begin() as conn:
+            conn.execute(NeededItems.__table__.delete())  # pyright: ignore[reportAttributeAccessIssue]
+        log_update("needed_items", market_ctx=market_ctx)
+        logger.info("Needed items updated: all fits at target")
+        return True
+    if upsert_database(NeededItems, needed_df, market_ctx=market_ctx):
+        log_update("needed_items", market_ctx=market_ctx)
+        logger.info(f"Needed items updated:{len(needed_df)} items")
+        return True
+    logger.error("Failed to update needed items")
+    return False
+
+
 def google_sheets_update_workflow(market_ctx: MarketContext) -> None:
     """Update Google Sheets with market data for the given market context."""
     google_sheet_config = GoogleSheetConfig(market_context=market_ctx)
@@ -301,15 +384,177 @@ def process_jita_prices(market_contexts: list[MarketContext]) -> bool:
     return any_success
 
 
+def _build_market_stages(
+    market_ctx: MarketContext,
+    esi: ESIConfig,
+    db: DatabaseConfig,
+    history: bool,
+    checkpoints: Optional[CheckpointStore] = None,
+    db_lane: Optional[threading.Lock] = None,
+) -> list[Stage]:
+    """The per-market pipeline as a stage graph.
+
+    Network stages (ESI fetches, push, Sheets) overlap with DB stages; DB
+    stages run one at a time. Dependencies encode the real data flow:
+    stats needs fresh orders (and history, when requested), doctrines need
+    stats, and the push only happens once every write has landed.
+
+    History is fetched in batches; each batch is written under ``db_lane``
+    (the lock passed to ``run_stages``) and checkpointed, so a resumed run
+    picks up after the last written batch.
+    """
+    from mkts_backend.db.db_handlers import load_esi_cache, load_orders_cache
+
+    structure_id = market_ctx.structure_id
+    db_lane = db_lane or threading.Lock()
+
+    def orders_cache(_):
+        cache = load_orders_cache(structure_id, market_ctx=market_ctx)
+        return None if _orders_cache_is_fresh(cache) else cache
+
+    def orders_fetch(r):
+        if r["orders_cache"] is None:
+            return None
+        if not QUIET:
+            print(f"Fetching market orders for {market_ctx.name}")
+        return _fetch_orders(esi, r["orders_cache"])
+
+    def orders_write(r):
+        if r["orders_cache"] is None:
+            return True
+        if not _write_orders(r["orders_fetch"], structure_id, market_ctx=market_ctx):
+            raise MarketPipelineError("Failed to update market orders")
+        return True
+
+    def watchlist(_):
+        df = db.get_watchlist()
+        if len(df) == 0:
+            raise MarketPipelineError("No watchlist found. Unable to proceed further.")
+        logger.debug(f"Watchlist found: {len(df)} items")
+        type_ids = df["type_id"].unique().tolist()
+        cache = load_esi_cache(market_ctx.region_id, market_ctx) if history else {}
+        return type_ids, cache
+
+    def history_stage(r):
+        type_ids, cache = r["watchlist"]
+        type_ids = sorted(type_ids)
+        total = len(type_ids)
+        resume_from = checkpoints.partial("history") if checkpoints else {}
+        if resume_from:
+            done_through = resume_from["done_through"]
+            type_ids = [t for t in type_ids if t > done_through]
+            logger.info(
+                f"Resuming history after type {done_through}: {len(type_ids)} of {total} left"
+            )
+        batch_size = max(1, SettingsService().pipeline_history_batch_size)
+        failed = 0
+        for start in range(0, len(type_ids), batch_size):
+            batch = type_ids[start : start + batch_size]
+            data = run_async_history(
+                batch,
+                region_id=market_ctx.region_id,
+                market_ctx=market_ctx,
+                cache=cache,
+                persist_cache=False,
+            )
+            errored = [
+                row["type_id"] for row in data or []
+                if row and row.get("status") not in (200, 304)
+            ]
+            with db_lane:
+                if not _write_history(data, market_ctx.region_id, market_ctx=market_ctx):
+                    raise MarketPipelineError("Failed to update history")
+                # Stop advancing the marker at the first failed type so
+                # --resume refetches it (and, cheaply via etags, what follows).
+                if checkpoints is not None and not failed:
+                    done_through = min(errored) - 1 if errored else batch[-1]
+                    checkpoints.record(
+                        "history", PARTIAL, {"done_through": done_through, "total": total}
+                    )
+            failed += len(errored)
+        return {"types": len(type_ids), "failed": failed}
+
+    def stats(_):
+        if not process_market_stats(market_ctx=market_ctx):
+            raise MarketPipelineError("Failed to update market stats")
+        return True
+
+    def doctrines(_):
+        if not process_doctrine_stats(market_ctx=market_ctx):
+            raise MarketPipelineError("Failed to update doctrines")
+        return True
+
+    def needed(_):
+        if not process_needed_items(market_ctx=market_ctx):
+            raise MarketPipelineError("Failed to update needed items")
+        return True
+
+    def push(_):
+        logger.info(f"Market update complete for {market_ctx.alias}; pushing local changes")
+        get_sync_orchestrator().push_now(db)
+
+    def sheets(_):
+        env = SettingsService().environment
+        if (
+            SettingsService().gsheets_enabled
+            and market_ctx.alias == "primary"
+            and env != "development"
+        ):
+            logger.info("Google Sheets are enabled in settings.toml. Updating Google Sheets")
+            google_sheets_update_workflow(market_ctx=market_ctx)
+        else:
+            logger.info(
+                "Google Sheets are disabled in settings.toml. Skipping Google Sheets update"
+            )
+
+    stages = [
+        Stage("orders_cache", orders_cache),
+        Stage("orders_fetch", orders_fetch, deps=("orders_cache",), kind="network"),
+        Stage("orders_write", orders_write, deps=("orders_fetch",)),
+        Stage("watchlist", watchlist),
+    ]
+    stats_deps: tuple[str, ...] = ("orders_write", "watchlist")
+    if history:
+        # A failed history update is logged and the stats run on existing history.
+        stages.append(
+            Stage("history", history_stage, deps=("watchlist",), kind="network", required=False)
+        )
+        stats_deps += ("history",)
+    else:
+        logger.debug("History mode disabled. Skipping history processing")
+    stages += [
+        Stage("stats", stats, deps=stats_deps),
+        Stage("doctrines", doctrines, deps=("stats",)),
+        Stage("needed", needed, deps=("doctrines",)),
+        Stage("push", push, deps=("needed",), kind="network"),
+        Stage("sheets", sheets, deps=("push",), kind="network"),
+    ]
+    return stages
+
+
 def _run_market_pipeline(
     market_ctx: MarketContext,
     history: bool = False,
-) -> None:
+    resume: bool = False,
+    force: bool = False,
+) -> StageReport:
     """Run the full market data pipeline for a single market.
 
+    Stages whose inputs have not changed since their last successful run
+    (stats, doctrines, push, Sheets) are skipped; see processing/checkpoints.
+
     Args:
         market_ctx: The market context to process.
         history: Whether to include historical data processing.
+        resume: Also skip the ESI stages a recent run already finished, and
+            continue a partial history fetch.
+        force: Run every stage regardless of freshness.
+
+    Returns:
+        Per-stage timings.
+
+    Raises:
+        MarketPipelineError: if a required stage fails.
     """
     logger.info("=" * 80)
     logger.info(f"Processing market: {market_ctx.name} ({market_ctx.alias})")
@@ -323,158 +568,182 @@ def _run_market_pipeline(
     db = DatabaseConfig(market_context=market_ctx)
     logger.info(f"Database: {db.alias} ({db.path})")
 
-    if not QUIET:
-        print("=" * 80)
-        print(f"Fetching market orders for {market_ctx.name}")
-        print("=" * 80)
-
-    # Process market orders
-    status = process_market_orders(
-        esi, order_type="all", test_mode=False, market_ctx=market_ctx
+    checkpoints = CheckpointStore(
+        db.engine,
+        market_ctx.alias,
+        resume=resume,
+        force=force,
+        max_age_minutes=SettingsService().pipeline_resume_max_age_minutes,
     )
-    if status:
-        logger.debug("Market orders updated")
-    else:
-        logger.error("Failed to update market orders")
-        exit()
+    db_lane = threading.Lock()
 
-    logger.info("=" * 80)
+    def should_skip(stage: Stage) -> bool:
+        # Fingerprinting reads the market DB, so it queues for the db lane.
+        with db_lane:
+            return checkpoints.is_fresh(stage.name)
 
-    # Get watchlist
-    watchlist = db.get_watchlist()
+    def record(stage: Stage, result) -> None:
+        if stage.name == "history" and result["failed"]:
+            return  # left partial so --resume retries the failed types
+        checkpoints.record(stage.name)
 
-    if len(watchlist) > 0:
-        logger.debug(f"Watchlist found: {len(watchlist)} items")
-    else:
-        logger.error("No watchlist found. Unable to proceed further.")
-        exit()
-
-    # Process history
-    if history:
-        logger.info("Processing history")
-        status = process_history(market_ctx=market_ctx)
-        if status:
-            logger.debug("History updated")
-        else:
-            logger.error("Failed to update history")
-    else:
-        logger.debug("History mode disabled. Skipping history processing")
-
-    # Process market stats
-    status = process_market_stats(market_ctx=market_ctx)
-    if status:
-        logger.debug("Market stats updated")
-    else:
-        logger.error("Failed to update market stats")
-        exit()
-
-    status = process_doctrine_stats(market_ctx=market_ctx)
-    if status:
-        logger.debug("Doctrines updated")
-    else:
-        logger.error("Failed to update doctrines")
-        exit()
-
-    logger.info(f"Market update complete for {market_ctx.alias}; pushing local changes")
-    db.push()
-
-    env = SettingsService().environment
-
-    # Update Google Sheets if enabled and primary market
-    if (
-        SettingsService().gsheets_enabled
-        and market_ctx.alias == "primary"
-        and env != "development"
-    ):
-        logger.info(
-            "Google Sheets are enabled in settings.toml. Updating Google Sheets"
+    stages = _build_market_stages(market_ctx, esi, db, history, checkpoints, db_lane)
+    try:
+        _, report = run_stages(
+            stages,
+            db_lane=db_lane,
+            should_skip=should_skip,
+            on_complete=record,
         )
-        google_sheets_update_workflow(market_ctx=market_ctx)
-    else:
+    except StageFailed as e:
+        logger.info(f"Stage timings for {market_ctx.alias}:\n{e.report.summary()}")
+        cause = e.__cause__
+        if isinstance(cause, MarketPipelineError):
+            raise cause
+        raise MarketPipelineError(f"{e}: {cause}") from cause
+    logger.info(f"Stage timings for {market_ctx.alias}:\n{report.summary()}")
+    return report
+
+
+def _run_market_pipeline_isolated(
+    market_ctx: MarketContext, history: bool, resume: bool = False, force: bool = False
+) -> bool:
+    """Run one market's pipeline with its log lines tagged; never raises."""
+    with market_log_context(market_ctx.alias):
+        start = time.perf_counter()
+        try:
+            _run_market_pipeline(market_ctx, history=history, resume=resume, force=force)
+        except MarketPipelineError as e:
+            logger.error(f"Market {market_ctx.alias} failed: {e}")
+            return False
+        except Exception:
+            logger.exception(f"Market {market_ctx.alias} failed with an unexpected error")
+            return False
         logger.info(
-            "Google Sheets are disabled in settings.toml. Skipping Google Sheets update"
+            f"Market {market_ctx.alias} finished in {time.perf_counter() - start:.1f}s"
         )
+        return True
+
 
+def _run_market_pipelines(
+    contexts: list[MarketContext],
+    history: bool,
+    workers: int,
+    resume: bool = False,
+    force: bool = False,
+) -> dict[str, bool]:
+    """Run every market's pipeline, up to ``workers`` at a time.
 
-def run_market_update(history: bool = False, market_alias: str = "all") -> bool:
+    Markets share nothing but the ESI budget (esi_governor), so threads are
+    enough: the work is ESI/Turso I/O and SQLite, which release the GIL.
+    A failing market is logged and reported; the others carry on.
+    """
+    workers = max(1, min(workers, len(contexts)))
+    if workers == 1:
+        return {
+            ctx.alias: _run_market_pipeline_isolated(ctx, history, resume, force)
+            for ctx in contexts
+        }
+
+    logger.info(f"Running {len(contexts)} markets with {workers} workers")
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="market") as pool:
+        futures = {
+            ctx.alias: pool.submit(_run_market_pipeline_isolated, ctx, history, resume, force)
+            for ctx in contexts
+        }
+        return {alias: future.result() for alias, future in futures.items()}
+
+
+def run_market_update(
+    history: bool = False,
+    market_alias: str = "all",
+    workers: Optional[int] = None,
+    resume: bool = False,
+    force: bool = False,
+) -> bool:
     """Run the full market-data update pipeline for one or all markets.
 
     Handles env validation, DB init, Jita-price fetch, and per-market pipeline.
-    Returns True on success; exits non-zero on setup failures.
+    ``workers`` markets run concurrently (default: ``[pipeline] workers``).
+    ``resume`` reuses the checkpoints of a previous, interrupted run;
+    ``force`` re-runs stages whose inputs are unchanged.
+    Returns True if every market succeeded; exits non-zero on setup failures.
     """
     from mkts_backend.cli_tools.market_args import expand_market_alias
 
-    start_time = time.perf_counter()
+    # Pipeline writes run under the bulk pragma profile; every DatabaseConfig
+    # built below picks it up when its engine is first created.
+    with use_pragma_profile(SettingsService().sqlite_pipeline_profile):
+        start_time = time.perf_counter()
 
-    market_aliases = expand_market_alias(market_alias)
+        market_aliases = expand_market_alias(market_alias)
 
-    # Scope credential validation to the markets actually being processed so a
-    # single-market run doesn't require every market's Turso credentials.
-    validation_result = validate_all(market_aliases)
-    if not validation_result["is_valid"]:
-        if validation_result["missing_required"]:
-            logger.error(
-                f"Missing required credentials: {', '.join(validation_result['missing_required'])}"
-            )
-            logger.error("Please check your .env file or environment variables.")
-        sys.exit(1)
-    logger.info("Environment validation passed")
-
-    init_databases()
-    logger.debug("Databases initialized")
-    os.makedirs("data", exist_ok=True)
-    logger.debug(f"Data directory created: {os.path.abspath('data')}")
-
-    all_contexts = []
-    for alias in market_aliases:
-        try:
-            market_ctx = MarketContext.from_settings(alias)
-            logger.info(f"MarketContext: {market_ctx}")
-            all_contexts.append(market_ctx)
-        except ValueError as e:
-            logger.error(f"Invalid market: {e}")
-            logger.error(
-                f"Available markets: {', '.join(MarketContext.list_available())}"
-            )
+        # Scope credential validation to the markets actually being processed so a
+        # single-market run doesn't require every market's Turso credentials.
+        validation_result = validate_all(market_aliases)
+        if not validation_result["is_valid"]:
+            if validation_result["missing_required"]:
+                logger.error(
+                    f"Missing required credentials: {', '.join(validation_result['missing_required'])}"
+                )
+                logger.error("Please check your .env file or environment variables.")
             sys.exit(1)
-
-    for market_ctx in all_contexts:
-        db = DatabaseConfig(market_context=market_ctx)
-        if db.needs_init():
+        logger.info("Environment validation passed")
+
+        init_databases()
+        logger.debug("Databases initialized")
+        os.makedirs("data", exist_ok=True)
+        logger.debug(f"Data directory created: {os.path.abspath('data')}")
+
+        all_contexts = []
+        for alias in market_aliases:
+            try:
+                market_ctx = MarketContext.from_settings(alias)
+                logger.info(f"MarketContext: {market_ctx}")
+                all_contexts.append(market_ctx)
+            except ValueError as e:
+                logger.error(f"Invalid market: {e}")
+                logger.error(
+                    f"Available markets: {', '.join(MarketContext.list_available())}"
+                )
+                sys.exit(1)
+
+        # Bootstrap any missing market DBs concurrently.
+        missing = [
+            db for db in (DatabaseConfig(market_context=ctx) for ctx in all_contexts)
+            if db.needs_init()
+        ]
+        for db in missing:
             logger.info(f"Initializing market database: {db.alias}")
-            db.verify_db_exists()
+        for result in get_sync_orchestrator().run_all(
+            missing, "init", lambda db: db.verify_db_exists()
+        ):
+            if not result.ok:
+                logger.error(f"Failed to initialize {result.alias}: {result.error}")
+                sys.exit(1)
+
+        jita_ok = process_jita_prices(all_contexts)
+        if not jita_ok:
+            logger.warning(
+                "Jita price update failed; downstream stats will lack Jita comparisons"
+            )
 
-    jita_ok = process_jita_prices(all_contexts)
-    if not jita_ok:
-        logger.warning(
-            "Jita price update failed; downstream stats will lack Jita comparisons"
+        if workers is None:
+            workers = SettingsService().pipeline_workers
+        results = _run_market_pipelines(
+            all_contexts, history, workers, resume=resume, force=force
         )
 
-    for market_ctx in all_contexts:
-        _run_market_pipeline(market_ctx, history=history)
-
-    logger.info("=" * 80)
-    label = " + ".join(market_aliases)
-    logger.info(
-        f"Market job complete for {label} in {time.perf_counter() - start_time:.1f}s"
-    )
-    logger.info("=" * 80)
-    return True
-
-
-def main() -> None:
-    """Entry point for the `mkts-backend` CLI.
-
-    Bare invocation prints help. Any subcommand is dispatched via the shared
-    command registry inside ``parse_args``.
-    """
-    from mkts_backend.cli_tools.cli_help import display_cli_help
-
-    if len(sys.argv) <= 1:
-        display_cli_help()
-        return
-
-    parse_args(sys.argv)
+        logger.info("=" * 80)
+        label = " + ".join(market_aliases)
+        logger.info(
+            f"Market job complete for {label} in {time.perf_counter() - start_time:.1f}s"
+        )
+        failed = [alias for alias, ok in results.items() if not ok]
+        if failed:
+            logger.error(f"Markets failed: {', '.join(failed)}")
+        logger.info("=" * 80)
+        return not failed
 
 
 if __name__ == "__main__":
@@ -14,30 +14,31 @@ This package contains CLI commands for managing EVE Online fits and doctrines:
 - check_tables: Check tables in the database
 """
 
-from mkts_backend.cli_tools.fit_check import fit_check_command
-from mkts_backend.cli_tools.fit_update import (
-    fit_update_command,
-    collect_fit_metadata_interactive,
-)
-from mkts_backend.cli_tools.cli_help import (
-    display_cli_help,
-    display_update_fit_help,
-    display_update_target_help,
-)
-from mkts_backend.cli_tools.add_watchlist import add_watchlist
-from mkts_backend.cli_tools.args_parser import parse_args
-from mkts_backend.cli_tools.cli_db_commands import check_tables
-from mkts_backend.cli_tools.prompter import get_multiline_input
+from importlib import import_module
 
-__all__ = [
-    "fit_check_command",
-    "fit_update_command",
-    "collect_fit_metadata_interactive",
-    "add_watchlist",
-    "parse_args",
-    "display_cli_help",
-    "display_update_fit_help",
-    "display_update_target_help",
-    "check_tables",
-    "get_multiline_input",
-]
+# Re-exports resolve on first attribute access (PEP 562) so that importing any
+# cli_tools submodule — the fitcheck / mkts-backend entry points included —
+# does not drag in every command's dependencies (pandas, prompt_toolkit, ...).
+_EXPORTS = {
+    "fit_check_command": "mkts_backend.cli_tools.fit_check",
+    "fit_update_command": "mkts_backend.cli_tools.fit_update",
+    "collect_fit_metadata_interactive": "mkts_backend.cli_tools.fit_update",
+    "display_cli_help": "mkts_backend.cli_tools.cli_help",
+    "display_update_fit_help": "mkts_backend.cli_tools.cli_help",
+    "display_update_target_help": "mkts_backend.cli_tools.cli_help",
+    "add_watchlist": "mkts_backend.cli_tools.add_watchlist",
+    "parse_args": "mkts_backend.cli_tools.args_parser",
+    "check_tables": "mkts_backend.cli_tools.cli_db_commands",
+    "get_multiline_input": "mkts_backend.cli_tools.prompter",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module), name)
+    globals()[name] = value
+    return value
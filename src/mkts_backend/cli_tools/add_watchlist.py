@@ -4,7 +4,7 @@ from mkts_backend.config.logging_config import configure_logging
 from mkts_backend.utils.db_utils import add_missing_items_to_watchlist
 from mkts_backend.cli_tools.arg_utils import ParsedArgs
 from mkts_backend.cli_tools.market_args import MARKET_DB_MAP, expand_market_alias
-from mkts_backend.cli_tools.prompter import get_multiline_input
+from mkts_backend.cli_tools.prompter import TypeNameCompleter, get_multiline_input
 from mkts_backend.utils.get_type_info import get_type_from_list
 logger = configure_logging(__name__)
 
@@ -46,7 +46,7 @@ def add_watchlist(args: list[str], market_alias: str = "primary") -> bool:
     file_path = p.get_string("file")
 
     if p.has_flag("paste"):
-        paste = get_multiline_input()
+        paste = get_multiline_input(TypeNameCompleter())
         if not paste:
             logger.error("No paste input provided")
             print("Error: No paste input provided")
@@ -21,6 +21,7 @@ _SUBCOMMANDS_WITH_HELP = {
     "update-target",
     "update-builder-costs",
     "build-watchlist",
+    "indexes",
 }
 
 
@@ -43,6 +44,10 @@ def parse_args(args: list[str]) -> dict | None:
         os.environ["MKTS_ENVIRONMENT"] = env_value
         print(f"Environment override: {env_value}")
 
+    # ── --profile-sql must also be set before any engine is built.
+    if p.has_flag("profile-sql"):
+        os.environ["MKTS_PROFILE_SQL"] = "1"
+
     # Handle --help: check for subcommand-specific help first
     if p.has_help():
         for subcmd in _SUBCOMMANDS_WITH_HELP:
@@ -111,8 +116,13 @@ def parse_args(args: list[str]) -> dict | None:
                 print(f"\033[93mDid you mean?\033[0m mkts-backend {arg} {corrected}")
                 exit(1)
             effective_market = user_market or entry.default_market
-            success = entry.handler(sub_args, effective_market)
-            exit(0 if success else 1)
+            # One sync batch per command: pushes requested by the handler are
+            # coalesced and sent once per database when it returns.
+            from mkts_backend.config.sync_orchestrator import get_sync_orchestrator
+
+            with get_sync_orchestrator().batch() as sync_batch:
+                success = entry.handler(sub_args, effective_market)
+            exit(0 if success and sync_batch.ok else 1)
 
     # ── Unknown positional? Suggest closest command ─────────────
     for i, arg in enumerate(args):
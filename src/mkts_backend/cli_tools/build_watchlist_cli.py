@@ -16,7 +16,7 @@ from __future__ import annotations
 
 import csv
 
-from mkts_backend.builder_costs.sde_lookup import lookup_type_ids_by_name
+from mkts_backend.builder_costs.sde_lookup import lookup_type_ids_by_name, suggest_type_names
 from mkts_backend.builder_costs.watchlist_sync import (
     AddResult,
     RemoveResult,
@@ -33,9 +33,10 @@ from mkts_backend.cli_tools.cli_help import (
     display_build_watchlist_remove_help,
     display_build_watchlist_sync_help,
 )
-from mkts_backend.cli_tools.prompter import get_multiline_input
+from mkts_backend.cli_tools.prompter import TypeNameCompleter, get_multiline_input
 from mkts_backend.config.db_config import DatabaseConfig
 from mkts_backend.config.logging_config import configure_logging
+from mkts_backend.config.sync_orchestrator import get_sync_orchestrator
 
 logger = configure_logging(__name__)
 
@@ -114,7 +115,7 @@ def _handle_remove(p: ParsedArgs) -> bool:
 def _sync_buildcost_mirror(buildcost_db: DatabaseConfig) -> None:
     """Pull the buildcost local mirror after a remote write. Best-effort."""
     try:
-        buildcost_db.push()
+        get_sync_orchestrator().push_now(buildcost_db)
         print("Synced local buildcost mirror")
     except Exception as exc:
         logger.warning(f"buildcost local sync failed (remote write succeeded): {exc}")
@@ -138,21 +139,19 @@ def _handle_mirror(p: ParsedArgs) -> bool:
     sde_db = DatabaseConfig("sde")
     primary_db = DatabaseConfig("primary")
 
-    try:
-        primary_db.sync()
-    except Exception as exc:
+    primary_sync, buildcost_sync = get_sync_orchestrator().pull_all(
+        [primary_db, buildcost_db]
+    )
+    if not primary_sync.ok:
         # Reconciling against a stale mirror would silently miss recent
         # wcmktprod additions; abort so the user knows the run was a no-op.
-        logger.error(f"Pre-sync of {primary_db.alias} failed: {exc}")
+        logger.error(f"Pre-sync of {primary_db.alias} failed: {primary_sync.error}")
         print(
             f"Error: could not sync {primary_db.alias} local mirror; aborting mirror."
         )
         return False
-
-    try:
-        buildcost_db.sync()
-    except Exception as exc:
-        logger.warning(f"Pre-sync of {buildcost_db.alias} failed: {exc}")
+    if not buildcost_sync.ok:
+        logger.warning(f"Pre-sync of {buildcost_db.alias} failed: {buildcost_sync.error}")
 
     result = sync_from_market(buildcost_db, sde_db, primary_db)
     _print_mirror_summary(result)
@@ -207,7 +206,7 @@ def _resolve_type_ids(p: ParsedArgs) -> list[int] | None:
     if file_path:
         return _read_type_ids_from_csv(file_path)
 
-    pasted = get_multiline_input()
+    pasted = get_multiline_input(TypeNameCompleter())
     if not pasted:
         print("Error: no paste input provided")
         return None
@@ -252,6 +251,10 @@ def _parse_pasted_lines(lines: list[str]) -> list[int] | None:
             f"Warning: {len(unresolved)} name(s) not found in SDE: "
             f"{unresolved[:10]}{'…' if len(unresolved) > 10 else ''}"
         )
+        for name in unresolved[:10]:
+            suggestions = suggest_type_names(name, sde_db)
+            if suggestions:
+                print(f"  '{name}': did you mean {', '.join(suggestions)}?")
     if not type_ids:
         print("Error: no valid type names found in paste input")
         return None
@@ -0,0 +1,95 @@
+"""
+Result cache CLI
+
+CLI commands for the read-command result cache in cli_cache.db:
+- stats: Hits, misses and stored entries per command (default)
+- clear: Drop every cached result and reset the counters
+"""
+
+from rich import box
+from rich.console import Console
+from rich.table import Table
+
+from mkts_backend.cli_tools.arg_utils import ParsedArgs
+from mkts_backend.cli_tools.result_cache import ResultCache
+from mkts_backend.config.logging_config import configure_logging
+from mkts_backend.config.settings_service import SettingsService
+
+logger = configure_logging(__name__)
+console = Console()
+
+_SUBCOMMANDS = {"stats", "clear"}
+
+
+def cache_command(args: list[str]) -> bool:
+    """
+    Route cache subcommands.
+
+    Args:
+        args: Command arguments (after 'cache')
+
+    Returns:
+        True if the command succeeded
+    """
+    p = ParsedArgs(args)
+    positionals = [a for a in p.positionals() if a != "cache"]
+    subcommand = positionals[0] if positionals else "stats"
+    if subcommand not in _SUBCOMMANDS:
+        console.print(f"[red]Error: unknown cache subcommand '{subcommand}'[/red]")
+        _display_cache_help()
+        return False
+
+    store = ResultCache()
+    if subcommand == "clear":
+        removed = store.clear()
+        console.print(f"Cleared [bold]{removed}[/bold] cached result(s)")
+        return True
+
+    rows = store.stats()
+    if not SettingsService().result_cache_enabled:
+        console.print("[yellow]The result cache is disabled ([result_cache] enabled = false)[/yellow]")
+    if not rows:
+        console.print("[dim]No cached lookups yet.[/dim]")
+        return True
+
+    table = Table(title="Result Cache", box=box.ROUNDED)
+    table.add_column("Command", style="cyan")
+    table.add_column("Hits", justify="right")
+    table.add_column("Misses", justify="right")
+    table.add_column("Hit rate", justify="right")
+    table.add_column("Entries", justify="right", style="dim")
+    for row in rows:
+        lookups = row["hits"] + row["misses"]
+        rate = f"{row['hits'] / lookups:.0%}" if lookups else "-"
+        table.add_row(
+            row["command"], str(row["hits"]), str(row["misses"]), rate, str(row["entries"])
+        )
+    console.print(table)
+    return True
+
+
+def _display_cache_help():
+    """Display help for the cache subcommand."""
+    console.print("""
+[bold]cache[/bold] - Inspect or clear the CLI result cache
+
+[bold]USAGE:[/bold]
+    mkts-backend cache [stats|clear]
+
+[bold]SUBCOMMANDS:[/bold]
+    stats     Hits, misses and stored entries per command (default)
+    clear     Drop every cached result and reset the counters
+
+[bold]BEHAVIOR:[/bold]
+    fit-check, needed, module, list-fits and equiv list keep their results
+    in the local [bold]cli_cache.db[/bold], keyed by arguments, market database and
+    the [bold]updatelog[/bold] stamps (plus content hashes of doctrine fits, ship
+    targets and module equivalents) they were computed from. Any re-stamp
+    invalidates; fit-check results also expire with [bold][jita] ttl_minutes[/bold].
+    Set [bold][result_cache] enabled = false[/bold] or MKTS_RESULT_CACHE=0 to
+    always recompute.
+
+[bold]EXAMPLES:[/bold]
+    mkts-backend cache
+    mkts-backend cache clear
+""")
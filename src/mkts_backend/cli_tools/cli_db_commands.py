@@ -1,9 +1,12 @@
 from mkts_backend.config.market_context import MarketContext
-from mkts_backend.config.db_config import DatabaseConfig
-from sqlalchemy import text
+
 
 def check_tables(market_alias: str = "primary"):
     """Check tables in the database for the specified market."""
+    # Imported here: args_parser imports this module on every CLI start.
+    from sqlalchemy import text
+    from mkts_backend.config.db_config import DatabaseConfig
+
     market_ctx = MarketContext.from_settings(market_alias)
     db = DatabaseConfig(market_context=market_ctx)
 
@@ -33,7 +33,15 @@ Global Options (accepted by most commands):
   --deployment       Shorthand for --market=deployment
   --all              Shorthand for --market=all (every configured market)
   --env=<env>        Override app.environment temporarily (production, development)
+  --profile-sql      Time every SQL statement; write logs/sql_profile_*.json on exit
+                     (same as MKTS_PROFILE_SQL=1)
   --history          Include history processing (update-markets only)
+  --workers=<n>      Run up to n markets concurrently (update-markets only)
+  --parallel         Run every selected market concurrently (update-markets only)
+  --resume           Skip stages a previous, interrupted run already finished and
+                     continue partial history (update-markets only)
+  --force            Re-run stats, doctrines, push and Sheets even when their
+                     inputs are unchanged (update-markets only)
   --check_tables     Check the tables in the database (supports --market)
   --validate-env     Validate environment credentials and exit
   --list-markets     List available market configurations
@@ -45,9 +53,14 @@ Examples:
   mkts-backend update-markets                 # Run full pipeline for all markets
   mkts-backend update-markets --history       # With history processing
   mkts-backend update-markets --primary       # Primary market only
+  mkts-backend update-markets --parallel      # All markets at once
+  mkts-backend update-markets --history --resume  # Retry only what's left
   mkts-backend sync                           # Sync all databases
   mkts-backend sync --deployment              # Sync deployment only
   mkts-backend validate --market=all          # Validate all databases
+  mkts-backend indexes create --remote        # Add missing indexes, push to Turso
+  mkts-backend sde compile                    # Rebuild the SDE type snapshot
+  mkts-backend cache                          # Result cache hits/misses per command
   mkts-backend fit-check --file=fits/hfi.txt  # Check fit availability
   mkts-backend assets --name='Damage Control'   # Look up assets by partial name
   mkts-backend assets --id=11379                # Look up assets by type ID
@@ -61,7 +74,14 @@ Examples:
 
 def display_builder_cost_help():
     console.print("[bold][cyan]update-builder-costs:[/bold][/cyan] Refresh manufacturing costs in buildcost.db")
-    console.print("[bold][green]Usage:[/bold][/green] mkts-backend update-builder-costs")
+    console.print("[bold][green]Usage:[/bold][/green] mkts-backend update-builder-costs \\[--full]")
+    console.print(
+        "Fetches only items that are due: no cost yet, Jita price moved more than\n"
+        "\\[builder_costs] price_move_pct, or older than their tier (high-value T2/T3,\n"
+        "ships and expensive items daily, cheap T1 weekly). Stalest and most valuable\n"
+        "first, within \\[builder_costs] time_budget_seconds; the rest wait for the next run."
+    )
+    console.print("    --full    Treat every item as due (still within the time budget)")
 
 
 def display_build_watchlist_help():
@@ -184,6 +204,7 @@ USAGE:
     mkts-backend fit-check --file=<path> [options]
     mkts-backend fit-check --paste [options]
     mkts-backend fit-check --fit-id=<id> [options]
+    mkts-backend fit-check --dir=<path> | --doctrine=<id> | --all-fits [options]
 
 DESCRIPTION:
     Analyzes an EFT (Eve Fitting Tool) formatted ship fit and displays market
@@ -198,18 +219,34 @@ DESCRIPTION:
     for quickly checking the status of fits that have already been processed
     by the main backend workflow.
 
+    --dir, --doctrine and --all-fits check many fits at once: market data,
+    Jita prices and equivalent-module stock are loaded once for every item
+    in every fit, and one summary row is printed per fit.
+
 OPTIONS:
     --file=<path>        Path to EFT fit file
     --paste              Read EFT fit from stdin instead of file
     --fit-id=<id>        Look up fit by ID from doctrine_fits/doctrines tables
                          (uses pre-calculated market data)
+    --dir=<path>         Check every EFT file (*.txt, *.eft, *.cfg) in a directory
+    --doctrine=<id>      Check every fit in a doctrine
+    --all-fits           Check every doctrine fit
     --market=<alias>     Market to check: primary, deployment (default: primary)
     --target=<N>         Override target quantity (default: from doctrine_fits)
     --output=<format>    Export format: csv, multibuy, or markdown
+                         (bulk modes also accept json)
     --no-jita            Hide Jita price comparison columns
+    --on-hand            Subtract stock our characters hold at the market's
+                         structure (local asset index) from Qty Needed
+    --offline            Use local Jita prices only; stale ones are marked ~
     --help               Show this help message
 
-    Note: One of --file, --paste, or --fit-id is required.
+    Note: One of --file, --paste, --fit-id, --dir, --doctrine or --all-fits
+    is required.
+
+    Jita prices come from the market DB's jita_prices table and the local
+    cli_cache.db; only prices missing or older than [jita] ttl_minutes are
+    fetched from Fuzzwork.
 
 OUTPUT:
     Header displays:
@@ -235,6 +272,11 @@ EXPORT FORMATS (--output):
     multibuy  Eve Multi-buy/jEveAssets stockpile format (ItemName qty)
     markdown  Discord-friendly markdown with bold formatting
 
+    In bulk modes csv and json write every item of every fit (with
+    qty_needed) to fitcheck_bulk_<market>.csv/.json, markdown covers every
+    fit below target, and multibuy is one list for all fits: each item's
+    target x fit qty summed across fits, minus market stock counted once.
+
 EXAMPLES:
     # Basic fit check from EFT file
     mkts-backend fit-check --file=fits/hurricane_fleet.txt
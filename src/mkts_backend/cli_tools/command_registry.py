@@ -109,19 +109,48 @@ def _register_all(reg: CommandRegistry) -> None:
             return True
 
         file_path = p.get_string("file", "fit-file")
+        dir_path = p.get_string("dir")
+        all_fits = p.has_flag("all-fits")
         paste_mode = p.has_flag("paste")
         no_jita = p.has_flag("no-jita")
+        on_hand = p.has_flag("on-hand")
+        if p.has_flag("offline"):
+            # Read by SettingsService.jita_offline, like --env sets MKTS_ENVIRONMENT
+            import os
+            os.environ["MKTS_JITA_OFFLINE"] = "1"
 
         try:
             fit_id = p.get_int("fit-id", "fit_id", "fit", "id")
+            doctrine_id = p.get_int("doctrine", "doctrine-id")
             target = p.get_int("target")
-            output_format = p.get_choice("output", choices={"csv", "multibuy", "markdown"})
+            output_format = p.get_choice(
+                "output", choices={"csv", "json", "multibuy", "markdown"}
+            )
         except ArgError as e:
             print(f"Error: {e}")
             return False
 
+        if dir_path or doctrine_id is not None or all_fits:
+            from mkts_backend.cli_tools.fit_check_bulk import bulk_fit_check_command
+            return bulk_fit_check_command(
+                directory=dir_path,
+                doctrine_id=doctrine_id,
+                all_fits=all_fits,
+                market_alias=market_alias,
+                target=target,
+                output_format=output_format,
+                show_jita=not no_jita,
+            )
+
+        if output_format == "json":
+            print("Error: --output=json is only available with --dir, --doctrine or --all-fits")
+            return False
+
         if not file_path and not paste_mode and fit_id is None:
-            print("Error: --file=<path>, --paste, or --fit-id=<id> is required for fit-check command")
+            print(
+                "Error: --file=<path>, --paste, --fit-id=<id>, --dir=<path>, "
+                "--doctrine=<id> or --all-fits is required for fit-check command"
+            )
             print("Use 'fit-check --help' for usage information.")
             return False
 
@@ -151,6 +180,7 @@ def _register_all(reg: CommandRegistry) -> None:
             target=target,
             output_format=output_format,
             show_jita=not no_jita,
+            on_hand=on_hand,
         )
 
     reg.register(
@@ -508,32 +538,38 @@ def _register_all(reg: CommandRegistry) -> None:
         from mkts_backend.config.market_context import MarketContext
         from mkts_backend.config.db_config import DatabaseConfig
         from mkts_backend.config.logging_config import configure_logging
+        from mkts_backend.config.sync_orchestrator import get_sync_orchestrator
         from mkts_backend.cli_tools.market_args import expand_market_alias
 
         logger = configure_logging(__name__)
         p = ParsedArgs(args)
         skip_buildcost = p.has_flag("no-buildcost")
 
+        dbs = []
         for mkt in expand_market_alias(market_alias):
             market_ctx = MarketContext.from_settings(mkt)
-            db = DatabaseConfig(market_context=market_ctx)
             print(f"Syncing database for market: {market_ctx.name} ({market_ctx.alias})")
-            db.sync()
-            logger.info(f"Database synced: {db.alias}")
-            print(f"Database synced: {db.alias} ({db.path})")
-
+            dbs.append(DatabaseConfig(market_context=market_ctx))
         if not skip_buildcost:
-            buildcost = DatabaseConfig("buildcost")
             print("Syncing database: buildcost")
-            try:
-                buildcost.sync()
-                logger.info("Database synced: buildcost")
-                print(f"Database synced: buildcost ({buildcost.path})")
-            except Exception as exc:
-                logger.warning(f"buildcost sync failed: {exc}")
-                print(f"Warning: buildcost sync failed: {exc}")
+            dbs.append(DatabaseConfig("buildcost"))
+
+        # The databases are independent, so pull them all at once.
+        ok = True
+        paths = {db.alias: db.path for db in dbs}
+        for result in get_sync_orchestrator().pull_all(dbs):
+            if result.ok:
+                logger.info(f"Database synced: {result.alias}")
+                print(f"Database synced: {result.alias} ({paths[result.alias]}) in {result.seconds:.1f}s")
+            elif result.alias == "buildcost":
+                logger.warning(f"buildcost sync failed: {result.error}")
+                print(f"Warning: buildcost sync failed: {result.error}")
+            else:
+                logger.error(f"Sync failed for {result.alias}: {result.error}")
+                print(f"Error: sync failed for {result.alias}: {result.error}")
+                ok = False
 
-        return True
+        return ok
 
     reg.register(
         "sync",
@@ -563,6 +599,63 @@ def _register_all(reg: CommandRegistry) -> None:
 
     reg.register("validate", _handle_validate, description="Validate the database sync status")
 
+    # ── indexes ─────────────────────────────────────────────────
+    def _handle_indexes(args: list[str], market_alias: str) -> bool:
+        from mkts_backend.cli_tools.arg_utils import ParsedArgs
+
+        if ParsedArgs(args).has_help():
+            from mkts_backend.cli_tools.index_manager import _display_indexes_help
+            _display_indexes_help()
+            return True
+
+        from mkts_backend.cli_tools.index_manager import indexes_command
+        return indexes_command(args, market_alias)
+
+    reg.register(
+        "indexes",
+        _handle_indexes,
+        description="Create, verify or drop secondary indexes on market databases",
+        default_market="all",
+    )
+
+    # ── sde ─────────────────────────────────────────────────────
+    def _handle_sde(args: list[str], market_alias: str) -> bool:
+        del market_alias  # the SDE is shared by every market
+        from mkts_backend.cli_tools.arg_utils import ParsedArgs
+
+        if ParsedArgs(args).has_help():
+            from mkts_backend.cli_tools.sde_command import _display_sde_help
+            _display_sde_help()
+            return True
+
+        from mkts_backend.cli_tools.sde_command import sde_command
+        return sde_command(args)
+
+    reg.register(
+        "sde",
+        _handle_sde,
+        description="Compile or check the memory-mapped SDE type snapshot",
+    )
+
+    # ── cache ───────────────────────────────────────────────────
+    def _handle_cache(args: list[str], market_alias: str) -> bool:
+        del market_alias  # one cache file covers every market
+        from mkts_backend.cli_tools.arg_utils import ParsedArgs
+
+        if ParsedArgs(args).has_help():
+            from mkts_backend.cli_tools.cache_command import _display_cache_help
+            _display_cache_help()
+            return True
+
+        from mkts_backend.cli_tools.cache_command import cache_command
+        return cache_command(args)
+
+    reg.register(
+        "cache",
+        _handle_cache,
+        description="Show hit/miss counters of the CLI result cache, or clear it",
+    )
+
     # ── update-builder-costs ───────────────────────────────────
     def _handle_update_builder_costs(args: list[str], market_alias: str) -> bool:
         del market_alias  # buildcost data is market-agnostic
@@ -574,7 +667,7 @@ def _register_all(reg: CommandRegistry) -> None:
             from mkts_backend.cli_tools.cli_help import display_builder_cost_help
             display_builder_cost_help()
             return True
-        result = run()
+        result = run(full=p.has_flag("full"))
         if not result.success:
             return False
         if result.missing > 0:
@@ -599,11 +692,25 @@ def _register_all(reg: CommandRegistry) -> None:
         import sys
         from mkts_backend.cli_tools.arg_utils import ParsedArgs
         from mkts_backend.cli import run_market_update
+        from mkts_backend.cli_tools.market_args import expand_market_alias
 
         # Honor --history regardless of flag position; market is already
         # resolved from full argv by the dispatcher, so do the same here.
-        history = ParsedArgs(sys.argv[1:]).has_flag("history", "include-history")
-        return run_market_update(history=history, market_alias=market_alias)
+        p = ParsedArgs(sys.argv[1:])
+        history = p.has_flag("history", "include-history")
+        # --parallel runs every selected market at once; --workers=N caps it.
+        workers = p.get_int("workers")
+        if workers is None and p.has_flag("parallel"):
+            workers = len(expand_market_alias(market_alias))
+        # --resume skips stages whose checkpoint from an interrupted run is current;
+        # --force re-runs stages whose inputs are unchanged.
+        return run_market_update(
+            history=history,
+            market_alias=market_alias,
+            workers=workers,
+            resume=p.has_flag("resume"),
+            force=p.has_flag("force"),
+        )
 
     reg.register(
         "update-markets",
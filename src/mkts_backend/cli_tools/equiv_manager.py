@@ -5,6 +5,8 @@ CLI commands for managing the module_equivalents table:
 - list: Display all equivalence groups
 - add: Create a new group from type IDs
 - remove: Delete a group by ID
+- find: Discover equivalents of one module by attribute fingerprint
+- discover: Cluster every watchlisted module into equivalence groups
 """
 
 from rich.console import Console
@@ -12,6 +14,7 @@ from rich.table import Table
 from rich import box
 
 from mkts_backend.cli_tools.arg_utils import ParsedArgs
+from mkts_backend.cli_tools.result_cache import cached
 from mkts_backend.config.logging_config import configure_logging
 from mkts_backend.config.market_context import MarketContext
 from mkts_backend.db.equiv_handlers import (
@@ -20,7 +23,9 @@ from mkts_backend.db.equiv_handlers import (
     remove_equiv_group,
     resolve_type_name,
     resolve_type_id,
+    suggest_type_names,
     find_equiv_by_attributes,
+    discover_equiv_groups,
     ensure_equiv_table,
 )
 
@@ -72,6 +77,8 @@ def equiv_command(args: list[str], market_alias: str = "primary") -> bool:
         return _equiv_remove_all(args, target_aliases)
     elif subcommand == "find":
         return _equiv_find(args, target_aliases)
+    elif subcommand == "discover":
+        return _equiv_discover(args, target_aliases)
     else:
         _display_equiv_help()
         return True
@@ -79,7 +86,9 @@ def equiv_command(args: list[str], market_alias: str = "primary") -> bool:
 
 def _equiv_list(market_ctx) -> bool:
     """List all equivalence groups."""
-    groups = list_equiv_groups(market_ctx)
+    groups = cached(
+        "equiv_list", {}, market_ctx.database_alias, lambda: list_equiv_groups(market_ctx)
+    )
 
     if not groups:
         console.print("[yellow]No equivalence groups found.[/yellow]")
@@ -213,6 +222,12 @@ def _equiv_find(args: list[str], target_aliases: list[str]) -> bool:
         matches = resolve_type_id(name_query)
         if not matches:
             console.print(f"[red]No types found matching '{name_query}'[/red]")
+            suggestions = suggest_type_names(name_query)
+            if suggestions:
+                console.print(
+                    "[yellow]Did you mean?[/yellow] "
+                    + ", ".join(f"{tname} ({tid})" for tid, tname in suggestions)
+                )
             return False
         if len(matches) == 1:
             type_id = matches[0][0]
@@ -282,6 +297,69 @@ def _equiv_find(args: list[str], target_aliases: list[str]) -> bool:
     return True
 
 
+def _equiv_discover(args: list[str], target_aliases: list[str]) -> bool:
+    """Cluster every watchlisted module into equivalence groups in one pass."""
+    from mkts_backend.config.db_config import DatabaseConfig
+
+    do_add = ParsedArgs(args).has_flag("add")
+    market_ctx = MarketContext.from_settings(target_aliases[0])
+    watchlist = DatabaseConfig(market_context=market_ctx).get_watchlist()
+    watched = {int(t) for t in watchlist["type_id"]}
+    grouped = {
+        member["type_id"]
+        for group in list_equiv_groups(market_ctx)
+        for member in group["members"]
+    }
+
+    console.print(
+        f"\nClustering {len(watched)} watchlist items from [bold]{market_ctx.name}[/bold]...\n"
+    )
+    groups = discover_equiv_groups(sorted(watched))
+    if not groups:
+        console.print("[yellow]No equivalence groups found among watchlisted modules.[/yellow]")
+        return True
+
+    table = Table(title=f"Discovered Equivalence Groups ({len(groups)})", box=box.ROUNDED, show_lines=True)
+    table.add_column("#", style="cyan", justify="right")
+    table.add_column("Type ID", style="dim", justify="right")
+    table.add_column("Module Name", style="green")
+    table.add_column("Meta", style="dim")
+    table.add_column("Status")
+
+    new_groups = []
+    for n, group in enumerate(groups, 1):
+        existing = any(r["typeID"] in grouped for r in group)
+        if not existing:
+            new_groups.append(group)
+        status = "[dim]existing[/dim]" if existing else "[green]new[/green]"
+        for i, r in enumerate(group):
+            marker = " [cyan]*[/cyan]" if r["typeID"] in watched else ""
+            table.add_row(
+                str(n) if i == 0 else "",
+                str(r["typeID"]),
+                f"{r['typeName']}{marker}",
+                r["metaGroupName"] or "",
+                status if i == 0 else "",
+            )
+    console.print(table)
+    console.print(
+        f"\n[dim]{len(new_groups)} new, {len(groups) - len(new_groups)} overlapping an existing "
+        "group. * = on the watchlist[/dim]"
+    )
+
+    if do_add and new_groups:
+        console.print(f"\n[bold]Adding {len(new_groups)} group(s) to: {', '.join(target_aliases)}[/bold]")
+        for alias in target_aliases:
+            ctx = MarketContext.from_settings(alias)
+            ensure_equiv_table(ctx)
+            added = sum(
+                add_equiv_group([r["typeID"] for r in group], ctx) is not None
+                for group in new_groups
+            )
+            console.print(f"  [green]{alias}[/green]: created {added} group(s)")
+    return True
+
+
 def _display_equiv_help():
     """Display help for the equiv subcommand."""
     console.print("""
@@ -293,6 +371,7 @@ def _display_equiv_help():
 [bold]SUBCOMMANDS:[/bold]
     list                           List all equivalence groups
     find <type_id|name> [--add]    Auto-discover equivalent modules by attributes
+    discover [--add]               Cluster every watchlisted module into groups
     add --type-ids=<id1,id2,...>   Create a new group (resolves names from SDE)
     remove --id=<group_id>         Remove a group
 
@@ -309,6 +388,7 @@ def _display_equiv_help():
     mkts-backend equiv find 13984
     mkts-backend equiv find "Thermal Armor Hardener"
     mkts-backend equiv find 13984 --add
+    mkts-backend equiv discover --market=primary
     mkts-backend equiv add --type-ids=13984,17838,15705,28528,14065,13982
     mkts-backend equiv remove --id=1
 """)
@@ -7,22 +7,27 @@ Uses Rich tables for beautiful console output.
 
 import csv
 from collections import defaultdict
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from itertools import groupby
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set
 
 from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
 
 from mkts_backend.config.logging_config import configure_logging
 from mkts_backend.config import DatabaseConfig
 from mkts_backend.config.market_context import MarketContext
+from mkts_backend.db.sde_index import get_sde_index
 from mkts_backend.cli_tools.market_args import parse_market_args
+from mkts_backend.cli_tools.result_cache import cached
+from mkts_backend.config.settings_service import SettingsService
 from mkts_backend.utils.eft_parser import (
     parse_eft_file,
     parse_eft_string,
     FitParseResult,
 )
-from mkts_backend.utils.jita import fetch_jita_prices, get_overpriced_items
+from mkts_backend.utils.jita import JitaPriceLookup, get_jita_prices, get_overpriced_items
 from mkts_backend.cli_tools.rich_display import (
     console,
     create_fit_status_table,
@@ -36,6 +41,12 @@ from mkts_backend.cli_tools.rich_display import (
     print_markdown_export,
     print_overpriced_items,
 )
+# The fitcheck console script lives in launcher (kept import-light); these
+# names stay importable from here.
+from mkts_backend.cli_tools.launcher import (  # noqa: F401
+    display_fitcheck_help as display_help,
+    fitcheck_main as main,
+)
 logger = configure_logging(__name__)
 
 
@@ -53,6 +64,18 @@ class DoctrineFitInfo:
     market_flag: Optional[str] = None
 
 
+@dataclass
+class FitItemData:
+    """Everything get_fit_market_status needs about a fit's type_ids."""
+
+    marketstats: Dict[int, Dict]
+    fallback: Dict[int, Dict]
+    ship_type_ids: Set[int]
+    sde_names: Dict[int, str]
+    # type_id -> stocked equivalents (see get_equiv_candidates)
+    equivs: Dict[int, List[Dict]] = field(default_factory=dict)
+
+
 @dataclass
 class FitCheckResult:
     """Result of a fit check operation with market data and export utilities."""
@@ -66,6 +89,10 @@ class FitCheckResult:
     target: Optional[int]
     market_name: str
     total_jita_fit_cost: float = 0.0
+    fit_id: Optional[int] = None
+    # type_id -> packaged qty our characters hold at the market's structure
+    # (--on-hand); netted out of what is needed to reach target.
+    on_hand: Optional[Dict[int, int]] = None
 
     @property
     def hulls(self) -> int:
@@ -75,6 +102,13 @@ class FitCheckResult:
                 return int(item.get("fits", 0))
         return 0
 
+    def qty_needed(self, item: Dict) -> int:
+        """Units of ``item`` to buy to reach target, net of on-hand stock."""
+        if self.target is None or item["fits"] >= self.target:
+            return 0
+        short = max(0, int((self.target - item["fits"]) * item["fit_qty"]))
+        return max(0, short - (self.on_hand or {}).get(item.get("type_id"), 0))
+
     @property
     def missing_for_target(self) -> List[Dict]:
         """Get list of items that are below target with qty_needed."""
@@ -83,10 +117,9 @@ class FitCheckResult:
         return [
             {
                 "type_name": item["type_name"],
-                "qty_needed": max(
-                    0, int((self.target - item["fits"]) * item["fit_qty"])
-                ),
+                "qty_needed": self.qty_needed(item),
                 "fits": item["fits"],
+                "on_hand": (self.on_hand or {}).get(item.get("type_id"), 0),
             }
             for item in self.market_data
             if item["fits"] < self.target
@@ -127,13 +160,7 @@ class FitCheckResult:
                     f"{item.get('fit_price', 0):.2f}",
                 ]
                 if self.target is not None:
-                    qty_needed = (
-                        max(0, int(
-                            (self.target - item["fits"]) * item["fit_qty"]))
-                        if item["fits"] < self.target
-                        else 0
-                    )
-                    row.append(qty_needed)
+                    row.append(self.qty_needed(item))
                 writer.writerow(row)
         return str(path.absolute())
 
@@ -271,9 +298,10 @@ def _get_doctrines_market_data(
 
     market_data = []
     with db.engine.connect() as conn:
-        query = text("""
+        equiv_col = "equiv_stock" if _doctrines_has_equiv_stock(conn) else "0 AS equiv_stock"
+        query = text(f"""
             SELECT fit_id, ship_id, ship_name, hulls, type_id, type_name,
-                   fit_qty, fits_on_mkt, total_stock, price, avg_vol, days,
+                   fit_qty, fits_on_mkt, total_stock, {equiv_col}, price, avg_vol, days,
                    group_id, group_name, category_id, category_name
             FROM doctrines
             WHERE fit_id = :fit_id
@@ -290,7 +318,9 @@ def _get_doctrines_market_data(
                 {
                     "type_id": row.type_id,
                     "type_name": row.type_name or "Unknown",
-                    "market_stock": row.total_stock or 0,
+                    # fits_on_mkt already counts equivalent modules
+                    "market_stock": (row.total_stock or 0) + (row.equiv_stock or 0),
+                    "equiv_stock": row.equiv_stock or 0,
                     "fit_qty": row.fit_qty or 1,
                     "fits": row.fits_on_mkt or 0,
                     "price": row.price,
@@ -307,168 +337,202 @@ def _get_doctrines_market_data(
     return market_data
 
 
-def _get_marketstats_data(
-    type_ids: List[int],
-    market_ctx: Optional[MarketContext] = None,
-) -> Dict[int, Dict]:
-    """
-    Query marketstats table for items on the watchlist.
+def _doctrines_has_equiv_stock(conn) -> bool:
+    """Whether ``doctrines`` has ``equiv_stock`` (added by update-markets)."""
+    columns = {row[1] for row in conn.execute(text("PRAGMA table_info(doctrines)"))}
+    return "equiv_stock" in columns
 
-    Args:
-        type_ids: List of type IDs to query
-        market_ctx: Market context for database selection
 
-    Returns:
-        Dict mapping type_id to market stats data
-    """
-    db_alias = market_ctx.database_alias if market_ctx else "wcmkt"
-    db = DatabaseConfig(db_alias)
+SHIP_CATEGORY_ID = 6
 
-    results = {}
-    with db.engine.connect() as conn:
-        for type_id in type_ids:
-            query = text("""
-                SELECT type_id, type_name, price, min_price, total_volume_remain,
-                       avg_price, avg_volume, days_remaining, last_update, category_id
-                FROM marketstats
-                WHERE type_id = :type_id
-            """)
-            row = conn.execute(query, {"type_id": type_id}).fetchone()
-            if row:
-                results[type_id] = dict(row._mapping)
 
-    return results
+def _in_params(prefix: str, values: List) -> tuple:
+    """Placeholder list and bind params for ``WHERE col IN (...)``."""
+    placeholders = ", ".join(f":{prefix}_{i}" for i in range(len(values)))
+    return placeholders, {f"{prefix}_{i}": v for i, v in enumerate(values)}
 
 
-def _is_ship(
-    type_id: int,
-    category_id: Optional[int] = None,
-    market_ctx: Optional[MarketContext] = None,
-) -> bool:
+def _query_marketstats(conn, type_ids: List[int]) -> Dict[int, Dict]:
+    """marketstats rows for ``type_ids`` in one query."""
+    if not type_ids:
+        return {}
+    placeholders, params = _in_params("id", type_ids)
+    query = text(f"""
+        SELECT type_id, type_name, price, min_price, total_volume_remain,
+               avg_price, avg_volume, days_remaining, last_update, category_id
+        FROM marketstats
+        WHERE type_id IN ({placeholders})
+    """)
+    return {row.type_id: dict(row._mapping) for row in conn.execute(query, params)}
+
+
+def _query_equiv_groups(conn, type_ids: List[int]) -> Dict[int, List[Dict]]:
+    """
+    Stocked members of each type's equivalence group, in one marketstats query.
+
+    ``marketstats.equiv_group_id`` is written by the stats stage; a
+    marketstats table from before that column yields no equivalents.
     """
-    Determine if a type_id is a ship.
+    if not type_ids:
+        return {}
+    placeholders, params = _in_params("id", type_ids)
+    query = text(f"""
+        SELECT g.type_id AS member_of, m.type_id, m.type_name, m.total_volume_remain
+        FROM marketstats AS g
+        JOIN marketstats AS m ON m.equiv_group_id = g.equiv_group_id
+        WHERE g.type_id IN ({placeholders})
+          AND g.equiv_group_id > 0
+          AND m.type_id != g.type_id
+          AND m.total_volume_remain > 0
+    """)
+    try:
+        rows = conn.execute(query, params).fetchall()
+    except OperationalError:
+        logger.warning("marketstats has no equivalence groups; run update-markets to add them")
+        return {}
 
-    Checks in order:
-    1. If category_id is provided and equals 6 (Ship category)
-    2. If type_id exists in ship_targets table
-    3. Lookup categoryID in sdelite.db sdetypes table
+    result: Dict[int, List[Dict]] = defaultdict(list)
+    for row in rows:
+        result[row.member_of].append({
+            "type_id": row.type_id,
+            "type_name": row.type_name,
+            "stock": row.total_volume_remain,
+        })
+    return dict(result)
 
-    Args:
-        type_id: The type ID to check
-        category_id: Optional category_id from marketstats
-        market_ctx: Market context for database selection
 
-    Returns:
-        True if the item is a ship, False otherwise
+def _percentile_fallback(type_id: int, prices: List[float], volumes: List[int]) -> Optional[Dict]:
     """
-    # Check 1: Direct category_id check
-    if category_id == 6:
-        return True
+    Fallback price data from one type's sell orders, cheapest first.
 
-    # Check 2: Look up in ship_targets table
-    db_alias = market_ctx.database_alias if market_ctx else "wcmkt"
-    db = DatabaseConfig(db_alias)
-    with db.engine.connect() as conn:
-        query = text(
-            "SELECT 1 FROM ship_targets WHERE ship_id = :type_id LIMIT 1")
-        result = conn.execute(query, {"type_id": type_id}).fetchone()
-        if result:
-            return True
+    The price is the 5th percentile by volume (the price where 5% of the
+    volume is below).
+    """
+    total_volume = sum(volumes)
+    if not prices or total_volume <= 0:
+        return None
 
-    # Check 3: Look up in SDE sdetypes table
-    sde_db = DatabaseConfig("sde")
-    with sde_db.engine.connect() as conn:
-        query = text("SELECT categoryID FROM sdetypes WHERE typeID = :type_id")
-        result = conn.execute(query, {"type_id": type_id}).fetchone()
-        if result and result[0] == 6:
-            return True
+    target_volume = total_volume * 0.05
+    cumulative = 0
+    percentile_5_price = prices[0]
+    for price, volume in zip(prices, volumes):
+        cumulative += volume
+        if cumulative >= target_volume:
+            percentile_5_price = price
+            break
+
+    return {
+        "type_id": type_id,
+        "price": percentile_5_price,
+        "min_price": prices[0],
+        "total_volume_remain": total_volume,
+        "avg_price": sum(p * v for p, v in zip(prices, volumes)) / total_volume,
+        "is_fallback": True,
+    }
+
+
+def _query_fallback(conn, type_ids: List[int]) -> Dict[int, Dict]:
+    """Fallback price data for ``type_ids`` from one ordered marketorders scan."""
+    if not type_ids:
+        return {}
+    placeholders, params = _in_params("id", type_ids)
+    query = text(f"""
+        SELECT type_id, price, volume_remain
+        FROM marketorders
+        WHERE type_id IN ({placeholders}) AND is_buy_order = 0
+        ORDER BY type_id, price ASC
+    """)
+    results = {}
+    for type_id, rows in groupby(conn.execute(query, params), key=lambda r: r.type_id):
+        rows = list(rows)
+        fallback = _percentile_fallback(
+            type_id, [r.price for r in rows], [r.volume_remain for r in rows]
+        )
+        if fallback:
+            results[type_id] = fallback
+    return results
 
-    return False
 
+def _ship_type_ids(
+    conn,
+    type_ids: List[int],
+    category_ids: Dict[int, Optional[int]],
+) -> Set[int]:
+    """
+    The ships among ``type_ids``.
 
-def _get_fallback_data(
-    type_id: int,
+    Checks, in order, each only for ids not yet classified:
+    1. category_id (from marketstats) equals 6 (Ship category)
+    2. one ship_targets query
+    3. categoryID in the in-memory SDE type index
+    """
+    ships = {t for t in type_ids if category_ids.get(t) == SHIP_CATEGORY_ID}
+    rest = [t for t in type_ids if t not in ships]
+    if rest:
+        placeholders, params = _in_params("id", rest)
+        query = text(f"SELECT DISTINCT ship_id FROM ship_targets WHERE ship_id IN ({placeholders})")
+        ships.update(row[0] for row in conn.execute(query, params))
+        rest = [t for t in rest if t not in ships]
+    if rest:
+        index = get_sde_index(DatabaseConfig("sde"))
+        ships.update(t for t in rest if index.category_id(t) == SHIP_CATEGORY_ID)
+    return ships
+
+
+def _load_fit_item_data(
+    type_ids: List[int],
     market_ctx: Optional[MarketContext] = None,
-) -> Optional[Dict]:
+) -> FitItemData:
     """
-    Get market data from marketorders for items not on watchlist.
+    Load market data for a fit's items with one query per source.
 
-    Calculates 5th percentile price from current sell orders.
+    One marketstats ``IN`` query, one marketorders scan for the ids without
+    stats, one ship_targets query and one equivalence-group query, all on a
+    single connection; names and categories come from the in-memory SDE index.
 
     Args:
-        type_id: Type ID to query
+        type_ids: Distinct type IDs in the fit (hull included)
         market_ctx: Market context for database selection
 
     Returns:
-        Dict with calculated price data, or None if no orders found
+        FitItemData keyed by type_id
     """
     db_alias = market_ctx.database_alias if market_ctx else "wcmkt"
     db = DatabaseConfig(db_alias)
 
     with db.engine.connect() as conn:
-        # Get sell orders sorted by price (lowest first)
-        query = text("""
-            SELECT price, volume_remain
-            FROM marketorders
-            WHERE type_id = :type_id AND is_buy_order = 0
-            ORDER BY price ASC
-        """)
-        rows = conn.execute(query, {"type_id": type_id}).fetchall()
-
-        if not rows:
-            return None
-
-        # Calculate total volume and 5th percentile price
-        prices = []
-        volumes = []
-        for row in rows:
-            prices.append(row.price)
-            volumes.append(row.volume_remain)
-
-        total_volume = sum(volumes)
-
-        # Calculate 5th percentile price (price where 5% of volume is below)
-        if total_volume > 0:
-            target_volume = total_volume * 0.05
-            cumulative = 0
-            percentile_5_price = prices[0]
-
-            for price, volume in zip(prices, volumes):
-                cumulative += volume
-                if cumulative >= target_volume:
-                    percentile_5_price = price
-                    break
-
-            return {
-                "type_id": type_id,
-                "price": percentile_5_price,
-                "min_price": prices[0] if prices else None,
-                "total_volume_remain": total_volume,
-                "avg_price": sum(p * v for p, v in zip(prices, volumes)) / total_volume
-                if total_volume
-                else None,
-                "is_fallback": True,
-            }
-
-    return None
+        marketstats = _query_marketstats(conn, type_ids)
+        missing = [t for t in type_ids if t not in marketstats]
+        fallback = _query_fallback(conn, missing)
+        ship_type_ids = _ship_type_ids(
+            conn,
+            type_ids,
+            {t: stats.get("category_id") for t, stats in marketstats.items()},
+        )
+        equivs = _query_equiv_groups(conn, type_ids)
+
+    sde_names = get_sde_index(DatabaseConfig("sde")).names(missing) if missing else {}
+    return FitItemData(
+        marketstats=marketstats,
+        fallback=fallback,
+        ship_type_ids=ship_type_ids,
+        sde_names=sde_names,
+        equivs=equivs,
+    )
 
 
-def get_equiv_stock(
+def get_equiv_candidates(
     type_ids: List[int],
     market_ctx: Optional[MarketContext] = None,
 ) -> Dict[int, List[Dict]]:
     """
-    Find equivalent modules with market stock for a list of type_ids.
+    Equivalent modules with market stock for each of ``type_ids``.
 
-    Queries module_equivalents to find all type_ids sharing an equiv_group_id
-    with any item in the list, then looks up stock from marketstats.
-
-    Args:
-        type_ids: List of canonical type_ids from a fit
-        market_ctx: Market context for database selection
+    Like ``get_equiv_stock`` but only the type itself is left out of its
+    equivalents, so one call can serve many fits; narrow it per fit with
+    ``exclude_fit_items``.
 
     Returns:
-        Dict mapping canonical_type_id to list of equiv dicts:
         {type_id: [{"type_id": x, "type_name": "...", "stock": n}, ...]}
         Only includes equivalents with stock > 0.
     """
@@ -477,93 +541,49 @@ def get_equiv_stock(
 
     db_alias = market_ctx.database_alias if market_ctx else "wcmkt"
     db = DatabaseConfig(db_alias)
-
-    result: Dict[int, List[Dict]] = {}
-
     with db.engine.connect() as conn:
-        # Check if module_equivalents table exists
-        try:
-            check = text("SELECT 1 FROM module_equivalents LIMIT 1")
-            conn.execute(check)
-        except Exception:
-            return {}
-
-        # Find equiv groups for all type_ids in one query
-        placeholders = ", ".join(f":id_{i}" for i in range(len(type_ids)))
-        params = {f"id_{i}": tid for i, tid in enumerate(type_ids)}
-
-        group_query = text(f"""
-            SELECT type_id, equiv_group_id
-            FROM module_equivalents
-            WHERE type_id IN ({placeholders})
-        """)
-        group_rows = conn.execute(group_query, params).fetchall()
+        return _query_equiv_groups(conn, list(type_ids))
 
-        if not group_rows:
-            return {}
 
-        # Map canonical type_id -> equiv_group_id
-        canonical_to_group = {row.type_id: row.equiv_group_id for row in group_rows}
-        group_ids = set(canonical_to_group.values())
+def exclude_fit_items(
+    equiv_candidates: Dict[int, List[Dict]],
+    type_ids: List[int],
+) -> Dict[int, List[Dict]]:
+    """
+    Narrow ``get_equiv_candidates`` output to one fit.
 
-        # Get all members of those equiv groups
-        g_placeholders = ", ".join(f":g_{i}" for i in range(len(group_ids)))
-        g_params = {f"g_{i}": gid for i, gid in enumerate(group_ids)}
+    Equivalents the fit itself uses are dropped so their stock is not
+    counted twice; only entries for ``type_ids`` are kept.
+    """
+    fit_ids = set(type_ids)
+    result: Dict[int, List[Dict]] = {}
+    for type_id in fit_ids:
+        equivs = [e for e in equiv_candidates.get(type_id, []) if e["type_id"] not in fit_ids]
+        if equivs:
+            result[type_id] = equivs
+    return result
 
-        members_query = text(f"""
-            SELECT equiv_group_id, type_id, type_name
-            FROM module_equivalents
-            WHERE equiv_group_id IN ({g_placeholders})
-        """)
-        member_rows = conn.execute(members_query, g_params).fetchall()
 
-        # Build group_id -> list of (type_id, type_name)
-        group_members: Dict[int, List[tuple]] = defaultdict(list)
-        for row in member_rows:
-            group_members[row.equiv_group_id].append(
-                (row.type_id, row.type_name)
-            )
+def get_equiv_stock(
+    type_ids: List[int],
+    market_ctx: Optional[MarketContext] = None,
+) -> Dict[int, List[Dict]]:
+    """
+    Find equivalent modules with market stock for a list of type_ids.
 
-        # Collect all equiv type_ids we need stock for (excluding canonicals)
-        canonical_set = set(type_ids)
-        equiv_type_ids = set()
-        for gid, members in group_members.items():
-            for tid, _ in members:
-                if tid not in canonical_set:
-                    equiv_type_ids.add(tid)
-
-        if not equiv_type_ids:
-            return {}
-
-        # Query marketstats for equiv stock
-        e_placeholders = ", ".join(f":e_{i}" for i in range(len(equiv_type_ids)))
-        e_params = {f"e_{i}": tid for i, tid in enumerate(equiv_type_ids)}
-
-        stock_query = text(f"""
-            SELECT type_id, total_volume_remain
-            FROM marketstats
-            WHERE type_id IN ({e_placeholders})
-        """)
-        stock_rows = conn.execute(stock_query, e_params).fetchall()
-        stock_map = {row.type_id: row.total_volume_remain or 0 for row in stock_rows}
-
-        # Build result: canonical_type_id -> equiv items with stock > 0
-        for canonical_tid, gid in canonical_to_group.items():
-            equivs = []
-            for tid, tname in group_members[gid]:
-                if tid == canonical_tid:
-                    continue
-                stock = stock_map.get(tid, 0)
-                if stock > 0:
-                    equivs.append({
-                        "type_id": tid,
-                        "type_name": tname,
-                        "stock": stock,
-                    })
-            if equivs:
-                result[canonical_tid] = equivs
+    Reads the equivalence groups precomputed in marketstats
+    (``equiv_group_id``) for every item in the list.
 
-    return result
+    Args:
+        type_ids: List of canonical type_ids from a fit
+        market_ctx: Market context for database selection
+
+    Returns:
+        Dict mapping canonical_type_id to list of equiv dicts:
+        {type_id: [{"type_id": x, "type_name": "...", "stock": n}, ...]}
+        Only includes equivalents with stock > 0 that are not in the list.
+    """
+    return exclude_fit_items(get_equiv_candidates(type_ids, market_ctx), type_ids)
 
 
 def _apply_equiv_stock(market_data: List[Dict], equiv_stock: Dict[int, List[Dict]]) -> None:
@@ -588,43 +608,10 @@ def _apply_equiv_stock(market_data: List[Dict], equiv_stock: Dict[int, List[Dict
         item["equiv_items"] = equivs
 
 
-def _get_type_name_from_sde(type_id: int) -> str:
-    """Get type name from SDE database."""
-    sde_db = DatabaseConfig("sde")
-    with sde_db.engine.connect() as conn:
-        query = text("SELECT typeName FROM sdetypes WHERE typeID = :type_id")
-        result = conn.execute(query, {"type_id": type_id}).fetchone()
-        return result[0] if result else f"Unknown (ID: {type_id})"
-
-
-def get_fit_market_status(
-    parse_result: FitParseResult,
-    market_ctx: Optional[MarketContext] = None,
-    target: Optional[int] = None,
-) -> FitCheckResult:
-    """
-    Get market status for all items in a parsed fit.
-
-    Args:
-        parse_result: Parsed EFT fit result
-        market_ctx: Market context for database selection
-        target: Optional target quantity override. If None, looks up from doctrine_fits.
-
-    Returns:
-        FitCheckResult with market data and export utilities
-    """
-    market_name = market_ctx.name if market_ctx else "primary"
-
-    # Look up target from doctrine_fits if not provided
-    if target is None:
-        target = _get_target_for_fit(
-            parse_result.fit_name,
-            parse_result.ship_type_id,
-            market_ctx,
-        )
-    # Aggregate items by type_id
-    item_quantities = defaultdict(int)
-    item_names = {}
+def _fit_quantities(parse_result: FitParseResult) -> tuple:
+    """``({type_id: qty}, {type_id: name})`` for a fit's items plus its hull."""
+    item_quantities: Dict[int, int] = defaultdict(int)
+    item_names: Dict[int, str] = {}
     for item in parse_result.items:
         type_id = item["type_id"]
         item_quantities[type_id] += item["quantity"]
@@ -637,43 +624,71 @@ def get_fit_market_status(
             item_quantities[parse_result.ship_type_id] = 1
             item_names[parse_result.ship_type_id] = parse_result.ship_name
 
-    type_ids = list(item_quantities.keys())
+    return dict(item_quantities), item_names
+
 
-    # Get marketstats data
-    marketstats_data = _get_marketstats_data(type_ids, market_ctx)
+def _fit_signature(parse_result: FitParseResult) -> list:
+    """What a parsed fit's result depends on, for the result cache key."""
+    item_quantities, item_names = _fit_quantities(parse_result)
+    return [
+        parse_result.fit_name,
+        parse_result.ship_name,
+        parse_result.ship_type_id,
+        sorted((t, q, item_names.get(t, "")) for t, q in item_quantities.items()),
+    ]
+
+
+def _jita_fresh(result: "FitCheckResult") -> bool:
+    """Cache only results priced from fresh Jita data; stale ones would
+    outlive the next successful fetch."""
+    return not any(item.get("jita_stale") for item in result.market_data)
+
+
+def evaluate_fit(
+    parse_result: FitParseResult,
+    item_data: FitItemData,
+    jita_prices: JitaPriceLookup,
+    target: Optional[int],
+    market_name: str,
+    fit_id: Optional[int] = None,
+) -> FitCheckResult:
+    """
+    Build a fit's FitCheckResult from already-loaded data, without queries.
 
-    # Fetch Jita prices for all items
-    jita_prices = fetch_jita_prices(type_ids)
+    ``item_data`` and ``jita_prices`` may cover more type_ids than the fit
+    uses (bulk fit-check loads them once for many fits). Equivalents the fit
+    itself uses are not counted (see ``exclude_fit_items``).
+    """
+    item_quantities, item_names = _fit_quantities(parse_result)
 
-    # Build result list
     market_data = []
     for type_id, fit_qty in item_quantities.items():
-        category_id = None
-        if type_id in marketstats_data:
-            stats = marketstats_data[type_id]
+        if type_id in item_data.marketstats:
+            stats = item_data.marketstats[type_id]
             market_stock = stats.get("total_volume_remain", 0) or 0
             price = stats.get("price")
             avg_price = stats.get("avg_price")
             is_fallback = False
             type_name = stats.get("type_name", item_names.get(type_id, ""))
-            category_id = stats.get("category_id")
         else:
-            # Try fallback from marketorders
-            fallback = _get_fallback_data(type_id, market_ctx)
+            # Fallback from marketorders
+            fallback = item_data.fallback.get(type_id)
             if fallback:
                 market_stock = fallback.get("total_volume_remain", 0) or 0
                 price = fallback.get("price")
                 avg_price = fallback.get("avg_price")
-                is_fallback = True
             else:
                 market_stock = 0
                 price = None
                 avg_price = None
-                is_fallback = True
+            is_fallback = True
 
             # Get type name from SDE if not in item_names
-            type_name = item_names.get(
-                type_id) or _get_type_name_from_sde(type_id)
+            type_name = (
+                item_names.get(type_id)
+                or item_data.sde_names.get(type_id)
+                or f"Unknown (ID: {type_id})"
+            )
 
         # Calculate fits available
         fits = (market_stock / fit_qty) if fit_qty > 0 else 0
@@ -685,8 +700,7 @@ def get_fit_market_status(
         jita_price = jita_prices.get(type_id)
         jita_fit_price = (jita_price * fit_qty) if jita_price else 0
 
-        # Determine if this is a ship
-        is_ship = _is_ship(type_id, category_id, market_ctx)
+        is_ship = type_id in item_data.ship_type_ids
 
         market_data.append(
             {
@@ -702,12 +716,12 @@ def get_fit_market_status(
                 "is_ship": is_ship,
                 "jita_price": jita_price,
                 "jita_fit_price": jita_fit_price,
+                "jita_stale": type_id in jita_prices.stale,
             }
         )
 
     # Apply equivalent module stock
-    equiv_stock = get_equiv_stock(type_ids, market_ctx)
-    _apply_equiv_stock(market_data, equiv_stock)
+    _apply_equiv_stock(market_data, exclude_fit_items(item_data.equivs, list(item_quantities)))
 
     # Sort: ships first, then by fits available (lowest first to highlight bottlenecks)
     market_data.sort(key=lambda x: (
@@ -729,9 +743,47 @@ def get_fit_market_status(
         target=target,
         market_name=market_name,
         total_jita_fit_cost=total_jita_fit_cost,
+        fit_id=fit_id,
     )
 
 
+def get_fit_market_status(
+    parse_result: FitParseResult,
+    market_ctx: Optional[MarketContext] = None,
+    target: Optional[int] = None,
+) -> FitCheckResult:
+    """
+    Get market status for all items in a parsed fit.
+
+    Args:
+        parse_result: Parsed EFT fit result
+        market_ctx: Market context for database selection
+        target: Optional target quantity override. If None, looks up from doctrine_fits.
+
+    Returns:
+        FitCheckResult with market data and export utilities
+    """
+    market_name = market_ctx.name if market_ctx else "primary"
+
+    # Look up target from doctrine_fits if not provided
+    if target is None:
+        target = _get_target_for_fit(
+            parse_result.fit_name,
+            parse_result.ship_type_id,
+            market_ctx,
+        )
+
+    type_ids = list(_fit_quantities(parse_result)[0])
+
+    # Market data for every item: one query per source, not per item
+    item_data = _load_fit_item_data(type_ids, market_ctx)
+
+    # Jita prices: local tables first, network only for missing/stale ids
+    jita_prices = get_jita_prices(type_ids, market_ctx)
+
+    return evaluate_fit(parse_result, item_data, jita_prices, target, market_name)
+
+
 def get_fit_market_status_by_id(
     fit_id: int,
     market_ctx: Optional[MarketContext] = None,
@@ -766,21 +818,26 @@ def get_fit_market_status_by_id(
     if not market_data:
         return None
 
-    # Fetch Jita prices for comparison
+    # Jita prices for comparison: local tables first, network only for missing/stale ids
     type_ids = [item["type_id"] for item in market_data]
-    jita_prices = fetch_jita_prices(type_ids)
+    jita_prices = get_jita_prices(type_ids, market_ctx)
 
     # Populate Jita prices in market data
     for item in market_data:
         type_id = item["type_id"]
         jita_price = jita_prices.get(type_id)
         item["jita_price"] = jita_price
+        item["jita_stale"] = type_id in jita_prices.stale
         item["jita_fit_price"] = (
             jita_price * item["fit_qty"]) if jita_price else 0
 
-    # Apply equivalent module stock
-    equiv_stock = get_equiv_stock(type_ids, market_ctx)
-    _apply_equiv_stock(market_data, equiv_stock)
+    # Equivalent stock is precomputed in doctrines; look up which modules
+    # make it up only when there is some
+    if any(item["equiv_stock"] for item in market_data):
+        equiv_stock = get_equiv_stock(type_ids, market_ctx)
+        for item in market_data:
+            if item["equiv_stock"] and item["type_id"] in equiv_stock:
+                item["equiv_items"] = equiv_stock[item["type_id"]]
 
     # Sort: ships first, then by fits available (lowest first to highlight bottlenecks)
     market_data.sort(key=lambda x: (
@@ -802,9 +859,32 @@ def get_fit_market_status_by_id(
         target=effective_target,
         market_name=market_name,
         total_jita_fit_cost=total_jita_fit_cost,
+        fit_id=fit_id,
     )
 
 
+def _load_on_hand(
+    result: FitCheckResult,
+    market_ctx: Optional[MarketContext] = None,
+) -> Dict[int, int]:
+    """Packaged stock of the fit's items held at the market's structure.
+
+    Read from the asset location index in cli_cache.db (filled by any asset
+    fetch, e.g. ``fitcheck needed --assets``); no ESI call is made.
+    """
+    from mkts_backend.esi.asset_cache import stock_at_structure
+
+    market_ctx = market_ctx or MarketContext.from_settings("primary")
+    type_ids = [item["type_id"] for item in result.market_data if item.get("type_id")]
+    held = stock_at_structure(market_ctx.structure_id, type_ids)
+    if not held:
+        console.print(
+            f"[dim]No indexed assets for this fit at the {market_ctx.name} structure "
+            f"(the index is refreshed by asset fetches, e.g. fitcheck needed --assets)[/dim]"
+        )
+    return held
+
+
 def display_fit_status_by_id(
     fit_id: int,
     market_ctx: Optional[MarketContext] = None,
@@ -812,6 +892,7 @@ def display_fit_status_by_id(
     target: Optional[int] = None,
     output_format: Optional[str] = None,
     show_jita: bool = True,
+    on_hand: bool = False,
 ) -> Optional[FitCheckResult]:
     """
     Display market status for a fit by fit_id using pre-calculated doctrines data.
@@ -823,17 +904,30 @@ def display_fit_status_by_id(
         target: Optional target quantity override
         output_format: Export format - 'csv', 'multibuy', or 'markdown' (optional)
         show_jita: Whether to show Jita price comparison columns
+        on_hand: Net stock held at the market's structure (from the local
+                 asset index) out of the quantities needed
 
     Returns:
         FitCheckResult object with market data, or None if fit not found
     """
-    # Get market data from doctrines table
-    result = get_fit_market_status_by_id(fit_id, market_ctx, target)
+    # Get market data from doctrines table (cached until it or Jita prices change)
+    settings = SettingsService()
+    result = cached(
+        "fitcheck_fit",
+        {"fit_id": fit_id, "target": target, "jita_offline": settings.jita_offline},
+        market_ctx.database_alias if market_ctx else "wcmkt",
+        lambda: get_fit_market_status_by_id(fit_id, market_ctx, target),
+        max_age_minutes=settings.jita_ttl_minutes,
+        store_if=_jita_fresh,
+    )
 
     if not result:
         console.print(f"[red]Error: No fit found with fit_id={fit_id}[/red]")
         return None
 
+    if on_hand:
+        result.on_hand = _load_on_hand(result, market_ctx)
+
     # Create table first to measure its width
     table = create_fit_status_table(
         fit_name=result.fit_name,
@@ -844,6 +938,7 @@ def display_fit_status_by_id(
         market_name=result.market_name,
         target=result.target,
         show_jita=show_jita,
+        on_hand=result.on_hand,
     )
 
     # Measure table width for header alignment
@@ -922,6 +1017,7 @@ def display_fit_status(
     target: Optional[int] = None,
     output_format: Optional[str] = None,
     show_jita: bool = True,
+    on_hand: bool = False,
 ) -> FitCheckResult:
     """
     Display market status for a parsed fit using Rich formatting.
@@ -933,12 +1029,25 @@ def display_fit_status(
         target: Optional target quantity override
         output_format: Export format - 'csv', 'multibuy', or 'markdown' (optional)
         show_jita: Whether to show Jita price comparison columns
+        on_hand: Net stock held at the market's structure (from the local
+                 asset index) out of the quantities needed
 
     Returns:
         FitCheckResult object with market data
     """
-    # Get market data with target lookup
-    result = get_fit_market_status(parse_result, market_ctx, target)
+    # Get market data with target lookup (cached per fit contents)
+    settings = SettingsService()
+    result = cached(
+        "fitcheck",
+        {"fit": _fit_signature(parse_result), "target": target, "jita_offline": settings.jita_offline},
+        market_ctx.database_alias if market_ctx else "wcmkt",
+        lambda: get_fit_market_status(parse_result, market_ctx, target),
+        max_age_minutes=settings.jita_ttl_minutes,
+        store_if=_jita_fresh,
+    )
+
+    if on_hand:
+        result.on_hand = _load_on_hand(result, market_ctx)
 
     # Create table first to measure its width
     table = create_fit_status_table(
@@ -950,6 +1059,7 @@ def display_fit_status(
         market_name=result.market_name,
         target=result.target,
         show_jita=show_jita,
+        on_hand=result.on_hand,
     )
 
     # Measure table width for header alignment
@@ -1102,99 +1212,6 @@ def _handle_assets(sub_args: List[str]) -> None:
     )
 
 
-def display_help():
-    """Display help for the fitcheck command."""
-    print("""
-fitcheck - Display market availability for items in an EFT-formatted ship fit
-
-USAGE:
-    fitcheck --fit=<id> [options]
-    fitcheck --file=<path> [options]
-    fitcheck --paste [options]
-    fitcheck needed [--ship=<name,...>] [--fit=<id,...>] [--target=<pct>] [--assets]
-    fitcheck list-fits [--market=<alias>]
-    fitcheck module --id=<type_id> [--market=<alias>]
-    fitcheck module --name="<name>" [--market=<alias>]
-
-SUBCOMMANDS:
-    needed               Show all items needed to reach ship targets
-        --ship=<name,...>    Filter by ship name(s), comma-separated
-                             (e.g. --ship=Maelstrom or --ship=Maelstrom,Hurricane)
-        --fit=<id,...>       Filter by fit ID(s), comma-separated
-                             (e.g. --fit=550 or --fit=550,551,552)
-        --target=<pct>       Show only fits below this target % (e.g. --target=0.5)
-        --market=<alias>     Market to check (default: primary)
-        --assets             Show per-character packaged asset columns
-        --refresh            Bypass asset cache and re-fetch from ESI
-
-    list-fits            List all tracked doctrine fits
-        --market=<alias>     Market database to query (default: primary)
-
-    module               Show which fits use a given module and market status
-        --id=<type_id>       Look up module by type ID
-        --name="<name>"      Look up module by name (exact or partial match)
-        --market=<alias>     Market to check: primary, deployment, all
-                             (default: primary)
-
-DESCRIPTION:
-    Analyzes an EFT (Eve Fitting Tool) formatted ship fit and displays market
-    availability for each item. Shows how many complete fits can be built from
-    current market stock, with color-coded status indicators.
-
-OPTIONS:
-    --fit=<id>           Look up fit by ID from doctrine_fits/doctrines tables
-                         (uses pre-calculated market data)
-    --file=<path>        Path to EFT fit file
-    --paste              Read EFT fit from stdin instead of file
-    --market=<alias>     Market to check: primary, deployment (default: primary)
-    --target=<N>         Override target quantity (default: from doctrine_fits)
-    --output=<format>    Export format: csv, multibuy, or markdown
-    --no-jita            Hide Jita price comparison columns
-    --no-legend          Hide the legend
-    --help, -h           Show this help message
-
-EXAMPLES:
-    # Check fit by ID (most common usage)
-    fitcheck --fit=42
-
-    # Check fit by ID against deployment market
-    fitcheck --fit=42 --market=deployment
-
-    # Check fit from EFT file
-    fitcheck --file=fits/hurricane_fleet.txt
-
-    # Override target and export multi-buy list
-    fitcheck --fit=42 --target=50 --output=multibuy
-
-    # Export markdown for Discord
-    fitcheck --fit=42 --output=markdown
-
-    # Show all items needed across all fits
-    fitcheck needed
-
-    # Show needed items for a specific ship
-    fitcheck needed --ship=Maelstrom
-
-    # Show needed items for multiple ships
-    fitcheck needed --ship=Maelstrom,Hurricane
-
-    # Show needed items for specific fit IDs
-    fitcheck needed --fit=550,551,552
-
-    # Show needed items for fits below 50% of target
-    fitcheck needed --target=0.5
-
-    # List all tracked fits
-    fitcheck list-fits
-    fitcheck list-fits --market=deployment
-
-    # Check module usage across fits
-    fitcheck module --id=11269
-    fitcheck module --name="Multispectrum Energized Membrane II"
-    fitcheck module --id=11269 --market=all
-""")
-
-
 def fit_check_command(
     file_path: Optional[str] = None,
     eft_text: Optional[str] = None,
@@ -1204,6 +1221,7 @@ def fit_check_command(
     target: Optional[int] = None,
     output_format: Optional[str] = None,
     show_jita: bool = True,
+    on_hand: bool = False,
 ) -> bool:
     """
     Execute the fit-check command.
@@ -1217,6 +1235,8 @@ def fit_check_command(
         target: Optional target quantity override
         output_format: Export format - 'csv', 'multibuy', or 'markdown' (optional)
         show_jita: Whether to show Jita price comparison columns
+        on_hand: Net stock held at the market's structure out of the
+                 quantities needed
 
     Returns:
         True if successful, False otherwise
@@ -1239,6 +1259,7 @@ def fit_check_command(
             target=target,
             output_format=output_format,
             show_jita=show_jita,
+            on_hand=on_hand,
         )
         return result is not None
 
@@ -1282,78 +1303,11 @@ def fit_check_command(
         target=target,
         output_format=output_format,
         show_jita=show_jita,
+        on_hand=on_hand,
     )
 
     return True
 
 
-def main():
-    """
-    Standalone CLI entry point for fitcheck command.
-
-    Uses the shared command registry for "no-wrong-door" dispatch — any
-    registered subcommand (including those normally accessed via
-    ``mkts-backend``) works from the ``fitcheck`` entry point too.
-    """
-    import sys
-    from mkts_backend.cli_tools.command_registry import get_registry
-
-    args = sys.argv[1:]
-
-    # Handle help
-    if not args or "--help" in args or "-h" in args:
-        display_help()
-        sys.exit(0)
-
-    market_alias = parse_market_args(args)
-
-    # Registry-based subcommand dispatch (no-wrong-door)
-    registry = get_registry()
-    if args and not args[0].startswith("--"):
-        entry = registry.resolve(args[0])
-        if entry:
-            sub_args = args[1:]
-            # Check for bare key=value args (missing --)
-            from mkts_backend.cli_tools.arg_utils import check_bare_args
-            bare = check_bare_args(sub_args, registry.all_names())
-            if bare:
-                corrected = " ".join(
-                    (f"--{a}" if not a.startswith("--") and "=" in a and a not in registry.all_names() else a)
-                    for a in sub_args
-                )
-                console.print(f"[yellow]Did you mean?[/yellow] fitcheck {args[0]} {corrected}")
-                sys.exit(1)
-            success = entry.handler(sub_args, market_alias)
-            sys.exit(0 if success else 1)
-
-        # Unknown subcommand — suggest closest match
-        from mkts_backend.cli_tools.arg_utils import suggest_command
-        suggestion = suggest_command(args[0], registry.all_names())
-        if suggestion:
-            rest = " ".join(args[1:])
-            hint = f"fitcheck {suggestion}"
-            if rest:
-                hint += f" {rest}"
-            console.print(f"Unknown command: '{args[0]}'")
-            console.print(f"[yellow]Did you mean?[/yellow] {hint}")
-            sys.exit(1)
-
-    # Check for bare key=value in direct invocation (e.g. fitcheck fit=42)
-    from mkts_backend.cli_tools.arg_utils import check_bare_args
-    bare = check_bare_args(args, registry.all_names())
-    if bare:
-        corrected = " ".join(
-            (f"--{a}" if not a.startswith("--") and "=" in a else a)
-            for a in args
-        )
-        console.print(f"[yellow]Did you mean?[/yellow] fitcheck {corrected}")
-        sys.exit(1)
-
-    # No subcommand matched — treat as direct fit-check invocation
-    entry = registry.resolve("fit-check")
-    success = entry.handler(args, market_alias)
-    sys.exit(0 if success else 1)
-
-
 if __name__ == "__main__":
     main()
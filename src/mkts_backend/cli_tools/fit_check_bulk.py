@@ -0,0 +1,345 @@
+"""Bulk ``fit-check``: ``--dir``, ``--doctrine`` and ``--all-fits``.
+
+Checks many fits in one process. Every fit is collected first (EFT files
+parsed, doctrine fits read from ``doctrines`` in one query), then market
+data, Jita prices and equivalent-module stock are loaded once for the union
+of their type_ids and each fit is evaluated in memory with
+``fit_check.evaluate_fit``. Output is a per-fit summary table plus an
+optional combined report (CSV, JSON, markdown) or an aggregate multibuy.
+"""
+
+import csv
+import json
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+
+from mkts_backend.cli_tools.fit_check import (
+    FitCheckResult,
+    _fit_quantities,
+    _in_params,
+    _load_fit_item_data,
+    evaluate_fit,
+)
+from mkts_backend.cli_tools.rich_display import (
+    console,
+    create_bulk_fit_table,
+    print_markdown_export,
+    print_multibuy_export,
+)
+from mkts_backend.config import DatabaseConfig
+from mkts_backend.config.logging_config import configure_logging
+from mkts_backend.config.market_context import MarketContext
+from mkts_backend.utils.eft_parser import FitParseResult, parse_eft_file
+from mkts_backend.utils.jita import get_jita_prices
+
+logger = configure_logging(__name__)
+
+EFT_SUFFIXES = (".txt", ".eft", ".cfg")
+
+# (parsed fit, target or None, doctrine fit_id or None)
+FitSpec = Tuple[FitParseResult, Optional[int], Optional[int]]
+
+
+def _db(market_ctx: Optional[MarketContext]) -> DatabaseConfig:
+    return DatabaseConfig(market_ctx.database_alias if market_ctx else "wcmkt")
+
+
+def load_dir_fits(
+    directory: str,
+    market_ctx: Optional[MarketContext] = None,
+) -> Tuple[List[FitSpec], List[str]]:
+    """
+    Parse every EFT file in ``directory``.
+
+    Targets come from doctrine_fits (by fit name, then by hull), read once.
+
+    Returns:
+        (fits, errors) where errors are "<file>: <reason>" strings
+    """
+    paths = sorted(
+        p for p in Path(directory).iterdir()
+        if p.is_file() and p.suffix.lower() in EFT_SUFFIXES
+    )
+    with _db(market_ctx).engine.connect() as conn:
+        rows = conn.execute(
+            text("SELECT fit_name, ship_type_id, target FROM doctrine_fits")
+        ).fetchall()
+    by_name: Dict[str, int] = {}
+    by_ship: Dict[int, int] = {}
+    for row in rows:
+        by_name.setdefault(row.fit_name, row.target)
+        by_ship.setdefault(row.ship_type_id, row.target)
+
+    fits: List[FitSpec] = []
+    errors: List[str] = []
+    for path in paths:
+        try:
+            parse_result = parse_eft_file(str(path))
+        except Exception as e:
+            errors.append(f"{path.name}: {e}")
+            continue
+        if parse_result.has_missing_types:
+            errors.append(
+                f"{path.name}: unresolved {', '.join(parse_result.missing_types[:3])}"
+            )
+        target = by_name.get(parse_result.fit_name)
+        if target is None:
+            target = by_ship.get(parse_result.ship_type_id)
+        fits.append((parse_result, target, None))
+    return fits, errors
+
+
+def load_doctrine_fits(
+    market_ctx: Optional[MarketContext] = None,
+    doctrine_id: Optional[int] = None,
+) -> List[FitSpec]:
+    """
+    Doctrine fits (one doctrine, or all) rebuilt from the doctrines table.
+
+    One doctrine_fits query and one doctrines query, however many fits.
+    """
+    with _db(market_ctx).engine.connect() as conn:
+        query = "SELECT fit_id, fit_name, ship_type_id, ship_name, target FROM doctrine_fits"
+        params = {}
+        if doctrine_id is not None:
+            query += " WHERE doctrine_id = :doctrine_id"
+            params["doctrine_id"] = doctrine_id
+        fit_rows = conn.execute(text(query + " ORDER BY fit_id"), params).fetchall()
+        if not fit_rows:
+            return []
+
+        placeholders, params = _in_params("fit", [row.fit_id for row in fit_rows])
+        item_rows = conn.execute(
+            text(f"""
+                SELECT fit_id, type_id, type_name, fit_qty
+                FROM doctrines
+                WHERE fit_id IN ({placeholders})
+            """),
+            params,
+        ).fetchall()
+
+    items: Dict[int, List[Dict]] = defaultdict(list)
+    for row in item_rows:
+        items[row.fit_id].append(
+            {"type_id": row.type_id, "type_name": row.type_name, "quantity": row.fit_qty or 1}
+        )
+
+    fits: List[FitSpec] = []
+    for row in fit_rows:
+        if not items.get(row.fit_id):
+            logger.warning(f"Fit {row.fit_id} ({row.fit_name}) has no doctrines rows; skipped")
+            continue
+        parse_result = FitParseResult(
+            items=items[row.fit_id],
+            ship_name=row.ship_name,
+            ship_type_id=row.ship_type_id,
+            fit_name=row.fit_name,
+            missing_types=[],
+        )
+        fits.append((parse_result, row.target, row.fit_id))
+    return fits
+
+
+def check_fits(
+    fits: List[FitSpec],
+    market_ctx: Optional[MarketContext] = None,
+    target: Optional[int] = None,
+) -> List[FitCheckResult]:
+    """
+    Evaluate many fits against one load of market data.
+
+    Args:
+        fits: Fits with their doctrine targets and fit IDs
+        market_ctx: Market context for database selection
+        target: Optional target override for every fit
+
+    Returns:
+        FitCheckResult per fit, in input order
+    """
+    market_name = market_ctx.name if market_ctx else "primary"
+    fit_type_ids = [list(_fit_quantities(parse_result)[0]) for parse_result, _, _ in fits]
+    union = list(dict.fromkeys(t for ids in fit_type_ids for t in ids))
+    if not union:
+        return []
+
+    item_data = _load_fit_item_data(union, market_ctx)
+    jita_prices = get_jita_prices(union, market_ctx)
+
+    return [
+        evaluate_fit(
+            parse_result,
+            item_data,
+            jita_prices,
+            target if target is not None else fit_target,
+            market_name,
+            fit_id=fit_id,
+        )
+        for parse_result, fit_target, fit_id in fits
+    ]
+
+
+def _qty_needed(item: Dict, target: Optional[int]) -> int:
+    if target is None or item["fits"] >= target:
+        return 0
+    return max(0, int((target - item["fits"]) * item["fit_qty"]))
+
+
+def aggregate_multibuy(results: List[FitCheckResult]) -> str:
+    """
+    One multibuy list to bring every fit to its target.
+
+    Stock is shared between fits, so each item's requirement is summed over
+    the fits that use it (target x fit qty) before subtracting stock once.
+    """
+    required: Dict[int, int] = defaultdict(int)
+    stock: Dict[int, int] = {}
+    names: Dict[int, str] = {}
+    for result in results:
+        if result.target is None:
+            continue
+        for item in result.market_data:
+            type_id = item["type_id"]
+            required[type_id] += result.target * item["fit_qty"]
+            stock[type_id] = item.get("market_stock", 0) or 0
+            names[type_id] = item["type_name"]
+
+    lines = []
+    for type_id in sorted(required, key=lambda t: names[t]):
+        needed = int(required[type_id] - stock[type_id])
+        if needed > 0:
+            lines.append(f"{names[type_id]} {needed}")
+    return "\n".join(lines)
+
+
+def to_markdown(results: List[FitCheckResult]) -> str:
+    """Discord markdown for every fit below target."""
+    sections = [r.to_markdown() for r in results if r.missing_for_target]
+    return "\n\n".join(s for s in sections if s)
+
+
+def to_csv(results: List[FitCheckResult], file_path: str) -> str:
+    """One CSV row per fit item, for every fit."""
+    path = Path(file_path)
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow([
+            "fit_id", "fit_name", "ship_name", "target", "type_id", "type_name",
+            "market_stock", "fit_qty", "fits", "price", "fit_cost", "jita_price",
+            "qty_needed",
+        ])
+        for result in results:
+            for item in result.market_data:
+                writer.writerow([
+                    result.fit_id if result.fit_id is not None else "",
+                    result.fit_name,
+                    result.ship_name,
+                    result.target if result.target is not None else "",
+                    item.get("type_id", ""),
+                    item.get("type_name", ""),
+                    item.get("market_stock", 0),
+                    item.get("fit_qty", 1),
+                    f"{item.get('fits', 0):.1f}",
+                    f"{item.get('price', 0):.2f}" if item.get("price") else "",
+                    f"{item.get('fit_price', 0):.2f}",
+                    f"{item['jita_price']:.2f}" if item.get("jita_price") else "",
+                    _qty_needed(item, result.target),
+                ])
+    return str(path.absolute())
+
+
+def to_json(results: List[FitCheckResult], file_path: str) -> str:
+    """Every fit's summary and items as a JSON list."""
+    payload = [
+        {
+            "fit_id": r.fit_id,
+            "fit_name": r.fit_name,
+            "ship_name": r.ship_name,
+            "ship_type_id": r.ship_type_id,
+            "market_name": r.market_name,
+            "target": r.target,
+            "min_fits": r.min_fits,
+            "hulls": r.hulls,
+            "total_fit_cost": r.total_fit_cost,
+            "total_jita_fit_cost": r.total_jita_fit_cost,
+            "items": [
+                {**item, "qty_needed": _qty_needed(item, r.target)}
+                for item in r.market_data
+            ],
+        }
+        for r in results
+    ]
+    path = Path(file_path)
+    path.write_text(json.dumps(payload, indent=2, default=str))
+    return str(path.absolute())
+
+
+def bulk_fit_check_command(
+    directory: Optional[str] = None,
+    doctrine_id: Optional[int] = None,
+    all_fits: bool = False,
+    market_alias: str = "primary",
+    target: Optional[int] = None,
+    output_format: Optional[str] = None,
+    show_jita: bool = True,
+) -> bool:
+    """
+    Check every fit in a directory, a doctrine, or all doctrine fits.
+
+    Args:
+        directory: Directory of EFT files (``--dir``)
+        doctrine_id: Doctrine to check (``--doctrine``)
+        all_fits: Check every doctrine fit (``--all-fits``)
+        market_alias: Market alias (primary, deployment)
+        target: Optional target override for every fit
+        output_format: 'csv', 'json', 'markdown' or 'multibuy' (optional)
+        show_jita: Whether to show the Jita fit cost column
+
+    Returns:
+        True if successful, False otherwise
+    """
+    try:
+        market_ctx = MarketContext.from_settings(market_alias)
+    except ValueError as e:
+        console.print(f"[red]Error: {e}[/red]")
+        return False
+
+    if directory:
+        if not Path(directory).is_dir():
+            console.print(f"[red]Error: Not a directory: {directory}[/red]")
+            return False
+        fits, errors = load_dir_fits(directory, market_ctx)
+        for error in errors:
+            console.print(f"  • {error}", style="yellow")
+    else:
+        fits = load_doctrine_fits(market_ctx, None if all_fits else doctrine_id)
+
+    if not fits:
+        console.print("[yellow]No fits found.[/yellow]")
+        return False
+
+    results = check_fits(fits, market_ctx, target)
+
+    console.print()
+    console.print(create_bulk_fit_table(results, market_ctx.name, show_jita=show_jita))
+    below = sum(1 for r in results if any(i["qty_needed"] > 0 for i in r.missing_for_target))
+    console.print(f"[dim]{len(results)} fit(s), {below} below target[/dim]")
+
+    if output_format == "csv":
+        csv_path = to_csv(results, f"fitcheck_bulk_{market_ctx.alias}.csv")
+        console.print(f"\n[green]CSV exported to:[/green] {csv_path}")
+    elif output_format == "json":
+        json_path = to_json(results, f"fitcheck_bulk_{market_ctx.alias}.json")
+        console.print(f"\n[green]JSON exported to:[/green] {json_path}")
+    elif output_format == "markdown":
+        print_markdown_export(to_markdown(results))
+    elif output_format == "multibuy":
+        multibuy = aggregate_multibuy(results)
+        if multibuy:
+            print_multibuy_export(multibuy)
+        else:
+            console.print("\n[yellow]No items below target - nothing to export[/yellow]")
+
+    return True
@@ -12,6 +12,7 @@ from sqlalchemy import text
 
 from mkts_backend.cli_tools.arg_utils import ArgError, ParsedArgs
 from mkts_backend.cli_tools.market_args import expand_market_alias, parse_market_args
+from mkts_backend.cli_tools.result_cache import cached
 from mkts_backend.cli_tools.rich_display import console, create_module_usage_table
 from mkts_backend.config import DatabaseConfig
 from mkts_backend.config.market_context import MarketContext
@@ -54,6 +55,24 @@ def _resolve_module_identity(
     raise ValueError("Either --id or --name is required")
 
 
+MODULE_USAGE_QUERY = """
+    SELECT
+        d.fit_id,
+        df.fit_name,
+        df.ship_name,
+        df.doctrine_name,
+        d.fit_qty,
+        df.target,
+        d.total_stock,
+        d.fits_on_mkt,
+        d.price
+    FROM doctrines d
+    JOIN doctrine_fits df ON d.fit_id = df.fit_id
+    WHERE d.type_id = :type_id
+    ORDER BY df.doctrine_name, df.fit_name
+"""
+
+
 def _query_module_usage(
     type_id: int,
     market_ctx: Optional[MarketContext] = None,
@@ -64,22 +83,7 @@ def _query_module_usage(
 
     results = []
     with db.engine.connect() as conn:
-        query = text("""
-            SELECT
-                d.fit_id,
-                df.fit_name,
-                df.ship_name,
-                df.doctrine_name,
-                d.fit_qty,
-                df.target,
-                d.total_stock,
-                d.fits_on_mkt,
-                d.price
-            FROM doctrines d
-            JOIN doctrine_fits df ON d.fit_id = df.fit_id
-            WHERE d.type_id = :type_id
-            ORDER BY df.doctrine_name, df.fit_name
-        """)
+        query = text(MODULE_USAGE_QUERY)
         rows = conn.execute(query, {"type_id": type_id}).fetchall()
 
         for row in rows:
@@ -106,6 +110,16 @@ def _query_module_usage(
     return results
 
 
+def _cached_module_usage(type_id: int, market_ctx: MarketContext) -> List[Dict]:
+    """``_query_module_usage`` through the CLI result cache."""
+    return cached(
+        "module",
+        {"type_id": type_id},
+        market_ctx.database_alias,
+        lambda: _query_module_usage(type_id, market_ctx),
+    )
+
+
 def module_command(
     type_id: Optional[int] = None,
     type_name: Optional[str] = None,
@@ -128,8 +142,8 @@ def module_command(
             console.print(f"[red]Error: {e}[/red]")
             return False
 
-        primary_data = _query_module_usage(resolved_id, primary_ctx)
-        deploy_data = _query_module_usage(resolved_id, deploy_ctx)
+        primary_data = _cached_module_usage(resolved_id, primary_ctx)
+        deploy_data = _cached_module_usage(resolved_id, deploy_ctx)
 
         if not primary_data and not deploy_data:
             console.print(
@@ -202,7 +216,7 @@ def module_command(
         console.print(f"Available markets: {', '.join(MarketContext.list_available())}")
         return False
 
-    data = _query_module_usage(resolved_id, market_ctx)
+    data = _cached_module_usage(resolved_id, market_ctx)
 
     if not data:
         console.print(
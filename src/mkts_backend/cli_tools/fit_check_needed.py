@@ -1,67 +1,174 @@
 """``fit-check needed`` subcommand.
 
-Computes per-fit "needed items" tables: type rows whose ``fits_on_mkt``
-falls below ``ship_target``. Optionally augments rows with per-character
-asset counts and equivalent-module stock. Extracted from ``fit_check.py``
-for clarity.
+Shows per-fit "needed items" tables: type rows whose ``fits_on_mkt``
+falls below ``ship_target``. Rows come from the ``needed_items`` table the
+pipeline rebuilds after the doctrines stage (equivalent-module stock
+already folded in), with the ship/fit/target filters pushed into SQL.
+Databases the pipeline has not materialized yet, and ``--live``, compute
+the same rows from ``doctrines`` and ``ship_targets`` on the fly.
+Optionally augments rows with per-character asset counts, and with the
+stock held at the market's own structure (``--on-hand``, read from the
+local asset location index). Extracted from ``fit_check.py`` for clarity.
 """
 
+import json
+from collections import defaultdict
 from typing import Dict, List, Optional
 
-from sqlalchemy import text
+from sqlalchemy import bindparam, text
 
 from mkts_backend.cli_tools.arg_utils import ArgError, ParsedArgs
 from mkts_backend.cli_tools.market_args import parse_market_args
+from mkts_backend.cli_tools.result_cache import cached
 from mkts_backend.cli_tools.rich_display import console, create_needed_table
 from mkts_backend.config import DatabaseConfig
 from mkts_backend.config.market_context import MarketContext
 
 
+FIT_TYPES_QUERY = "SELECT DISTINCT fit_id, type_id FROM doctrines WHERE fit_id IN :fit_ids"
+
+NEEDED_ITEMS_QUERY = """
+    SELECT
+        d.fit_id,
+        d.ship_id,
+        d.ship_name,
+        d.type_id,
+        d.type_name,
+        d.fit_qty,
+        t.ship_target AS target,
+        t.fit_name,
+        d.fits_on_mkt,
+        d.total_stock,
+        d.equiv_stock,
+        round((1.0 * d.fits_on_mkt) / NULLIF(t.ship_target, 0), 2) AS targ_perc,
+        CASE
+            WHEN d.fits_on_mkt < t.ship_target
+                THEN (NULLIF(t.ship_target, 0) - d.fits_on_mkt) * d.fit_qty
+            ELSE 0
+        END AS qty_needed
+    FROM doctrines AS d
+    LEFT JOIN ship_targets AS t
+        ON d.fit_id = t.fit_id
+    WHERE CASE
+            WHEN d.fits_on_mkt < t.ship_target
+                THEN (NULLIF(t.ship_target, 0) - d.fits_on_mkt) * d.fit_qty
+            ELSE 0
+          END > 0
+    ORDER BY d.ship_name, d.fit_id, targ_perc
+"""
+
+
+MATERIALIZED_NEEDED_QUERY = """
+    SELECT
+        fit_id,
+        ship_id,
+        ship_name,
+        type_id,
+        type_name,
+        fit_qty,
+        target,
+        fit_name,
+        fits_on_mkt,
+        total_stock,
+        targ_perc,
+        qty_needed,
+        equiv_items
+    FROM needed_items
+"""
+
+
+def _read_needed_items(
+    conn,
+    ship_filter: Optional[List[str]] = None,
+    fit_filter: Optional[List[int]] = None,
+    targ_perc_filter: Optional[float] = None,
+) -> Optional[List[Dict]]:
+    """Rows of the materialized ``needed_items`` table, or None if it doesn't exist."""
+    from mkts_backend.cli_tools.fit_check import _in_params
+
+    exists = conn.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'needed_items'")
+    ).fetchone()
+    if exists is None:
+        return None
+
+    clauses, params = [], {}
+    if ship_filter:
+        placeholders, ship_params = _in_params("ship", list(ship_filter))
+        clauses.append(f"ship_name IN ({placeholders})")
+        params.update(ship_params)
+    if fit_filter:
+        placeholders, fit_params = _in_params("fit", list(fit_filter))
+        clauses.append(f"fit_id IN ({placeholders})")
+        params.update(fit_params)
+    if targ_perc_filter is not None:
+        clauses.append("targ_perc < :targ_perc")
+        params["targ_perc"] = targ_perc_filter
+    where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+    query = text(f"{MATERIALIZED_NEEDED_QUERY}{where} ORDER BY ship_name, fit_id, targ_perc")
+
+    results = []
+    for row in conn.execute(query, params):
+        item = {
+            "fit_id": row.fit_id,
+            "ship_id": row.ship_id,
+            "ship_name": row.ship_name,
+            "type_id": row.type_id,
+            "type_name": row.type_name,
+            "fit_qty": row.fit_qty or 1,
+            "target": row.target,
+            "fit_name": row.fit_name or "Unknown",
+            "fits_on_mkt": row.fits_on_mkt or 0,
+            "total_stock": row.total_stock or 0,
+            "targ_perc": row.targ_perc or 0,
+            "qty_needed": row.qty_needed or 0,
+        }
+        equivs = json.loads(row.equiv_items) if row.equiv_items else []
+        if equivs:
+            item["equiv_items"] = equivs
+        results.append(item)
+    return results
+
+
 def _query_needed_data(
     market_ctx: Optional[MarketContext] = None,
     ship_filter: Optional[List[str]] = None,
     fit_filter: Optional[List[int]] = None,
     targ_perc_filter: Optional[float] = None,
+    live: bool = False,
 ) -> List[Dict]:
-    """Return needed items joined from ``doctrines`` and ``ship_targets``."""
-    # Lazy import — get_equiv_stock lives in fit_check.py and importing it at
-    # module load time would create a circular dependency through the legacy
+    """
+    Return needed items, from ``needed_items`` unless ``live`` or absent.
+
+    The live path joins ``doctrines`` and ``ship_targets``; ``fits_on_mkt``
+    there already counts equivalent modules, only their breakdown is looked
+    up.
+    """
+    # Lazy import — these live in fit_check.py and importing them at module
+    # load time would create a circular dependency through the legacy
     # re-exports.
-    from mkts_backend.cli_tools.fit_check import get_equiv_stock
+    from mkts_backend.cli_tools.fit_check import (
+        _doctrines_has_equiv_stock,
+        exclude_fit_items,
+        get_equiv_candidates,
+    )
 
     db_alias = market_ctx.database_alias if market_ctx else "wcmkt"
     db = DatabaseConfig(db_alias)
 
     results = []
     with db.engine.connect() as conn:
-        query = text("""
-            SELECT
-                d.fit_id,
-                d.ship_id,
-                d.ship_name,
-                d.type_id,
-                d.type_name,
-                d.fit_qty,
-                t.ship_target AS target,
-                t.fit_name,
-                d.fits_on_mkt,
-                d.total_stock,
-                round((1.0 * d.fits_on_mkt) / NULLIF(t.ship_target, 0), 2) AS targ_perc,
-                CASE
-                    WHEN d.fits_on_mkt < t.ship_target
-                        THEN (NULLIF(t.ship_target, 0) - d.fits_on_mkt) * d.fit_qty
-                    ELSE 0
-                END AS qty_needed
-            FROM doctrines AS d
-            LEFT JOIN ship_targets AS t
-                ON d.fit_id = t.fit_id
-            WHERE CASE
-                    WHEN d.fits_on_mkt < t.ship_target
-                        THEN (NULLIF(t.ship_target, 0) - d.fits_on_mkt) * d.fit_qty
-                    ELSE 0
-                  END > 0
-            ORDER BY d.ship_name, d.fit_id, targ_perc
-        """)
+        if not live:
+            materialized = _read_needed_items(
+                conn, ship_filter, fit_filter, targ_perc_filter
+            )
+            if materialized is not None:
+                return materialized
+
+        sql = NEEDED_ITEMS_QUERY
+        if not _doctrines_has_equiv_stock(conn):
+            sql = sql.replace("d.equiv_stock", "0 AS equiv_stock")
+        query = text(sql)
         rows = conn.execute(query).fetchall()
 
         for row in rows:
@@ -75,7 +182,8 @@ def _query_needed_data(
                 "target": row.target,
                 "fit_name": row.fit_name or "Unknown",
                 "fits_on_mkt": row.fits_on_mkt or 0,
-                "total_stock": row.total_stock or 0,
+                "total_stock": (row.total_stock or 0) + (row.equiv_stock or 0),
+                "equiv_stock": row.equiv_stock or 0,
                 "targ_perc": row.targ_perc or 0,
                 "qty_needed": row.qty_needed or 0,
             }
@@ -87,29 +195,25 @@ def _query_needed_data(
 
             results.append(item)
 
-    all_type_ids = list({item["type_id"] for item in results})
-    equiv_stock = get_equiv_stock(all_type_ids, market_ctx)
-
-    for item in results:
-        equivs = equiv_stock.get(item["type_id"])
-        if not equivs:
-            continue
-
-        equiv_total = sum(e["stock"] for e in equivs)
-        item["total_stock"] = (item.get("total_stock", 0) or 0) + equiv_total
-        target_val = item.get("target", 0) or 0
-        fit_qty = item.get("fit_qty", 1) or 1
-
-        item["fits_on_mkt"] = item["total_stock"] / fit_qty if fit_qty > 0 else 0
-        item["targ_perc"] = (
-            round(item["fits_on_mkt"] / target_val, 2) if target_val > 0 else 0
-        )
-        item["qty_needed"] = (
-            max(0, int((target_val - item["fits_on_mkt"]) * fit_qty))
-            if item["fits_on_mkt"] < target_val
-            else 0
-        )
-        item["equiv_items"] = equivs
+        # Every type in each fit, not just the rows still needed, so a
+        # well-stocked module the fit also uses is never listed as an
+        # equivalent (matching the materialized needed_items rows).
+        with_equivs = [item for item in results if item["equiv_stock"]]
+        fit_types: Dict[int, List[int]] = defaultdict(list)
+        if with_equivs:
+            fit_rows = conn.execute(
+                text(FIT_TYPES_QUERY).bindparams(bindparam("fit_ids", expanding=True)),
+                {"fit_ids": sorted({item["fit_id"] for item in with_equivs})},
+            )
+            for fit_id, type_id in fit_rows:
+                fit_types[fit_id].append(type_id)
+
+    if with_equivs:
+        candidates = get_equiv_candidates(list({item["type_id"] for item in with_equivs}), market_ctx)
+        for item in with_equivs:
+            item["equiv_items"] = exclude_fit_items(
+                candidates, fit_types[item["fit_id"]]
+            ).get(item["type_id"], [])
 
     if targ_perc_filter is not None:
         results = [item for item in results if item["targ_perc"] < targ_perc_filter]
@@ -126,6 +230,8 @@ def needed_command(
     targ_perc_filter: Optional[float] = None,
     show_assets: bool = False,
     force_refresh: bool = False,
+    live: bool = False,
+    on_hand: bool = False,
 ) -> bool:
     """Display needed items grouped per-fit."""
     try:
@@ -134,11 +240,22 @@ def needed_command(
         console.print(f"[red]Error: {e}[/red]")
         return False
 
-    data = _query_needed_data(
-        market_ctx,
-        ship_filter=ship_filter,
-        fit_filter=fit_filter,
-        targ_perc_filter=targ_perc_filter,
+    data = cached(
+        "needed",
+        {
+            "ships": sorted(ship_filter or []),
+            "fits": sorted(fit_filter or []),
+            "targ_perc": targ_perc_filter,
+            "live": live,
+        },
+        market_ctx.database_alias,
+        lambda: _query_needed_data(
+            market_ctx,
+            ship_filter=ship_filter,
+            fit_filter=fit_filter,
+            targ_perc_filter=targ_perc_filter,
+            live=live,
+        ),
     )
 
     if not data:
@@ -154,6 +271,20 @@ def needed_command(
             type_ids=all_type_ids, force_refresh=force_refresh
         )
 
+    held = None
+    if on_hand:
+        # After any --assets fetch above, which refreshes the index.
+        from mkts_backend.esi.asset_cache import stock_at_structure
+
+        held = stock_at_structure(
+            market_ctx.structure_id, {item["type_id"] for item in data}
+        )
+        if not held:
+            console.print(
+                f"[dim]No indexed assets for these items at the {market_ctx.name} structure "
+                f"(the index is refreshed by asset fetches, e.g. --assets)[/dim]"
+            )
+
     grouped: Dict[int, List[Dict]] = {}
     for item in data:
         fid = item["fit_id"]
@@ -190,6 +321,7 @@ def needed_command(
             target=target,
             items=items,
             char_assets=char_assets,
+            on_hand=held,
         )
         console.print(table)
         console.print()
@@ -257,6 +389,8 @@ def handle_needed(sub_args: List[str]) -> None:
     market_alias = parse_market_args(sub_args)
     show_assets = p.has_flag("assets")
     force_refresh = p.has_flag("refresh")
+    live = p.has_flag("live")
+    on_hand = p.has_flag("on-hand")
 
     ship_filters = p.get_string_list("ship")
 
@@ -286,4 +420,6 @@ def handle_needed(sub_args: List[str]) -> None:
         targ_perc_filter=targ_perc_filter,
         show_assets=show_assets,
         force_refresh=force_refresh,
+        live=live,
+        on_hand=on_hand,
     )
@@ -67,7 +67,7 @@ from mkts_backend.utils.parse_fits import (
     remove_all_doctrine_links_for_fit,
     get_doctrine_ids_for_fit,
 )
-from mkts_backend.cli_tools.prompter import get_multiline_input
+from mkts_backend.cli_tools.prompter import TypeNameCompleter, get_multiline_input
 from mkts_backend.utils.db_utils import add_missing_items_to_watchlist
 
 logger = configure_logging(__name__)
@@ -1600,7 +1600,12 @@ def unassign_doctrine_market(
 
 def list_fits_command(db_alias: str = "wcmkt", remote: bool = False) -> None:
     """List all doctrine fits and their target quantity for the given market."""
-    fits = get_fits_list(db_alias=db_alias, remote=remote)
+    if remote:
+        fits = get_fits_list(db_alias=db_alias, remote=True)
+    else:
+        from mkts_backend.cli_tools.result_cache import cached
+
+        fits = cached("list_fits", {}, db_alias, lambda: get_fits_list(db_alias=db_alias))
     fits.sort(key=lambda f: (f["ship_name"], f["fit_name"]))
     if fits:
         display_fits_table(fits)
@@ -2945,7 +2950,7 @@ def fit_update_command(
     use_remote = remote and not local_only
 
     if paste_mode and subcommand not in ("add", "update"):
-        eft_text = get_multiline_input()
+        eft_text = get_multiline_input(TypeNameCompleter())
         if eft_text:
             print("EFT text input registered")
             file_path = "temp_file.txt"
@@ -2996,7 +3001,7 @@ def fit_update_command(
     elif subcommand == "add":
         eft_text = None
         if not file_path:
-            eft_text = get_multiline_input()
+            eft_text = get_multiline_input(TypeNameCompleter())
 
         if interactive:
             return interactive_add_fit(
@@ -3063,7 +3068,7 @@ def fit_update_command(
             return False
 
         if not file_path:
-            eft_text = get_multiline_input()
+            eft_text = get_multiline_input(TypeNameCompleter())
             if eft_text:
                 file_path = eft_text_to_file(eft_text)
 
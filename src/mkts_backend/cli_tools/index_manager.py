@@ -0,0 +1,176 @@
+"""
+Index Manager CLI
+
+CLI commands for the secondary indexes declared on the market-DB models:
+- verify: Report which model-declared indexes exist (default)
+- create: Create the missing ones, showing hot-query plans before and after
+- drop:   Drop them again, showing hot-query plans before and after
+- plan:   Show EXPLAIN QUERY PLAN for every hot query
+"""
+
+from rich.console import Console
+from rich.table import Table
+from rich import box
+
+from mkts_backend.cli_tools.arg_utils import ParsedArgs
+from mkts_backend.config.db_config import DatabaseConfig
+from mkts_backend.config.logging_config import configure_logging
+from mkts_backend.config.market_context import MarketContext
+from mkts_backend.db.db_indexes import (
+    HOT_QUERIES,
+    create_indexes,
+    drop_indexes,
+    explain_hot_queries,
+    index_status,
+    is_full_scan,
+)
+
+logger = configure_logging(__name__)
+console = Console()
+
+_SUBCOMMANDS = {"verify", "create", "drop", "plan"}
+
+
+def indexes_command(args: list[str], market_alias: str = "all") -> bool:
+    """
+    Route indexes subcommands across the target markets.
+
+    Args:
+        args: Command arguments (after 'indexes')
+        market_alias: Market alias or "all"
+
+    Returns:
+        True if command succeeded (for verify: every index present)
+    """
+    from mkts_backend.cli_tools.market_args import expand_market_alias
+
+    p = ParsedArgs(args)
+    positionals = [a for a in p.positionals() if a != "indexes"]
+    subcommand = positionals[0] if positionals else "verify"
+    if subcommand not in _SUBCOMMANDS:
+        console.print(f"[red]Error: unknown indexes subcommand '{subcommand}'[/red]")
+        _display_indexes_help()
+        return False
+
+    remote = p.has_flag("remote")
+    show_plan = p.has_flag("plan") or subcommand == "plan"
+
+    success = True
+    for alias in expand_market_alias(market_alias):
+        market_ctx = MarketContext.from_settings(alias)
+        db = DatabaseConfig(market_context=market_ctx)
+        console.print(
+            f"\n[bold]{market_ctx.name}[/bold] ({alias}) — {db.alias} ({db.path})"
+        )
+        if remote and not db.turso_url:
+            console.print(f"  [yellow]{alias}: no Turso remote configured; local only[/yellow]")
+
+        if subcommand in ("verify", "plan"):
+            if remote and db.turso_url:
+                # Refresh the local mirror so verify reflects the remote schema.
+                db.pull()
+            if subcommand == "verify":
+                success &= _print_status(db)
+            if show_plan:
+                _print_plans(explain_hot_queries(db.engine), title="Query plans")
+            continue
+
+        before = explain_hot_queries(db.engine)
+        if subcommand == "create":
+            changed = create_indexes(db.engine)
+            verb = "created"
+        else:
+            changed = drop_indexes(db.engine)
+            verb = "dropped"
+        after = explain_hot_queries(db.engine)
+
+        if changed:
+            console.print(f"  [green]{verb} {len(changed)} index(es):[/green] {', '.join(changed)}")
+        else:
+            console.print(f"  [dim]nothing to do — no index {verb}[/dim]")
+        _print_plan_diff(before, after)
+
+        if remote and db.turso_url and changed:
+            console.print("  pushing schema change to remote...")
+            db.push()
+        _print_status(db)
+
+    return success
+
+
+def _print_status(db: DatabaseConfig) -> bool:
+    """Print the index status table; return True if every index is usable."""
+    statuses = index_status(db.engine)
+    table = Table(box=box.SIMPLE_HEAD, show_edge=False)
+    table.add_column("Table", style="cyan")
+    table.add_column("Index")
+    table.add_column("Columns", style="dim")
+    table.add_column("State")
+
+    styles = {"ok": "green", "missing": "red", "mismatch": "yellow", "no table": "dim"}
+    for status in statuses:
+        style = styles[status.state]
+        table.add_row(
+            status.table,
+            status.name,
+            ", ".join(status.columns),
+            f"[{style}]{status.state}[/{style}]",
+        )
+    console.print(table)
+    return all(s.ok for s in statuses if s.table_exists)
+
+
+def _print_plans(plans: dict[str, list[str]], title: str) -> None:
+    console.print(f"  [bold]{title}[/bold]")
+    for query in HOT_QUERIES:
+        plan = plans.get(query.name, [])
+        marker = "[red]scan[/red]" if is_full_scan(plan) else "[green]ok[/green]"
+        console.print(f"    {query.name} ({marker}) [dim]{query.description}[/dim]")
+        for line in plan:
+            console.print(f"      {line}")
+
+
+def _print_plan_diff(before: dict[str, list[str]], after: dict[str, list[str]]) -> None:
+    """Show each hot query's plan before and after, collapsing unchanged ones."""
+    console.print("  [bold]Hot query plans (before → after)[/bold]")
+    for query in HOT_QUERIES:
+        old = before.get(query.name, [])
+        new = after.get(query.name, [])
+        if old == new:
+            console.print(f"    {query.name}: [dim]unchanged[/dim] — {'; '.join(new)}")
+            continue
+        console.print(f"    {query.name}:")
+        for line in old:
+            console.print(f"      [red]- {line}[/red]")
+        for line in new:
+            console.print(f"      [green]+ {line}[/green]")
+
+
+def _display_indexes_help():
+    """Display help for the indexes subcommand."""
+    console.print("""
+[bold]indexes[/bold] - Manage secondary indexes on market databases
+
+[bold]USAGE:[/bold]
+    mkts-backend indexes [verify|create|drop|plan] [options]
+
+[bold]SUBCOMMANDS:[/bold]
+    verify    Show which model-declared indexes exist (default)
+    create    Create missing indexes; prints hot-query plans before/after
+    drop      Drop the model-declared indexes; prints plans before/after
+    plan      Show EXPLAIN QUERY PLAN for every hot query
+
+[bold]OPTIONS:[/bold]
+    --market=<alias>   Target a single market (default: all markets)
+    --remote           create/drop: push the schema change to Turso afterwards
+                       verify/plan: pull from Turso first
+    --plan             verify: also show query plans
+    --help             Show this help
+
+[bold]EXAMPLES:[/bold]
+    mkts-backend indexes
+    mkts-backend indexes create --primary
+    mkts-backend indexes create --remote
+    mkts-backend indexes verify --remote --plan
+    mkts-backend indexes drop --market=deployment
+""")
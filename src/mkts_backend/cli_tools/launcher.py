@@ -0,0 +1,214 @@
+"""
+Console-script entry points: ``mkts-backend`` / ``mkts`` and ``fitcheck``.
+
+This module is what runs before any command does, so it only imports the
+argument helpers and the command registry. Registry handlers import their
+command module (and with it SQLAlchemy, pandas, prompt_toolkit, ...) when
+they are dispatched, so ``fitcheck --help`` or a typo never pays for them.
+``scripts/bench_startup.py`` holds the startup-time budget.
+"""
+
+import sys
+
+from mkts_backend.cli_tools.arg_utils import check_bare_args, suggest_command
+from mkts_backend.cli_tools.command_registry import get_registry
+from mkts_backend.cli_tools.market_args import parse_market_args
+from mkts_backend.cli_tools.rich_display import console
+
+
+def main() -> None:
+    """Entry point for the `mkts-backend` CLI.
+
+    Bare invocation prints help. Any subcommand is dispatched via the shared
+    command registry inside ``parse_args``.
+    """
+    from mkts_backend.cli_tools.args_parser import parse_args
+    from mkts_backend.cli_tools.cli_help import display_cli_help
+
+    if len(sys.argv) <= 1:
+        display_cli_help()
+        return
+
+    parse_args(sys.argv)
+
+
+def fitcheck_main():
+    """
+    Standalone CLI entry point for fitcheck command.
+
+    Uses the shared command registry for "no-wrong-door" dispatch — any
+    registered subcommand (including those normally accessed via
+    ``mkts-backend``) works from the ``fitcheck`` entry point too.
+    """
+    args = sys.argv[1:]
+
+    # Handle help
+    if not args or "--help" in args or "-h" in args:
+        display_fitcheck_help()
+        sys.exit(0)
+
+    market_alias = parse_market_args(args)
+
+    # Registry-based subcommand dispatch (no-wrong-door)
+    registry = get_registry()
+    if args and not args[0].startswith("--"):
+        entry = registry.resolve(args[0])
+        if entry:
+            sub_args = args[1:]
+            # Check for bare key=value args (missing --)
+            bare = check_bare_args(sub_args, registry.all_names())
+            if bare:
+                corrected = " ".join(
+                    (f"--{a}" if not a.startswith("--") and "=" in a and a not in registry.all_names() else a)
+                    for a in sub_args
+                )
+                console.print(f"[yellow]Did you mean?[/yellow] fitcheck {args[0]} {corrected}")
+                sys.exit(1)
+            success = entry.handler(sub_args, market_alias)
+            sys.exit(0 if success else 1)
+
+        # Unknown subcommand — suggest closest match
+        suggestion = suggest_command(args[0], registry.all_names())
+        if suggestion:
+            rest = " ".join(args[1:])
+            hint = f"fitcheck {suggestion}"
+            if rest:
+                hint += f" {rest}"
+            console.print(f"Unknown command: '{args[0]}'")
+            console.print(f"[yellow]Did you mean?[/yellow] {hint}")
+            sys.exit(1)
+
+    # Check for bare key=value in direct invocation (e.g. fitcheck fit=42)
+    bare = check_bare_args(args, registry.all_names())
+    if bare:
+        corrected = " ".join(
+            (f"--{a}" if not a.startswith("--") and "=" in a else a)
+            for a in args
+        )
+        console.print(f"[yellow]Did you mean?[/yellow] fitcheck {corrected}")
+        sys.exit(1)
+
+    # No subcommand matched — treat as direct fit-check invocation
+    entry = registry.resolve("fit-check")
+    success = entry.handler(args, market_alias)
+    sys.exit(0 if success else 1)
+
+
+def display_fitcheck_help():
+    """Display help for the fitcheck command."""
+    print("""
+fitcheck - Display market availability for items in an EFT-formatted ship fit
+
+USAGE:
+    fitcheck --fit=<id> [options]
+    fitcheck --file=<path> [options]
+    fitcheck --paste [options]
+    fitcheck --dir=<path> | --doctrine=<id> | --all-fits [options]
+    fitcheck needed [--ship=<name,...>] [--fit=<id,...>] [--target=<pct>] [--assets] [--on-hand] [--live]
+    fitcheck list-fits [--market=<alias>]
+    fitcheck module --id=<type_id> [--market=<alias>]
+    fitcheck module --name="<name>" [--market=<alias>]
+
+SUBCOMMANDS:
+    needed               Show all items needed to reach ship targets
+        --ship=<name,...>    Filter by ship name(s), comma-separated
+                             (e.g. --ship=Maelstrom or --ship=Maelstrom,Hurricane)
+        --fit=<id,...>       Filter by fit ID(s), comma-separated
+                             (e.g. --fit=550 or --fit=550,551,552)
+        --target=<pct>       Show only fits below this target % (e.g. --target=0.5)
+        --market=<alias>     Market to check (default: primary)
+        --assets             Show per-character packaged asset columns
+        --refresh            Bypass asset cache and re-fetch from ESI
+        --on-hand            Show stock our characters hold at the market's
+                             structure (Held) and what is left to buy (Buy),
+                             from the local asset index; no ESI calls
+        --live               Recompute from doctrines instead of reading the
+                             needed_items table the pipeline maintains
+
+    list-fits            List all tracked doctrine fits
+        --market=<alias>     Market database to query (default: primary)
+
+    module               Show which fits use a given module and market status
+        --id=<type_id>       Look up module by type ID
+        --name="<name>"      Look up module by name (exact or partial match)
+        --market=<alias>     Market to check: primary, deployment, all
+                             (default: primary)
+
+DESCRIPTION:
+    Analyzes an EFT (Eve Fitting Tool) formatted ship fit and displays market
+    availability for each item. Shows how many complete fits can be built from
+    current market stock, with color-coded status indicators.
+
+OPTIONS:
+    --fit=<id>           Look up fit by ID from doctrine_fits/doctrines tables
+                         (uses pre-calculated market data)
+    --file=<path>        Path to EFT fit file
+    --paste              Read EFT fit from stdin instead of file
+    --dir=<path>         Check every EFT file (*.txt, *.eft, *.cfg) in a directory
+    --doctrine=<id>      Check every fit in a doctrine
+    --all-fits           Check every doctrine fit
+                         (bulk modes load market data once for all fits and
+                         print one summary row per fit)
+    --market=<alias>     Market to check: primary, deployment (default: primary)
+    --target=<N>         Override target quantity (default: from doctrine_fits)
+    --output=<format>    Export format: csv, multibuy, or markdown
+                         (bulk modes: csv, json, markdown, or an aggregate
+                         multibuy for all fits)
+    --no-jita            Hide Jita price comparison columns
+    --on-hand            Subtract stock our characters hold at the market's
+                         structure (local asset index) from Qty Needed
+    --offline            Use local Jita prices only; stale ones are marked ~
+    --no-legend          Hide the legend
+    --help, -h           Show this help message
+
+EXAMPLES:
+    # Check fit by ID (most common usage)
+    fitcheck --fit=42
+
+    # Check fit by ID against deployment market
+    fitcheck --fit=42 --market=deployment
+
+    # Check fit from EFT file
+    fitcheck --file=fits/hurricane_fleet.txt
+
+    # Override target and export multi-buy list
+    fitcheck --fit=42 --target=50 --output=multibuy
+
+    # Export markdown for Discord
+    fitcheck --fit=42 --output=markdown
+
+    # Check a directory of fits; one multibuy for all of them
+    fitcheck --dir=fits/ --output=multibuy
+
+    # Check every fit in doctrine 7, or every doctrine fit, as JSON
+    fitcheck --doctrine=7
+    fitcheck --all-fits --output=json
+
+    # Show all items needed across all fits
+    fitcheck needed
+
+    # Show needed items for a specific ship
+    fitcheck needed --ship=Maelstrom
+
+    # Show needed items for multiple ships
+    fitcheck needed --ship=Maelstrom,Hurricane
+
+    # Show needed items for specific fit IDs
+    fitcheck needed --fit=550,551,552
+
+    # Show needed items for fits below 50% of target
+    fitcheck needed --target=0.5
+
+    # Net out what is already sitting in the market structure
+    fitcheck needed --assets --on-hand
+    fitcheck --fit=42 --on-hand
+
+    # List all tracked fits
+    fitcheck list-fits
+    fitcheck list-fits --market=deployment
+
+    # Check module usage across fits
+    fitcheck module --id=11269
+    fitcheck module --name="Multispectrum Energized Membrane II"
+    fitcheck module --id=11269 --market=all
+""")
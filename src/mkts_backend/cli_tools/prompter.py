@@ -3,12 +3,45 @@ Multiline input prompter for pasting EFT fit text into the CLI.
 
 Uses prompt_toolkit to provide a multiline input with line numbers,
 allowing users to paste EFT-formatted fit data directly instead of
-requiring a file path.
+requiring a file path. Typed lines can Tab-complete SDE type names.
 """
 
+import re
+
 from prompt_toolkit import prompt
+from prompt_toolkit.completion import Completer, Completion
 from prompt_toolkit.formatted_text import HTML
 
+_QTY_SUFFIX = re.compile(r"\s+x\d+$")
+
+
+class TypeNameCompleter(Completer):
+    """
+    Complete the current line (or the ship name in an EFT "[Ship, Fit]"
+    header) against SDE type names: prefix matches first, then close
+    spellings for typos. The name index is loaded on the first Tab.
+    """
+
+    def __init__(self, limit: int = 20):
+        self.limit = limit
+
+    def get_completions(self, document, complete_event):
+        from mkts_backend.db.sde_index import get_sde_index
+
+        line = document.current_line_before_cursor.lstrip()
+        if line.startswith("["):
+            line = line[1:]
+            if "," in line:
+                return
+        if not line.strip() or _QTY_SUFFIX.search(line):
+            return
+        names = get_sde_index().name_index()
+        matches = names.prefix(line, self.limit)
+        if not matches and len(line.strip()) >= 4:
+            matches = names.suggest(line, self.limit)
+        for _, name in matches:
+            yield Completion(name, start_position=-len(line))
+
 
 def prompt_continuation(width, line_number, wrap_count):
     """
@@ -28,19 +61,27 @@ def prompt_continuation(width, line_number, wrap_count):
         return HTML("<strong>%s</strong>") % text
 
 
-def get_multiline_input() -> str:
+def get_multiline_input(completer: Completer | None = None) -> str:
     """
     Prompt the user for multiline text input (e.g., pasted EFT fit data).
 
     Uses prompt_toolkit's multiline mode with line-numbered continuation.
     Submit input with Meta+Enter or Esc followed by Enter.
 
+    Args:
+        completer: Optional completer offered on Tab (e.g. TypeNameCompleter);
+            never runs while typing, so large pastes stay fast.
+
     Returns:
         The multiline text entered by the user.
     """
     print("Press [Meta+Enter] or [Esc] followed by [Enter] to accept input.")
     fit = prompt(
-        "Multiline input: ", multiline=True, prompt_continuation=prompt_continuation
+        "Multiline input: ",
+        multiline=True,
+        prompt_continuation=prompt_continuation,
+        completer=completer,
+        complete_while_typing=False,
     )
     print("--------------------------------------")
     print(f"you entered: {fit}")
@@ -0,0 +1,279 @@
+"""
+Result cache for the read-only CLI commands.
+
+``fit-check`` (``--fit``, ``--file``/``--paste``), ``needed``, ``module``,
+``list-fits`` and ``equiv list`` re-derive the same rows from tables that
+only change when the pipeline (or a fit/equivalence edit) writes them.
+Their results are pickled into a ``result_cache`` table in the local-only
+``cli_cache.db``, keyed by command, normalized arguments and market
+database, and stored with the *data version* they were computed from:
+
+- the ``updatelog`` stamps of the tables the command reads;
+- for the tables CLI commands edit without stamping updatelog (doctrine
+  fits, ship targets, module equivalents, the doctrines item list), a hash
+  of their key columns, as for the pipeline checkpoints.
+
+A lookup recomputes that version (one connection, one updatelog query plus
+those hashes) and serves the stored result only if it matches, so any
+re-stamp invalidates. Results that embed Jita prices also expire after
+``[jita] ttl_minutes``. Hits and misses are counted per command in
+``result_cache_stats``; ``mkts-backend cache stats`` shows them.
+
+Keys include ``CACHE_FORMAT``; bump it when a cached result class changes
+shape so an upgrade does not serve pickles of the old one. A stored value
+that no longer unpickles is deleted and recomputed.
+
+Caching never fails a command: any cache error falls back to computing.
+"""
+
+import hashlib
+import json
+import pickle
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Optional, Sequence
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import SQLAlchemyError
+
+from mkts_backend.config.logging_config import configure_logging
+from mkts_backend.config.sqlite_pragmas import install_pragma_profile
+from mkts_backend.processing.checkpoints import (
+    CONTENT_FINGERPRINTS,
+    content_fingerprint,
+    read_updatelog,
+)
+
+logger = configure_logging(__name__)
+
+RESULT_CACHE_DB_URL = "sqlite:///cli_cache.db"
+
+# Part of every key: bump when a cached result type (FitCheckResult, the
+# needed/module row dicts, ...) is changed, moved or renamed.
+CACHE_FORMAT = 1
+
+# Tables each cached command reads from the market DB.
+COMMAND_DEPS: dict[str, tuple[str, ...]] = {
+    "fitcheck": ("marketstats", "marketorders", "doctrine_fits", "ship_targets", "jita_prices"),
+    "fitcheck_fit": ("doctrines", "doctrine_fits", "marketstats", "jita_prices"),
+    "needed": ("needed_items", "doctrines", "ship_targets", "marketstats"),
+    "module": ("doctrines", "doctrine_fits"),
+    "list_fits": ("doctrine_fits",),
+    "equiv_list": ("module_equivalents",),
+}
+
+
+def data_version(engine, deps: Sequence[str]) -> str:
+    """Hash of the updatelog stamps and content hashes of ``deps``."""
+    with engine.connect() as conn:
+        updatelog = read_updatelog(conn)
+        parts = []
+        for name in deps:
+            part = f"{name}={updatelog.get(name, '')}"
+            if name in CONTENT_FINGERPRINTS:
+                part += f":{content_fingerprint(conn, name)}"
+            parts.append(part)
+    return hashlib.sha1("|".join(parts).encode()).hexdigest()[:16]
+
+
+def cache_key(command: str, args: dict, db_alias: str) -> str:
+    """Stable key for one command invocation (argument order does not matter)."""
+    payload = json.dumps(
+        {"format": CACHE_FORMAT, "command": command, "args": args, "db": db_alias},
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+class ResultCache:
+    """``result_cache`` and ``result_cache_stats`` tables in the local CLI cache.
+
+    ``url=None`` disables storage: every lookup computes (used by tests and
+    by ``[result_cache] enabled = false``).
+    """
+
+    def __init__(self, url: Optional[str] = RESULT_CACHE_DB_URL):
+        self.url = url
+        self.hits = 0
+        self.misses = 0
+        self._engine = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.url is not None
+
+    def _get_engine(self):
+        if self._engine is None:
+            engine = create_engine(self.url)
+            install_pragma_profile(engine, "local_cache")
+            with engine.begin() as conn:
+                conn.execute(text("""
+                    CREATE TABLE IF NOT EXISTS result_cache (
+                        key          TEXT PRIMARY KEY,
+                        command      TEXT NOT NULL,
+                        db_alias     TEXT NOT NULL,
+                        data_version TEXT NOT NULL,
+                        created_at   TEXT NOT NULL,
+                        value        BLOB NOT NULL
+                    )
+                """))
+                conn.execute(text("""
+                    CREATE TABLE IF NOT EXISTS result_cache_stats (
+                        command TEXT PRIMARY KEY,
+                        hits    INTEGER NOT NULL DEFAULT 0,
+                        misses  INTEGER NOT NULL DEFAULT 0
+                    )
+                """))
+            self._engine = engine
+        return self._engine
+
+    def lookup(self, key: str, version: str, max_age: Optional[timedelta] = None) -> tuple[bool, Any]:
+        """``(True, value)`` if ``key`` is stored for ``version`` and young enough.
+
+        A value that fails to unpickle (truncated, or pickled from a class
+        that has since moved or changed) is deleted and reported as a miss.
+        """
+        with self._get_engine().connect() as conn:
+            row = conn.execute(
+                text("SELECT data_version, created_at, value FROM result_cache WHERE key = :key"),
+                {"key": key},
+            ).fetchone()
+        if row is None or row.data_version != version:
+            return False, None
+        if max_age is not None:
+            created = datetime.fromisoformat(row.created_at)
+            if datetime.now(timezone.utc) - created > max_age:
+                return False, None
+        try:
+            return True, pickle.loads(row.value)
+        except Exception as e:
+            logger.debug(f"Discarding unreadable result cache entry {key}: {e}")
+            self.discard(key)
+            return False, None
+
+    def discard(self, key: str) -> None:
+        with self._get_engine().begin() as conn:
+            conn.execute(text("DELETE FROM result_cache WHERE key = :key"), {"key": key})
+
+    def store(self, key: str, command: str, db_alias: str, version: str, value: Any) -> None:
+        with self._get_engine().begin() as conn:
+            conn.execute(
+                text("""
+                    INSERT OR REPLACE INTO result_cache
+                        (key, command, db_alias, data_version, created_at, value)
+                    VALUES (:key, :command, :db_alias, :version, :created_at, :value)
+                """),
+                {
+                    "key": key,
+                    "command": command,
+                    "db_alias": db_alias,
+                    "version": version,
+                    "created_at": datetime.now(timezone.utc).isoformat(),
+                    "value": pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL),
+                },
+            )
+
+    def record(self, command: str, hit: bool) -> None:
+        """Count a hit or miss, in memory and in ``result_cache_stats``."""
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+        column = "hits" if hit else "misses"
+        with self._get_engine().begin() as conn:
+            conn.execute(
+                text(f"""
+                    INSERT INTO result_cache_stats (command, {column}) VALUES (:command, 1)
+                    ON CONFLICT(command) DO UPDATE SET {column} = {column} + 1
+                """),
+                {"command": command},
+            )
+
+    def stats(self) -> list[dict]:
+        """Per-command hits, misses and stored entries."""
+        with self._get_engine().connect() as conn:
+            rows = conn.execute(text("""
+                SELECT s.command, s.hits, s.misses,
+                       (SELECT COUNT(*) FROM result_cache c WHERE c.command = s.command) AS entries
+                FROM result_cache_stats s
+                ORDER BY s.command
+            """)).fetchall()
+        return [dict(row._mapping) for row in rows]
+
+    def clear(self) -> int:
+        """Drop every stored result and reset the counters. Returns entries removed."""
+        with self._get_engine().begin() as conn:
+            removed = conn.execute(text("DELETE FROM result_cache")).rowcount
+            conn.execute(text("DELETE FROM result_cache_stats"))
+        return removed
+
+    def get_or_compute(
+        self,
+        command: str,
+        args: dict,
+        db_alias: str,
+        compute: Callable[[], Any],
+        max_age_minutes: Optional[int] = None,
+        store_if: Optional[Callable[[Any], bool]] = None,
+    ) -> Any:
+        """
+        Serve ``command``'s result for ``args`` from the cache, or compute it.
+
+        The data version is taken before computing, so a pipeline write that
+        lands mid-command leaves an entry that the next lookup rejects.
+        ``None`` results (fit not found, ...) are not stored, nor are results
+        ``store_if`` rejects (e.g. ones priced from stale Jita data).
+        """
+        if not self.enabled:
+            return compute()
+
+        from mkts_backend.config.db_config import DatabaseConfig
+
+        key = cache_key(command, args, db_alias)
+        max_age = timedelta(minutes=max_age_minutes) if max_age_minutes is not None else None
+        try:
+            version = data_version(DatabaseConfig(db_alias).engine, COMMAND_DEPS[command])
+            found, value = self.lookup(key, version, max_age)
+            self.record(command, found)
+        except (SQLAlchemyError, ValueError, OSError) as e:
+            logger.debug(f"Result cache unavailable for {command}: {e}")
+            return compute()
+        if found:
+            logger.debug(f"Result cache hit: {command} {args} ({db_alias})")
+            return value
+
+        value = compute()
+        if value is not None and (store_if is None or store_if(value)):
+            try:
+                self.store(key, command, db_alias, version, value)
+            except (SQLAlchemyError, pickle.PicklingError, TypeError) as e:
+                logger.debug(f"Could not cache {command} result: {e}")
+        return value
+
+
+_result_cache: Optional[ResultCache] = None
+
+
+def get_result_cache() -> ResultCache:
+    """Process-wide result cache; disabled when ``[result_cache] enabled`` is false."""
+    global _result_cache
+    if _result_cache is None:
+        from mkts_backend.config.settings_service import SettingsService
+
+        enabled = SettingsService().result_cache_enabled
+        _result_cache = ResultCache(RESULT_CACHE_DB_URL if enabled else None)
+    return _result_cache
+
+
+def cached(
+    command: str,
+    args: dict,
+    db_alias: str,
+    compute: Callable[[], Any],
+    max_age_minutes: Optional[int] = None,
+    store_if: Optional[Callable[[Any], bool]] = None,
+) -> Any:
+    """Shorthand for ``get_result_cache().get_or_compute(...)``."""
+    return get_result_cache().get_or_compute(
+        command, args, db_alias, compute, max_age_minutes, store_if
+    )
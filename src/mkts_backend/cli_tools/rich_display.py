@@ -64,6 +64,7 @@ def create_fit_status_table(
     market_name: str = "primary",
     target: Optional[int] = None,
     show_jita: bool = True,
+    on_hand: Optional[Dict[int, int]] = None,
 ) -> Table:
     """
     Create a Rich table displaying fit market status.
@@ -77,6 +78,9 @@ def create_fit_status_table(
         market_name: Name of the market being queried
         target: Optional target quantity for qty_needed calculation
         show_jita: Whether to show Jita price columns
+        on_hand: Optional {type_id: qty} held at the market's structure.
+                 When provided (with a target), adds an On Hand column and
+                 subtracts it from Qty Needed.
 
     Returns:
         A Rich Table object ready for display
@@ -95,8 +99,11 @@ def create_fit_status_table(
     table.add_column("Stock", justify="right", width=10)
     table.add_column("Fit Qty", justify="right", width=8)
     table.add_column("Fits", justify="right", width=8)
+    show_on_hand = target is not None and on_hand is not None
     if target is not None:
         table.add_column("Qty Needed", justify="right", width=10)
+    if show_on_hand:
+        table.add_column("On Hand", justify="right", width=8, style="cyan")
     table.add_column("Price", justify="right", width=14)
     table.add_column("Fit Cost", justify="right", width=14)
     if show_jita:
@@ -143,9 +150,13 @@ def create_fit_status_table(
         # Add qty_needed if target is set
         if target is not None:
             qty_needed = max(0, int((target - fits) * fit_qty)) if fits < target else 0
+            held = on_hand.get(type_id, 0) if show_on_hand else 0
+            qty_needed = max(0, qty_needed - held)
             qty_needed_str = format_quantity(qty_needed) if qty_needed > 0 else "-"
             qty_needed_style = "red" if qty_needed > 0 else "dim"
             row_data.append(f"[{qty_needed_style}]{qty_needed_str}[/{qty_needed_style}]")
+            if show_on_hand:
+                row_data.append(format_quantity(held) if held > 0 else "[dim]-[/dim]")
 
         # Add price columns
         row_data.append(format_isk(price, include_suffix=False))
@@ -153,8 +164,13 @@ def create_fit_status_table(
 
         # Add Jita columns if enabled
         if show_jita:
-            row_data.append(format_isk(jita_price, include_suffix=False))
-            row_data.append(format_isk(jita_fit_price, include_suffix=False))
+            if item.get("jita_stale"):
+                # Local price older than the TTL, served offline
+                row_data.append(f"[dim]~{format_isk(jita_price, include_suffix=False)}[/dim]")
+                row_data.append(f"[dim]~{format_isk(jita_fit_price, include_suffix=False)}[/dim]")
+            else:
+                row_data.append(format_isk(jita_price, include_suffix=False))
+                row_data.append(format_isk(jita_fit_price, include_suffix=False))
 
         # Add source indicator
         row_data.append(source_indicator)
@@ -174,6 +190,8 @@ def create_fit_status_table(
                 ]
                 if target is not None:
                     equiv_row.append("[dim]-[/dim]")  # qty_needed
+                if show_on_hand:
+                    equiv_row.append("[dim]-[/dim]")  # on hand
                 equiv_row.append("[dim]-[/dim]")  # price
                 equiv_row.append("[dim]-[/dim]")  # fit cost
                 if show_jita:
@@ -308,6 +326,7 @@ def print_legend() -> None:
 [bold]Legend:[/bold]
   [green]✓[/green] = Data from watchlist/marketstats
   [yellow]*[/yellow] = Fallback data (marketorders + ESI)
+  ~ = Stale Jita price (older than the TTL; offline or fetch failed)
   [green]Fits >= 10[/green] = Good stock
   [yellow]Fits 1-9[/yellow] = Low stock
   [red]Fits < 1[/red] = Insufficient stock
@@ -321,6 +340,7 @@ def print_missing_for_target(missing_items: List[Dict], target: int) -> None:
 
     Args:
         missing_items: List of dicts with type_name and qty_needed
+                       (and on_hand, when on-hand stock was subtracted)
         target: Target quantity
     """
     if not missing_items:
@@ -332,7 +352,8 @@ def print_missing_for_target(missing_items: List[Dict], target: int) -> None:
         if item["qty_needed"] > 0:
             console.print(
                 f"  • {item['type_name']}: [red]{format_quantity(item['qty_needed'])}[/red] needed "
-                f"(current: {item['fits']:.0f} fits)",
+                f"(current: {item['fits']:.0f} fits"
+                + (f", {format_quantity(item['on_hand'])} on hand)" if item.get("on_hand") else ")"),
                 style="white"
             )
 
@@ -415,6 +436,7 @@ def create_needed_table(
     items: List[Dict],
     ship_id: Optional[int] = None,
     char_assets: Optional[List[tuple]] = None,
+    on_hand: Optional[Dict[int, int]] = None,
 ) -> Table:
     """
     Create a Rich sub-table for a single fit's needed items.
@@ -430,6 +452,8 @@ def create_needed_table(
         ship_id: Ship type ID for the header
         char_assets: Optional list of (CharacterConfig, {type_id: qty}) tuples.
                      When provided, adds one column per character showing packaged qty.
+        on_hand: Optional {type_id: qty} held at the market's structure.
+                 When provided, adds Held and Buy (Need minus Held) columns.
 
     Returns:
         A Rich Table object for this fit group
@@ -462,6 +486,9 @@ def create_needed_table(
     table.add_column("Tgt", justify="right", width=5)
     table.add_column("Tgt%", justify="right", width=5)
     table.add_column("Need", justify="right", width=7)
+    if on_hand is not None:
+        table.add_column("Held", justify="right", width=7, style="cyan")
+        table.add_column("Buy", justify="right", width=7)
 
     if char_assets:
         for char, _ in char_assets:
@@ -490,6 +517,12 @@ def create_needed_table(
             f"[red]{format_quantity(qty_needed)}[/red]" if qty_needed > 0 else "[dim]-[/dim]",
         ]
 
+        if on_hand is not None:
+            held = on_hand.get(item.get("type_id"), 0)
+            buy = max(0, qty_needed - held)
+            row_data.append(format_quantity(held) if held > 0 else "[dim]-[/dim]")
+            row_data.append(f"[red]{format_quantity(buy)}[/red]" if buy > 0 else "[green]0[/green]")
+
         if char_assets:
             type_id = item.get("type_id")
             for _, assets_map in char_assets:
@@ -514,6 +547,8 @@ def create_needed_table(
                     "[dim]-[/dim]",  # tgt%
                     "[dim]-[/dim]",  # need
                 ]
+                if on_hand is not None:
+                    equiv_row.extend(["[dim]-[/dim]", "[dim]-[/dim]"])  # held, buy
                 if char_assets:
                     for _ in char_assets:
                         equiv_row.append("[dim]-[/dim]")
@@ -642,6 +677,64 @@ def create_module_usage_table(
     return table
 
 
+def create_bulk_fit_table(
+    results: List,
+    market_name: str,
+    show_jita: bool = True,
+) -> Table:
+    """
+    Create a Rich table summarising many fit-check results, one row per fit.
+
+    Args:
+        results: FitCheckResult objects (from bulk fit-check)
+        market_name: Name of the market checked
+        show_jita: Whether to show the Jita fit cost column
+
+    Returns:
+        A Rich Table object ready for display
+    """
+    table = Table(
+        title=f"[bold cyan]Fit Check[/bold cyan] - [green]{market_name}[/green] ({len(results)} fits)",
+        box=box.ROUNDED,
+        show_header=True,
+        header_style="bold magenta",
+        title_justify="left",
+    )
+
+    table.add_column("Fit ID", style="dim", justify="right", width=8)
+    table.add_column("Fit Name", style="white", min_width=25)
+    table.add_column("Ship", style="cyan", min_width=18)
+    table.add_column("Fits", justify="right", width=8)
+    table.add_column("Hulls", justify="right", width=7)
+    table.add_column("Target", justify="right", width=8)
+    table.add_column("Below", justify="right", width=7)
+    table.add_column("Bottleneck", style="white", min_width=20)
+    table.add_column("Fit Cost", justify="right", width=14)
+    if show_jita:
+        table.add_column("Jita Fit", justify="right", width=14)
+
+    for result in results:
+        style = _fits_style(result.min_fits, result.target)
+        below = [item for item in result.missing_for_target if item["qty_needed"] > 0]
+        bottleneck = min(result.market_data, key=lambda x: x["fits"], default=None)
+        row_data = [
+            str(result.fit_id) if result.fit_id is not None else "-",
+            result.fit_name,
+            result.ship_name,
+            f"[{style}]{format_fits(result.min_fits)}[/{style}]",
+            str(result.hulls),
+            str(result.target) if result.target is not None else "-",
+            f"[red]{len(below)}[/red]" if below else "[dim]-[/dim]",
+            bottleneck["type_name"] if bottleneck else "-",
+            format_isk(result.total_fit_cost, include_suffix=False),
+        ]
+        if show_jita:
+            row_data.append(format_isk(result.total_jita_fit_cost, include_suffix=False))
+        table.add_row(*row_data)
+
+    return table
+
+
 def create_asset_table(
     type_name: str,
     type_id: int,
@@ -0,0 +1,92 @@
+"""
+SDE CLI
+
+CLI commands for the compiled SDE type snapshot:
+- compile: Rebuild the snapshot next to the SDE database (default)
+- status:  Report whether the snapshot matches the current SDE
+"""
+
+from rich.console import Console
+
+from mkts_backend.cli_tools.arg_utils import ParsedArgs
+from mkts_backend.config.db_config import DatabaseConfig
+from mkts_backend.config.logging_config import configure_logging
+from mkts_backend.db.sde_index import _file_key
+from mkts_backend.db.sde_snapshot import compile_snapshot, load_snapshot, snapshot_path
+
+logger = configure_logging(__name__)
+console = Console()
+
+_SUBCOMMANDS = {"compile", "status"}
+
+
+def sde_command(args: list[str]) -> bool:
+    """
+    Route sde subcommands.
+
+    Args:
+        args: Command arguments (after 'sde')
+
+    Returns:
+        True if command succeeded (for status: the snapshot is current)
+    """
+    p = ParsedArgs(args)
+    positionals = [a for a in p.positionals() if a != "sde"]
+    subcommand = positionals[0] if positionals else "compile"
+    if subcommand not in _SUBCOMMANDS:
+        console.print(f"[red]Error: unknown sde subcommand '{subcommand}'[/red]")
+        _display_sde_help()
+        return False
+
+    sde_db = DatabaseConfig("sde")
+    if subcommand == "compile":
+        try:
+            info = compile_snapshot(sde_db)
+        except FileNotFoundError as e:
+            console.print(f"[red]{e}. Run 'mkts-backend sync' first.[/red]")
+            return False
+        console.print(
+            f"Compiled [bold]{info.types}[/bold] types ({info.strings} distinct names) "
+            f"to {info.path} [dim]({info.size_bytes / 1024:.0f} KiB)[/dim]"
+        )
+        return True
+
+    path = snapshot_path(sde_db.path)
+    key = _file_key(sde_db.path)
+    if key is None:
+        console.print(f"[red]SDE database not found: {sde_db.path}[/red]")
+        return False
+    index = load_snapshot(path, key[1:])
+    if index is None:
+        console.print(
+            f"[yellow]{path} is missing or stale[/yellow] — it is rebuilt on the next "
+            "type lookup, or run 'mkts-backend sde compile'"
+        )
+        return False
+    console.print(f"[green]{path} is current[/green]: {len(index)} types")
+    return True
+
+
+def _display_sde_help():
+    """Display help for the sde subcommand."""
+    console.print("""
+[bold]sde[/bold] - Manage the compiled SDE type snapshot
+
+[bold]USAGE:[/bold]
+    mkts-backend sde [compile|status]
+
+[bold]SUBCOMMANDS:[/bold]
+    compile   Write the type snapshot next to the SDE database (default)
+    status    Check whether the snapshot matches the current SDE
+
+[bold]BEHAVIOR:[/bold]
+    Type lookups (names, groups, categories, volumes, meta groups and the
+    manufacturing-product flag) are served from a memory-mapped snapshot of
+    [bold]sdetypes[/bold] and [bold]industryActivityProducts[/bold]. The snapshot is rebuilt
+    automatically the first time a lookup sees a changed SDE; compile after
+    'mkts-backend sync' to pay that cost up front.
+
+[bold]EXAMPLES:[/bold]
+    mkts-backend sde compile
+    mkts-backend sde status
+""")
@@ -1,4 +1,22 @@
-from .db_config import DatabaseConfig as DatabaseConfig
-from .esi_config import ESIConfig as ESIConfig
-from .market_context import MarketContext
-from .settings_service import SettingsService
+from importlib import import_module
+
+# Resolved on first access (PEP 562): importing a config submodule such as
+# settings_service must not pull pandas/turso (db_config) or requests_oauthlib
+# (esi_config) into commands that never touch them.
+_EXPORTS = {
+    "DatabaseConfig": "mkts_backend.config.db_config",
+    "ESIConfig": "mkts_backend.config.esi_config",
+    "MarketContext": "mkts_backend.config.market_context",
+    "SettingsService": "mkts_backend.config.settings_service",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module), name)
+    globals()[name] = value
+    return value
@@ -1,19 +1,22 @@
 import os
 from sqlalchemy import create_engine, text
-import pandas as pd
 from typing import Optional, TYPE_CHECKING
 
-import turso
-import turso.sync as tursosync
-from turso.sqlalchemy import get_sync_connection
 from dotenv import load_dotenv
 from mkts_backend.config.logging_config import configure_logging
 from mkts_backend.config.settings_service import SettingsService
+from mkts_backend.config.sqlite_pragmas import (
+    current_pragma_profile,
+    install_pragma_profile,
+)
+from mkts_backend.config.sql_profiler import instrument_engine
 from datetime import datetime
 from time import perf_counter
 from pathlib import Path
 
 if TYPE_CHECKING:
+    import turso
+    import turso.sync as tursosync
     from mkts_backend.config.market_context import MarketContext
 
 load_dotenv()
@@ -22,42 +25,63 @@ logger = configure_logging(__name__)
 
 
 class DatabaseConfig:
-    _service = SettingsService()
     # Per-market routing comes entirely from [markets.*] (+ [shared.testing])
     # via the settings service — the single source of truth. Shared,
     # market-independent DBs (sde/fittings/buildcost) are layered on top.
-    # Materialized at import time: a malformed [markets.*] section (missing
-    # database_alias/database_file, or a duplicate database_alias) fails here
-    # with a clear, section-named error from database_routing() rather than a
-    # cryptic KeyError or a silently mis-routed database later on.
-    _routing = _service.database_routing()
-
-    _db_paths = {alias: r["file"] for alias, r in _routing.items()}
-    _db_paths.update({
-        "sde": _service.db_sde_file,
-        "fittings": _service.db_fittings_file,
-        "buildcost": _service.db_buildcost_file,
-    })
-
-    _db_turso_urls = {
-        f"{alias}_turso": os.getenv(r["turso_url_env"])
-        for alias, r in _routing.items() if r["turso_url_env"]
-    }
-    _db_turso_urls.update({
-        "sde_turso": os.getenv("TURSO_SDE_URL"),
-        "fittings_turso": os.getenv("TURSO_FITTING_URL"),
-        "buildcost_turso": os.getenv("TURSO_BUILDCOST_URL"),
-    })
-
-    _db_turso_auth_tokens = {
-        f"{alias}_turso": os.getenv(r["turso_token_env"])
-        for alias, r in _routing.items() if r["turso_token_env"]
-    }
-    _db_turso_auth_tokens.update({
-        "sde_turso": os.getenv("TURSO_SDE_TOKEN"),
-        "fittings_turso": os.getenv("TURSO_FITTING_TOKEN"),
-        "buildcost_turso": os.getenv("TURSO_BUILDCOST_TOKEN"),
-    })
+    # Materialized once, by the first DatabaseConfig built without a
+    # MarketContext (see _load_routing), so importing this module stays cheap.
+    _service: SettingsService | None = None
+    _routing: dict | None = None
+    _db_paths: dict[str, str] = {}
+    _db_turso_urls: dict[str, str | None] = {}
+    _db_turso_auth_tokens: dict[str, str | None] = {}
+
+    @classmethod
+    def _load_routing(cls) -> None:
+        """Build the alias → file / Turso URL / token tables from settings.
+
+        A malformed [markets.*] section (missing database_alias/database_file,
+        or a duplicate database_alias) fails here with a clear, section-named
+        error from database_routing() rather than a cryptic KeyError or a
+        silently mis-routed database later on.
+        """
+        if cls._routing is not None:
+            return
+        service = SettingsService()
+        routing = service.database_routing()
+
+        db_paths = {alias: r["file"] for alias, r in routing.items()}
+        db_paths.update({
+            "sde": service.db_sde_file,
+            "fittings": service.db_fittings_file,
+            "buildcost": service.db_buildcost_file,
+        })
+
+        turso_urls = {
+            f"{alias}_turso": os.getenv(r["turso_url_env"])
+            for alias, r in routing.items() if r["turso_url_env"]
+        }
+        turso_urls.update({
+            "sde_turso": os.getenv("TURSO_SDE_URL"),
+            "fittings_turso": os.getenv("TURSO_FITTING_URL"),
+            "buildcost_turso": os.getenv("TURSO_BUILDCOST_URL"),
+        })
+
+        turso_tokens = {
+            f"{alias}_turso": os.getenv(r["turso_token_env"])
+            for alias, r in routing.items() if r["turso_token_env"]
+        }
+        turso_tokens.update({
+            "sde_turso": os.getenv("TURSO_SDE_TOKEN"),
+            "fittings_turso": os.getenv("TURSO_FITTING_TOKEN"),
+            "buildcost_turso": os.getenv("TURSO_BUILDCOST_TOKEN"),
+        })
+
+        cls._service = service
+        cls._db_paths = db_paths
+        cls._db_turso_urls = turso_urls
+        cls._db_turso_auth_tokens = turso_tokens
+        cls._routing = routing
 
     def __init__(
         self,
@@ -65,6 +89,7 @@ class DatabaseConfig:
         dialect: str = "sqlite+turso",
         sync_dialect: str = "sqlite+turso_sync",
         market_context: Optional["MarketContext"] = None,
+        pragma_profile: str | None = None,
     ):
         """
         Initialize database configuration.
@@ -76,7 +101,11 @@ class DatabaseConfig:
             dialect: SQLAlchemy dialect string.
             market_context: Optional MarketContext that provides all config values.
                            When provided, takes precedence over alias parameter.
+            pragma_profile: Optional SQLite pragma profile (see sqlite_pragmas).
+                           Defaults to the active use_pragma_profile() block,
+                           then the [sqlite] profile setting.
         """
+        self.pragma_profile = pragma_profile
         if market_context is not None:
             # Use MarketContext for configuration (preferred method)
             self.alias = market_context.database_alias
@@ -91,6 +120,7 @@ class DatabaseConfig:
             # module import is still picked up. Reading self.settings directly
             # would freeze on the cached TOML default.
             env = SettingsService().environment
+            self._load_routing()
             if env == 'development':
                 alias = self._service.shared_testing["database_alias"]
             elif alias is None or alias in ["wcmkt", "primary"]:
@@ -113,8 +143,8 @@ class DatabaseConfig:
         self.sync_url = f"{sync_dialect}:///{self.path}"
         self._engine = None
         self._sqlite_local_connect = None
-        self._turso_connect: turso.Connection
-        self._turso_sync_connection: tursosync.ConnectionSync
+        self._turso_connect: "turso.Connection"
+        self._turso_sync_connection: "tursosync.ConnectionSync"
 
     @property
     def engine(self):
@@ -124,6 +154,8 @@ class DatabaseConfig:
                 # connections: a plain connection auto-checkpoints the WAL at
                 # 1000 frames, destroying the baseline conn.pull() needs and
                 # panicking turso core (wal.rs frame_watermark assertion).
+                # For the same reason the pragma profile drops anything that
+                # touches journaling (sqlite_pragmas.LOCAL_ONLY_PRAGMAS).
                 self._engine = create_engine(
                     self.sync_url,
                     connect_args={
@@ -133,8 +165,27 @@ class DatabaseConfig:
                 )
             else:
                 self._engine = create_engine(self.url)
+            install_pragma_profile(
+                self._engine,
+                self.resolved_pragma_profile,
+                sync_managed=bool(self.turso_url),
+            )
+            instrument_engine(self._engine, self.alias)
         return self._engine
 
+    @property
+    def resolved_pragma_profile(self) -> str:
+        """Pragma profile applied when the engine is built.
+
+        Explicit constructor argument, else the enclosing use_pragma_profile()
+        block, else the [sqlite] profile setting.
+        """
+        return (
+            getattr(self, "pragma_profile", None)
+            or current_pragma_profile()
+            or SettingsService().sqlite_pragma_profile
+        )
+
     @property
     def remote_engine(self):
         # Writes land locally and reach Turso via push(), so the local and
@@ -142,7 +193,9 @@ class DatabaseConfig:
         return self.engine
 
     @property
-    def turso_sync_connection(self) -> tursosync.ConnectionSync:
+    def turso_sync_connection(self) -> "tursosync.ConnectionSync":
+        import turso.sync as tursosync
+
         self._turso_sync_connection = tursosync.connect(
             self.path,
             remote_url=self.turso_url,
@@ -152,6 +205,8 @@ class DatabaseConfig:
 
     @property
     def turso_local_connect(self):
+        import turso
+
         self._turso_connect = turso.connect(self.path)
         return self._turso_connect
 
@@ -179,13 +234,15 @@ class DatabaseConfig:
         logger.info(f"stats = {stats}")
         logger.info(f"========== END SYNC {self.alias} ==========")
         logger.info("--------------------------------\n")
+        return stats
 
     def push(self):
         push_start = perf_counter()
         conn = self.turso_sync_connection
         with conn:
             conn.push()
-            logger.debug(conn.stats())
+            stats = conn.stats()
+            logger.debug(stats)
         conn.close()
         push_end = perf_counter()
         logger.info(f"Database: {self.alias} ({self.path})")
@@ -193,13 +250,15 @@ class DatabaseConfig:
         logger.info(
             "========================================================================="
         )
+        return stats
 
     def pull(self):
         pull_start = perf_counter()
         conn = self.turso_sync_connection
         with conn:
             conn.pull()
-            logger.debug(conn.stats())
+            stats = conn.stats()
+            logger.debug(stats)
         conn.close()
         pull_end = perf_counter()
         logger.info(f"Database: {self.alias} ({self.path})")
@@ -207,6 +266,7 @@ class DatabaseConfig:
         logger.info(
             "========================================================================="
         )
+        return stats
 
 
     def get_table_list(self, local_only: bool = True) -> list[tuple]:
@@ -270,6 +330,8 @@ class DatabaseConfig:
                 return result[0]
 
     def get_watchlist(self):
+        import pandas as pd
+
         engine = self.engine
         with engine.connect() as conn:
             df = pd.read_sql_table("watchlist", conn)
@@ -332,6 +394,7 @@ class DatabaseConfig:
             return False
 
     def get_db_credentials_dicts(self):
+        self._load_routing()
         return {
             "turso_urls": self._db_turso_urls,
             "turso_tokens": self._db_turso_auth_tokens,
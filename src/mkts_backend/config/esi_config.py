@@ -1,6 +1,5 @@
 from typing import TYPE_CHECKING
 
-from mkts_backend.esi.esi_auth import get_token
 from mkts_backend.config.logging_config import configure_logging
 from mkts_backend.config.settings_service import SettingsService
 
@@ -10,9 +9,6 @@ if TYPE_CHECKING:
 logger = configure_logging(__name__)
 
 
-_service = SettingsService()
-
-
 class ESIConfig:
     """ESI configuration bound to a specific :class:`MarketContext`.
 
@@ -28,10 +24,14 @@ class ESIConfig:
         self.structure_id = market_context.structure_id
         logger.info(f"ESIConfig initialized from MarketContext: {market_context.name}")
 
-        self.user_agent = _service.esi_user_agent
-        self.compatibility_date = _service.esi_compatibility_date
+        service = SettingsService()
+        self.user_agent = service.esi_user_agent
+        self.compatibility_date = service.esi_compatibility_date
 
     def token(self, scope: str = "esi-markets.structure_markets.v1"):
+        # esi_auth pulls in requests_oauthlib; only commands that hit ESI need it.
+        from mkts_backend.esi.esi_auth import get_token
+
         return get_token(scope)
 
     @property
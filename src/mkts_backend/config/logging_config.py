@@ -1,9 +1,15 @@
+import atexit
 import logging
 import logging.handlers
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
 from logging import StreamHandler
 import sys
 import os
-from typing import Optional, Dict
+from typing import Iterator, Optional, Dict
 
 try:
     import colorlog
@@ -33,20 +39,58 @@ def _resolve_log_level() -> int:
         raise ValueError(f"Invalid log_level in settings: {level_name!r}")
     return level
 
-log_level = _resolve_log_level()
+_log_level: Optional[int] = None
 
-def configure_logging(
-    name: str,
-    use_colors: bool = True,
-    console_level: int = log_level,
-    file_level: int = log_level,
-    custom_colors: Optional[Dict[str, str]] = None,
-):
-    logger = logging.getLogger(name)
-    logger.setLevel(min(console_level, file_level))
 
-    logger.handlers.clear()
+def _default_log_level() -> int:
+    """``[logging] log_level`` from settings, resolved on the first logger setup."""
+    global _log_level
+    if _log_level is None:
+        _log_level = _resolve_log_level()
+    return _log_level
+
+# Market alias of the pipeline currently running in this thread/task, so
+# interleaved output from concurrent markets stays attributable.
+_market_tag: ContextVar[str] = ContextVar("mkts_market_tag", default="")
+
+
+class _MarketTagFilter(logging.Filter):
+    """Expose the current market alias to formatters as ``%(market)s``."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        tag = _market_tag.get()
+        record.market = f"[{tag}] " if tag else ""
+        return True
+
 
+@contextmanager
+def market_log_context(alias: str) -> Iterator[None]:
+    """Prefix every log line emitted inside the block with ``[alias]``."""
+    token = _market_tag.set(alias)
+    try:
+        yield
+    finally:
+        _market_tag.reset(token)
+
+# Every logger in the package shares one handler set: a QueueHandler on the
+# ``mkts_backend`` logger feeding a QueueListener thread that owns the single
+# RotatingFileHandler and StreamHandler. Callers only enqueue the record, so
+# formatting and file I/O (and rotation, which now has one owner) stay off
+# hot paths; the listener is drained at interpreter exit.
+PACKAGE_LOGGER = "mkts_backend"
+FILE_FORMAT = "%(asctime)s|%(name)s|%(levelname)s|%(funcName)s:%(lineno)d > %(market)s%(message)s"
+
+_install_lock = threading.Lock()
+_queue_handler: Optional[logging.handlers.QueueHandler] = None
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def _build_handlers(
+    use_colors: bool,
+    console_level: int,
+    file_level: int,
+    custom_colors: Optional[Dict[str, str]],
+) -> list[logging.Handler]:
     default_colors = {
         'DEBUG': 'cyan',
         'INFO': 'green',
@@ -57,13 +101,11 @@ def configure_logging(
 
     log_colors = custom_colors if custom_colors else default_colors
 
-    file_formatter = logging.Formatter(
-        "%(asctime)s|%(name)s|%(levelname)s|%(funcName)s:%(lineno)d > %(message)s"
-    )
+    file_formatter = logging.Formatter(FILE_FORMAT)
 
     if COLOR_AVAILABLE and use_colors and sys.stdout.isatty():
         console_formatter = colorlog.ColoredFormatter(
-            "%(log_color)s%(asctime)s|%(name)s|%(levelname)s|%(funcName)s:%(lineno)d > %(message)s",
+            "%(log_color)s" + FILE_FORMAT,
             datefmt=None,
             reset=True,
             log_colors=log_colors,
@@ -73,11 +115,12 @@ def configure_logging(
     else:
         console_formatter = file_formatter
 
-    # Ensure logs directory exists at project root (pyproject.toml locator)
-    project_root = _find_project_root(os.path.dirname(__file__))
-    log_dir = os.path.join(project_root, "logs")
-    if not os.path.exists(log_dir):
-        os.makedirs(log_dir)
+    # Ensure logs directory exists at project root (pyproject.toml locator),
+    # unless MKTS_LOG_DIR points elsewhere (the test suite does)
+    log_dir = os.environ.get("MKTS_LOG_DIR") or os.path.join(
+        _find_project_root(os.path.dirname(__file__)), "logs"
+    )
+    os.makedirs(log_dir, exist_ok=True)
 
     log_file_path = os.path.join(log_dir, "mkts-backend.log")
     rotating_handler = logging.handlers.RotatingFileHandler(
@@ -85,12 +128,128 @@ def configure_logging(
     )
     rotating_handler.setFormatter(file_formatter)
     rotating_handler.setLevel(file_level)
-    logger.addHandler(rotating_handler)
 
     stream_handler = StreamHandler()
     stream_handler.setFormatter(console_formatter)
     stream_handler.setLevel(console_level)
-    logger.addHandler(stream_handler)
 
+    return [rotating_handler, stream_handler]
+
+
+def _shared_queue_handler(
+    use_colors: bool = True,
+    custom_colors: Optional[Dict[str, str]] = None,
+) -> logging.handlers.QueueHandler:
+    """Install the shared handlers on the package logger (once) and return its QueueHandler."""
+    global _queue_handler, _listener
+    with _install_lock:
+        if _queue_handler is None:
+            level = _default_log_level()
+            handlers = _build_handlers(use_colors, level, level, custom_colors)
+            log_queue: queue.SimpleQueue = queue.SimpleQueue()
+            queue_handler = logging.handlers.QueueHandler(log_queue)
+            # The market tag lives in a ContextVar of the emitting thread, so
+            # it is stamped here, before the record crosses to the listener.
+            queue_handler.addFilter(_MarketTagFilter())
+            listener = logging.handlers.QueueListener(
+                log_queue, *handlers, respect_handler_level=True
+            )
+            listener.start()
+            atexit.register(shutdown_logging)
+
+            package_logger = logging.getLogger(PACKAGE_LOGGER)
+            package_logger.addHandler(queue_handler)
+            package_logger.setLevel(level)
+            _queue_handler, _listener = queue_handler, listener
+        return _queue_handler
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the listener thread (idempotent)."""
+    global _listener
+    listener, _listener = _listener, None
+    if listener is not None:
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+
+
+def configure_logging(
+    name: str,
+    use_colors: bool = True,
+    console_level: Optional[int] = None,
+    file_level: Optional[int] = None,
+    custom_colors: Optional[Dict[str, str]] = None,
+):
+    """Logger for ``name``, writing through the shared queued handlers.
+
+    Loggers under ``mkts_backend`` get no handlers of their own: records
+    propagate to the package logger. Other names (``__main__``, scripts) get
+    the shared QueueHandler attached directly. The first call decides colors;
+    ``console_level``/``file_level``, when given, only set this logger's level.
+    """
+    queue_handler = _shared_queue_handler(use_colors, custom_colors)
+    logger = logging.getLogger(name)
+    if console_level is not None or file_level is not None:
+        levels = [lvl for lvl in (console_level, file_level) if lvl is not None]
+        logger.setLevel(min(levels))
+
+    in_package = name == PACKAGE_LOGGER or name.startswith(PACKAGE_LOGGER + ".")
+    if not in_package and queue_handler not in logger.handlers:
+        logger.addHandler(queue_handler)
     return logger
 
+
+class ProgressReporter:
+    """Rate-limited progress for hot loops (chunked upserts, per-type requests).
+
+    ``update()`` redraws a ``\r`` terminal line at most every ``interval``
+    seconds (never under ``MKTS_QUIET=1``) and logs an INFO line at most every
+    ``log_interval`` seconds; ``finish()`` always logs the final count. A loop
+    of thousands of steps costs a clock read per step instead of a print or a
+    log record.
+    """
+
+    def __init__(
+        self,
+        logger: logging.Logger,
+        label: str,
+        total: int,
+        interval: float = 0.25,
+        log_interval: float = 10.0,
+    ):
+        self.logger = logger
+        self.label = label
+        self.total = total
+        self.done = 0
+        self.interval = interval
+        self.log_interval = log_interval
+        self.quiet = os.environ.get("MKTS_QUIET", "0") == "1"
+        self._started = time.monotonic()
+        self._last_draw = float("-inf")
+        self._last_log = self._started
+        self._drawn = False
+
+    def _line(self) -> str:
+        pct = 100 * self.done / self.total if self.total else 100.0
+        return f"{self.label}: {self.done}/{self.total} ({pct:.1f}%)"
+
+    def update(self, step: int = 1, done: Optional[int] = None) -> None:
+        """Advance by ``step`` (or jump to ``done``) and report if due."""
+        self.done = done if done is not None else self.done + step
+        now = time.monotonic()
+        if not self.quiet and now - self._last_draw >= self.interval:
+            self._last_draw = now
+            self._drawn = True
+            print(f"\r {self._line()}", end="", flush=True)
+        if now - self._last_log >= self.log_interval:
+            self._last_log = now
+            self.logger.info(self._line())
+
+    def finish(self) -> None:
+        """Close the terminal line and log the final count with the elapsed time."""
+        if self._drawn:
+            print(f"\r {self._line()}", flush=True)
+            self._drawn = False
+        elapsed = time.monotonic() - self._started
+        self.logger.info(f"{self._line()} in {elapsed:.1f}s")
@@ -160,6 +160,80 @@ class SettingsService:
         """Tables that are fully wiped and re-inserted on each upsert run."""
         return list(self.settings.get("wipe_replace", {}).get("tables", []))
 
+    # ---- [sqlite] ----
+
+    @property
+    def sqlite_pragma_profile(self) -> str:
+        """Pragma profile for engines outside the market pipeline.
+
+        ``MKTS_SQLITE_PROFILE`` wins over the TOML ``sqlite.profile`` so a
+        one-off run can be re-tuned without editing settings.
+        """
+        return os.environ.get(
+            "MKTS_SQLITE_PROFILE",
+            self.settings.get("sqlite", {}).get("profile", "read"),
+        )
+
+    @property
+    def sqlite_pipeline_profile(self) -> str:
+        """Pragma profile used while ``update-markets`` writes (``MKTS_SQLITE_PROFILE`` wins)."""
+        return os.environ.get(
+            "MKTS_SQLITE_PROFILE",
+            self.settings.get("sqlite", {}).get("pipeline_profile", "bulk"),
+        )
+
+    # ---- [pipeline] ----
+
+    @property
+    def pipeline_workers(self) -> int:
+        """Markets ``update-markets`` runs concurrently (``MKTS_PIPELINE_WORKERS`` wins)."""
+        return int(
+            os.environ.get(
+                "MKTS_PIPELINE_WORKERS",
+                self.settings.get("pipeline", {}).get("workers", 1),
+            )
+        )
+
+    @property
+    def pipeline_resume_max_age_minutes(self) -> int:
+        """How old a stage checkpoint may be and still be reused by ``--resume``."""
+        return int(self.settings.get("pipeline", {}).get("resume_max_age_minutes", 60))
+
+    @property
+    def pipeline_history_batch_size(self) -> int:
+        """Type IDs per history batch; each batch is written and checkpointed."""
+        return int(self.settings.get("pipeline", {}).get("history_batch_size", 200))
+
+    # ---- [jita] ----
+
+    @property
+    def jita_ttl_minutes(self) -> int:
+        """Age after which a local Jita price is refetched (``MKTS_JITA_TTL_MINUTES`` wins)."""
+        return int(
+            os.environ.get(
+                "MKTS_JITA_TTL_MINUTES",
+                self.settings.get("jita", {}).get("ttl_minutes", 360),
+            )
+        )
+
+    @property
+    def jita_offline(self) -> bool:
+        """Never fetch Jita prices; serve stale local ones (``MKTS_JITA_OFFLINE`` wins)."""
+        env = os.environ.get("MKTS_JITA_OFFLINE")
+        if env is not None:
+            return env.strip().lower() in ("1", "true", "yes")
+        return bool(self.settings.get("jita", {}).get("offline", False))
+
+    # ---- [result_cache] ----
+
+    @property
+    def result_cache_enabled(self) -> bool:
+        """Serve CLI read commands from cli_cache.db (``MKTS_RESULT_CACHE`` wins)."""
+        env = os.environ.get("MKTS_RESULT_CACHE")
+        if env is not None:
+            return env.strip().lower() in ("1", "true", "yes")
+        return bool(self.settings.get("result_cache", {}).get("enabled", True))
+
     # ---- [google_sheets] ----
 
     @property
@@ -176,6 +250,33 @@ class SettingsService:
     def buildcost_default_worksheet(self) -> str:
         return self.settings["buildcost"].get("default_worksheet", "")
 
+    # ---- [builder_costs] ----
+
+    @property
+    def builder_costs_high_value_max_age_hours(self) -> float:
+        """Max age of a T2/T3, ship or high-price item's cost before it is refetched."""
+        return float(self.settings.get("builder_costs", {}).get("high_value_max_age_hours", 24))
+
+    @property
+    def builder_costs_low_value_max_age_hours(self) -> float:
+        """Max age of a cheap T1 item's cost before it is refetched."""
+        return float(self.settings.get("builder_costs", {}).get("low_value_max_age_hours", 168))
+
+    @property
+    def builder_costs_price_move_pct(self) -> float:
+        """Jita price move (percent) since the last fetch that forces a refetch."""
+        return float(self.settings.get("builder_costs", {}).get("price_move_pct", 10))
+
+    @property
+    def builder_costs_time_budget_seconds(self) -> float:
+        """Cap on EverRef fetching per run (``MKTS_BUILDER_COSTS_BUDGET_SECONDS`` wins)."""
+        return float(
+            os.environ.get(
+                "MKTS_BUILDER_COSTS_BUDGET_SECONDS",
+                self.settings.get("builder_costs", {}).get("time_budget_seconds", 180),
+            )
+        )
+
     # ---- [markets] ----
 
     @property
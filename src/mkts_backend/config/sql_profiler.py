@@ -0,0 +1,434 @@
+"""Opt-in SQL profiler for engines handed out by ``DatabaseConfig``.
+
+Enable with ``MKTS_PROFILE_SQL=1`` or the global ``--profile-sql`` flag. Every
+engine built while profiling is enabled gets ``before_cursor_execute`` /
+``after_cursor_execute`` listeners that record, per statement:
+
+- wall time and row count (affected rows for DML, fetched rows for SELECT)
+- the first call site inside ``mkts_backend``
+- ``EXPLAIN QUERY PLAN`` once the statement exceeds the slow threshold
+  (``MKTS_PROFILE_SQL_THRESHOLD_MS``, default 100 ms)
+- equality joins whose key columns have different SQLite type affinity —
+  the INTEGER-vs-VARCHAR ``market_history.type_id`` join that made turso
+  re-run a grouped subquery per outer row (docs/turso-subquery-materialization.md)
+
+At process exit a JSON report is written to ``MKTS_PROFILE_SQL_REPORT`` or
+``logs/sql_profile_<timestamp>.json``.
+"""
+
+import atexit
+import json
+import os
+import re
+import sys
+import threading
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from time import perf_counter
+from typing import Callable
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from mkts_backend.config.logging_config import configure_logging
+
+logger = configure_logging(__name__)
+
+PROFILE_ENV = "MKTS_PROFILE_SQL"
+THRESHOLD_ENV = "MKTS_PROFILE_SQL_THRESHOLD_MS"
+REPORT_ENV = "MKTS_PROFILE_SQL_REPORT"
+DEFAULT_THRESHOLD_MS = 100.0
+
+_PACKAGE_DIR = str(Path(__file__).resolve().parent.parent)
+_THIS_FILE = str(Path(__file__).resolve())
+
+
+def profiling_enabled() -> bool:
+    return os.environ.get(PROFILE_ENV, "0").lower() in {"1", "true", "yes", "on"}
+
+
+# ---- affinity analysis -------------------------------------------------------
+
+
+def column_affinity(declared_type: str | None) -> str:
+    """SQLite type affinity for a declared column type (sqlite.org/datatype3, 3.1)."""
+    t = (declared_type or "").upper()
+    if "INT" in t:
+        return "INTEGER"
+    if "CHAR" in t or "CLOB" in t or "TEXT" in t:
+        return "TEXT"
+    if t == "" or "BLOB" in t:
+        return "BLOB"
+    if "REAL" in t or "FLOA" in t or "DOUB" in t:
+        return "REAL"
+    return "NUMERIC"
+
+
+_NUMERIC_AFFINITIES = {"INTEGER", "REAL", "NUMERIC"}
+_SQL_KEYWORDS = {
+    "on", "left", "right", "inner", "outer", "cross", "full", "join", "natural",
+    "where", "group", "order", "limit", "using", "union", "having", "as", "select",
+}
+_QUALIFIED_EQ = re.compile(r"\b(\w+)\.(\w+)\s*=\s*(\w+)\.(\w+)\b")
+_FROM_JOIN = re.compile(r"\b(?:FROM|JOIN)\s+(\w+)(?:\s+(?:AS\s+)?(\w+))?", re.IGNORECASE)
+_CAST_AS = re.compile(r"^CAST\s*\(.*\s+AS\s+(\w+(?:\s*\(\s*\d+\s*\))?)\s*\)$", re.IGNORECASE | re.DOTALL)
+_ALIASED = re.compile(r"^(.*?)\s+(?:AS\s+)?(\w+)$", re.IGNORECASE | re.DOTALL)
+_BARE_COLUMN = re.compile(r"^(?:(\w+)\.)?(\w+)$")
+
+
+def _split_subqueries(sql: str) -> tuple[str, dict[str, str]]:
+    """Blank out ``( SELECT ... ) [AS] alias`` blocks; return (outer_sql, {alias: inner_sql})."""
+    subqueries: dict[str, str] = {}
+    out: list[str] = []
+    i = 0
+    while i < len(sql):
+        if sql[i] == "(" and re.match(r"\(\s*SELECT\b", sql[i:], re.IGNORECASE):
+            depth, j = 0, i
+            while j < len(sql):
+                if sql[j] == "(":
+                    depth += 1
+                elif sql[j] == ")":
+                    depth -= 1
+                    if depth == 0:
+                        break
+                j += 1
+            inner = sql[i + 1 : j]
+            alias_match = re.match(r"\s*(?:AS\s+)?(\w+)", sql[j + 1 :], re.IGNORECASE)
+            if alias_match and alias_match.group(1).lower() not in _SQL_KEYWORDS:
+                subqueries[alias_match.group(1)] = inner
+            out.append(" __subquery__ ")
+            i = j + 1
+            continue
+        out.append(sql[i])
+        i += 1
+    return "".join(out), subqueries
+
+
+def _alias_tables(sql: str) -> dict[str, str]:
+    aliases: dict[str, str] = {}
+    for table, alias in _FROM_JOIN.findall(sql):
+        if table == "__subquery__":
+            continue
+        aliases[table] = table
+        if alias and alias.lower() not in _SQL_KEYWORDS:
+            aliases[alias] = table
+    return aliases
+
+
+def _split_top_level(select_list: str) -> list[str]:
+    parts, depth, current = [], 0, []
+    for ch in select_list:
+        if ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+        if ch == "," and depth == 0:
+            parts.append("".join(current).strip())
+            current = []
+            continue
+        current.append(ch)
+    if current:
+        parts.append("".join(current).strip())
+    return parts
+
+
+def _subquery_column_affinity(
+    inner_sql: str, column: str, table_types: Callable[[str], dict[str, str]]
+) -> tuple[str, str] | None:
+    """Affinity of output ``column`` of a subquery, with a description of its source."""
+    outer, _ = _split_subqueries(inner_sql)
+    match = re.search(r"\bSELECT\b(.*?)\bFROM\b", outer, re.IGNORECASE | re.DOTALL)
+    if not match:
+        return None
+    aliases = _alias_tables(outer)
+    default_table = next(iter(aliases.values()), None)
+    for expr in _split_top_level(match.group(1)):
+        named = _ALIASED.match(expr)
+        body, name = (named.group(1).strip(), named.group(2)) if named else (expr, None)
+        bare = _BARE_COLUMN.match(expr)
+        if name is None and bare:
+            name = bare.group(2)
+        if name is None or name.lower() != column.lower():
+            continue
+        cast = _CAST_AS.match(body)
+        if cast:
+            return column_affinity(cast.group(1)), f"CAST(... AS {cast.group(1)})"
+        bare = _BARE_COLUMN.match(body)
+        if bare:
+            table = aliases.get(bare.group(1), bare.group(1)) if bare.group(1) else default_table
+            if table:
+                declared = table_types(table).get(bare.group(2))
+                if declared is not None:
+                    return column_affinity(declared), f"{table}.{bare.group(2)} {declared}"
+        return None
+    return None
+
+
+def find_affinity_mismatches(
+    sql: str, table_types: Callable[[str], dict[str, str]]
+) -> list[str]:
+    """Return a description of every ``a.x = b.y`` whose sides differ numeric-vs-text.
+
+    ``table_types(table)`` returns ``{column: declared_type}``. Heuristic and
+    regex-based — it understands the FROM/JOIN/subquery shapes used in this
+    codebase, and skips anything it cannot resolve rather than guessing.
+    """
+    outer, subqueries = _split_subqueries(sql)
+    aliases = _alias_tables(outer)
+
+    def resolve(alias: str, column: str) -> tuple[str, str] | None:
+        if alias in subqueries:
+            return _subquery_column_affinity(subqueries[alias], column, table_types)
+        table = aliases.get(alias)
+        if table is None:
+            return None
+        declared = table_types(table).get(column)
+        if declared is None:
+            return None
+        return column_affinity(declared), f"{table}.{column} {declared}"
+
+    mismatches: list[str] = []
+    for left_alias, left_col, right_alias, right_col in _QUALIFIED_EQ.findall(outer):
+        left = resolve(left_alias, left_col)
+        right = resolve(right_alias, right_col)
+        if left is None or right is None:
+            continue
+        kinds = {left[0] in _NUMERIC_AFFINITIES, right[0] in _NUMERIC_AFFINITIES}
+        if left[0] != right[0] and kinds == {True, False}:
+            mismatches.append(
+                f"{left_alias}.{left_col} ({left[0]}: {left[1]}) = "
+                f"{right_alias}.{right_col} ({right[0]}: {right[1]})"
+            )
+    for inner in subqueries.values():
+        mismatches.extend(find_affinity_mismatches(inner, table_types))
+    return mismatches
+
+
+# ---- profiler ----------------------------------------------------------------
+
+
+@dataclass
+class StatementStats:
+    """Aggregated timings for one distinct statement on one database."""
+
+    db_alias: str
+    statement: str
+    calls: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    rows: int = 0
+    call_sites: dict[str, int] = field(default_factory=dict)
+    query_plan: list[str] | None = None
+    affinity_mismatches: list[str] = field(default_factory=list)
+
+
+class _CountingCursor:
+    """Pass-through DBAPI cursor that counts fetched rows into ``stats``."""
+
+    def __init__(self, cursor, stats: StatementStats, lock: threading.Lock):
+        self._cursor = cursor
+        self._stats = stats
+        self._lock = lock
+
+    def _count(self, rows):
+        with self._lock:
+            self._stats.rows += len(rows)
+        return rows
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        if row is not None:
+            with self._lock:
+                self._stats.rows += 1
+        return row
+
+    def fetchmany(self, *args, **kwargs):
+        return self._count(self._cursor.fetchmany(*args, **kwargs))
+
+    def fetchall(self):
+        return self._count(self._cursor.fetchall())
+
+    def __iter__(self):
+        for row in self._cursor:
+            with self._lock:
+                self._stats.rows += 1
+            yield row
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+def _call_site() -> str:
+    """First stack frame inside mkts_backend that is not the profiler or db_config."""
+    frame = sys._getframe(2)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if (
+            filename.startswith(_PACKAGE_DIR)
+            and filename != _THIS_FILE
+            and not filename.endswith("db_config.py")
+        ):
+            rel = os.path.relpath(filename, _PACKAGE_DIR)
+            return f"{rel}:{frame.f_lineno} in {frame.f_code.co_name}"
+        frame = frame.f_back
+    return "<outside mkts_backend>"
+
+
+def _normalize(statement: str) -> str:
+    return " ".join(statement.split())
+
+
+class SqlProfiler:
+    """Collects per-statement timings from every instrumented engine."""
+
+    def __init__(self, threshold_ms: float = DEFAULT_THRESHOLD_MS):
+        self.threshold_ms = threshold_ms
+        self.started_at = datetime.now(timezone.utc)
+        self._stats: dict[tuple[str, str], StatementStats] = {}
+        self._schema: dict[tuple[str, str], dict[str, str]] = {}
+        self._analyzed: set[tuple[str, str]] = set()
+        self._lock = threading.Lock()
+
+    def instrument(self, engine: Engine, db_alias: str) -> None:
+        """Attach cursor-execute listeners to ``engine``."""
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def _before(conn, cursor, statement, parameters, context, executemany):
+            conn.info.setdefault("mkts_profile_start", []).append(perf_counter())
+
+        @event.listens_for(engine, "after_cursor_execute")
+        def _after(conn, cursor, statement, parameters, context, executemany):
+            elapsed_ms = (perf_counter() - conn.info["mkts_profile_start"].pop()) * 1000
+            self._record(conn, cursor, statement, parameters, context, executemany, db_alias, elapsed_ms)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany, db_alias, elapsed_ms):
+        key = (db_alias, _normalize(statement))
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = StatementStats(db_alias=db_alias, statement=key[1])
+            stats.calls += 1
+            stats.total_ms += elapsed_ms
+            stats.max_ms = max(stats.max_ms, elapsed_ms)
+            site = _call_site()
+            stats.call_sites[site] = stats.call_sites.get(site, 0) + 1
+            needs_analysis = key not in self._analyzed
+
+        is_query = key[1][:6].upper() in {"SELECT", "WITH ("} or key[1][:4].upper() == "WITH"
+        if is_query and context is not None and getattr(context, "cursor", None) is cursor:
+            # Result rows are fetched after this hook; count them as they are read.
+            context.cursor = _CountingCursor(cursor, stats, self._lock)
+        elif cursor.rowcount is not None and cursor.rowcount >= 0:
+            with self._lock:
+                stats.rows += cursor.rowcount
+
+        if needs_analysis and is_query and " JOIN " in key[1].upper():
+            with self._lock:
+                self._analyzed.add(key)
+            try:
+                mismatches = find_affinity_mismatches(
+                    statement, lambda table: self._table_types(conn, db_alias, table)
+                )
+            except Exception as exc:  # never let profiling break a query
+                logger.debug(f"affinity analysis failed: {exc}")
+                mismatches = []
+            if mismatches:
+                stats.affinity_mismatches = mismatches
+                for m in mismatches:
+                    logger.warning(f"SQL profiler: affinity-mismatched join on {db_alias}: {m}")
+
+        if (
+            is_query
+            and not executemany
+            and elapsed_ms >= self.threshold_ms
+            and stats.query_plan is None
+        ):
+            stats.query_plan = self._explain(conn, statement, parameters)
+
+    def _raw_cursor(self, conn):
+        # A raw DBAPI cursor on the same connection: bypasses the engine
+        # events (no recursion) and sees the same transaction state.
+        return conn.connection.dbapi_connection.cursor()
+
+    def _table_types(self, conn, db_alias: str, table: str) -> dict[str, str]:
+        key = (db_alias, table)
+        if key not in self._schema:
+            cur = self._raw_cursor(conn)
+            try:
+                cur.execute(f"PRAGMA table_info({table})")
+                self._schema[key] = {row[1]: row[2] for row in cur.fetchall()}
+            finally:
+                cur.close()
+        return self._schema[key]
+
+    def _explain(self, conn, statement: str, parameters) -> list[str]:
+        cur = self._raw_cursor(conn)
+        try:
+            cur.execute(f"EXPLAIN QUERY PLAN {statement}", parameters or ())
+            return [str(row[-1]) for row in cur.fetchall()]
+        except Exception as exc:
+            return [f"<explain failed: {exc}>"]
+        finally:
+            cur.close()
+
+    def statements(self) -> list[StatementStats]:
+        with self._lock:
+            return sorted(self._stats.values(), key=lambda s: s.total_ms, reverse=True)
+
+    def report(self) -> dict:
+        statements = self.statements()
+        return {
+            "started_at": self.started_at.isoformat(),
+            "finished_at": datetime.now(timezone.utc).isoformat(),
+            "argv": sys.argv,
+            "threshold_ms": self.threshold_ms,
+            "total_statements": sum(s.calls for s in statements),
+            "total_ms": round(sum(s.total_ms for s in statements), 3),
+            "slow_statements": [
+                asdict(s) for s in statements if s.max_ms >= self.threshold_ms
+            ],
+            "affinity_mismatches": [
+                {"db_alias": s.db_alias, "statement": s.statement, "joins": s.affinity_mismatches}
+                for s in statements
+                if s.affinity_mismatches
+            ],
+            "statements": [asdict(s) for s in statements],
+        }
+
+    def write_report(self, path: str | Path | None = None) -> Path:
+        if path is None:
+            path = os.environ.get(REPORT_ENV) or os.path.join(
+                "logs", f"sql_profile_{self.started_at.strftime('%Y%m%d_%H%M%S')}.json"
+            )
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        report = self.report()
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2, default=str)
+        logger.info(
+            f"SQL profile: {report['total_statements']} statements, "
+            f"{report['total_ms'] / 1000:.2f}s total, "
+            f"{len(report['slow_statements'])} over {self.threshold_ms:.0f} ms, "
+            f"{len(report['affinity_mismatches'])} affinity-mismatched joins -> {path}"
+        )
+        return path
+
+
+_profiler: SqlProfiler | None = None
+
+
+def get_profiler() -> SqlProfiler:
+    """Process-wide profiler; registers the exit-time report on first use."""
+    global _profiler
+    if _profiler is None:
+        threshold = float(os.environ.get(THRESHOLD_ENV, DEFAULT_THRESHOLD_MS))
+        _profiler = SqlProfiler(threshold_ms=threshold)
+        atexit.register(_profiler.write_report)
+    return _profiler
+
+
+def instrument_engine(engine: Engine, db_alias: str) -> None:
+    """Attach the profiler to ``engine`` if profiling is enabled."""
+    if profiling_enabled():
+        get_profiler().instrument(engine, db_alias)
@@ -0,0 +1,129 @@
+"""Connect-time SQLite pragma profiles.
+
+Engines get their tuning from a named profile applied in a SQLAlchemy
+``connect`` event, so every pooled DBAPI connection starts with the same
+settings regardless of which module created the engine.
+
+Profiles:
+- ``read``   — CLI queries: larger page cache, mmap, in-memory temp B-trees
+  for the GROUP BY / ORDER BY sorts in the stats and fit-check queries.
+- ``bulk``   — pipeline writes (``update-markets``): a much larger page cache
+  for the chunked upserts and ``synchronous=OFF`` on local-only files.
+- ``local_cache`` — small standalone caches such as ``cli_cache.db``.
+- ``default`` — busy timeout only.
+
+Sync-managed databases (``sqlite+turso_sync``) only receive the pragmas that
+do not touch journaling or durability. ``journal_mode``/``wal_autocheckpoint``
+would change when the WAL is checkpointed, which destroys the baseline
+``conn.pull()`` needs (see ``DatabaseConfig.engine``); ``synchronous`` is
+restricted to local-only files so a crash can never leave a replica whose
+WAL disagrees with its ``-info`` metadata.
+"""
+
+from contextlib import contextmanager
+from typing import Iterator
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+PragmaValue = int | str
+
+PRAGMA_PROFILES: dict[str, dict[str, PragmaValue]] = {
+    "default": {
+        "busy_timeout": 5000,
+    },
+    "read": {
+        "cache_size": -65536,  # KiB -> 64 MiB
+        "mmap_size": 268435456,  # 256 MiB
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+    },
+    "bulk": {
+        "cache_size": -262144,  # KiB -> 256 MiB
+        "temp_store": "MEMORY",
+        "synchronous": "OFF",
+        "busy_timeout": 30000,
+    },
+    "local_cache": {
+        "cache_size": -8192,  # KiB -> 8 MiB
+        "temp_store": "MEMORY",
+        "synchronous": "NORMAL",
+        "busy_timeout": 5000,
+    },
+}
+
+# Pragmas that are only applied to databases without a Turso remote.
+LOCAL_ONLY_PRAGMAS = frozenset(
+    {"synchronous", "journal_mode", "wal_autocheckpoint", "locking_mode"}
+)
+
+# Process-wide profile set by use_pragma_profile(); takes precedence over the
+# settings default for engines created while it is active.
+_active_profile: str | None = None
+
+
+def pragmas_for(profile: str, *, sync_managed: bool = False) -> dict[str, PragmaValue]:
+    """Return the pragmas for ``profile``, minus the local-only ones if sync-managed.
+
+    Raises:
+        ValueError: If ``profile`` is not a known profile name.
+    """
+    if profile not in PRAGMA_PROFILES:
+        raise ValueError(
+            f"Unknown SQLite pragma profile '{profile}'. "
+            f"Available: {list(PRAGMA_PROFILES.keys())}"
+        )
+    pragmas = dict(PRAGMA_PROFILES[profile])
+    if sync_managed:
+        pragmas = {k: v for k, v in pragmas.items() if k not in LOCAL_ONLY_PRAGMAS}
+    return pragmas
+
+
+def install_pragma_profile(
+    engine: Engine, profile: str, *, sync_managed: bool = False
+) -> dict[str, PragmaValue]:
+    """Register a ``connect`` listener on ``engine`` that applies ``profile``.
+
+    Only connections opened after the call are affected, so call this right
+    after ``create_engine``. Returns the pragmas that will be applied.
+    """
+    pragmas = pragmas_for(profile, sync_managed=sync_managed)
+    if not pragmas:
+        return pragmas
+
+    statements = [f"PRAGMA {name}={value}" for name, value in pragmas.items()]
+
+    @event.listens_for(engine, "connect")
+    def _apply_pragmas(dbapi_connection, _connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for statement in statements:
+                cursor.execute(statement)
+        finally:
+            cursor.close()
+
+    return pragmas
+
+
+def current_pragma_profile() -> str | None:
+    """Return the profile set by an enclosing ``use_pragma_profile`` block, if any."""
+    return _active_profile
+
+
+@contextmanager
+def use_pragma_profile(profile: str) -> Iterator[None]:
+    """Make ``profile`` the default for engines created inside the block.
+
+    Engines are cached per ``DatabaseConfig`` instance, so this applies to
+    configs whose engine is first built inside the block — the pipeline
+    builds a fresh ``DatabaseConfig`` per market/stage, which is the case
+    this is meant for.
+    """
+    global _active_profile
+    pragmas_for(profile)  # validate before switching
+    previous = _active_profile
+    _active_profile = profile
+    try:
+        yield
+    finally:
+        _active_profile = previous
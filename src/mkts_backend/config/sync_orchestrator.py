@@ -0,0 +1,249 @@
+"""Coalesced, concurrent Turso pulls and pushes with per-sync metrics.
+
+Every Turso round trip is a fixed cost paid per database, so the CLI routes
+them through one :class:`SyncOrchestrator` (see :func:`get_sync_orchestrator`):
+
+- ``request_push(db)`` marks a database dirty. Inside ``batch()`` — every
+  registry command runs in one — the push is deferred and coalesced, so a
+  command pushes each database at most once, when the batch closes.
+  Outside a batch it pushes immediately, as ``db.push()`` always did.
+- ``pull_all`` / ``push_all`` / ``run_all`` run independent databases
+  concurrently (each DB has its own file and remote).
+- Every sync is timed and recorded, with ``conn.stats()``, in the
+  ``sync_metrics`` table of the local-only ``cli_cache.db``.
+"""
+
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Iterator, Optional
+
+from mkts_backend.config.logging_config import configure_logging
+
+logger = configure_logging(__name__)
+
+METRICS_DB_URL = "sqlite:///cli_cache.db"
+DEFAULT_MAX_WORKERS = 4
+
+
+@dataclass
+class SyncResult:
+    """Outcome of one pull/push/verify against one database."""
+
+    alias: str
+    op: str
+    seconds: float
+    ok: bool = True
+    stats: dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+
+
+@dataclass
+class SyncBatch:
+    """Handle yielded by :meth:`SyncOrchestrator.batch`; filled when it closes."""
+
+    results: list[SyncResult] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return all(r.ok for r in self.results)
+
+
+def stats_to_dict(stats: Any) -> dict[str, Any]:
+    """Plain-dict view of a turso ``PyTursoSyncDatabaseStats`` (or None)."""
+    if stats is None:
+        return {}
+    if isinstance(stats, dict):
+        return dict(stats)
+    out = {}
+    for name in dir(stats):
+        if name.startswith("_"):
+            continue
+        value = getattr(stats, name, None)
+        if isinstance(value, (int, float, str, bool)) or value is None:
+            out[name] = value
+    return out
+
+
+class SyncOrchestrator:
+    """Coalesces push requests per database and runs syncs concurrently."""
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS, metrics_url: Optional[str] = METRICS_DB_URL):
+        self.max_workers = max_workers
+        self.metrics_url = metrics_url
+        self._metrics_engine = None
+        self._lock = threading.Lock()
+        self._pending: dict[str, Any] = {}  # alias -> DatabaseConfig
+        self._depth = 0
+
+    # ---- push coalescing ----
+
+    def request_push(self, db) -> None:
+        """Push ``db`` now, or once at the end of the enclosing batch."""
+        with self._lock:
+            if self._depth:
+                if db.alias not in self._pending:
+                    logger.debug(f"Deferring push of {db.alias} to the end of the batch")
+                self._pending[db.alias] = db
+                return
+        self.push_now(db)
+
+    def push_now(self, db) -> SyncResult:
+        """Push ``db`` immediately (raises on failure); clears any pending request."""
+        with self._lock:
+            self._pending.pop(db.alias, None)
+        return self._sync_one(db, "push")
+
+    @property
+    def pending(self) -> list[str]:
+        with self._lock:
+            return sorted(self._pending)
+
+    def flush(self) -> list[SyncResult]:
+        """Push every database with a pending request, concurrently."""
+        with self._lock:
+            dbs = list(self._pending.values())
+            self._pending.clear()
+        if not dbs:
+            return []
+        results = self.push_all(dbs)
+        for r in results:
+            if not r.ok:
+                logger.error(f"Deferred push of {r.alias} failed: {r.error}")
+        return results
+
+    @contextmanager
+    def batch(self) -> Iterator[SyncBatch]:
+        """Defer ``request_push`` calls; push each dirty database once on exit."""
+        handle = SyncBatch()
+        with self._lock:
+            self._depth += 1
+        try:
+            yield handle
+        finally:
+            with self._lock:
+                self._depth -= 1
+                outermost = self._depth == 0
+            if outermost:
+                handle.results = self.flush()
+
+    # ---- concurrent pulls/pushes ----
+
+    def pull_all(self, dbs: list) -> list[SyncResult]:
+        """Pull every database concurrently (``DatabaseConfig.sync``)."""
+        return self.run_all(dbs, "pull", lambda db: db.sync())
+
+    def push_all(self, dbs: list) -> list[SyncResult]:
+        """Push every database concurrently."""
+        return self.run_all(dbs, "push", lambda db: db.push())
+
+    def run_all(self, dbs: list, op: str, fn: Callable[[Any], Any]) -> list[SyncResult]:
+        """Run ``fn(db)`` for each database concurrently; never raises.
+
+        ``fn`` may return the connection stats, which are recorded.
+        """
+        if not dbs:
+            return []
+        if len(dbs) == 1:
+            return [self._capture(dbs[0], op, fn)]
+        workers = max(1, min(self.max_workers, len(dbs)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sync") as pool:
+            futures = [pool.submit(self._capture, db, op, fn) for db in dbs]
+            return [f.result() for f in futures]
+
+    def _capture(self, db, op: str, fn: Callable[[Any], Any]) -> SyncResult:
+        try:
+            return self._sync_one(db, op, fn)
+        except Exception as e:
+            return SyncResult(db.alias, op, 0.0, ok=False, error=f"{e.__class__.__name__}: {e}")
+
+    def _sync_one(self, db, op: str, fn: Optional[Callable[[Any], Any]] = None) -> SyncResult:
+        fn = fn or (lambda d: d.push())
+        started = datetime.now(timezone.utc)
+        t0 = time.perf_counter()
+        try:
+            stats = fn(db)
+        except Exception as e:
+            result = SyncResult(
+                db.alias, op, time.perf_counter() - t0, ok=False,
+                error=f"{e.__class__.__name__}: {e}",
+            )
+            self._record(result, started)
+            raise
+        result = SyncResult(db.alias, op, time.perf_counter() - t0, stats=stats_to_dict(stats))
+        logger.info(f"{op} {db.alias}: {result.seconds:.1f}s")
+        self._record(result, started)
+        return result
+
+    # ---- metrics ----
+
+    def _engine(self):
+        # SQLAlchemy is imported on first use: every registry dispatch opens
+        # a batch, most of which never sync anything.
+        from sqlalchemy import create_engine, text
+
+        from mkts_backend.config.sqlite_pragmas import install_pragma_profile
+
+        if self._metrics_engine is None:
+            self._metrics_engine = create_engine(self.metrics_url)
+            install_pragma_profile(self._metrics_engine, "local_cache")
+            with self._metrics_engine.begin() as conn:
+                conn.execute(text("""
+                    CREATE TABLE IF NOT EXISTS sync_metrics (
+                        id         INTEGER PRIMARY KEY AUTOINCREMENT,
+                        alias      TEXT NOT NULL,
+                        op         TEXT NOT NULL,
+                        started_at TEXT NOT NULL,
+                        seconds    REAL NOT NULL,
+                        ok         INTEGER NOT NULL,
+                        error      TEXT,
+                        stats      TEXT
+                    )
+                """))
+        return self._metrics_engine
+
+    def _record(self, result: SyncResult, started: datetime) -> None:
+        """Append one row to sync_metrics; metrics never fail a sync."""
+        if not self.metrics_url:
+            return
+        from sqlalchemy import text
+        from sqlalchemy.exc import SQLAlchemyError
+
+        try:
+            with self._lock:
+                engine = self._engine()
+            with engine.begin() as conn:
+                conn.execute(
+                    text("""
+                        INSERT INTO sync_metrics (alias, op, started_at, seconds, ok, error, stats)
+                        VALUES (:alias, :op, :started_at, :seconds, :ok, :error, :stats)
+                    """),
+                    {
+                        "alias": result.alias,
+                        "op": result.op,
+                        "started_at": started.isoformat(),
+                        "seconds": round(result.seconds, 3),
+                        "ok": int(result.ok),
+                        "error": result.error,
+                        "stats": json.dumps(result.stats) if result.stats else None,
+                    },
+                )
+        except SQLAlchemyError as e:
+            logger.debug(f"Could not record sync metrics for {result.alias}: {e}")
+
+
+_orchestrator: Optional[SyncOrchestrator] = None
+_orchestrator_lock = threading.Lock()
+
+
+def get_sync_orchestrator() -> SyncOrchestrator:
+    """The process-wide orchestrator."""
+    global _orchestrator
+    with _orchestrator_lock:
+        if _orchestrator is None:
+            _orchestrator = SyncOrchestrator()
+        return _orchestrator
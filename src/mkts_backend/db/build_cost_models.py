@@ -61,6 +61,28 @@ class BuilderCosts(BuildCostBase):
         )
 
 
+class BuilderCostRefresh(BuildCostBase):
+    """Refresh bookkeeping for ``builder_costs``, one row per type_id.
+
+    ``jita_price`` is the Jita sell price at the time the cost row was last
+    fetched; ``update-builder-costs`` refetches an item early when the
+    current price has moved too far from it. Kept out of ``builder_costs`` so
+    the table the frontend reads keeps its shape.
+    """
+
+    __tablename__ = "builder_cost_refresh"
+
+    type_id = Column(Integer, primary_key=True)
+    jita_price = Column(Float, nullable=True)
+    fetched_at = Column(DateTime, nullable=False)
+
+    def __repr__(self) -> str:
+        return (
+            f"BuilderCostRefresh(type_id={self.type_id!r}, "
+            f"jita_price={self.jita_price!r}, fetched_at={self.fetched_at!r})"
+        )
+
+
 class Structure(BuildCostBase):
     __tablename__ = "structures"
 
@@ -16,7 +16,7 @@ from mkts_backend.utils.utils import (
     convert_datetime_columns,
     get_type_names_from_df,
 )
-from mkts_backend.config.logging_config import configure_logging
+from mkts_backend.config.logging_config import ProgressReporter, configure_logging
 from mkts_backend.db.models import Base, MarketHistory, MarketOrders, UpdateLog
 from mkts_backend.config.db_config import DatabaseConfig
 from mkts_backend.config.settings_service import SettingsService
@@ -27,7 +27,6 @@ if TYPE_CHECKING:
 
 load_dotenv()
 logger = configure_logging(__name__)
-QUIET = os.environ.get("MKTS_QUIET", "0") == "1"
 
 # Lazy initialization - these will be initialized on first use or via market_ctx
 _db = None
@@ -130,6 +129,38 @@ def handle_nulls(df: pd.DataFrame, tabname: str) -> pd.DataFrame:
     return df
 
 
+def ensure_model_columns(
+    table: type[TableModel],
+    market_ctx: Optional["MarketContext"] = None,
+) -> list[str]:
+    """Add columns the model declares but an existing table lacks.
+
+    Uses PRAGMA table_info, then ALTER TABLE ADD COLUMN (and any index on an
+    added column). Tables that don't exist yet are left to ``create``.
+
+    Returns:
+        Names of the columns added
+    """
+    db = _get_db(market_ctx)
+    t = table.__table__
+    added: list[str] = []
+    with db.engine.begin() as conn:
+        live = {row[1] for row in conn.execute(text(f"PRAGMA table_info({t.name})"))}
+        if not live:
+            return added
+        for column in t.columns:
+            if column.name in live:
+                continue
+            col_type = column.type.compile(dialect=conn.dialect)
+            conn.execute(text(f"ALTER TABLE {t.name} ADD COLUMN {column.name} {col_type}"))
+            logger.info(f"Added {column.name} column to {t.name} ({db.alias})")
+            added.append(column.name)
+    for index in t.indexes:
+        if any(c.name in added for c in index.columns):
+            index.create(db.engine, checkfirst=True)
+    return added
+
+
 def upsert_database(
     table: type[TableModel],
     df: pd.DataFrame,
@@ -194,14 +225,13 @@ def upsert_database(
                 session.execute(delete(t))
                 logger.info(f"Wiped data from {table.__tablename__}")
 
+                progress = ProgressReporter(logger, f"inserting {table.__tablename__}", len(data))
                 for idx in range(0, len(data), chunk_size):
                     chunk = data[idx : idx + chunk_size]
                     stmt = insert(t).values(chunk)
                     session.execute(stmt)
-                    if not QUIET:
-                        logger.info(
-                            f"  • chunk {idx // chunk_size + 1}, {len(chunk)} rows"
-                        )
+                    progress.update(len(chunk))
+                progress.finish()
 
                 count = session.execute(
                     select(func.count()).select_from(t)
@@ -267,6 +297,7 @@ def upsert_database(
                 total_skipped = 0
                 total_inserted = 0
 
+                progress = ProgressReporter(logger, f"upserting {table.__tablename__}", len(data))
                 for idx in range(0, len(data), chunk_size):
                     chunk = data[idx : idx + chunk_size]
                     base = sqlite_insert(t).values(chunk)
@@ -307,11 +338,8 @@ def upsert_database(
                     total_updated += chunk_updated
                     total_skipped += chunk_skipped
 
-                    print(
-                        f"\r upserting {table.__tablename__}. {round(100 * (idx / len(data)), 3)}%",
-                        end="",
-                        flush=True,
-                    )
+                    progress.update(len(chunk))
+                progress.finish()
 
                 # Calculate insertions: total incoming minus those that already existed
                 count_after = session.execute(
@@ -431,28 +459,11 @@ def update_history(
     logger.info(f"Available columns: {list(history_df.columns)}")
     logger.info(f"Expected columns: {list(valid_history_columns)}")
 
-    # Get type names efficiently with bulk lookup
-    from sqlalchemy import text
+    # Type names come from the process-wide SDE index (one load per process)
+    from mkts_backend.db.sde_index import get_sde_index
 
     unique_type_ids = history_df["type_id"].unique()
-
-    sde_db = _get_sde_db()
-    engine = sde_db.engine
-    with engine.connect() as conn:
-        placeholders = ",".join(
-            [":type_id_" + str(i) for i in range(len(unique_type_ids))]
-        )
-        params = {
-            "type_id_" + str(i): int(unique_type_ids[i])
-            for i in range(len(unique_type_ids))
-        }
-
-        stmt = text(
-            f"SELECT typeID, typeName FROM sdetypes WHERE typeID IN ({placeholders})"
-        )
-        res = conn.execute(stmt, params)
-        type_name_map = dict(res.fetchall())
-    engine.dispose()
+    type_name_map = get_sde_index(_get_sde_db()).names(unique_type_ids)
 
     history_df["type_name"] = history_df["type_id"].map(
         lambda x: type_name_map.get(int(x), f"Unknown_{x}")
@@ -0,0 +1,269 @@
+"""Secondary-index management for market databases.
+
+The indexes themselves are declared on the ORM models in ``db/models.py``
+(``index=True`` / ``__table_args__``) so ``Base.metadata.create_all`` builds
+them on fresh databases. Existing databases predate those declarations; the
+helpers here create, verify and drop exactly the model-declared set on a live
+engine and capture ``EXPLAIN QUERY PLAN`` for the hot read queries so the
+before/after effect is visible.
+
+All writes go through ``DatabaseConfig.engine`` — for Turso-synced databases
+that is the sync-dialect engine, so the DDL lands locally and reaches the
+remote on the next ``push()``.
+"""
+
+from dataclasses import dataclass, field
+
+from sqlalchemy import Index, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+
+from mkts_backend.config.logging_config import configure_logging
+from mkts_backend.db.models import Base
+
+logger = configure_logging(__name__)
+
+
+@dataclass(frozen=True)
+class HotQuery:
+    """A read query on the critical path, with representative bind values."""
+
+    name: str
+    description: str
+    sql: str
+    params: dict = field(default_factory=dict)
+
+
+# Mirrors the SQL in data_processing / fit_check / fit_check_needed /
+# fit_check_module / equiv_handlers. Only the plan matters, so bind values
+# are placeholders.
+HOT_QUERIES: list[HotQuery] = [
+    HotQuery(
+        "market_stats_orders",
+        "calculate_market_stats sell-side aggregate",
+        """
+        SELECT type_id, MIN(price), SUM(volume_remain)
+        FROM marketorders
+        WHERE is_buy_order = 0
+        GROUP BY type_id
+        """,
+    ),
+    HotQuery(
+        "market_stats_history",
+        "calculate_market_stats 30-day history aggregate",
+        """
+        SELECT CAST(type_id AS INTEGER), AVG(average), SUM(volume)/30
+        FROM market_history
+        WHERE date >= DATE('now', '-30 day') AND average > 0 AND volume > 0
+        GROUP BY type_id
+        """,
+    ),
+    HotQuery(
+        "history_by_type",
+        "per-type history lookup (update_history / fill_nulls_from_history)",
+        """
+        SELECT date, average, volume
+        FROM market_history
+        WHERE type_id = :type_id
+        ORDER BY date
+        """,
+        {"type_id": "34"},
+    ),
+    HotQuery(
+        "fit_check_fallback",
+        "fit-check 5th-percentile fallback from marketorders",
+        """
+        SELECT type_id, price, volume_remain
+        FROM marketorders
+        WHERE type_id IN (:id_0, :id_1) AND is_buy_order = 0
+        ORDER BY type_id, price ASC
+        """,
+        {"id_0": 34, "id_1": 35},
+    ),
+    HotQuery(
+        "fit_check_doctrine",
+        "fit-check precomputed doctrine rows",
+        """
+        SELECT type_id, fit_qty, fits_on_mkt, total_stock, price
+        FROM doctrines
+        WHERE fit_id = :fit_id
+        ORDER BY category_id ASC, fits_on_mkt ASC
+        """,
+        {"fit_id": 1},
+    ),
+    HotQuery(
+        "module_usage",
+        "module command: fits using a type_id",
+        """
+        SELECT d.fit_id, df.fit_name, d.fit_qty, d.total_stock
+        FROM doctrines d
+        JOIN doctrine_fits df ON d.fit_id = df.fit_id
+        WHERE d.type_id = :type_id
+        """,
+        {"type_id": 34},
+    ),
+    HotQuery(
+        "needed_items_by_ship",
+        "fitcheck needed --ship: materialized needed_items",
+        """
+        SELECT fit_id, type_id, fits_on_mkt, qty_needed
+        FROM needed_items
+        WHERE ship_name IN (:ship_0)
+        ORDER BY ship_name, fit_id, targ_perc
+        """,
+        {"ship_0": "Hurricane"},
+    ),
+    HotQuery(
+        "ship_target_lookup",
+        "fit-check ship classification via ship_targets",
+        "SELECT DISTINCT ship_id FROM ship_targets WHERE ship_id IN (:id_0, :id_1)",
+        {"id_0": 34, "id_1": 35},
+    ),
+    HotQuery(
+        "equiv_group_members",
+        "fit-check: stocked equivalents of a fit's type_ids",
+        """
+        SELECT g.type_id AS member_of, m.type_id, m.type_name, m.total_volume_remain
+        FROM marketstats AS g
+        JOIN marketstats AS m ON m.equiv_group_id = g.equiv_group_id
+        WHERE g.type_id IN (:id_0, :id_1)
+          AND g.equiv_group_id > 0
+          AND m.type_id != g.type_id
+          AND m.total_volume_remain > 0
+        """,
+        {"id_0": 34, "id_1": 35},
+    ),
+]
+
+
+@dataclass
+class IndexStatus:
+    """Live state of one model-declared index."""
+
+    table: str
+    name: str
+    columns: list[str]
+    table_exists: bool
+    present: bool
+    live_columns: list[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return self.present and self.live_columns == self.columns
+
+    @property
+    def state(self) -> str:
+        if not self.table_exists:
+            return "no table"
+        if not self.present:
+            return "missing"
+        if self.live_columns != self.columns:
+            return "mismatch"
+        return "ok"
+
+
+def managed_indexes() -> list[Index]:
+    """Every index declared on ``Base`` models, ordered by table then name."""
+    out: list[Index] = []
+    for table in Base.metadata.sorted_tables:
+        out.extend(sorted(table.indexes, key=lambda ix: ix.name or ""))
+    return out
+
+
+def _existing_tables(conn) -> set[str]:
+    rows = conn.execute(
+        text("SELECT name FROM sqlite_master WHERE type = 'table'")
+    ).fetchall()
+    return {row[0] for row in rows}
+
+
+def _index_columns(conn, index_name: str) -> list[str]:
+    rows = conn.execute(text(f"PRAGMA index_info({index_name})")).fetchall()
+    return [row[2] for row in sorted(rows, key=lambda r: r[0])]
+
+
+def index_status(engine: Engine) -> list[IndexStatus]:
+    """Compare the model-declared indexes with what exists on ``engine``."""
+    statuses: list[IndexStatus] = []
+    with engine.connect() as conn:
+        tables = _existing_tables(conn)
+        live = {
+            row[0]
+            for row in conn.execute(
+                text("SELECT name FROM sqlite_master WHERE type = 'index'")
+            ).fetchall()
+        }
+        for index in managed_indexes():
+            table_name = index.table.name  # type: ignore[union-attr]
+            name = str(index.name)
+            present = name in live
+            statuses.append(
+                IndexStatus(
+                    table=table_name,
+                    name=name,
+                    columns=[c.name for c in index.columns],
+                    table_exists=table_name in tables,
+                    present=present,
+                    live_columns=_index_columns(conn, name) if present else [],
+                )
+            )
+    return statuses
+
+
+def create_indexes(engine: Engine) -> list[str]:
+    """Create any missing model-declared index. Returns the names created.
+
+    Indexes on tables that do not exist yet are skipped — ``create_all`` will
+    build them with the table.
+    """
+    created: list[str] = []
+    for status, index in zip(index_status(engine), managed_indexes()):
+        if status.present or not status.table_exists:
+            continue
+        index.create(engine, checkfirst=True)
+        logger.info(f"Created index {status.name} on {status.table}")
+        created.append(status.name)
+    return created
+
+
+def drop_indexes(engine: Engine) -> list[str]:
+    """Drop every model-declared index that exists. Returns the names dropped."""
+    dropped: list[str] = []
+    present = [status for status in index_status(engine) if status.present]
+    with engine.begin() as conn:
+        for status in present:
+            conn.execute(text(f"DROP INDEX IF EXISTS {status.name}"))
+            logger.info(f"Dropped index {status.name} on {status.table}")
+            dropped.append(status.name)
+    return dropped
+
+
+def explain_query(engine: Engine, sql: str, params: dict | None = None) -> list[str]:
+    """Return the ``EXPLAIN QUERY PLAN`` detail lines for ``sql``."""
+    with engine.connect() as conn:
+        rows = conn.execute(text(f"EXPLAIN QUERY PLAN {sql}"), params or {}).fetchall()
+    return [str(row[-1]) for row in rows]
+
+
+def explain_hot_queries(engine: Engine) -> dict[str, list[str]]:
+    """``EXPLAIN QUERY PLAN`` for every hot query; an error line if a table is absent."""
+    plans: dict[str, list[str]] = {}
+    for query in HOT_QUERIES:
+        try:
+            plans[query.name] = explain_query(engine, query.sql, query.params)
+        except SQLAlchemyError as exc:
+            logger.debug(f"EXPLAIN failed for {query.name}: {exc}")
+            plans[query.name] = [f"<unavailable: {exc.__class__.__name__}>"]
+    return plans
+
+
+def is_full_scan(plan: list[str]) -> bool:
+    """True if any step walks a whole table (or a whole index) instead of searching it.
+
+    Aggregates over every row legitimately scan; this is meant for point lookups.
+    """
+    return any(
+        line.startswith("SCAN ") and not line.startswith("SCAN CONSTANT ROW")
+        and "SUBQUERY" not in line
+        for line in plan
+    )
@@ -10,6 +10,8 @@ from sqlalchemy import text
 
 from mkts_backend.config.logging_config import configure_logging
 from mkts_backend.config.db_config import DatabaseConfig
+from mkts_backend.db.sde_index import get_sde_index
+from mkts_backend.db.type_fingerprints import get_fingerprint_store
 
 if TYPE_CHECKING:
     from mkts_backend.config.market_context import MarketContext
@@ -31,86 +33,102 @@ def _get_sde_db() -> DatabaseConfig:
 
 def resolve_type_name(type_id: int) -> Optional[str]:
     """Look up a type name from the SDE database."""
-    sde_db = _get_sde_db()
-    query = text("SELECT typeName FROM sdetypes WHERE typeID = :type_id")
-    with sde_db.engine.connect() as conn:
-        result = conn.execute(query, {"type_id": type_id}).fetchone()
-        return result[0] if result else None
+    return get_sde_index(_get_sde_db()).name(type_id)
+
+
+def _not_blueprint(index):
+    return lambda type_id: index.category_id(type_id) != 9
 
 
 def resolve_type_id(name: str) -> list[tuple[int, str]]:
     """
     Look up type IDs by name from the SDE database.
 
-    Tries exact match first, then partial LIKE match.
+    Tries an exact (then case-insensitive) match first, then prefix and
+    substring matches. Typos are not resolved here; see suggest_type_names.
     Excludes blueprints (categoryID 9).
     Returns list of (typeID, typeName) tuples, max 20 results.
     """
-    sde_db = _get_sde_db()
+    index = get_sde_index(_get_sde_db())
+    names = index.name_index()
+
+    type_id = names.lookup(name, where=_not_blueprint(index))
+    if type_id is not None:
+        return [(type_id, index.name(type_id))]
+    return names.search(name, limit=20, where=_not_blueprint(index))
+
+
+def suggest_type_names(name: str, limit: int = 5) -> list[tuple[int, str]]:
+    """
+    Names within a small edit distance of ``name`` (typos), for a
+    "did you mean" hint when resolve_type_id finds nothing. Never act on
+    these without the user choosing one.
+    """
+    index = get_sde_index(_get_sde_db())
+    return index.name_index().suggest(name, limit=limit, where=_not_blueprint(index))
+
+
+MODULE_CATEGORY_ID = 7
 
-    # Exact match first
-    exact_query = text("""
-        SELECT typeID, typeName FROM sdetypes
-        WHERE typeName = :name AND categoryID != 9
-        LIMIT 20
-    """)
-    with sde_db.engine.connect() as conn:
-        rows = conn.execute(exact_query, {"name": name}).fetchall()
-        if rows:
-            return [(r[0], r[1]) for r in rows]
-
-    # Partial match
-    like_query = text("""
-        SELECT typeID, typeName FROM sdetypes
-        WHERE typeName LIKE :pattern AND categoryID != 9
-        ORDER BY typeName
-        LIMIT 20
-    """)
-    with sde_db.engine.connect() as conn:
-        rows = conn.execute(like_query, {"pattern": f"%{name}%"}).fetchall()
-        return [(r[0], r[1]) for r in rows]
+
+def _describe(type_ids: list[int], index) -> list[dict]:
+    rows = []
+    for type_id in type_ids:
+        sde_type = index.get(type_id)
+        if sde_type is None:
+            continue
+        rows.append({
+            "typeID": type_id,
+            "typeName": sde_type.type_name,
+            "groupName": sde_type.group_name,
+            "metaGroupName": sde_type.meta_group_name,
+        })
+    rows.sort(key=lambda r: (r["metaGroupName"] or "", r["typeName"] or ""))
+    return rows
 
 
 def find_equiv_by_attributes(type_id: int) -> list[dict]:
     """
     Find modules with identical dogma attributes (attribute fingerprinting).
 
-    Uses GROUP_CONCAT of attributeID:valueInt pairs as a fingerprint to find
-    all types sharing the same attribute set as the given type_id.
+    Looks up the type's precomputed fingerprint hash (see
+    ``db/type_fingerprints.py``) and every type sharing it.
 
     Returns list of dicts with typeID, typeName, groupName, metaGroupName.
     """
     sde_db = _get_sde_db()
-    query = text("""
-        WITH type_fingerprints AS (
-            SELECT typeID,
-                   GROUP_CONCAT(attributeID || ':' || valueInt, ',') as fingerprint
-            FROM dgmTypeAttributes
-            WHERE valueInt IS NOT NULL
-            GROUP BY typeID
-        )
-        SELECT tf.typeID, s.typeName, s.groupName, s.metaGroupName
-        FROM type_fingerprints tf
-        JOIN sdetypes s ON tf.typeID = s.typeID
-        WHERE tf.fingerprint = (
-            SELECT GROUP_CONCAT(attributeID || ':' || valueInt, ',') as fingerprint
-            FROM dgmTypeAttributes
-            WHERE typeID = :type_id AND valueInt IS NOT NULL
-        )
-        ORDER BY s.metaGroupName, s.typeName
-    """)
-    with sde_db.engine.connect() as conn:
-        rows = conn.execute(query, {"type_id": type_id}).fetchall()
+    store = get_fingerprint_store(sde_db)
+    fingerprint = store.hashes_for([type_id]).get(int(type_id))
+    if fingerprint is None:
+        return []
+    members = store.members([fingerprint]).get(fingerprint, [])
+    return _describe(members, get_sde_index(sde_db))
 
-    return [
-        {
-            "typeID": r[0],
-            "typeName": r[1],
-            "groupName": r[2],
-            "metaGroupName": r[3],
-        }
-        for r in rows
-    ]
+
+def discover_equiv_groups(type_ids: list[int]) -> list[list[dict]]:
+    """
+    Cluster the given types into equivalence groups in one pass.
+
+    Every module (categoryID 7) among ``type_ids`` is mapped to its
+    fingerprint; each fingerprint shared by two or more SDE modules becomes
+    a group. Groups include equivalent modules that are not in ``type_ids``.
+
+    Returns a list of groups, each as returned by find_equiv_by_attributes,
+    largest first.
+    """
+    sde_db = _get_sde_db()
+    index = get_sde_index(sde_db)
+    modules = [t for t in type_ids if index.category_id(t) == MODULE_CATEGORY_ID]
+    store = get_fingerprint_store(sde_db)
+    by_hash = store.members(store.hashes_for(modules).values())
+
+    groups = []
+    for members in by_hash.values():
+        members = [t for t in members if index.category_id(t) == MODULE_CATEGORY_ID]
+        if len(members) > 1:
+            groups.append(_describe(members, index))
+    groups.sort(key=lambda g: (-len(g), g[0]["typeName"] or ""))
+    return groups
 
 
 def list_equiv_groups(market_ctx: Optional["MarketContext"] = None) -> list[dict]:
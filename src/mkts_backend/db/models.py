@@ -1,4 +1,4 @@
-from sqlalchemy import String, Integer, DateTime, Float, Boolean, event
+from sqlalchemy import String, Integer, DateTime, Float, Boolean, Index, event
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
 from mkts_backend.db._update_log_mixin import UpdateLogMixin
@@ -22,6 +22,10 @@ class MarketStats(Base):
     category_name: Mapped[str] = mapped_column(String)
     days_remaining: Mapped[float] = mapped_column(Float)
     last_update: Mapped[DateTime] = mapped_column(DateTime)
+    # module_equivalents group (0 = none) and the stock of the whole group,
+    # this type included; equal to total_volume_remain for ungrouped types.
+    equiv_group_id: Mapped[int] = mapped_column(Integer, nullable=True, default=0, index=True)
+    equiv_total_stock: Mapped[int] = mapped_column(Integer, nullable=True)
 
     def __repr__(self) -> str:
         return (
@@ -30,11 +34,17 @@ class MarketStats(Base):
             f"avg_volume={self.avg_volume!r}, group_id={self.group_id!r}, type_name={self.type_name!r}, "
             f"group_name={self.group_name!r}, category_id={self.category_id!r}, "
             f"category_name={self.category_name!r}, days_remaining={self.days_remaining!r}, "
-            f"last_update={self.last_update!r})"
+            f"last_update={self.last_update!r}, equiv_group_id={self.equiv_group_id!r}, "
+            f"equiv_total_stock={self.equiv_total_stock!r})"
         )
 
 class MarketOrders(Base):
     __tablename__ = "marketorders"
+    # Covers the sell-side GROUP BY in calculate_market_stats and the
+    # fallback price walk in fit_check (type_id IN ..., is_buy_order=0, ORDER BY type_id, price).
+    __table_args__ = (
+        Index("ix_marketorders_type_id_is_buy_order_price", "type_id", "is_buy_order", "price"),
+    )
     order_id: Mapped[int] = mapped_column(Integer, primary_key=True)
     is_buy_order: Mapped[bool] = mapped_column(Boolean, nullable=True)
     type_id: Mapped[int] = mapped_column(Integer, nullable=True)
@@ -53,6 +63,10 @@ class MarketOrders(Base):
 
 class MarketHistory(Base):
     __tablename__ = "market_history"
+    # The PK leads with date; per-type history lookups need type_id first.
+    __table_args__ = (
+        Index("ix_market_history_type_id_date", "type_id", "date"),
+    )
     date: Mapped[DateTime] = mapped_column(DateTime, primary_key=True)
     type_id: Mapped[str] = mapped_column(String(10), primary_key=True)
     type_name: Mapped[str] = mapped_column(String(100))
@@ -73,11 +87,11 @@ class MarketHistory(Base):
 class Doctrines(Base):
     __tablename__ = "doctrines"
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    fit_id: Mapped[int] = mapped_column(Integer)
+    fit_id: Mapped[int] = mapped_column(Integer, index=True)
     ship_id: Mapped[int] = mapped_column(Integer)
     ship_name: Mapped[str] = mapped_column(String)
     hulls: Mapped[int] = mapped_column(Integer, nullable=True)
-    type_id: Mapped[int] = mapped_column(Integer)
+    type_id: Mapped[int] = mapped_column(Integer, index=True)
     type_name: Mapped[str] = mapped_column(String, nullable=True)
     fit_qty: Mapped[int] = mapped_column(Integer)
     fits_on_mkt: Mapped[float] = mapped_column(Float, nullable=True)
@@ -90,6 +104,9 @@ class Doctrines(Base):
     category_id: Mapped[int] = mapped_column(Integer, nullable=True)
     category_name: Mapped[str] = mapped_column(String, nullable=True)
     timestamp: Mapped[DateTime] = mapped_column(DateTime, nullable=True)
+    # Stock of equivalent modules the fit does not use itself; fits_on_mkt
+    # counts it, total_stock does not.
+    equiv_stock: Mapped[int] = mapped_column(Integer, nullable=True, default=0)
 
     def __repr__(self) -> str:
         return (
@@ -97,7 +114,8 @@ class Doctrines(Base):
             f"hulls={self.hulls!r}, type_id={self.type_id!r}, type_name={self.type_name!r}, fit_qty={self.fit_qty!r}, "
             f"fits_on_mkt={self.fits_on_mkt!r}, total_stock={self.total_stock!r}, price={self.price!r}, "
             f"avg_vol={self.avg_vol!r}, days={self.days!r}, group_id={self.group_id!r}, group_name={self.group_name!r}, "
-            f"category_id={self.category_id!r}, category_name={self.category_name!r}, timestamp={self.timestamp!r})"
+            f"category_id={self.category_id!r}, category_name={self.category_name!r}, timestamp={self.timestamp!r}, "
+            f"equiv_stock={self.equiv_stock!r})"
         )
 
 
@@ -105,7 +123,7 @@ class ShipTargets(Base):
     __tablename__ = "ship_targets"
     fit_id: Mapped[int] = mapped_column(Integer, primary_key=True)
     fit_name: Mapped[str] = mapped_column(String)
-    ship_id: Mapped[int] = mapped_column(Integer)
+    ship_id: Mapped[int] = mapped_column(Integer, index=True)
     ship_name: Mapped[str] = mapped_column(String)
     ship_target: Mapped[int] = mapped_column(Integer)
     created_at: Mapped[DateTime] = mapped_column(DateTime)
@@ -116,6 +134,42 @@ class ShipTargets(Base):
             f"ship_name={self.ship_name!r}, ship_target={self.ship_target!r}, created_at={self.created_at!r})"
         )
 
+
+class NeededItems(Base):
+    """
+    Doctrine items below their fit's ship target, rebuilt by the pipeline
+    after the doctrines stage.
+
+    ``total_stock``, ``fits_on_mkt``, ``targ_perc`` and ``qty_needed``
+    already include the stock of equivalent modules that the fit does not
+    use itself (``doctrines.equiv_stock``); ``equiv_items`` is its
+    breakdown as a JSON list of ``{"type_id", "type_name", "stock"}``.
+    """
+    __tablename__ = "needed_items"
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    fit_id: Mapped[int] = mapped_column(Integer, index=True)
+    fit_name: Mapped[str] = mapped_column(String, nullable=True)
+    ship_id: Mapped[int] = mapped_column(Integer)
+    ship_name: Mapped[str] = mapped_column(String, index=True)
+    type_id: Mapped[int] = mapped_column(Integer, index=True)
+    type_name: Mapped[str] = mapped_column(String, nullable=True)
+    fit_qty: Mapped[int] = mapped_column(Integer)
+    target: Mapped[int] = mapped_column(Integer)
+    total_stock: Mapped[int] = mapped_column(Integer)
+    equiv_stock: Mapped[int] = mapped_column(Integer, default=0)
+    equiv_items: Mapped[str] = mapped_column(String, nullable=True)
+    fits_on_mkt: Mapped[float] = mapped_column(Float)
+    targ_perc: Mapped[float] = mapped_column(Float)
+    qty_needed: Mapped[int] = mapped_column(Integer)
+    timestamp: Mapped[DateTime] = mapped_column(DateTime, nullable=True)
+
+    def __repr__(self) -> str:
+        return (
+            f"needed_items(fit_id={self.fit_id!r}, ship_name={self.ship_name!r}, "
+            f"type_id={self.type_id!r}, type_name={self.type_name!r}, target={self.target!r}, "
+            f"fits_on_mkt={self.fits_on_mkt!r}, qty_needed={self.qty_needed!r})"
+        )
+
 class DoctrineMap(Base):
     __tablename__ = "doctrine_map"
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
@@ -211,6 +265,30 @@ class JitaPrices(Base):
         )
 
 
+class PipelineCheckpoint(Base):
+    """Last completion of each market-pipeline stage, for ``update-markets --resume``.
+
+    ``inputs_version`` fingerprints the checkpoints of the stage's inputs, so a
+    stage is only reusable while everything upstream is unchanged. ``status``
+    is "partial" while a batched stage (history) is mid-way; ``detail`` holds
+    its JSON progress marker.
+    """
+    __tablename__ = "pipeline_checkpoints"
+    market: Mapped[str] = mapped_column(String, primary_key=True)
+    stage: Mapped[str] = mapped_column(String, primary_key=True)
+    inputs_version: Mapped[str] = mapped_column(String)
+    status: Mapped[str] = mapped_column(String)
+    detail: Mapped[str] = mapped_column(String, nullable=True)
+    completed_at: Mapped[DateTime] = mapped_column(DateTime)
+
+    def __repr__(self) -> str:
+        return (
+            f"pipeline_checkpoints(market={self.market!r}, stage={self.stage!r}, "
+            f"inputs_version={self.inputs_version!r}, status={self.status!r}, "
+            f"completed_at={self.completed_at!r})"
+        )
+
+
 class ModuleEquivalents(Base):
     """
     Maps equivalent faction modules that can be used interchangeably.
@@ -0,0 +1,352 @@
+"""Process-wide, in-memory index of SDE type metadata.
+
+``sdetypes`` is small (~50k rows) and read-only between SDE pulls, yet the
+codebase used to query it once per id or name. :func:`get_sde_index` loads
+it once per process into column arrays and serves lookups from memory:
+
+- ``type_id -> row`` through one dict of row positions; ids, group, category
+  and meta-group ids, volumes and the manufacturing-product flag live in
+  parallel arrays, and every name is an index into one interned string table;
+- ``type name -> type_id`` through an exact-match hash, built on first use;
+  case-insensitive, prefix and fuzzy search live in ``name_index()``.
+
+The index is keyed by the SDE file's mtime (and its WAL's, since a Turso pull
+may only touch the WAL), so a pull picks up a fresh index on the next lookup.
+When the SDE is a file, the columns are also written to a compiled snapshot
+next to it (see :mod:`mkts_backend.db.sde_snapshot`); later processes map
+that snapshot instead of querying SQLite at all.
+"""
+
+import math
+import os
+import threading
+from array import array
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Iterable, Optional, Sequence
+
+from sqlalchemy import text
+
+from mkts_backend.config.logging_config import configure_logging
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+logger = configure_logging(__name__)
+
+SDE_COLUMNS = (
+    "typeID",
+    "typeName",
+    "groupID",
+    "groupName",
+    "categoryID",
+    "categoryName",
+    "volume",
+    "metaGroupID",
+    "metaGroupName",
+)
+_NONE = -1  # integer placeholder for NULL ids
+NO_STRING = 0xFFFFFFFF  # string-table placeholder for NULL names
+
+
+@dataclass(frozen=True)
+class SdeType:
+    """One ``sdetypes`` row."""
+
+    type_id: int
+    type_name: str
+    group_id: Optional[int]
+    group_name: Optional[str]
+    category_id: Optional[int]
+    category_name: Optional[str]
+    volume: Optional[float]
+    meta_group_id: Optional[int]
+    meta_group_name: Optional[str]
+    is_manufactured: bool = False
+
+
+@dataclass
+class SdeColumns:
+    """Column storage behind :class:`SdeTypeIndex`.
+
+    Id columns are signed 64-bit (``_NONE`` for NULL), volumes are doubles
+    (NaN for NULL), ``manufactured`` is one byte per row and every ``*_name``
+    column holds a 32-bit index into ``strings`` (``NO_STRING`` for NULL).
+    Plain ``array``\\ s when loaded from SQLite; memoryviews over a mapped
+    snapshot otherwise.
+    """
+
+    type_ids: Sequence[int]
+    group_ids: Sequence[int]
+    category_ids: Sequence[int]
+    meta_ids: Sequence[int]
+    volumes: Sequence[float]
+    manufactured: Sequence[int]
+    type_names: Sequence[int]
+    group_names: Sequence[int]
+    category_names: Sequence[int]
+    meta_names: Sequence[int]
+    strings: Sequence[str]
+
+
+def _int(value) -> int:
+    return _NONE if value is None else int(value)
+
+
+def _opt(value: int) -> Optional[int]:
+    return None if value == _NONE else value
+
+
+def _u32() -> array:
+    out = array("I")
+    if out.itemsize != 4:  # pragma: no cover - every supported platform
+        out = array("L")
+    return out
+
+
+def columns_from_rows(rows: Iterable[tuple], manufactured: Iterable[int] = ()) -> SdeColumns:
+    """Build columns from tuples in ``SDE_COLUMNS`` order (missing columns as None)."""
+    made = {int(t) for t in manufactured}
+    strings: list[str] = []
+    interned: dict[str, int] = {}
+
+    def intern(value) -> int:
+        if value is None:
+            return NO_STRING
+        i = interned.get(value)
+        if i is None:
+            i = interned[value] = len(strings)
+            strings.append(value)
+        return i
+
+    cols = SdeColumns(
+        type_ids=array("q"), group_ids=array("q"), category_ids=array("q"),
+        meta_ids=array("q"), volumes=array("d"), manufactured=array("B"),
+        type_names=_u32(), group_names=_u32(), category_names=_u32(),
+        meta_names=_u32(), strings=strings,
+    )
+    for (type_id, name, group_id, group_name, category_id, category_name,
+         volume, meta_id, meta_name) in rows:
+        type_id = int(type_id)
+        cols.type_ids.append(type_id)
+        cols.group_ids.append(_int(group_id))
+        cols.category_ids.append(_int(category_id))
+        cols.meta_ids.append(_int(meta_id))
+        cols.volumes.append(math.nan if volume is None else float(volume))
+        cols.manufactured.append(1 if type_id in made else 0)
+        cols.type_names.append(intern(name))
+        cols.group_names.append(intern(group_name))
+        cols.category_names.append(intern(category_name))
+        cols.meta_names.append(intern(meta_name))
+    return cols
+
+
+class SdeTypeIndex:
+    """Column-backed ``sdetypes`` snapshot with O(1) id and name lookups."""
+
+    def __init__(self, rows: Iterable[tuple], manufactured: Iterable[int] = ()):
+        """``rows`` are tuples in ``SDE_COLUMNS`` order (missing columns as None);
+        ``manufactured`` lists the type ids a manufacturing blueprint produces."""
+        self._init(columns_from_rows(rows, manufactured))
+
+    @classmethod
+    def from_columns(cls, columns: SdeColumns) -> "SdeTypeIndex":
+        index = cls.__new__(cls)
+        index._init(columns)
+        return index
+
+    def _init(self, columns: SdeColumns) -> None:
+        self.columns = columns
+        self._pos: dict[int, int] = dict(zip(columns.type_ids, range(len(columns.type_ids))))
+        self._by_name: Optional[dict[str, int]] = None
+        self._name_index = None
+
+    @classmethod
+    def from_engine(cls, engine) -> "SdeTypeIndex":
+        """Load every ``sdetypes`` row; columns absent from older SDEs read as None."""
+        with engine.connect() as conn:
+            tables = {
+                row[0] for row in conn.execute(
+                    text("SELECT name FROM sqlite_master WHERE type = 'table'")
+                )
+            }
+            present = {row[1] for row in conn.execute(text("PRAGMA table_info(sdetypes)"))}
+            select_list = ", ".join(c if c in present else "NULL" for c in SDE_COLUMNS)
+            rows = conn.execute(text(f"SELECT {select_list} FROM sdetypes")).fetchall()
+            manufactured = []
+            if "industryActivityProducts" in tables:
+                manufactured = [
+                    row[0] for row in conn.execute(text(
+                        "SELECT DISTINCT productTypeID FROM industryActivityProducts "
+                        "WHERE activityID = 1"
+                    ))
+                ]
+        width = len(SDE_COLUMNS)
+        return cls((tuple(row) + (None,) * (width - len(row)) for row in rows), manufactured)
+
+    def _str(self, i: int) -> Optional[str]:
+        return None if i == NO_STRING else self.columns.strings[i]
+
+    def __len__(self) -> int:
+        return len(self._pos)
+
+    def __contains__(self, type_id) -> bool:
+        return int(type_id) in self._pos
+
+    def get(self, type_id) -> Optional[SdeType]:
+        """The full row for ``type_id``, or None."""
+        i = self._pos.get(int(type_id))
+        if i is None:
+            return None
+        c = self.columns
+        volume = c.volumes[i]
+        return SdeType(
+            type_id=c.type_ids[i],
+            type_name=self._str(c.type_names[i]),
+            group_id=_opt(c.group_ids[i]),
+            group_name=self._str(c.group_names[i]),
+            category_id=_opt(c.category_ids[i]),
+            category_name=self._str(c.category_names[i]),
+            volume=None if math.isnan(volume) else volume,
+            meta_group_id=_opt(c.meta_ids[i]),
+            meta_group_name=self._str(c.meta_names[i]),
+            is_manufactured=bool(c.manufactured[i]),
+        )
+
+    def name(self, type_id) -> Optional[str]:
+        i = self._pos.get(int(type_id))
+        return None if i is None else self._str(self.columns.type_names[i])
+
+    def category_id(self, type_id) -> Optional[int]:
+        i = self._pos.get(int(type_id))
+        return None if i is None else _opt(self.columns.category_ids[i])
+
+    def is_manufactured(self, type_id) -> bool:
+        """Whether a manufacturing blueprint produces ``type_id``."""
+        i = self._pos.get(int(type_id))
+        return i is not None and bool(self.columns.manufactured[i])
+
+    def id_for_name(self, name: str) -> Optional[int]:
+        """Exact (case-sensitive) name match, like ``WHERE typeName = :name``."""
+        if self._by_name is None:
+            by_name: dict[str, int] = {}
+            for type_id, ix in zip(self.columns.type_ids, self.columns.type_names):
+                if ix != NO_STRING:
+                    # First row wins, matching "LIMIT 1" on the old name queries.
+                    by_name.setdefault(self.columns.strings[ix], type_id)
+            self._by_name = by_name
+        return self._by_name.get(name)
+
+    def name_index(self):
+        """Case-insensitive, prefix and fuzzy name search (built on first use)."""
+        if self._name_index is None:
+            from mkts_backend.db.sde_names import NameIndex
+
+            c = self.columns
+            self._name_index = NameIndex(
+                (type_id, self._str(ix)) for type_id, ix in zip(c.type_ids, c.type_names)
+            )
+        return self._name_index
+
+    def names(self, type_ids: Iterable) -> dict[int, str]:
+        """``{type_id: name}`` for the ids that exist."""
+        out = {}
+        for type_id in type_ids:
+            i = self._pos.get(int(type_id))
+            if i is not None:
+                out[int(type_id)] = self._str(self.columns.type_names[i])
+        return out
+
+    def frame(self, type_ids: Optional[Iterable] = None) -> "pd.DataFrame":
+        """type_id, type_name, group_name, category_name, category_id for ``type_ids``.
+
+        Ids not in the index are left out; ``None`` means every type.
+        """
+        import pandas as pd
+
+        if type_ids is None:
+            positions = range(len(self))
+        else:
+            positions = [
+                i for i in (self._pos.get(int(t)) for t in type_ids) if i is not None
+            ]
+        c = self.columns
+        records = [
+            (
+                c.type_ids[i],
+                self._str(c.type_names[i]),
+                self._str(c.group_names[i]),
+                self._str(c.category_names[i]),
+                _opt(c.category_ids[i]),
+            )
+            for i in positions
+        ]
+        return pd.DataFrame.from_records(
+            records,
+            columns=["type_id", "type_name", "group_name", "category_name", "category_id"],
+        )
+
+
+_index: Optional[SdeTypeIndex] = None
+_index_key: Optional[tuple] = None
+_index_lock = threading.Lock()
+
+
+def _file_key(path: str) -> Optional[tuple]:
+    """(path, db mtime, db size) — None if the file does not exist.
+
+    The WAL is deliberately left out: merely opening the database touches
+    it, which would invalidate the snapshot on every run. SDE updates
+    replace the file (or checkpoint into it), which changes the key.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+
+
+def _load(sde_db, path: str, key: tuple) -> tuple[SdeTypeIndex, tuple]:
+    """Map a current snapshot, or query SQLite and (re)write the snapshot."""
+    from mkts_backend.db import sde_snapshot
+
+    snap_path = sde_snapshot.snapshot_path(path)
+    index = sde_snapshot.load_snapshot(snap_path, key[1:])
+    if index is not None:
+        logger.info(f"Mapped SDE type snapshot: {len(index)} types from {snap_path}")
+        return index, key
+    index = SdeTypeIndex.from_engine(sde_db.engine)
+    try:
+        sde_snapshot.write_snapshot(index, snap_path, key[1:])
+    except OSError as e:
+        logger.warning(f"Could not write SDE type snapshot {snap_path}: {e}")
+    logger.info(f"Loaded SDE type index: {len(index)} types from {path}")
+    return index, key
+
+
+def get_sde_index(sde_db=None) -> SdeTypeIndex:
+    """The process-wide SDE index, rebuilt when the SDE file changes.
+
+    ``sde_db`` defaults to ``DatabaseConfig("sde")``. A database without a
+    file on disk (tests, in-memory engines) gets a fresh, uncached index.
+    """
+    global _index, _index_key
+    if sde_db is None:
+        from mkts_backend.config.db_config import DatabaseConfig
+
+        sde_db = DatabaseConfig("sde")
+    path = getattr(sde_db, "path", None)
+    key = _file_key(path) if isinstance(path, str) else None
+    if key is None:
+        return SdeTypeIndex.from_engine(sde_db.engine)
+    with _index_lock:
+        if _index is None or _index_key != key:
+            _index, _index_key = _load(sde_db, path, key)
+        return _index
+
+
+def clear_sde_index() -> None:
+    """Drop the cached index (the next lookup reloads it)."""
+    global _index, _index_key
+    with _index_lock:
+        _index = None
+        _index_key = None
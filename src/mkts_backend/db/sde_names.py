@@ -0,0 +1,162 @@
+"""In-memory type-name search over the SDE type index.
+
+Built lazily from :class:`~mkts_backend.db.sde_index.SdeTypeIndex` (see
+``SdeTypeIndex.name_index()``) and shared with it, so EFT parsing, paste
+imports, ``equiv find`` and prompt autocompletion resolve names without
+SQLite:
+
+- ``lookup``: exact match, falling back to a case-folded hash
+  ("tritanium" finds "Tritanium"; SQLite's ``LOWER`` only folds ASCII);
+- ``prefix``: binary search over the sorted case-folded names;
+- ``search``: prefix hits first, then substring hits — the in-memory
+  equivalent of ``LIKE '%name%'``;
+- ``suggest``: names within a bounded edit distance (swapped letters count
+  as one edit), for typos. Candidates are pre-filtered by shared trigrams:
+  each edit touches at most four of a query's ``n + 1`` padded trigrams, so
+  a name within distance *k* shares at least ``n + 1 - 4k`` of them and
+  only a handful of names reach the banded distance check.
+"""
+
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Callable, Iterable, Optional
+
+TypeFilter = Callable[[int], bool]
+DEFAULT_MAX_DISTANCE = 2
+
+
+def _trigrams(folded: str) -> set[str]:
+    padded = f"  {folded} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def edit_distance(a: str, b: str, max_distance: int) -> Optional[int]:
+    """Edit distance (Levenshtein plus adjacent transpositions, i.e. optimal
+    string alignment) if it is at most ``max_distance``, else None."""
+    if abs(len(a) - len(b)) > max_distance:
+        return None
+    if len(a) > len(b):
+        a, b = b, a
+    over = max_distance + 1
+    before: Optional[list[int]] = None
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [over] * (len(b) + 1)
+        lo, hi = max(1, i - max_distance), min(len(b), i + max_distance)
+        if lo == 1:
+            current[0] = i
+        for j in range(lo, hi + 1):
+            cost = 0 if ca == b[j - 1] else 1
+            best = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if before is not None and j > 1 and ca == b[j - 2] and a[i - 2] == b[j - 1]:
+                best = min(best, before[j - 2] + 1)
+            current[j] = best
+        if min(current[lo - 1:hi + 1]) > max_distance:
+            return None
+        before, previous = previous, current
+    distance = previous[len(b)]
+    return distance if distance <= max_distance else None
+
+
+class NameIndex:
+    """Case-folded hash, sorted prefix array and trigram postings over type names."""
+
+    def __init__(self, pairs: Iterable[tuple[int, str]]):
+        """``pairs`` are ``(type_id, type_name)`` in SDE row order."""
+        self._exact: dict[str, int] = {}
+        self._folded: dict[str, list[int]] = defaultdict(list)
+        self._names: dict[int, str] = {}
+        for type_id, name in pairs:
+            if name is None:
+                continue
+            self._exact.setdefault(name, type_id)
+            self._folded[name.casefold()].append(type_id)
+            self._names[type_id] = name
+        self._sorted = sorted(self._folded)
+        self._grams: Optional[dict[str, list[int]]] = None
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def _allowed(self, folded: str, where: Optional[TypeFilter]) -> list[int]:
+        ids = self._folded.get(folded, [])
+        return ids if where is None else [t for t in ids if where(t)]
+
+    def lookup(self, name: str, where: Optional[TypeFilter] = None) -> Optional[int]:
+        """Exact match, else the first case-insensitive match."""
+        name = name.strip()
+        type_id = self._exact.get(name)
+        if type_id is not None and (where is None or where(type_id)):
+            return type_id
+        ids = self._allowed(name.casefold(), where)
+        return ids[0] if ids else None
+
+    def prefix(self, text: str, limit: int = 20, where: Optional[TypeFilter] = None) -> list[tuple[int, str]]:
+        """Names starting with ``text`` (case-insensitive), alphabetically."""
+        folded = text.strip().casefold()
+        out: list[tuple[int, str]] = []
+        i = bisect_left(self._sorted, folded)
+        while i < len(self._sorted) and len(out) < limit:
+            key = self._sorted[i]
+            if not key.startswith(folded):
+                break
+            out.extend((t, self._names[t]) for t in self._allowed(key, where))
+            i += 1
+        return out[:limit]
+
+    def search(self, text: str, limit: int = 20, where: Optional[TypeFilter] = None) -> list[tuple[int, str]]:
+        """Prefix matches, then other substring matches, up to ``limit``."""
+        out = self.prefix(text, limit, where)
+        if len(out) >= limit:
+            return out
+        folded = text.strip().casefold()
+        seen = {t for t, _ in out}
+        for key in self._sorted:
+            if folded in key and not key.startswith(folded):
+                for t in self._allowed(key, where):
+                    if t not in seen:
+                        out.append((t, self._names[t]))
+                if len(out) >= limit:
+                    break
+        return out[:limit]
+
+    def suggest(
+        self,
+        text: str,
+        limit: int = 5,
+        max_distance: int = DEFAULT_MAX_DISTANCE,
+        where: Optional[TypeFilter] = None,
+    ) -> list[tuple[int, str]]:
+        """Names within ``max_distance`` edits of ``text``, closest first."""
+        folded = text.strip().casefold()
+        if not folded:
+            return []
+        query_grams = _trigrams(folded)
+        needed = len(folded) + 1 - 4 * max_distance
+        if needed > 0:
+            if self._grams is None:
+                grams: dict[str, list[int]] = defaultdict(list)
+                for pos, key in enumerate(self._sorted):
+                    for gram in _trigrams(key):
+                        grams[gram].append(pos)
+                self._grams = grams
+            counts: dict[int, int] = defaultdict(int)
+            for gram in query_grams:
+                for pos in self._grams.get(gram, ()):
+                    counts[pos] += 1
+            candidates = [self._sorted[pos] for pos, n in counts.items() if n >= needed]
+        else:
+            candidates = [k for k in self._sorted if abs(len(k) - len(folded)) <= max_distance]
+
+        scored = []
+        for key in candidates:
+            distance = edit_distance(folded, key, max_distance)
+            if distance is not None:
+                scored.append((distance, key))
+        scored.sort()
+        out: list[tuple[int, str]] = []
+        for _, key in scored:
+            out.extend((t, self._names[t]) for t in self._allowed(key, where))
+            if len(out) >= limit:
+                break
+        return out[:limit]
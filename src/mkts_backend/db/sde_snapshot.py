@@ -0,0 +1,183 @@
+"""Compiled, memory-mapped snapshot of the SDE type index.
+
+Even one full ``sdetypes`` query costs time on every CLI start, and the SDE
+lives in a Turso-synced database. ``mkts-backend sde compile`` (and any
+process that had to load the index from SQLite) writes the columns of
+:class:`~mkts_backend.db.sde_index.SdeTypeIndex` to a versioned binary file
+next to the SDE database. Later processes ``mmap`` it and read the columns in
+place — no SQLite connection, no per-row parsing.
+
+Layout (native byte order, every section 8-byte aligned)::
+
+    header   magic, version, byte-order mark, source db mtime and size,
+             row count, string count, string blob length
+    int64    type_ids, group_ids, category_ids, meta_ids   (-1 = NULL)
+    float64  volumes                                        (NaN = NULL)
+    uint8    manufactured                                   (industryActivityProducts, activityID 1)
+    uint32   type_names, group_names, category_names, meta_names  (string-table indexes)
+    uint32   string offsets (count + 1)
+    bytes    UTF-8 string blob (interned: each distinct name stored once)
+
+The header records the SDE file's mtime and size (not the WAL's, which any
+open may touch); a snapshot whose source no longer matches is ignored and
+rewritten on the next load.
+"""
+
+import mmap
+import os
+import struct
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+from mkts_backend.config.logging_config import configure_logging
+from mkts_backend.db.sde_index import SdeColumns, SdeTypeIndex
+
+logger = configure_logging(__name__)
+
+MAGIC = b"MKSDESNP"
+VERSION = 2
+SNAPSHOT_SUFFIX = ".types.snap"
+_BOM = 0x0102
+_HEADER = struct.Struct("=8sHHqqIII")
+
+_INT_COLUMNS = ("type_ids", "group_ids", "category_ids", "meta_ids")
+_NAME_COLUMNS = ("type_names", "group_names", "category_names", "meta_names")
+
+
+@dataclass(frozen=True)
+class SnapshotInfo:
+    """What ``sde compile`` wrote."""
+
+    path: str
+    types: int
+    strings: int
+    size_bytes: int
+
+
+def snapshot_path(sde_path: str) -> str:
+    """``sdelite.db`` -> ``sdelite.types.snap`` in the same directory."""
+    return os.path.splitext(sde_path)[0] + SNAPSHOT_SUFFIX
+
+
+def _pad(n: int) -> int:
+    return (n + 7) & ~7
+
+
+def write_snapshot(index: SdeTypeIndex, path: str, source_key: tuple[int, int]) -> int:
+    """Write ``index`` to ``path`` atomically; returns the file size."""
+    c = index.columns
+    encoded = [s.encode("utf-8") for s in c.strings]
+    offsets = [0]
+    for s in encoded:
+        offsets.append(offsets[-1] + len(s))
+    blob = b"".join(encoded)
+
+    sections = [bytes(memoryview(getattr(c, name)).cast("B")) for name in _INT_COLUMNS]
+    sections.append(bytes(memoryview(c.volumes).cast("B")))
+    sections.append(bytes(memoryview(c.manufactured).cast("B")))
+    sections += [bytes(memoryview(getattr(c, name)).cast("B")) for name in _NAME_COLUMNS]
+    sections.append(struct.pack(f"={len(offsets)}I", *offsets))
+    sections.append(blob)
+
+    db_mtime, db_size = source_key
+    header = _HEADER.pack(
+        MAGIC, VERSION, _BOM, db_mtime, db_size, len(index), len(c.strings), len(blob)
+    )
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        for chunk in [header, *sections]:
+            f.write(chunk)
+            f.write(b"\0" * (_pad(len(chunk)) - len(chunk)))
+        size = f.tell()
+    os.replace(tmp, path)
+    return size
+
+
+class _StringTable(Sequence):
+    """Interned strings decoded on access from the mapped blob."""
+
+    def __init__(self, offsets: memoryview, blob: memoryview):
+        self._offsets = offsets
+        self._blob = blob
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i: int) -> str:
+        return bytes(self._blob[self._offsets[i]:self._offsets[i + 1]]).decode("utf-8")
+
+
+def load_snapshot(path: str, source_key: Optional[tuple[int, int]] = None) -> Optional[SdeTypeIndex]:
+    """Map ``path`` as an index; None if it is missing, malformed or stale.
+
+    ``source_key`` is the SDE's current (db mtime, db size); pass None to
+    accept the snapshot regardless of its source.
+    """
+    try:
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+
+    view = memoryview(mm)
+    try:
+        if len(mm) < _HEADER.size:
+            raise ValueError("truncated header")
+        magic, version, bom, db_mtime, db_size, rows, n_strings, blob_len = (
+            _HEADER.unpack_from(mm)
+        )
+        if magic != MAGIC or version != VERSION or bom != _BOM:
+            raise ValueError(f"unsupported snapshot (version {version})")
+        if source_key is not None and (db_mtime, db_size) != tuple(source_key):
+            logger.info(f"SDE type snapshot {path} is stale; rebuilding")
+            view.release()
+            mm.close()
+            return None
+
+        pos = _pad(_HEADER.size)
+
+        def take(fmt: str, count: int, width: int) -> memoryview:
+            nonlocal pos
+            end = pos + count * width
+            if end > len(mm):
+                raise ValueError("truncated section")
+            section = view[pos:end].cast(fmt) if fmt != "B" else view[pos:end]
+            pos = _pad(end)
+            return section
+
+        ints = {name: take("q", rows, 8) for name in _INT_COLUMNS}
+        volumes = take("d", rows, 8)
+        manufactured = take("B", rows, 1)
+        names = {name: take("I", rows, 4) for name in _NAME_COLUMNS}
+        offsets = take("I", n_strings + 1, 4)
+        blob = take("B", blob_len, 1)
+    except (ValueError, struct.error) as e:
+        logger.warning(f"Ignoring SDE type snapshot {path}: {e}")
+        return None
+
+    return SdeTypeIndex.from_columns(SdeColumns(
+        volumes=volumes,
+        manufactured=manufactured,
+        strings=_StringTable(offsets, blob),
+        **ints,
+        **names,
+    ))
+
+
+def compile_snapshot(sde_db=None) -> SnapshotInfo:
+    """Query the SDE and write its snapshot, whatever state the old one is in."""
+    from mkts_backend.db.sde_index import _file_key, clear_sde_index
+
+    if sde_db is None:
+        from mkts_backend.config.db_config import DatabaseConfig
+
+        sde_db = DatabaseConfig("sde")
+    index = SdeTypeIndex.from_engine(sde_db.engine)
+    key = _file_key(sde_db.path)
+    if key is None:
+        raise FileNotFoundError(f"SDE database not found: {sde_db.path}")
+    path = snapshot_path(sde_db.path)
+    size = write_snapshot(index, path, key[1:])
+    clear_sde_index()
+    logger.info(f"Compiled SDE type snapshot: {len(index)} types -> {path} ({size} bytes)")
+    return SnapshotInfo(path, len(index), len(index.columns.strings), size)
@@ -0,0 +1,177 @@
+"""
+Precomputed dogma-attribute fingerprints for module equivalence.
+
+Two modules are equivalent when their integer dogma attributes
+(``dgmTypeAttributes.valueInt``) are identical. Computing that on demand
+means ``GROUP_CONCAT``-ing every type's attributes on every ``equiv find``.
+Instead, each type's sorted ``attributeID:valueInt`` list is hashed once
+per SDE version into ``type_fingerprint(type_id, fingerprint_hash)``,
+indexed on the hash, so finding a type's equivalents is two point lookups
+and clustering a whole watchlist is one pass.
+
+The table lives in the local-only ``cli_cache.db``: the SDE is a
+Turso-synced replica and must not collect local writes. The SDE version is
+the SDE file's (and WAL's) mtime, as for the type index; a pull triggers a
+rebuild on the next lookup.
+"""
+
+import hashlib
+from collections import defaultdict
+from typing import Iterable, Optional
+
+from sqlalchemy import create_engine, text
+
+from mkts_backend.config.logging_config import configure_logging
+from mkts_backend.config.sqlite_pragmas import install_pragma_profile
+from mkts_backend.db.sde_index import _file_key
+
+logger = configure_logging(__name__)
+
+FINGERPRINT_DB_URL = "sqlite:///cli_cache.db"
+_INSERT_CHUNK_SIZE = 5000
+
+FINGERPRINT_SCAN_QUERY = """
+    SELECT typeID, attributeID, valueInt
+    FROM dgmTypeAttributes
+    WHERE valueInt IS NOT NULL
+    ORDER BY typeID, attributeID
+"""
+
+
+def fingerprint_hash(attributes: Iterable[tuple[int, int]]) -> str:
+    """Hash of ``(attributeID, valueInt)`` pairs, independent of their order."""
+    canonical = ",".join(f"{a}:{v}" for a, v in sorted(attributes))
+    return hashlib.sha1(canonical.encode()).hexdigest()
+
+
+def sde_version(sde_db) -> Optional[str]:
+    """The SDE's file version (db and WAL mtimes), or None if it has no file."""
+    path = getattr(sde_db, "path", None)
+    key = _file_key(path) if isinstance(path, str) else None
+    return None if key is None else f"{key[1]}:{key[2]}"
+
+
+class FingerprintStore:
+    """``type_fingerprint`` table in the local CLI cache."""
+
+    def __init__(self, url: str = FINGERPRINT_DB_URL):
+        self.engine = create_engine(url)
+        install_pragma_profile(self.engine, "local_cache")
+        with self.engine.begin() as conn:
+            conn.execute(text("""
+                CREATE TABLE IF NOT EXISTS type_fingerprint (
+                    type_id          INTEGER PRIMARY KEY,
+                    fingerprint_hash TEXT NOT NULL
+                )
+            """))
+            conn.execute(text("""
+                CREATE INDEX IF NOT EXISTS idx_type_fingerprint_hash
+                ON type_fingerprint (fingerprint_hash)
+            """))
+            conn.execute(text("""
+                CREATE TABLE IF NOT EXISTS type_fingerprint_meta (
+                    id          INTEGER PRIMARY KEY CHECK (id = 1),
+                    sde_path    TEXT NOT NULL,
+                    sde_version TEXT NOT NULL,
+                    types       INTEGER NOT NULL,
+                    built_at    TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+                )
+            """))
+
+    def built_for(self) -> Optional[tuple[str, str]]:
+        """(sde_path, sde_version) the table was built from, if any."""
+        with self.engine.connect() as conn:
+            row = conn.execute(
+                text("SELECT sde_path, sde_version FROM type_fingerprint_meta WHERE id = 1")
+            ).fetchone()
+        return None if row is None else (row[0], row[1])
+
+    def ensure(self, sde_db) -> bool:
+        """Build the table unless it matches this SDE's version; True if rebuilt."""
+        version = sde_version(sde_db)
+        path = str(getattr(sde_db, "path", ""))
+        if version is not None and self.built_for() == (path, version):
+            return False
+        self.build(sde_db, version or "unversioned")
+        return True
+
+    def build(self, sde_db, version: str) -> int:
+        """Hash every type's integer attributes in one ordered scan."""
+        rows = []
+        with sde_db.engine.connect() as conn:
+            result = conn.execute(text(FINGERPRINT_SCAN_QUERY))
+            current, attributes = None, []
+            for type_id, attribute_id, value in result:
+                if type_id != current:
+                    if current is not None:
+                        rows.append({"type_id": current, "hash": fingerprint_hash(attributes)})
+                    current, attributes = type_id, []
+                attributes.append((attribute_id, value))
+            if current is not None:
+                rows.append({"type_id": current, "hash": fingerprint_hash(attributes)})
+
+        insert = text(
+            "INSERT INTO type_fingerprint (type_id, fingerprint_hash) VALUES (:type_id, :hash)"
+        )
+        with self.engine.begin() as conn:
+            conn.execute(text("DELETE FROM type_fingerprint"))
+            for start in range(0, len(rows), _INSERT_CHUNK_SIZE):
+                conn.execute(insert, rows[start:start + _INSERT_CHUNK_SIZE])
+            conn.execute(
+                text("""
+                    INSERT OR REPLACE INTO type_fingerprint_meta (id, sde_path, sde_version, types)
+                    VALUES (1, :path, :version, :types)
+                """),
+                {"path": str(getattr(sde_db, "path", "")), "version": version, "types": len(rows)},
+            )
+        logger.info(f"Built attribute fingerprints for {len(rows)} types (SDE {version})")
+        return len(rows)
+
+    def hashes_for(self, type_ids: Iterable[int]) -> dict[int, str]:
+        """``{type_id: fingerprint_hash}`` for types that have integer attributes."""
+        ids = sorted({int(t) for t in type_ids})
+        out: dict[int, str] = {}
+        with self.engine.connect() as conn:
+            for start in range(0, len(ids), 500):
+                chunk = ids[start:start + 500]
+                placeholders = ", ".join(f":t{i}" for i in range(len(chunk)))
+                result = conn.execute(
+                    text(
+                        "SELECT type_id, fingerprint_hash FROM type_fingerprint "
+                        f"WHERE type_id IN ({placeholders})"
+                    ),
+                    {f"t{i}": t for i, t in enumerate(chunk)},
+                )
+                out.update((r[0], r[1]) for r in result)
+        return out
+
+    def members(self, hashes: Iterable[str]) -> dict[str, list[int]]:
+        """``{fingerprint_hash: [type_id, ...]}`` via the hash index."""
+        unique = sorted(set(hashes))
+        out: dict[str, list[int]] = defaultdict(list)
+        with self.engine.connect() as conn:
+            for start in range(0, len(unique), 500):
+                chunk = unique[start:start + 500]
+                placeholders = ", ".join(f":h{i}" for i in range(len(chunk)))
+                result = conn.execute(
+                    text(
+                        "SELECT fingerprint_hash, type_id FROM type_fingerprint "
+                        f"WHERE fingerprint_hash IN ({placeholders}) ORDER BY type_id"
+                    ),
+                    {f"h{i}": h for i, h in enumerate(chunk)},
+                )
+                for h, type_id in result:
+                    out[h].append(type_id)
+        return dict(out)
+
+
+_store: Optional[FingerprintStore] = None
+
+
+def get_fingerprint_store(sde_db) -> FingerprintStore:
+    """The process-wide store, (re)built for ``sde_db``'s current version."""
+    global _store
+    if _store is None:
+        _store = FingerprintStore()
+    _store.ensure(sde_db)
+    return _store
@@ -5,21 +5,37 @@ Stores aggregated {type_id: quantity} per character to avoid redundant
 ESI fetches within the cache window. ESI's asset endpoint has a ~1 hour
 cache, so we use a matching TTL.
 
+Each fetched page is also kept in ``character_asset_pages`` with its ETag,
+Last-Modified and compact item rows, so a refresh after the TTL is a round
+of conditional requests: pages that come back 304 are rebuilt from their
+stored rows instead of being downloaded again.
+
+Every complete fetch also resolves the container hierarchy once and writes
+one row per item to ``character_asset_items``: its direct location and
+flag, its container (if it sits in another of the character's items) and
+its root location, the station or structure the item is physically in.
+``stock_by_location`` and ``stock_at_structure`` aggregate that table, so
+"what do we hold at the market structure" needs no ESI call.
+
 Cache lives in a standalone local-only SQLite file (cli_cache.db) to
 avoid being wiped by Turso cloud-to-local sync on production databases.
 """
 
+import json
 from datetime import datetime, timezone
-from typing import Dict, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 
-from sqlalchemy import create_engine, text
+from sqlalchemy import bindparam, create_engine, text
 
 from mkts_backend.config.logging_config import configure_logging
+from mkts_backend.config.sqlite_pragmas import install_pragma_profile
 
 logger = configure_logging(__name__)
 
 CACHE_TTL_SECONDS = 3600  # 1 hour, matches ESI cache window
 
+_CACHE_TABLES = ("character_asset_cache", "character_asset_pages", "character_asset_items")
+
 _engine = None
 
 
@@ -27,11 +43,13 @@ def _get_engine():
     """Get a standalone SQLite engine for the local CLI cache.
 
     Uses cli_cache.db in the current working directory, alongside
-    the other .db files. No Turso config — purely local.
+    the other .db files. No Turso config — purely local, so it can take
+    the ``local_cache`` profile's relaxed ``synchronous`` level.
     """
     global _engine
     if _engine is None:
         _engine = create_engine("sqlite:///cli_cache.db")
+        install_pragma_profile(_engine, "local_cache")
     return _engine
 
 
@@ -52,6 +70,35 @@ def _ensure_table(engine) -> None:
             CREATE INDEX IF NOT EXISTS idx_asset_cache_char_id
             ON character_asset_cache (char_id)
         """))
+        conn.execute(text("""
+            CREATE TABLE IF NOT EXISTS character_asset_pages (
+                char_id       INTEGER NOT NULL,
+                page          INTEGER NOT NULL,
+                etag          TEXT,
+                last_modified TEXT,
+                items         TEXT NOT NULL,
+                fetched_at    TEXT NOT NULL,
+                PRIMARY KEY (char_id, page)
+            )
+        """))
+        conn.execute(text("""
+            CREATE TABLE IF NOT EXISTS character_asset_items (
+                char_id          INTEGER NOT NULL,
+                item_id          INTEGER NOT NULL,
+                type_id          INTEGER NOT NULL,
+                quantity         INTEGER NOT NULL,
+                location_id      INTEGER NOT NULL,
+                location_flag    TEXT,
+                container_id     INTEGER,
+                root_location_id INTEGER NOT NULL,
+                is_singleton     INTEGER NOT NULL,
+                PRIMARY KEY (char_id, item_id)
+            )
+        """))
+        conn.execute(text("""
+            CREATE INDEX IF NOT EXISTS idx_asset_items_root_type
+            ON character_asset_items (root_location_id, type_id)
+        """))
         conn.commit()
 
 
@@ -149,9 +196,191 @@ def write_cache(char_id: int, assets: Dict[int, int]) -> None:
     logger.info(f"Cached {len(assets)} asset types for char_id={char_id}")
 
 
+def read_pages(char_id: int) -> Dict[int, dict]:
+    """
+    Read the stored asset pages for a character, whatever their age.
+
+    Args:
+        char_id: ESI character ID
+
+    Returns:
+        Dict mapping page number to {"etag", "last_modified", "items"},
+        where items are the page's compact rows (see character_assets)
+    """
+    engine = _get_engine()
+    _ensure_table(engine)
+
+    with engine.connect() as conn:
+        rows = conn.execute(
+            text("""
+                SELECT page, etag, last_modified, items FROM character_asset_pages
+                WHERE char_id = :char_id
+            """),
+            {"char_id": char_id},
+        ).fetchall()
+
+    return {
+        r.page: {
+            "etag": r.etag,
+            "last_modified": r.last_modified,
+            "items": json.loads(r.items),
+        }
+        for r in rows
+    }
+
+
+def write_pages(char_id: int, pages: Dict[int, dict]) -> None:
+    """
+    Replace the stored asset pages for a character.
+
+    Args:
+        char_id: ESI character ID
+        pages: Dict mapping page number to {"etag", "last_modified", "items"}
+    """
+    engine = _get_engine()
+    _ensure_table(engine)
+
+    now = datetime.now(timezone.utc).isoformat()
+
+    with engine.connect() as conn:
+        conn.execute(
+            text("DELETE FROM character_asset_pages WHERE char_id = :char_id"),
+            {"char_id": char_id},
+        )
+        if pages:
+            conn.execute(
+                text("""
+                    INSERT INTO character_asset_pages
+                        (char_id, page, etag, last_modified, items, fetched_at)
+                    VALUES (:char_id, :page, :etag, :last_modified, :items, :fetched_at)
+                """),
+                [
+                    {
+                        "char_id": char_id,
+                        "page": page,
+                        "etag": entry.get("etag"),
+                        "last_modified": entry.get("last_modified"),
+                        "items": json.dumps(entry["items"], separators=(",", ":")),
+                        "fetched_at": now,
+                    }
+                    for page, entry in pages.items()
+                ],
+            )
+        conn.commit()
+
+
+def write_items(char_id: int, rows: List[dict]) -> None:
+    """
+    Replace a character's rows in the location index.
+
+    Args:
+        char_id: ESI character ID
+        rows: Dicts with item_id, type_id, quantity, location_id,
+              location_flag, container_id, root_location_id, is_singleton
+    """
+    engine = _get_engine()
+    _ensure_table(engine)
+
+    with engine.connect() as conn:
+        conn.execute(
+            text("DELETE FROM character_asset_items WHERE char_id = :char_id"),
+            {"char_id": char_id},
+        )
+        if rows:
+            conn.execute(
+                text("""
+                    INSERT INTO character_asset_items
+                        (char_id, item_id, type_id, quantity, location_id,
+                         location_flag, container_id, root_location_id, is_singleton)
+                    VALUES (:char_id, :item_id, :type_id, :quantity, :location_id,
+                            :location_flag, :container_id, :root_location_id, :is_singleton)
+                """),
+                [{**row, "char_id": char_id} for row in rows],
+            )
+        conn.commit()
+
+    logger.info(f"Indexed {len(rows)} assets by location for char_id={char_id}")
+
+
+def stock_by_location(
+    type_ids: Optional[Iterable[int]] = None,
+    location_ids: Optional[Iterable[int]] = None,
+    char_ids: Optional[Iterable[int]] = None,
+    include_singletons: bool = False,
+) -> Dict[Tuple[int, int], int]:
+    """
+    Sum indexed quantities by (root location, type_id).
+
+    Reads only the local index, as of each character's last complete fetch.
+
+    Args:
+        type_ids: If provided, only these types
+        location_ids: If provided, only these stations/structures
+        char_ids: If provided, only these characters
+        include_singletons: Also count assembled items (ships, containers)
+
+    Returns:
+        Dict mapping (root_location_id, type_id) to total quantity
+    """
+    engine = _get_engine()
+    _ensure_table(engine)
+
+    clauses = []
+    params = {}
+    if not include_singletons:
+        clauses.append("is_singleton = 0")
+    for column, values in (
+        ("type_id", type_ids),
+        ("root_location_id", location_ids),
+        ("char_id", char_ids),
+    ):
+        if values is not None:
+            clauses.append(f"{column} IN :{column}")
+            params[column] = list(values)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+    query = text(f"""
+        SELECT root_location_id, type_id, SUM(quantity) AS quantity
+        FROM character_asset_items
+        {where}
+        GROUP BY root_location_id, type_id
+    """)
+    if params:
+        query = query.bindparams(*(bindparam(name, expanding=True) for name in params))
+
+    with engine.connect() as conn:
+        rows = conn.execute(query, params).fetchall()
+    return {(r.root_location_id, r.type_id): r.quantity for r in rows}
+
+
+def stock_at_structure(
+    structure_id: int,
+    type_ids: Optional[Iterable[int]] = None,
+    include_singletons: bool = False,
+) -> Dict[int, int]:
+    """
+    Packaged stock all characters hold at one station or structure.
+
+    Args:
+        structure_id: Station or structure ID, e.g. a market's structure_id
+        type_ids: If provided, only these types
+        include_singletons: Also count assembled items
+
+    Returns:
+        Dict mapping type_id to total quantity at that location
+    """
+    stock = stock_by_location(
+        type_ids=type_ids,
+        location_ids=[structure_id],
+        include_singletons=include_singletons,
+    )
+    return {type_id: qty for (_, type_id), qty in stock.items()}
+
+
 def invalidate_cache(char_id: Optional[int] = None) -> None:
     """
-    Clear cached asset data.
+    Clear cached asset data, including the stored pages, their ETags and
+    the location index.
 
     Args:
         char_id: If provided, clear only this character's cache.
@@ -162,12 +391,14 @@ def invalidate_cache(char_id: Optional[int] = None) -> None:
 
     with engine.connect() as conn:
         if char_id is not None:
-            conn.execute(
-                text("DELETE FROM character_asset_cache WHERE char_id = :char_id"),
-                {"char_id": char_id},
-            )
+            for table in _CACHE_TABLES:
+                conn.execute(
+                    text(f"DELETE FROM {table} WHERE char_id = :char_id"),
+                    {"char_id": char_id},
+                )
         else:
-            conn.execute(text("DELETE FROM character_asset_cache"))
+            for table in _CACHE_TABLES:
+                conn.execute(text(f"DELETE FROM {table}"))
         conn.commit()
 
     target = f"char_id={char_id}" if char_id else "all characters"
@@ -1,10 +1,11 @@
 import asyncio
 import re
 import time
+from collections import Counter
 from collections.abc import Mapping
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Any, TypedDict
+from typing import TYPE_CHECKING, Any, TypedDict
 
 import httpx
 from aiolimiter import AsyncLimiter
@@ -14,6 +15,9 @@ from sqlalchemy.engine import Engine
 from mkts_backend.config.settings_service import SettingsService
 from mkts_backend.config.logging_config import configure_logging
 
+if TYPE_CHECKING:
+    from mkts_backend.builder_costs.refresh_policy import CostState, RefreshPolicy
+
 logger = configure_logging(__name__)
 
 EVEREF_BASE_URL = "https://api.everef.net/v1/industry/cost"
@@ -25,7 +29,9 @@ API_TIMEOUT = 20.0
 MAX_CONCURRENCY = 10
 # EverRef has no rate limit; the maintainer has confirmed bursts are fine.
 # 120 req/min keeps the average at 2/sec (polite for a single-maintainer hobby
-# API) and lets the full ~1300-item watchlist finish inside a 15-min CI budget.
+# API). At that rate the full ~1300-item watchlist takes ~11 min, so the
+# runner only fetches items due under its staleness tiers, within a time
+# budget (see builder_costs/refresh_policy.py).
 EVEREF_REQUESTS_PER_MINUTE = 120
 
 MANUFACTURABLE_META_GROUPS = frozenset({1, 2, 14})
@@ -64,6 +70,9 @@ T2_MODULE_CATEGORIES = frozenset({7, 18, 8})
 DEFAULT_TE = 0
 DEFAULT_MATERIAL_PRICE_SOURCE = "ESI_AVG"
 
+# Returned by _fetch_one for a job skipped because the run's time budget ran out.
+DEFERRED: Any = object()
+
 _DURATION_RE = re.compile(
     r"^P(?:(?P<days>\d+)D)?(?:T(?:(?P<hours>\d+)H)?(?:(?P<minutes>\d+)M)?(?:(?P<seconds>\d+(?:\.\d+)?)S)?)?$"
 )
@@ -127,17 +136,19 @@ class BuilderCostRecord(TypedDict):
 class FetchSummary:
     """Outcome of a builder-cost fetch run.
 
-    ``attempted`` counts items that entered the EverRef queue (i.e. survived
-    the design-time filters in ``_resolve_api_params`` and the SDE buildable
-    join). ``failed = attempted - len(records)`` is the real EverRef miss
-    count — the right denominator when deciding whether the run "missed"
-    fresh data.
+    ``attempted`` counts items that were requested from EverRef (i.e.
+    survived the design-time filters in ``_resolve_api_params`` and the SDE
+    buildable join, were due for a refresh, and fit in the time budget).
+    ``failed = attempted - len(records)`` is the real EverRef miss count —
+    the right denominator when deciding whether the run "missed" fresh data.
     """
 
     records: list[BuilderCostRecord] = field(default_factory=list)
     attempted: int = 0
     filtered_unbuildable: int = 0  # no manufacturing blueprint in SDE
     filtered_out_of_scope: int = 0  # excluded by meta-group/category/name filters
+    fresh: int = 0  # within their staleness tier; not due this run
+    deferred: int = 0  # due, but past the time budget; first in line next run
 
     @property
     def succeeded(self) -> int:
@@ -276,9 +287,12 @@ async def _fetch_one(
     me: int,
     runs: int,
     progress: _ProgressTracker | None = None,
+    deadline: float | None = None,
 ) -> BuilderCostRecord | None:
     try:
-        return await _fetch_one_inner(client, semaphore, limiter, type_id, me, runs)
+        return await _fetch_one_inner(
+            client, semaphore, limiter, type_id, me, runs, deadline
+        )
     finally:
         if progress is not None:
             progress.tick()
@@ -291,11 +305,15 @@ async def _fetch_one_inner(
     type_id: int,
     me: int,
     runs: int,
+    deadline: float | None = None,
 ) -> BuilderCostRecord | None:
     url = _build_request_url(type_id, me, runs)
 
     async with limiter:
         async with semaphore:
+            if deadline is not None and time.monotonic() > deadline:
+                # Out of time budget: leave it due for the next run.
+                return DEFERRED
             try:
                 response = await client.get(url, timeout=API_TIMEOUT)
             except Exception as exc:
@@ -349,7 +367,17 @@ async def async_fetch_builder_costs(
     jita_prices: dict[int, float],
     sde_engine: Engine,
     watchlist_metadata: Mapping[int, WatchlistMetadata] | None = None,
+    state: "Mapping[int, CostState] | None" = None,
+    policy: "RefreshPolicy | None" = None,
 ) -> FetchSummary:
+    """Fetch EverRef costs for the buildable, in-scope subset of ``type_ids``.
+
+    Without ``policy`` every such item is fetched. With it, only items
+    ``select_due`` reports as due against ``state`` (the current
+    builder_costs rows) are fetched, highest priority first, and no more
+    than the policy's time budget allows; the rest are counted as fresh or
+    deferred.
+    """
     watchlist_metadata = watchlist_metadata or {}
     meta_groups = _get_meta_groups(type_ids, sde_engine)
     unbuildable = len(type_ids) - len(meta_groups)
@@ -386,6 +414,48 @@ async def async_fetch_builder_costs(
             filtered_out_of_scope=out_of_scope,
         )
 
+    fresh = deferred = 0
+    deadline = None
+    if policy is not None:
+        from mkts_backend.builder_costs.refresh_policy import (
+            budget_item_count,
+            select_due,
+        )
+
+        params_by_id = {type_id: (me, runs) for type_id, me, runs in fetch_jobs}
+        due = select_due(
+            list(params_by_id),
+            meta_groups,
+            {
+                type_id: (watchlist_metadata.get(type_id) or {}).get("category_id")
+                for type_id in params_by_id
+            },
+            jita_prices,
+            state or {},
+            policy,
+        )
+        fresh = len(fetch_jobs) - len(due)
+        cap = budget_item_count(policy, EVEREF_REQUESTS_PER_MINUTE)
+        if cap is not None and len(due) > cap:
+            deferred = len(due) - cap
+            due = due[:cap]
+        if policy.time_budget_seconds > 0:
+            deadline = time.monotonic() + policy.time_budget_seconds
+        reasons = Counter(item.reason for item in due)
+        logger.info(
+            f"Fetching {len(due)} due builder costs "
+            f"({', '.join(f'{k}={v}' for k, v in sorted(reasons.items())) or 'none'}); "
+            f"{fresh} fresh, {deferred} deferred past the time budget"
+        )
+        fetch_jobs = [(item.type_id, *params_by_id[item.type_id]) for item in due]
+        if not fetch_jobs:
+            return FetchSummary(
+                attempted=0,
+                filtered_unbuildable=unbuildable,
+                filtered_out_of_scope=out_of_scope,
+                fresh=fresh,
+            )
+
     semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
     limiter = AsyncLimiter(EVEREF_REQUESTS_PER_MINUTE, time_period=60.0)
     headers = {"User-Agent": SettingsService().esi_user_agent}
@@ -394,24 +464,37 @@ async def async_fetch_builder_costs(
     async with httpx.AsyncClient(http2=True, headers=headers) as client:
         results = await asyncio.gather(
             *(
-                _fetch_one(client, semaphore, limiter, type_id, me, runs, progress)
+                _fetch_one(
+                    client, semaphore, limiter, type_id, me, runs, progress, deadline
+                )
                 for type_id, me, runs in fetch_jobs
             )
         )
 
-    successful = [result for result in results if result is not None]
-    failed = len(fetch_jobs) - len(successful)
+    out_of_time = sum(1 for result in results if result is DEFERRED)
+    if out_of_time:
+        logger.warning(
+            f"Time budget reached; deferred {out_of_time} more items to the next run"
+        )
+    deferred += out_of_time
+    attempted = len(fetch_jobs) - out_of_time
+    successful = [
+        result for result in results if result is not None and result is not DEFERRED
+    ]
+    failed = attempted - len(successful)
     if failed:
         logger.warning(
-            f"{failed}/{len(fetch_jobs)} items failed; persisting the {len(successful)} successful results"
+            f"{failed}/{attempted} items failed; persisting the {len(successful)} successful results"
         )
     else:
-        logger.info(f"{len(successful)}/{len(fetch_jobs)} items fetched successfully")
+        logger.info(f"{len(successful)}/{attempted} items fetched successfully")
     return FetchSummary(
         records=successful,
-        attempted=len(fetch_jobs),
+        attempted=attempted,
         filtered_unbuildable=unbuildable,
         filtered_out_of_scope=out_of_scope,
+        fresh=fresh,
+        deferred=deferred,
     )
 
 
@@ -420,6 +503,8 @@ def run_async_fetch_builder_costs(
     jita_prices: dict[int, float],
     sde_engine: Engine,
     watchlist_metadata: Mapping[int, WatchlistMetadata] | None = None,
+    state: "Mapping[int, CostState] | None" = None,
+    policy: "RefreshPolicy | None" = None,
 ) -> FetchSummary:
     return asyncio.run(
         async_fetch_builder_costs(
@@ -427,6 +512,8 @@ def run_async_fetch_builder_costs(
             jita_prices,
             sde_engine,
             watchlist_metadata=watchlist_metadata,
+            state=state,
+            policy=policy,
         )
     )
 
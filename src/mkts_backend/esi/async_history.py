@@ -1,23 +1,27 @@
 import asyncio
-import os
+import threading
 import time
 import httpx
 from aiolimiter import AsyncLimiter
 from typing import Optional, TYPE_CHECKING
 from mkts_backend.config.db_config import DatabaseConfig
 from mkts_backend.config.esi_config import ESIConfig
-from mkts_backend.config.logging_config import configure_logging
+from mkts_backend.config.logging_config import ProgressReporter, configure_logging
+from mkts_backend.esi.esi_governor import get_governor
 
 if TYPE_CHECKING:
     from mkts_backend.config.market_context import MarketContext
 
 logger = configure_logging(__name__)
-request_count = 0
-error_count = 0
+# Per thread: concurrent market pipelines each run their own event loop in a
+# worker thread, and must not share progress/error counters.
+_counts = threading.local()
 
-# Check if terminal output (progress prints) should be suppressed.
-# Set MKTS_QUIET=1 in CI/GitHub Actions to disable progress output.
-QUIET = os.environ.get("MKTS_QUIET", "0") == "1"
+
+def _count(name: str) -> int:
+    value = getattr(_counts, name, 0) + 1
+    setattr(_counts, name, value)
+    return value
 
 # Default headers - can be overridden when market_ctx is provided
 _DEFAULT_HEADERS = None
@@ -54,11 +58,8 @@ async def call_one(
     sema: asyncio.Semaphore,
     headers: dict,
     cache_entry: dict | None = None,
+    progress: ProgressReporter | None = None,
 ) -> dict:
-    global request_count, error_count
-
-    total_req = length
-
     # Build per-request headers with conditional request fields
     req_headers = dict(headers)
     if cache_entry:
@@ -67,8 +68,11 @@ async def call_one(
         if cache_entry.get("last_modified"):
             req_headers["If-Modified-Since"] = cache_entry["last_modified"]
 
+    governor = get_governor()
     async with limiter:
         async with sema:
+            # Shared with every other market running in this process.
+            await governor.acquire_async()
             try:
                 r = await client.get(
                     f"https://esi.evetech.net/markets/{region_id}/history",
@@ -78,37 +82,25 @@ async def call_one(
                 )
             except httpx.TransportError as exc:
                 logger.error(f"Transport error for type_id {type_id}: {exc}")
-                error_count += 1
+                _count("errors")
                 return {"type_id": type_id, "data": None, "status": 0, "error": str(exc)}
 
-            request_count += 1
-            if not QUIET:
-                print(f"\r fetching history. ({round(100*(request_count/total_req),3)}%)", end="", flush=True)
+            request_count = _count("requests")
+            if progress is not None:
+                progress.update(done=request_count)
 
             # --- ESI Error Limit Headers ---
-            # Track error budget; pause all requests if we're close to exhaustion.
+            # The governor tracks the error budget and pauses every market's
+            # requests (not just this coroutine) when it is close to exhaustion.
             error_remain = r.headers.get("X-ESI-Error-Limit-Remain")
             error_reset = r.headers.get("X-ESI-Error-Limit-Reset")
-
-            if error_remain is not None:
-                try:
-                    remain = int(error_remain)
-                    reset = int(error_reset) if error_reset else 60
-                    if remain < 10:
-                        logger.critical(
-                            f"ESI error budget nearly exhausted: {remain} errors remain, resets in {reset}s. "
-                            f"Pausing requests for {reset}s."
-                        )
-                        await asyncio.sleep(reset)
-                    elif remain < 50:
-                        logger.warning(f"ESI error budget low: {remain} errors remain, resets in {reset}s")
-                except (ValueError, TypeError):
-                    pass
+            governor.observe(r.status_code, r.headers)
 
             # Handle 304 Not Modified — refund rate-limit token since ESI
             # does not count conditional hits against the caller's budget.
             if r.status_code == 304:
                 limiter._level = max(0, limiter._level - 1)
+                governor.refund()
                 return {
                     "type_id": type_id,
                     "data": None,
@@ -128,7 +120,7 @@ async def call_one(
                 }
 
             # --- Error handling for non-200/304 responses ---
-            error_count += 1
+            _count("errors")
             logger.error(
                 f"ESI error for type_id {type_id}: HTTP {r.status_code} | "
                 f"error_remain={error_remain} error_reset={error_reset} | "
@@ -136,20 +128,13 @@ async def call_one(
             )
 
             if r.status_code == 420:
-                # Error limit exceeded — stop hammering and wait for reset
-                reset_seconds = int(error_reset) if error_reset else 60
-                logger.critical(
-                    f"HTTP 420 Error Limit Exceeded. Sleeping {reset_seconds}s until reset."
-                )
-                await asyncio.sleep(reset_seconds)
+                # Error limit exceeded — governor.observe() has paused all
+                # requests until the reset.
                 return {"type_id": type_id, "data": None, "status": 420, "error": "error limit exceeded"}
 
             if r.status_code == 429:
-                # Rate limited — honour Retry-After if present
-                ra = r.headers.get("Retry-After")
-                wait = float(ra) if ra else 5.0
-                logger.warning(f"HTTP 429 for type_id {type_id}, retrying after {wait}s")
-                await asyncio.sleep(wait)
+                # Rate limited — governor.observe() honours Retry-After.
+                logger.warning(f"HTTP 429 for type_id {type_id}")
                 return {"type_id": type_id, "data": None, "status": 429, "error": "rate limited"}
 
             # For client errors (4xx) don't retry — these won't succeed on retry
@@ -164,10 +149,21 @@ async def call_one(
             return {"type_id": type_id, "data": None, "status": r.status_code, "error": f"HTTP {r.status_code}"}
 
 
-async def async_history(watchlist: list[int] = None, region_id: int = None, market_ctx: Optional["MarketContext"] = None):
-    global request_count, error_count
-    request_count = 0
-    error_count = 0
+async def async_history(
+    watchlist: list[int] = None,
+    region_id: int = None,
+    market_ctx: Optional["MarketContext"] = None,
+    cache: dict | None = None,
+    persist_cache: bool = True,
+):
+    """Fetch history for every type in ``watchlist``.
+
+    ``cache`` (type_id -> etag/last_modified) and ``persist_cache=False`` let a
+    caller keep all DB access outside the network phase: pass the preloaded
+    cache in, and save it yourself with ``save_esi_cache``.
+    """
+    _counts.requests = 0
+    _counts.errors = 0
 
     from mkts_backend.db.db_handlers import load_esi_cache, save_esi_cache
 
@@ -195,7 +191,8 @@ async def async_history(watchlist: list[int] = None, region_id: int = None, mark
     length = len(type_ids)
 
     # Load ESI request cache for conditional headers
-    cache = load_esi_cache(region_id, market_ctx)
+    if cache is None:
+        cache = load_esi_cache(region_id, market_ctx)
     if cache:
         logger.info(f"Loaded {len(cache)} ESI cache entries for region {region_id}")
 
@@ -204,14 +201,16 @@ async def async_history(watchlist: list[int] = None, region_id: int = None, mark
     sema = asyncio.Semaphore(50)
 
     t0 = time.perf_counter()
+    progress = ProgressReporter(logger, "fetching history", length)
     async with httpx.AsyncClient(http2=True) as client:
         results = await asyncio.gather(*(
-            call_one(client, tid, length, region_id, limiter, sema, headers, cache_entry=cache.get(tid))
+            call_one(
+                client, tid, length, region_id, limiter, sema, headers,
+                cache_entry=cache.get(tid), progress=progress,
+            )
             for tid in type_ids
         ))
-
-    if not QUIET:
-        print()  # newline after progress output
+    progress.finish()
 
     # Log 200 vs 304 counts
     count_200 = sum(1 for r in results if r and r.get("status") == 200)
@@ -221,7 +220,7 @@ async def async_history(watchlist: list[int] = None, region_id: int = None, mark
         f"Got {len(results)} results in {time.perf_counter()-t0:.1f}s "
         f"({count_200} updated, {count_304} unchanged, {count_err} errors)"
     )
-    logger.info(f"Request count: {request_count}, error count: {error_count}")
+    logger.info(f"Request count: {_counts.requests}, error count: {_counts.errors}")
 
     if count_err > 0:
         error_types = {}
@@ -232,13 +231,22 @@ async def async_history(watchlist: list[int] = None, region_id: int = None, mark
         logger.warning(f"Error breakdown: {error_types}")
 
     # Save updated cache entries (only for successful results)
-    save_esi_cache(results, region_id, market_ctx)
+    if persist_cache:
+        save_esi_cache(results, region_id, market_ctx)
 
     return results
 
 
-def run_async_history(watchlist: list[int] = None, region_id: int = None, market_ctx: Optional["MarketContext"] = None):
-    return asyncio.run(async_history(watchlist, region_id, market_ctx))
+def run_async_history(
+    watchlist: list[int] = None,
+    region_id: int = None,
+    market_ctx: Optional["MarketContext"] = None,
+    cache: dict | None = None,
+    persist_cache: bool = True,
+):
+    return asyncio.run(
+        async_history(watchlist, region_id, market_ctx, cache=cache, persist_cache=persist_cache)
+    )
 
 
 if __name__ == "__main__":
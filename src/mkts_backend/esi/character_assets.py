@@ -3,19 +3,40 @@ Character asset fetching via ESI.
 
 Fetches packaged (non-singleton) assets for configured characters,
 returning {type_id: quantity} maps suitable for display in needed tables.
+
+All characters are fetched concurrently: each resolves its access token
+(reusing an unexpired one) in a worker thread, fetches page 1 to learn
+X-Pages, then fetches the remaining pages concurrently. Every request goes
+through the shared ESI governor plus a local rate limiter and semaphore,
+as the history fetcher does. Pages carry the ETag/Last-Modified stored by
+the previous fetch, so a refresh after the cache TTL is mostly 304s.
+
+Pages are stored as compact rows (see ITEM_FIELDS). A complete fetch
+resolves every item's container chain once (index_asset_locations) and
+writes the result to the location index in asset_cache.
 """
 
+import asyncio
 import os
-from collections import defaultdict
+import time
+from collections import Counter, defaultdict
 from typing import Dict, List, Optional
 
-import requests
+import httpx
+from aiolimiter import AsyncLimiter
 
 from mkts_backend.config.character_config import CharacterConfig
 from mkts_backend.config.logging_config import configure_logging
-from mkts_backend.config.settings_service import get_all_characters
-from mkts_backend.esi.asset_cache import read_cache, write_cache
+from mkts_backend.config.settings_service import SettingsService, get_all_characters
+from mkts_backend.esi.asset_cache import (
+    read_cache,
+    read_pages,
+    write_cache,
+    write_items,
+    write_pages,
+)
 from mkts_backend.esi.esi_auth import get_token_for_character
+from mkts_backend.esi.esi_governor import get_governor
 
 logger = configure_logging(__name__)
 
@@ -25,29 +46,175 @@ ESI_ASSETS_URL = (
 )
 ASSETS_SCOPE = "esi-assets.read_assets.v1"
 
+# Same local caps as the history fetcher; the governor enforces the
+# process-wide budget on top of these.
+RATE_LIMIT = 300
+RATE_PERIOD = 60.0
+MAX_CONCURRENCY = 50
 
-def fetch_character_assets(
+
+# Order of the values in a compact item row, as stored per page.
+ITEM_FIELDS = ("item_id", "type_id", "quantity", "location_id", "location_flag", "is_singleton")
+
+
+def _compact(items: list) -> List[list]:
+    """Reduce raw ESI asset dicts to compact rows in ITEM_FIELDS order."""
+    return [
+        [
+            item["item_id"],
+            item["type_id"],
+            item.get("quantity", 0),
+            item["location_id"],
+            item.get("location_flag"),
+            bool(item.get("is_singleton", False)),
+        ]
+        for item in items
+    ]
+
+
+def _packaged(rows: List[list]) -> Dict[int, int]:
+    """Sum the quantities of packaged (non-singleton) rows by type_id."""
+    assets: Dict[int, int] = defaultdict(int)
+    for _, type_id, quantity, _, _, is_singleton in rows:
+        if not is_singleton:
+            assets[type_id] += quantity
+    return dict(assets)
+
+
+def index_asset_locations(rows: List[list]) -> List[dict]:
+    """
+    Resolve each item's container and root location.
+
+    An item inside a container, ship or other item has that item's item_id
+    as its location_id; the root location is the first location_id up the
+    chain that is not one of the character's own items (a station or
+    structure, or a solar system for items in space).
+
+    Args:
+        rows: Compact rows for all of one character's pages
+
+    Returns:
+        One dict per item with the write_items columns
+    """
+    locations = {row[0]: row[3] for row in rows}
+    roots: Dict[int, int] = {}
+
+    def root_of(location_id: int) -> int:
+        chain = []
+        while location_id in locations and location_id not in roots and location_id not in chain:
+            chain.append(location_id)
+            location_id = locations[location_id]
+        root = roots.get(location_id, location_id)
+        for item_id in chain:
+            roots[item_id] = root
+        return root
+
+    return [
+        {
+            "item_id": item_id,
+            "type_id": type_id,
+            "quantity": quantity,
+            "location_id": location_id,
+            "location_flag": location_flag,
+            "container_id": location_id if location_id in locations else None,
+            "root_location_id": root_of(location_id),
+            "is_singleton": int(is_singleton),
+        }
+        for item_id, type_id, quantity, location_id, location_flag, is_singleton in rows
+    ]
+
+
+async def fetch_asset_page(
+    client: httpx.AsyncClient,
+    char: CharacterConfig,
+    page: int,
+    headers: dict,
+    limiter: AsyncLimiter,
+    sema: asyncio.Semaphore,
+    stored: Optional[dict] = None,
+) -> dict:
+    """
+    Fetch one page of a character's assets, conditionally if it was stored.
+
+    Returns:
+        Dict with page, status, items (the page's compact rows, None on
+        error), etag, last_modified and pages (X-Pages, if sent).
+        A 304 returns the stored page's rows.
+    """
+    req_headers = dict(headers)
+    if stored:
+        if stored.get("etag"):
+            req_headers["If-None-Match"] = stored["etag"]
+        if stored.get("last_modified"):
+            req_headers["If-Modified-Since"] = stored["last_modified"]
+
+    governor = get_governor()
+    async with limiter:
+        async with sema:
+            await governor.acquire_async()
+            try:
+                r = await client.get(
+                    ESI_ASSETS_URL.format(char_id=char.char_id, page=page),
+                    headers=req_headers,
+                    timeout=30.0,
+                )
+            except httpx.TransportError as exc:
+                logger.error(f"ESI request failed for {char.name} page {page}: {exc}")
+                return {"page": page, "status": 0, "items": None}
+
+            governor.observe(r.status_code, r.headers)
+            x_pages = r.headers.get("X-Pages")
+            result = {
+                "page": page,
+                "status": r.status_code,
+                "items": None,
+                "pages": int(x_pages) if x_pages else None,
+                "etag": r.headers.get("ETag") or (stored or {}).get("etag"),
+                "last_modified": r.headers.get("Last-Modified") or (stored or {}).get("last_modified"),
+            }
+
+            if r.status_code == 304 and stored:
+                # ESI does not count conditional hits against the budget.
+                limiter._level = max(0, limiter._level - 1)
+                governor.refund()
+                result["items"] = stored["items"]
+            elif r.status_code == 200:
+                result["items"] = _compact(r.json())
+            else:
+                logger.error(f"ESI {r.status_code} for {char.name} page {page}")
+            return result
+
+
+async def fetch_character_assets_async(
+    client: httpx.AsyncClient,
     char: CharacterConfig,
+    limiter: AsyncLimiter,
+    sema: asyncio.Semaphore,
     force_refresh: bool = False,
+    statuses: Optional[Counter] = None,
 ) -> Dict[int, int]:
     """
     Fetch packaged assets for a single character via ESI.
 
     Checks the local SQLite cache first. If cached data is fresh (< 1 hour)
     and force_refresh is False, returns cached data without hitting ESI.
-
-    Paginates through all pages, filters to is_singleton=False (packaged),
-    and sums quantities by type_id.
+    Otherwise fetches page 1, then pages 2..X-Pages concurrently, each
+    conditional on its stored ETag. force_refresh skips the TTL check but
+    still sends the ETags: a 304 means ESI has nothing newer. A complete
+    fetch also rewrites the character's rows in the location index.
 
     Args:
+        client: Shared HTTP client
         char: Character configuration with key, char_id, token_env
-        force_refresh: If True, bypass cache and fetch from ESI
+        limiter: Shared rate limiter
+        sema: Shared concurrency cap
+        force_refresh: If True, bypass the TTL cache and ask ESI
+        statuses: Optional counter of page response statuses
 
     Returns:
         Dict mapping type_id to total packaged quantity.
         Returns empty dict on auth or request failure.
     """
-    # Check cache first
     if not force_refresh:
         cached = read_cache(char.char_id)
         if cached is not None:
@@ -55,79 +222,113 @@ def fetch_character_assets(
             return cached
 
     refresh_token = os.getenv(char.token_env, "")
-
     try:
-        token = get_token_for_character(char.key, refresh_token, ASSETS_SCOPE)
+        token = await asyncio.to_thread(
+            get_token_for_character, char.key, refresh_token, ASSETS_SCOPE
+        )
     except Exception as e:
         logger.error(f"Token fetch failed for {char.name}: {e}")
         return {}
 
-    access_token = token.get("access_token", "")
-    headers = {"Authorization": f"Bearer {access_token}"}
-
-    assets: Dict[int, int] = defaultdict(int)
-    page = 1
+    settings = SettingsService()
+    headers = {
+        "Authorization": f"Bearer {token.get('access_token', '')}",
+        "User-Agent": settings.esi_user_agent,
+        "Accept": "application/json",
+        "X-Compatibility-Date": settings.esi_compatibility_date,
+    }
+
+    stored = read_pages(char.char_id)
+    first = await fetch_asset_page(client, char, 1, headers, limiter, sema, stored.get(1))
+    if first["status"] == 403:
+        print(
+            f"\nToken for {char.name} lacks required scope. Run:\n"
+            f"  mkts-backend esi-auth --char={char.key}\n"
+        )
     max_pages = 1
-    fetch_complete = False
-
-    while page <= max_pages:
-        url = ESI_ASSETS_URL.format(char_id=char.char_id, page=page)
-        try:
-            resp = requests.get(url, headers=headers, timeout=30)
-        except requests.RequestException as e:
-            logger.error(f"ESI request failed for {char.name} page {page}: {e}")
-            break
-
-        if resp.status_code == 403:
-            logger.error(f"ESI 403 for {char.name} — token may lack scope")
-            print(
-                f"\nToken for {char.name} lacks required scope. Run:\n"
-                f"  mkts-backend esi-auth --char={char.key}\n"
-            )
-            break
-        if resp.status_code != 200:
-            logger.error(
-                f"ESI {resp.status_code} for {char.name} page {page}"
-            )
-            break
-
-        if page == 1:
-            max_pages = int(resp.headers.get("X-Pages", 1))
-
-        for item in resp.json():
-            if not item.get("is_singleton", False):
-                assets[item["type_id"]] += item.get("quantity", 0)
-
-        page += 1
-    else:
-        # Loop completed without break — all pages fetched
-        fetch_complete = True
-
-    result = dict(assets)
+    if first["items"] is not None:
+        # A 304 may omit X-Pages; the stored page count is then still current.
+        max_pages = first["pages"] or max(len(stored), 1)
+    rest = await asyncio.gather(*(
+        fetch_asset_page(client, char, page, headers, limiter, sema, stored.get(page))
+        for page in range(2, max_pages + 1)
+    ))
+    pages = [first, *rest]
+    if statuses is not None:
+        statuses.update(p["status"] for p in pages)
+
+    fetched = [p for p in pages if p["items"] is not None]
+    rows = [row for p in fetched for row in p["items"]]
+    result = _packaged(rows)
 
     logger.info(
-        f"Fetched {sum(assets.values())} packaged items "
-        f"({len(assets)} types) for {char.name}"
+        f"Fetched {sum(result.values())} packaged items "
+        f"({len(result)} types) for {char.name} "
+        f"({sum(p['status'] == 304 for p in pages)}/{len(pages)} pages unchanged)"
     )
 
     # Only cache complete fetches to avoid storing partial data
-    if result and fetch_complete:
-        write_cache(char.char_id, result)
-    elif result and not fetch_complete:
+    if len(fetched) == max_pages:
+        if result:
+            write_cache(char.char_id, result)
+        write_pages(char.char_id, {p["page"]: p for p in pages})
+        write_items(char.char_id, index_asset_locations(rows))
+    elif result:
         logger.warning(
             f"Skipping cache for {char.name}: partial fetch "
-            f"(got {page - 1}/{max_pages} pages)"
+            f"(got {len(fetched)}/{max_pages} pages)"
         )
 
     return result
 
 
+async def fetch_all_character_assets_async(
+    characters: List[CharacterConfig],
+    force_refresh: bool = False,
+) -> List[Dict[int, int]]:
+    """Fetch every character's assets concurrently; results follow ``characters``."""
+    limiter = AsyncLimiter(RATE_LIMIT, time_period=RATE_PERIOD)
+    sema = asyncio.Semaphore(MAX_CONCURRENCY)
+    statuses: Counter = Counter()
+
+    t0 = time.perf_counter()
+    async with httpx.AsyncClient(http2=True) as client:
+        results = await asyncio.gather(*(
+            fetch_character_assets_async(
+                client, char, limiter, sema, force_refresh=force_refresh, statuses=statuses
+            )
+            for char in characters
+        ))
+
+    if statuses:
+        errors = sum(n for status, n in statuses.items() if status not in (200, 304))
+        logger.info(
+            f"Fetched {sum(statuses.values())} asset pages for {len(characters)} "
+            f"characters in {time.perf_counter() - t0:.1f}s "
+            f"({statuses[200]} updated, {statuses[304]} unchanged, {errors} errors)"
+        )
+    return results
+
+
+def fetch_character_assets(
+    char: CharacterConfig,
+    force_refresh: bool = False,
+) -> Dict[int, int]:
+    """
+    Fetch packaged assets for a single character via ESI.
+
+    Synchronous wrapper around fetch_all_character_assets_async; see
+    fetch_character_assets_async for cache and paging behaviour.
+    """
+    return asyncio.run(fetch_all_character_assets_async([char], force_refresh))[0]
+
+
 def fetch_all_character_assets(
     type_ids: Optional[List[int]] = None,
     force_refresh: bool = False,
 ) -> List[tuple]:
     """
-    Fetch assets for all configured characters.
+    Fetch assets for all configured characters, concurrently.
 
     Args:
         type_ids: If provided, only include these type_ids in results.
@@ -138,14 +339,13 @@ def fetch_all_character_assets(
         Characters that fail auth are included with empty dicts.
     """
     characters = get_all_characters()
-    results = []
-
-    for char in characters:
-        assets = fetch_character_assets(char, force_refresh=force_refresh)
+    fetched = asyncio.run(fetch_all_character_assets_async(characters, force_refresh))
 
+    results = []
+    for char, assets in zip(characters, fetched):
         if type_ids is not None:
-            assets = {tid: qty for tid, qty in assets.items() if tid in type_ids}
-
+            wanted = set(type_ids)
+            assets = {tid: qty for tid, qty in assets.items() if tid in wanted}
         results.append((char, assets))
 
     return results
@@ -45,7 +45,17 @@ def get_oauth_session(token: dict | None, scope):
     )
 
 
+# Concurrent market pipelines share token.json; serialize refreshes so two
+# threads never redeem the same refresh token.
+_token_lock = threading.Lock()
+
+
 def get_token(requested_scope):
+    with _token_lock:
+        return _get_token(requested_scope)
+
+
+def _get_token(requested_scope):
     if not CLIENT_ID:
         raise ValueError("CLIENT_ID environment variable is not set")
     if not SECRET_KEY:
@@ -94,12 +104,28 @@ def get_token(requested_scope):
             return token
 
 
+# Asset fetches resolve every character's token concurrently; one lock per
+# character keeps two threads from redeeming the same refresh token.
+_char_token_locks: dict[str, threading.Lock] = {}
+_char_token_locks_guard = threading.Lock()
+
+# Refresh a cached access token this many seconds before it expires, so it
+# cannot lapse in the middle of a paginated fetch.
+TOKEN_EXPIRY_MARGIN = 60
+
+
+def _char_token_lock(char_key: str) -> threading.Lock:
+    with _char_token_locks_guard:
+        return _char_token_locks.setdefault(char_key, threading.Lock())
+
+
 def get_token_for_character(char_key: str, refresh_token: str, scope):
     """
     Get an OAuth token for a specific character.
 
     Uses a per-character token cache file (token_<char_key>.json) and the
-    shared CLIENT_ID / SECRET_KEY credentials.
+    shared CLIENT_ID / SECRET_KEY credentials. A cached access token that is
+    valid for at least TOKEN_EXPIRY_MARGIN more seconds is reused as is.
 
     Args:
         char_key: Character key (e.g. "dennis") — used for cache filename
@@ -118,6 +144,11 @@ def get_token_for_character(char_key: str, refresh_token: str, scope):
     if not SECRET_KEY:
         raise ValueError("SECRET_KEY environment variable is not set")
 
+    with _char_token_lock(char_key):
+        return _get_token_for_character(char_key, refresh_token, scope)
+
+
+def _get_token_for_character(char_key: str, refresh_token: str, scope):
     token_file = f"token_{char_key}.json"
 
     # Try loading cached token
@@ -130,7 +161,7 @@ def get_token_for_character(char_key: str, refresh_token: str, scope):
         with open(token_file, "w") as f:
             json.dump(t, f)
 
-    if token and token.get("expires_at", 0) > time.time():
+    if token and token.get("expires_at", 0) > time.time() + TOKEN_EXPIRY_MARGIN:
         return token
 
     # Refresh using the character's refresh token
@@ -0,0 +1,129 @@
+"""Process-wide ESI rate and error-budget governor.
+
+ESI enforces its request rate and its error budget (``X-ESI-Error-Limit-*``)
+per client, not per market. When several market pipelines run at once
+(``update-markets --workers``), every ESI call — the sync orders pager and
+the async history fetcher alike — goes through the one ``EsiGovernor``
+returned by :func:`get_governor`, so the markets share a single token
+bucket and a single pause when the error budget runs low.
+"""
+
+import asyncio
+import threading
+import time
+from typing import Mapping
+
+from mkts_backend.config.logging_config import configure_logging
+
+logger = configure_logging(__name__)
+
+# Matches the per-market AsyncLimiter in async_history.
+DEFAULT_RATE = 300
+DEFAULT_PERIOD = 60.0
+ERROR_BUDGET_PAUSE = 10  # pause everything below this many remaining errors
+ERROR_BUDGET_WARN = 50
+
+
+class EsiGovernor:
+    """Thread-safe token bucket plus a shared pause for ESI error/rate limits.
+
+    Usable from plain threads (:meth:`acquire`) and from event loops running
+    in those threads (:meth:`acquire_async`).
+    """
+
+    def __init__(self, rate: int = DEFAULT_RATE, period: float = DEFAULT_PERIOD):
+        self.rate = rate
+        self.period = period
+        self._tokens = float(rate)
+        self._refill_per_sec = rate / period
+        self._last = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Take a token if one is available; otherwise return seconds to wait."""
+        with self._lock:
+            now = time.monotonic()
+            if now < self._paused_until:
+                return self._paused_until - now
+            self._tokens = min(
+                float(self.rate), self._tokens + (now - self._last) * self._refill_per_sec
+            )
+            self._last = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self._refill_per_sec
+
+    def acquire(self) -> None:
+        """Block the calling thread until a request may be sent."""
+        while (wait := self._reserve()) > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self) -> None:
+        """Await until a request may be sent, without blocking the event loop."""
+        while (wait := self._reserve()) > 0:
+            await asyncio.sleep(wait)
+
+    def refund(self) -> None:
+        """Return a token — ESI does not count conditional (304) hits."""
+        with self._lock:
+            self._tokens = min(float(self.rate), self._tokens + 1)
+
+    def pause(self, seconds: float, reason: str) -> None:
+        """Hold every caller for ``seconds`` (extends, never shortens, a pause)."""
+        with self._lock:
+            until = time.monotonic() + seconds
+            if until <= self._paused_until:
+                return
+            self._paused_until = until
+        logger.critical(f"ESI governor pausing all requests for {seconds:.0f}s: {reason}")
+
+    @property
+    def paused_for(self) -> float:
+        """Seconds left on the current pause (0 if not paused)."""
+        with self._lock:
+            return max(0.0, self._paused_until - time.monotonic())
+
+    def observe(self, status_code: int, headers: Mapping[str, str]) -> None:
+        """Update the shared state from an ESI response's status and headers."""
+        error_remain = headers.get("X-ESI-Error-Limit-Remain")
+        error_reset = headers.get("X-ESI-Error-Limit-Reset")
+        try:
+            reset = int(error_reset) if error_reset else 60
+        except (ValueError, TypeError):
+            reset = 60
+
+        if status_code == 420:
+            self.pause(reset, "HTTP 420 error limit exceeded")
+        elif status_code == 429:
+            retry_after = headers.get("Retry-After")
+            try:
+                wait = float(retry_after) if retry_after else 5.0
+            except (ValueError, TypeError):
+                wait = 5.0
+            self.pause(wait, "HTTP 429 rate limited")
+
+        if error_remain is None:
+            return
+        try:
+            remain = int(error_remain)
+        except (ValueError, TypeError):
+            return
+        if remain < ERROR_BUDGET_PAUSE:
+            self.pause(reset, f"error budget nearly exhausted ({remain} remain)")
+        elif remain < ERROR_BUDGET_WARN:
+            logger.warning(f"ESI error budget low: {remain} errors remain, resets in {reset}s")
+
+
+_governor: EsiGovernor | None = None
+_governor_lock = threading.Lock()
+
+
+def get_governor() -> EsiGovernor:
+    """The process-wide governor shared by every market pipeline."""
+    global _governor
+    with _governor_lock:
+        if _governor is None:
+            _governor = EsiGovernor()
+        return _governor
@@ -9,13 +9,12 @@ import requests
 from millify import millify
 
 from mkts_backend.config.esi_config import ESIConfig
-from mkts_backend.config.logging_config import configure_logging
+from mkts_backend.config.logging_config import ProgressReporter, configure_logging
 from mkts_backend.config.settings_service import SettingsService
+from mkts_backend.esi.esi_governor import get_governor
 
 logger = configure_logging(__name__)
 
-_USER_AGENT = SettingsService().esi_user_agent
-
 # Check if terminal output (progress prints) should be suppressed.
 # Set MKTS_QUIET=1 in CI/GitHub Actions to disable progress output.
 QUIET = os.environ.get("MKTS_QUIET", "0") == "1"
@@ -75,6 +74,7 @@ def fetch_market_orders(
 
     url = esi.market_orders_url
     headers = esi.headers
+    governor = get_governor()
 
     logger.debug(url)
     logger.debug("-------------")
@@ -99,9 +99,11 @@ def fetch_market_orders(
             logger.debug(f"Page {page} request: no etag (fresh request)")
 
         logger.debug(f"Page {page} request headers: {page_headers}")
+        governor.acquire()
         response = requests.get(
             url, headers=page_headers, params=querystring, timeout=10
         )
+        governor.observe(response.status_code, response.headers)
         logger.debug(
             f"Page {page} response: status={response.status_code}, "
             f"ETag={response.headers.get('ETag')}, "
@@ -110,6 +112,7 @@ def fetch_market_orders(
 
         if response.status_code == 304:
             logger.debug(f"Page {page} returned 304 Not Modified")
+            governor.refund()
             got_any_304 = True
             if test_mode:
                 max_pages = 5
@@ -134,9 +137,11 @@ def fetch_market_orders(
             except requests.exceptions.JSONDecodeError:
                 logger.warning(f"Malformed JSON on page {page}, retrying once...")
                 time.sleep(1)
+                governor.acquire()
                 response = requests.get(
                     url, headers=page_headers, params=querystring, timeout=10
                 )
+                governor.observe(response.status_code, response.headers)
                 response.raise_for_status()
                 data = response.json()
                 # Capture etag from retry too
@@ -243,20 +248,16 @@ def fetch_history(watchlist: pd.DataFrame) -> list[dict[str, object]] | None:
     history: list[dict[str, object]] = []
     request_count = 0
     watchlist_length = len(type_ids)
+    progress = ProgressReporter(logger, "fetching history", watchlist_length)
 
     while request_count < watchlist_length:
         type_id = type_ids[request_count]
         item_name = watchlist[watchlist["type_id"] == type_id]["type_name"].values[0]
-        logger.info(f"Fetching history for {item_name}: {type_id}")
+        logger.debug(f"Fetching history for {item_name}: {type_id}")
         querystring = {"type_id": type_id}
         request_count += 1
         try:
-            if not QUIET:
-                print(
-                    f"\rFetching history for ({request_count}/{watchlist_length})",
-                    end="",
-                    flush=True,
-                )
+            progress.update(done=request_count)
             t1 = time.perf_counter()
             response = requests.get(
                 url, headers=headers, timeout=10, params=querystring
@@ -264,7 +265,7 @@ def fetch_history(watchlist: pd.DataFrame) -> list[dict[str, object]] | None:
             response.raise_for_status()
 
             if response.status_code == 200:
-                logger.info(f"response successful: {response.status_code}")
+                logger.debug(f"response successful: {response.status_code}")
                 error_remain_header = response.headers.get(
                     "X-Esi-Error-Limit-Remain", "100"
                 )
@@ -303,15 +304,15 @@ def fetch_history(watchlist: pd.DataFrame) -> list[dict[str, object]] | None:
         t2 = time.perf_counter()
         time_taken = round(t2 - t1, 2)
         total_time_taken += time_taken
-        logger.info(
+        logger.debug(
             f"time: {time_taken}s, average: {round(total_time_taken / request_count, 2)}s"
         )
         if time_taken < 0.25:
             time.sleep(0.5)
-            if not QUIET:
-                print(
-                    f"sleeping for 0.5 seconds to avoid rate limiting. Time: {time_taken}s"
-                )
+            logger.debug(
+                f"sleeping for 0.5 seconds to avoid rate limiting. Time: {time_taken}s"
+            )
+    progress.finish()
     if history:
         logger.info(f"Successfully fetched {len(history)} total history records")
         os.makedirs("data", exist_ok=True)
@@ -331,6 +332,7 @@ def fetch_region_orders(
     page = 1
     error_count = 0
     logger.info(f"Getting orders for region {region_id} with order type {order_type}")
+    user_agent = SettingsService().esi_user_agent
     begin_time = time.time()
 
     while page <= max_pages:
@@ -339,7 +341,7 @@ def fetch_region_orders(
         elapsed = "0"
 
         headers = {
-            "User-Agent": _USER_AGENT,
+            "User-Agent": user_agent,
             "Accept": "application/json",
         }
         base_url = f"https://esi.evetech.net/latest/markets/{region_id}/orders/?datasource=tranquility&order_type={order_type}&page={page}"
@@ -454,7 +456,7 @@ def fetch_region_item_history(region_id: int, type_id: int) -> list[dict[str, ob
         "X-Compatibility-Date": "2020-01-01",
         "X-Tenant": "tranquility",
         "Accept": "application/json",
-        "User-Agent": _USER_AGENT,
+        "User-Agent": SettingsService().esi_user_agent,
     }
 
     try:
@@ -0,0 +1,224 @@
+"""Per-market stage checkpoints and input freshness for ``update-markets``.
+
+Every checkpointed stage of the market pipeline records a row in the market
+DB's ``pipeline_checkpoints`` table when it completes: the stage, the market,
+an *inputs version* and the completion time.
+
+Each stage declares what it reads (``STAGE_INPUTS``). The inputs version is a
+hash of those inputs as they stood when the stage started:
+
+- tables the pipeline writes are fingerprinted by their ``updatelog``
+  timestamp (a 304 from ESI writes nothing, so the timestamp stays put);
+- tables edited outside the pipeline (watchlist, doctrine fits, ship
+  targets, module equivalents) by a hash of their key columns;
+- ``@date`` stands for the current UTC date, for stages whose SQL uses a
+  rolling ``DATE('now', ...)`` window;
+- ``@updatelog`` for every updatelog row (anything the push could carry).
+
+A stage with inputs is skipped when its last successful run saw the same
+inputs version, unless ``--force`` is given. Stages fed only by ESI (orders,
+history) have no local inputs; they are only skipped by ``--resume``, while
+their checkpoint is younger than ``[pipeline] resume_max_age_minutes``.
+History is fetched in batches and checkpointed as "partial" after each one,
+so a resumed run continues from the first unfetched type.
+"""
+
+import hashlib
+import json
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Any, Optional
+
+from sqlalchemy import DateTime, String, select, text
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import SQLAlchemyError
+
+from mkts_backend.config.logging_config import configure_logging
+
+if TYPE_CHECKING:
+    from mkts_backend.db.models import PipelineCheckpoint
+
+logger = configure_logging(__name__)
+
+# Checkpointed stage -> the inputs it reads.
+STAGE_INPUTS: dict[str, tuple[str, ...]] = {
+    "orders_write": (),
+    "history": (),
+    "stats": ("marketorders", "market_history", "watchlist", "module_equivalents", "@date"),
+    "doctrines": ("marketstats", "doctrines"),
+    "needed": ("marketstats", "doctrines", "ship_targets"),
+    "push": ("@updatelog",),
+    "sheets": ("marketorders", "marketstats"),
+}
+
+# Helper stages that only exist to feed a checkpointed one; they are skipped
+# together with it.
+STAGE_OWNER: dict[str, str] = {
+    "orders_cache": "orders_write",
+    "orders_fetch": "orders_write",
+}
+
+# Inputs not tracked by updatelog: hash of the columns the pipeline reads.
+CONTENT_FINGERPRINTS: dict[str, str] = {
+    "watchlist": "SELECT type_id FROM watchlist ORDER BY type_id",
+    "doctrines": (
+        "SELECT fit_id, ship_id, type_id, fit_qty FROM doctrines ORDER BY fit_id, type_id"
+    ),
+    "ship_targets": "SELECT fit_id, fit_name, ship_target FROM ship_targets ORDER BY fit_id",
+    "doctrine_fits": "SELECT * FROM doctrine_fits ORDER BY fit_id, doctrine_id",
+    "module_equivalents": (
+        "SELECT equiv_group_id, type_id FROM module_equivalents ORDER BY equiv_group_id, type_id"
+    ),
+}
+
+DONE = "done"
+PARTIAL = "partial"
+
+
+# Typed like UpdateLog's columns, so the stamps format exactly as through the
+# ORM, without importing db.models (read_updatelog is on the CLI's hot path).
+_UPDATELOG_QUERY = text("SELECT table_name, timestamp FROM updatelog").columns(
+    table_name=String, timestamp=DateTime
+)
+
+
+def _as_utc(ts: datetime) -> datetime:
+    return ts if ts.tzinfo else ts.replace(tzinfo=timezone.utc)
+
+
+def read_updatelog(conn) -> dict[str, str]:
+    """``{table_name: timestamp}`` from updatelog ({} if there is none)."""
+    try:
+        return {
+            row.table_name: str(row.timestamp)
+            for row in conn.execute(_UPDATELOG_QUERY)
+        }
+    except SQLAlchemyError:
+        return {}
+
+
+def content_fingerprint(conn, name: str) -> str:
+    """Hash of the ``CONTENT_FINGERPRINTS`` rows of ``name`` ("" if unreadable)."""
+    try:
+        rows = conn.execute(text(CONTENT_FINGERPRINTS[name])).fetchall()
+    except SQLAlchemyError:
+        return ""
+    return hashlib.sha1(repr(rows).encode()).hexdigest()
+
+
+class CheckpointStore:
+    """The checkpoints of one market, cached in memory for the run.
+
+    ``resume=False`` still records every checkpoint (so the *next* run can
+    resume) but never skips ESI-fed stages. ``force=True`` never skips
+    anything.
+    """
+
+    def __init__(
+        self,
+        engine,
+        market: str,
+        resume: bool = False,
+        force: bool = False,
+        max_age_minutes: int = 60,
+    ):
+        from mkts_backend.db.models import PipelineCheckpoint
+
+        self.engine = engine
+        self.market = market
+        self.resume = resume
+        self.force = force
+        self.max_age = timedelta(minutes=max_age_minutes)
+        self._rows: dict[str, "PipelineCheckpoint"] = {}
+        # inputs version each stage started from, recorded on completion
+        self._started: dict[str, str] = {}
+        PipelineCheckpoint.__table__.create(engine, checkfirst=True)  # pyright: ignore[reportAttributeAccessIssue]
+        self._load()
+
+    def _load(self) -> None:
+        from mkts_backend.db.models import PipelineCheckpoint
+
+        stmt = select(PipelineCheckpoint).where(PipelineCheckpoint.market == self.market)
+        with self.engine.connect() as conn:
+            for row in conn.execute(stmt).mappings():
+                self._rows[row["stage"]] = PipelineCheckpoint(**row)
+
+    def _fingerprint(self, conn, name: str, updatelog: dict[str, str]) -> str:
+        if name == "@date":
+            return datetime.now(timezone.utc).date().isoformat()
+        if name == "@updatelog":
+            return ",".join(f"{k}={v}" for k, v in sorted(updatelog.items()))
+        if name in CONTENT_FINGERPRINTS:
+            return content_fingerprint(conn, name)
+        return updatelog.get(name, "")
+
+    def inputs_version(self, stage: str) -> str:
+        """Hash of the current state of everything ``stage`` reads."""
+        inputs = STAGE_INPUTS.get(stage, ())
+        parts = []
+        if inputs:
+            with self.engine.connect() as conn:
+                updatelog = read_updatelog(conn)
+                parts = [f"{name}={self._fingerprint(conn, name, updatelog)}" for name in inputs]
+        return hashlib.sha1("|".join(parts).encode()).hexdigest()[:16]
+
+    def is_fresh(self, stage: str) -> bool:
+        """True if ``stage`` (or the stage it feeds) can be skipped this run.
+
+        Also remembers the inputs version the stage is about to run on, so
+        :meth:`record` stores what the stage actually consumed.
+        """
+        stage = STAGE_OWNER.get(stage, stage)
+        if stage not in STAGE_INPUTS:
+            return False
+        version = self.inputs_version(stage)
+        self._started[stage] = version
+        if self.force:
+            return False
+        row = self._rows.get(stage)
+        if row is None or row.status != DONE or row.inputs_version != version:
+            return False
+        if STAGE_INPUTS[stage]:
+            return True
+        return self.resume and self._young(row)
+
+    def _young(self, row: "PipelineCheckpoint") -> bool:
+        return datetime.now(timezone.utc) - _as_utc(row.completed_at) <= self.max_age
+
+    def partial(self, stage: str) -> dict[str, Any]:
+        """Progress marker of an unfinished batched stage ({} if none to resume)."""
+        if not self.resume or self.force:
+            return {}
+        row = self._rows.get(stage)
+        if row is None or row.status != PARTIAL or not row.detail or not self._young(row):
+            return {}
+        return json.loads(row.detail)
+
+    def record(self, stage: str, status: str = DONE, detail: Optional[dict] = None) -> None:
+        """Upsert the checkpoint for ``stage``; failures are logged, not raised."""
+        from mkts_backend.db.models import PipelineCheckpoint
+
+        if stage not in STAGE_INPUTS:
+            return
+        version = self._started.get(stage)
+        if version is None:
+            version = self.inputs_version(stage)
+        values = {
+            "market": self.market,
+            "stage": stage,
+            "inputs_version": version,
+            "status": status,
+            "detail": json.dumps(detail) if detail else None,
+            "completed_at": datetime.now(timezone.utc),
+        }
+        stmt = sqlite_insert(PipelineCheckpoint).values(**values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["market", "stage"],
+            set_={k: stmt.excluded[k] for k in values if k not in ("market", "stage")},
+        )
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(stmt)
+        except SQLAlchemyError as e:
+            logger.warning(f"Could not record checkpoint {self.market}/{stage}: {e}")
+            return
+        self._rows[stage] = PipelineCheckpoint(**values)
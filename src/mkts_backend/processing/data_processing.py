@@ -1,3 +1,6 @@
+import json
+from collections import defaultdict
+
 import pandas as pd
 from typing import Optional, TYPE_CHECKING
 from mkts_backend.config.logging_config import configure_logging
@@ -25,32 +28,33 @@ def _get_db(market_ctx: Optional["MarketContext"] = None) -> DatabaseConfig:
     return _wcmkt_db
 
 
-def calculate_5_percentile_price(market_ctx: Optional["MarketContext"] = None) -> pd.DataFrame:
-    query = """
+FIVE_PERCENTILE_QUERY = """
     SELECT
     type_id,
     price
     FROM marketorders
     WHERE is_buy_order = 0
     """
+
+
+def calculate_5_percentile_price(market_ctx: Optional["MarketContext"] = None) -> pd.DataFrame:
     db = _get_db(market_ctx)
     engine = db.engine
     with engine.connect() as conn:
-        df = pd.read_sql_query(query, conn)
+        df = pd.read_sql_query(FIVE_PERCENTILE_QUERY, conn)
     logger.info(f"5 percentile price queried: {df.shape[0]} items")
     df = df.groupby("type_id")["price"].quantile(0.05).reset_index()
     df["price"] = df["price"].round(2)
     df.columns = ["type_id", "5_perc_price"]
     return df
 
-def calculate_market_stats(market_ctx: Optional["MarketContext"] = None) -> pd.DataFrame:
-    # market_history.type_id is VARCHAR while watchlist.type_id is INTEGER.
-    # The CAST keeps both join keys the same affinity: turso re-executes a
-    # joined subquery per outer row when key affinities differ (minutes vs
-    # 0.1s here). See docs/turso-subquery-materialization.md.
-    # total_volume_remain * 1.0 forces float division — both operands are
-    # integers, so days_remaining would otherwise be silently truncated.
-    query = """
+# market_history.type_id is VARCHAR while watchlist.type_id is INTEGER.
+# The CAST keeps both join keys the same affinity: turso re-executes a
+# joined subquery per outer row when key affinities differ (minutes vs
+# 0.1s here). See docs/turso-subquery-materialization.md.
+# total_volume_remain * 1.0 forces float division — both operands are
+# integers, so days_remaining would otherwise be silently truncated.
+MARKET_STATS_QUERY = """
     SELECT
     w.type_id,
     w.type_name,
@@ -90,10 +94,13 @@ def calculate_market_stats(market_ctx: Optional["MarketContext"] = None) -> pd.D
     GROUP BY type_id
     ) AS h ON w.type_id = h.type_id
     """
+
+
+def calculate_market_stats(market_ctx: Optional["MarketContext"] = None) -> pd.DataFrame:
     db = _get_db(market_ctx)
     engine = db.engine
     with engine.connect() as conn:
-        df = pd.read_sql_query(query, conn)
+        df = pd.read_sql_query(MARKET_STATS_QUERY, conn)
         logger.info(f"Market stats queried: {df.shape[0]} items")
 
     logger.info("Calculating 5 percentile price")
@@ -117,6 +124,8 @@ def calculate_market_stats(market_ctx: Optional["MarketContext"] = None) -> pd.D
     df["avg_volume"] = df["avg_volume"].where(df["avg_volume"] > 0, 0.0).round(1).astype("float64")
     df["total_volume_remain"] = df["total_volume_remain"].fillna(0).astype("int64")
 
+    df = add_equiv_totals(df, market_ctx)
+
     # Ensure we have all required database columns
     db_cols = MarketStats.__table__.columns.keys()
     df = df[db_cols]
@@ -131,6 +140,7 @@ def calculate_market_stats(market_ctx: Optional["MarketContext"] = None) -> pd.D
         "avg_volume":          "float64",
         "days_remaining":      "float64",
         "total_volume_remain": "int64",
+        "equiv_total_stock":   "int64",
     }
     for col, expected in expected_dtypes.items():
         if col in df.columns and str(df[col].dtype) != expected:
@@ -142,6 +152,39 @@ def calculate_market_stats(market_ctx: Optional["MarketContext"] = None) -> pd.D
     logger.info(f"Market stats calculated: {df.shape[0]} items")
     return df
 
+EQUIV_GROUPS_QUERY = """
+    SELECT type_id, MIN(equiv_group_id) AS equiv_group_id
+    FROM module_equivalents
+    GROUP BY type_id
+    """
+
+
+def add_equiv_totals(stats: pd.DataFrame, market_ctx: Optional["MarketContext"] = None) -> pd.DataFrame:
+    """Add ``equiv_group_id`` and ``equiv_total_stock`` to market stats.
+
+    One read of ``module_equivalents`` and a group-sum of
+    ``total_volume_remain``. Ungrouped types get group 0 and their own stock.
+    """
+    db = _get_db(market_ctx)
+    try:
+        with db.engine.connect() as conn:
+            groups = pd.read_sql_query(EQUIV_GROUPS_QUERY, conn)
+    except Exception as e:
+        logger.debug(f"No module equivalents: {e}")
+        groups = pd.DataFrame({"type_id": [], "equiv_group_id": []})
+
+    group_of = groups.set_index("type_id")["equiv_group_id"]
+    stats["equiv_group_id"] = stats["type_id"].map(group_of).fillna(0).astype("int64")
+    grouped = stats[stats["equiv_group_id"] > 0]
+    group_stock = grouped.groupby("equiv_group_id")["total_volume_remain"].sum()
+    stats["equiv_total_stock"] = (
+        stats["equiv_group_id"].map(group_stock)
+        .fillna(stats["total_volume_remain"])
+        .astype("int64")
+    )
+    return stats
+
+
 def fill_nulls_from_history(stats: pd.DataFrame, market_ctx: Optional["MarketContext"] = None) -> pd.DataFrame:
     """
     Fill nulls from market history data.
@@ -247,25 +290,54 @@ def fill_nulls_from_history(stats: pd.DataFrame, market_ctx: Optional["MarketCon
     logger.info("No nulls found after filling")
     return stats
 
-def calculate_doctrine_stats(market_ctx: Optional["MarketContext"] = None) -> pd.DataFrame:
-    doctrine_query = """
+DOCTRINE_STATS_DOCTRINES_QUERY = """
     SELECT
     *
     FROM doctrines
     """
-    stats_query = """
+DOCTRINE_STATS_MARKETSTATS_QUERY = """
     SELECT
     *
     FROM marketstats
     """
+
+
+def _doctrine_equiv_stock(doctrine_stats: pd.DataFrame, market_stats: pd.DataFrame) -> pd.Series:
+    """Stock of each row's equivalents, less the group members its fit already uses.
+
+    ``equiv_total_stock`` covers the whole group; subtracting the stock of
+    every group member in the same fit (the row's own type included) leaves
+    what the equivalents add for that fit.
+    """
+    zero = pd.Series(0, index=doctrine_stats.index, dtype="int64")
+    if "equiv_group_id" not in market_stats.columns:
+        return zero
+    by_type = market_stats.set_index("type_id")
+    group = doctrine_stats["type_id"].map(by_type["equiv_group_id"]).fillna(0).astype("int64")
+    if not (group > 0).any():
+        return zero
+    group_total = doctrine_stats["type_id"].map(by_type["equiv_total_stock"]).fillna(0)
+
+    members = doctrine_stats[["fit_id", "type_id"]].assign(
+        group=group, stock=doctrine_stats["total_stock"].fillna(0)
+    ).drop_duplicates(["fit_id", "type_id"])
+    used = members[members["group"] > 0].groupby(["fit_id", "group"])["stock"].sum()
+    key = pd.MultiIndex.from_arrays([doctrine_stats["fit_id"], group])
+    used_by_row = pd.Series(used.reindex(key).to_numpy(), index=doctrine_stats.index).fillna(0)
+
+    extra = (group_total - used_by_row).where(group > 0, 0).clip(lower=0)
+    return extra.astype("int64")
+
+
+def calculate_doctrine_stats(market_ctx: Optional["MarketContext"] = None) -> pd.DataFrame:
     db = _get_db(market_ctx)
     engine = db.engine
     with engine.connect() as conn:
-        doctrine_stats = pd.read_sql_query(doctrine_query, conn)
-        market_stats = pd.read_sql_query(stats_query, conn)
+        doctrine_stats = pd.read_sql_query(DOCTRINE_STATS_DOCTRINES_QUERY, conn)
+        market_stats = pd.read_sql_query(DOCTRINE_STATS_MARKETSTATS_QUERY, conn)
     doctrine_stats = doctrine_stats.drop(columns=[
-        "hulls", "fits_on_mkt", "total_stock", "avg_vol", "days", "timestamp"
-    ])
+        "hulls", "fits_on_mkt", "total_stock", "avg_vol", "days", "timestamp", "equiv_stock"
+    ], errors="ignore")
     doctrine_stats["hulls"] = doctrine_stats["ship_id"].map(
         market_stats.set_index("type_id")["total_volume_remain"]
     )
@@ -284,9 +356,13 @@ def calculate_doctrine_stats(market_ctx: Optional["MarketContext"] = None) -> pd
     doctrine_stats["timestamp"] = doctrine_stats["type_id"].map(
         market_stats.set_index("type_id")["last_update"]
     )
-    # Calculate fits_on_mkt with safe division
+    doctrine_stats["equiv_stock"] = _doctrine_equiv_stock(doctrine_stats, market_stats)
+    # Calculate fits_on_mkt with safe division; equivalents count as stock
     doctrine_stats["fits_on_mkt"] = doctrine_stats.apply(
-        lambda row: round(row["total_stock"] / row["fit_qty"], 1) if row["fit_qty"] > 0 else 0,
+        lambda row: (
+            round((row["total_stock"] + row["equiv_stock"]) / row["fit_qty"], 1)
+            if row["fit_qty"] > 0 else 0
+        ),
         axis=1
     )
 
@@ -302,7 +378,7 @@ def calculate_doctrine_stats(market_ctx: Optional["MarketContext"] = None) -> pd
     # Convert ALL integer columns to int with explicit type safety
     # Include both nullable and non-nullable Integer columns from the model
     int_cols = ['id', 'fit_id', 'ship_id', 'hulls', 'type_id', 'fit_qty',
-                'total_stock', 'group_id', 'category_id']
+                'total_stock', 'group_id', 'category_id', 'equiv_stock']
     for col in int_cols:
         if col in doctrine_stats.columns:
             # Ensure clean conversion: coerce any non-numeric, replace NaN, convert to int
@@ -330,5 +406,94 @@ def calculate_doctrine_stats(market_ctx: Optional["MarketContext"] = None) -> pd
 
     return doctrine_stats
 
+
+NEEDED_ITEMS_DOCTRINES_QUERY = """
+    SELECT
+        d.fit_id,
+        t.fit_name,
+        d.ship_id,
+        d.ship_name,
+        d.type_id,
+        d.type_name,
+        d.fit_qty,
+        t.ship_target AS target,
+        d.total_stock,
+        d.equiv_stock,
+        d.fits_on_mkt
+    FROM doctrines AS d
+    JOIN ship_targets AS t
+        ON d.fit_id = t.fit_id
+    WHERE t.ship_target > 0
+    """
+NEEDED_ITEMS_EQUIV_QUERY = """
+    SELECT equiv_group_id, type_id, type_name, total_volume_remain AS stock
+    FROM marketstats
+    WHERE equiv_group_id > 0
+    """
+NEEDED_ITEMS_COLUMNS = [
+    "fit_id", "fit_name", "ship_id", "ship_name", "type_id", "type_name",
+    "fit_qty", "target", "total_stock", "equiv_stock", "equiv_items",
+    "fits_on_mkt", "targ_perc", "qty_needed", "timestamp",
+]
+
+
+def _equiv_breakdown(items: pd.DataFrame, equivs: pd.DataFrame) -> list:
+    """Per-row JSON list of the equivalents in ``doctrines.equiv_stock``."""
+    group_of: dict[int, int] = {}
+    members: dict[int, list] = defaultdict(list)
+    for row in equivs.itertuples(index=False):
+        group_of[row.type_id] = row.equiv_group_id
+        members[row.equiv_group_id].append((row.type_id, row.type_name, int(row.stock)))
+    fit_types = items.groupby("fit_id")["type_id"].agg(set).to_dict()
+
+    breakdown = []
+    for row in items.itertuples(index=False):
+        if not row.equiv_stock:
+            breakdown.append("[]")
+            continue
+        in_fit = fit_types[row.fit_id]
+        breakdown.append(json.dumps([
+            {"type_id": int(type_id), "type_name": type_name, "stock": qty}
+            for type_id, type_name, qty in members.get(group_of.get(row.type_id), [])
+            if type_id not in in_fit and qty > 0
+        ]))
+    return breakdown
+
+
+def calculate_needed_items(market_ctx: Optional["MarketContext"] = None) -> pd.DataFrame:
+    """Doctrine items below their ship target, for the ``needed_items`` table.
+
+    Reads the freshly written ``doctrines`` stats, whose ``fits_on_mkt``
+    already counts equivalent modules (``equiv_stock``). The equivalents'
+    breakdown comes from the ``marketstats`` equivalence groups.
+    """
+    db = _get_db(market_ctx)
+    with db.engine.connect() as conn:
+        items = pd.read_sql_query(NEEDED_ITEMS_DOCTRINES_QUERY, conn)
+        try:
+            equivs = pd.read_sql_query(NEEDED_ITEMS_EQUIV_QUERY, conn)
+        except Exception as e:
+            logger.debug(f"No equivalence groups in marketstats: {e}")
+            equivs = pd.DataFrame(columns=["equiv_group_id", "type_id", "type_name", "stock"])
+
+    if items.empty:
+        return pd.DataFrame(columns=NEEDED_ITEMS_COLUMNS)
+
+    items["fit_qty"] = items["fit_qty"].fillna(1).astype(int).clip(lower=1)
+    items["equiv_stock"] = items["equiv_stock"].fillna(0).astype(int)
+    items["total_stock"] = items["total_stock"].fillna(0).astype(int) + items["equiv_stock"]
+    items["fits_on_mkt"] = items["fits_on_mkt"].fillna(0)
+    items["equiv_items"] = _equiv_breakdown(items, equivs)
+    items["targ_perc"] = (items["fits_on_mkt"] / items["target"]).round(2)
+    items["qty_needed"] = (
+        ((items["target"] - items["fits_on_mkt"]) * items["fit_qty"]).clip(lower=0).astype(int)
+    )
+    items["fit_name"] = items["fit_name"].fillna("Unknown")
+    items["timestamp"] = pd.Timestamp.now(tz="UTC").tz_localize(None)
+
+    needed = items[items["qty_needed"] > 0]
+    needed = needed.sort_values(["ship_name", "fit_id", "targ_perc"])
+    return needed[NEEDED_ITEMS_COLUMNS].reset_index(drop=True)
+
 if __name__ == "__main__":
     pass
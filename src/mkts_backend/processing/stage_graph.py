@@ -0,0 +1,217 @@
+"""Tiny dependency-graph executor for the per-market pipeline.
+
+A pipeline is a list of :class:`Stage` objects. Each stage runs once all of
+its ``deps`` have finished, receiving the shared ``results`` dict (stage name
+-> return value). Two kinds of stage exist:
+
+- ``"network"`` stages (ESI fetches, Turso push, Sheets) run concurrently
+  with anything else that is ready.
+- ``"db"`` stages hold a single lane lock, so at most one touches the market
+  database at a time — SQLite (and the turso sync engine) serialize writers
+  anyway, and this keeps transaction ordering deterministic.
+
+So the history fetch can be in flight while orders are written, but two
+upserts never race. A failing ``required`` stage stops everything not yet
+started and is re-raised; a failing optional stage is logged and its
+dependents run without its result.
+
+``should_skip`` and ``on_complete`` hooks let the caller skip stages whose
+output is already current and record each completion (see checkpoints).
+"""
+
+import contextvars
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from mkts_backend.config.logging_config import configure_logging
+
+logger = configure_logging(__name__)
+
+STAGE_KINDS = ("network", "db")
+
+
+@dataclass
+class Stage:
+    """One node of the pipeline graph."""
+
+    name: str
+    fn: Callable[[dict[str, Any]], Any]
+    deps: tuple[str, ...] = ()
+    kind: str = "db"
+    required: bool = True
+
+    def __post_init__(self):
+        if self.kind not in STAGE_KINDS:
+            raise ValueError(f"Stage {self.name}: kind must be one of {STAGE_KINDS}")
+
+
+@dataclass
+class StageTiming:
+    name: str
+    kind: str
+    status: str  # "ok", "skipped", "failed", "not run"
+    started: float = 0.0  # seconds after the graph started
+    seconds: float = 0.0
+    waited: float = 0.0  # time spent queued for the db lane
+    error: str | None = None
+
+
+@dataclass
+class StageReport:
+    """Per-stage timings for one run of the graph."""
+
+    timings: dict[str, StageTiming] = field(default_factory=dict)
+    total_seconds: float = 0.0
+
+    @property
+    def serial_seconds(self) -> float:
+        """What the stages would have taken back to back."""
+        return sum(t.seconds for t in self.timings.values())
+
+    def summary(self) -> str:
+        lines = [
+            f"{'stage':<16} {'kind':<8} {'status':<8} {'start':>7} {'time':>8} {'db wait':>8}"
+        ]
+        for t in sorted(self.timings.values(), key=lambda t: (t.status == "not run", t.started)):
+            lines.append(
+                f"{t.name:<16} {t.kind:<8} {t.status:<8} {t.started:>6.1f}s "
+                f"{t.seconds:>7.2f}s {t.waited:>7.2f}s"
+            )
+        lines.append(
+            f"total {self.total_seconds:.1f}s wall vs {self.serial_seconds:.1f}s serial"
+        )
+        return "\n".join(lines)
+
+
+class StageFailed(RuntimeError):
+    """A required stage raised; ``__cause__`` is the original exception."""
+
+    def __init__(self, stage: str, report: StageReport):
+        super().__init__(f"stage '{stage}' failed")
+        self.stage = stage
+        self.report = report
+
+
+def _validate(stages: list[Stage]) -> None:
+    names = [s.name for s in stages]
+    if len(names) != len(set(names)):
+        raise ValueError(f"Duplicate stage names: {names}")
+    known = set(names)
+    for stage in stages:
+        missing = set(stage.deps) - known
+        if missing:
+            raise ValueError(f"Stage {stage.name} depends on unknown stage(s) {sorted(missing)}")
+    # Kahn's algorithm: every stage must be reachable without a cycle.
+    remaining = {s.name: set(s.deps) for s in stages}
+    while remaining:
+        ready = [n for n, d in remaining.items() if not d]
+        if not ready:
+            raise ValueError(f"Dependency cycle among {sorted(remaining)}")
+        for n in ready:
+            del remaining[n]
+        for d in remaining.values():
+            d.difference_update(ready)
+
+
+def run_stages(
+    stages: list[Stage],
+    max_workers: int = 4,
+    results: dict[str, Any] | None = None,
+    db_lane: "threading.Lock | None" = None,
+    should_skip: Callable[[Stage], bool] | None = None,
+    on_complete: Callable[[Stage, Any], None] | None = None,
+) -> tuple[dict[str, Any], StageReport]:
+    """Run ``stages`` respecting dependencies; return (results, report).
+
+    Args:
+        db_lane: Lock serializing "db" stages. Pass one in when a network
+            stage also needs to write (it can take the lane itself).
+        should_skip: Called before a stage starts; if True the stage is
+            marked "skipped" and its result is None.
+        on_complete: Called with each successful stage and its result,
+            while holding the db lane.
+
+    Raises:
+        StageFailed: if a required stage raised. In-flight stages are allowed
+            to finish; stages not yet started are not run.
+    """
+    _validate(stages)
+    results = {} if results is None else results
+    report = StageReport(
+        timings={s.name: StageTiming(s.name, s.kind, "not run") for s in stages}
+    )
+    db_lane = db_lane or threading.Lock()
+    t0 = time.perf_counter()
+
+    def _run(stage: Stage) -> Any:
+        timing = report.timings[stage.name]
+        queued = time.perf_counter()
+        lane = db_lane if stage.kind == "db" else None
+        if lane:
+            lane.acquire()
+        try:
+            timing.started = time.perf_counter() - t0
+            timing.waited = time.perf_counter() - queued
+            start = time.perf_counter()
+            try:
+                return stage.fn(results)
+            finally:
+                timing.seconds = time.perf_counter() - start
+        finally:
+            if lane:
+                lane.release()
+
+    pending = {s.name: s for s in stages}
+    done: set[str] = set()
+    running: dict[Future, Stage] = {}
+    failure: tuple[str, BaseException] | None = None
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="stage") as pool:
+        while pending or running:
+            if failure is None:
+                for name, stage in list(pending.items()):
+                    if set(stage.deps) <= done:
+                        del pending[name]
+                        if should_skip is not None and should_skip(stage):
+                            results[name] = None
+                            report.timings[name].status = "skipped"
+                            done.add(name)
+                            continue
+                        # copy_context() carries the market log tag into the worker.
+                        ctx = contextvars.copy_context()
+                        running[pool.submit(ctx.run, _run, stage)] = stage
+            if not running:
+                if pending and failure is None:
+                    continue  # a skip just released more stages
+                break
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                stage = running.pop(future)
+                timing = report.timings[stage.name]
+                exc = future.exception()
+                if exc is None:
+                    results[stage.name] = future.result()
+                    timing.status = "ok"
+                    if on_complete is not None:
+                        with db_lane:
+                            on_complete(stage, results[stage.name])
+                else:
+                    timing.status = "failed"
+                    timing.error = f"{exc.__class__.__name__}: {exc}"
+                    if stage.required:
+                        logger.error(f"Stage {stage.name} failed: {timing.error}")
+                        if failure is None:
+                            failure = (stage.name, exc)
+                    else:
+                        logger.warning(
+                            f"Optional stage {stage.name} failed, continuing: {timing.error}"
+                        )
+                done.add(stage.name)
+
+    report.total_seconds = time.perf_counter() - t0
+    if failure is not None:
+        raise StageFailed(failure[0], report) from failure[1]
+    return results, report
@@ -1,2 +1,18 @@
-from .get_type_info import TypeInfo
+from importlib import import_module
 
+# TypeInfo (numpy, SQLAlchemy, the SDE) resolves on first access (PEP 562) so
+# importing a light helper such as utils.validation stays cheap.
+_EXPORTS = {
+    "TypeInfo": "mkts_backend.utils.get_type_info",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module), name)
+    globals()[name] = value
+    return value
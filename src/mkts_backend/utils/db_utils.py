@@ -1,3 +1,4 @@
+import os
 import pandas as pd
 from sqlalchemy import text, select, bindparam
 from sqlalchemy.dialects.sqlite import insert as sqlite_insert
@@ -63,6 +64,7 @@ def add_missing_items_to_watchlist(missing_items: list[int], remote: bool = Fals
 
     # Save updated watchlist to CSV for backup
     updated_watchlist = pd.concat([watchlist, new_items], ignore_index=True)
+    os.makedirs("data", exist_ok=True)
     updated_watchlist.to_csv("data/watchlist_updated.csv", index=False)
     logger.info(f"Saved updated watchlist to data/watchlist_updated.csv")
 
@@ -1030,7 +1030,6 @@ def add_doctrine_type_info_to_watchlist(doctrine_id: int):
             if item not in watchlist_ids:
                 missing_fit_items.append(item)
 
-    missing_type_info = []
     logger.info(f"Adding {len(missing_fit_items)} missing items to watchlist")
     print(f"Adding {len(missing_fit_items)} missing items to watchlist")
     continue_adding = input("Continue adding? (y/n)")
@@ -1040,15 +1039,7 @@ def add_doctrine_type_info_to_watchlist(doctrine_id: int):
         logger.info(f"Continuing to add {len(missing_fit_items)} missing items to watchlist")
         print(f"Continuing to add {len(missing_fit_items)} missing items to watchlist")
 
-    for item in missing_fit_items:
-        stmt4 = text("SELECT * FROM inv_info WHERE typeID = :item")
-        db = DatabaseConfig("sde")
-        engine = db.engine
-        with engine.connect() as conn:
-            result = conn.execute(stmt4, {"item": item})
-            for row in result:
-                type_info = TypeInfo(type_id=item)
-                missing_type_info.append(type_info)
+    missing_type_info = TypeInfo.bulk(missing_fit_items, strict=False)
 
     for type_info in missing_type_info:
         stmt5 = sqlite_insert(Watchlist).values(
@@ -1096,6 +1087,9 @@ def refresh_doctrines_for_fit(fit_id: int, ship_id: int, ship_name: str, remote:
         fittings_engine.dispose()
 
     timestamp = datetime.datetime.now(datetime.timezone.utc).isoformat()
+    type_infos = {
+        int(info.type_id): info for info in TypeInfo.bulk([type_id for type_id, _ in components])
+    }
 
     def _do(c):
         stats_map = {}
@@ -1125,7 +1119,7 @@ def refresh_doctrines_for_fit(fit_id: int, ship_id: int, ship_name: str, remote:
             """
         )
         for type_id, qty in components:
-            type_info = TypeInfo(type_id)
+            type_info = type_infos[int(type_id)]
             stats = stats_map.get(type_id)
             total_stock = int(stats.total_volume_remain) if stats and stats.total_volume_remain is not None else 0
             price_val = float(stats.price) if stats and stats.price is not None else 0.0
@@ -6,6 +6,7 @@ into structured data that can be used for market analysis and database storage.
 """
 
 import re
+from contextlib import nullcontext
 from collections import defaultdict
 from dataclasses import dataclass
 from typing import Dict, Generator, List, Optional
@@ -15,6 +16,7 @@ from sqlalchemy.engine import Engine
 
 from mkts_backend.config.logging_config import configure_logging
 from mkts_backend.config import DatabaseConfig
+from mkts_backend.db.sde_index import get_sde_index
 
 logger = configure_logging(__name__)
 
@@ -62,12 +64,17 @@ def lookup_type_id(type_name: str, conn=None) -> Optional[int]:
 
     Args:
         type_name: The item name to look up
-        conn: Optional database connection. If None, creates a new connection.
+        conn: Optional database connection. If None, the in-memory SDE name
+            index is tried first (exact, then case-insensitive) and a new
+            connection is only opened on a miss.
 
     Returns:
         The type ID if found, None otherwise
     """
     if conn is None:
+        type_id = get_sde_index(_sde_db).name_index().lookup(type_name)
+        if type_id is not None:
+            return type_id
         engine = _sde_db.engine
         with engine.connect() as new_conn:
             result = new_conn.execute(
@@ -83,6 +90,11 @@ def lookup_type_id(type_name: str, conn=None) -> Optional[int]:
         return result[0] if result else None
 
 
+def suggest_type_names(type_name: str, limit: int = 3) -> list[str]:
+    """Closest SDE type names to an unresolved ``type_name`` (typos)."""
+    return [name for _, name in get_sde_index(_sde_db).name_index().suggest(type_name, limit)]
+
+
 def resolve_ship_type_id(ship_name: str, conn=None) -> Optional[int]:
     """
     Resolve a ship name to its type ID.
@@ -104,13 +116,15 @@ def parse_eft_string(eft_text: str, fit_id: int = 0, sde_engine: Engine = None)
     Args:
         eft_text: The EFT format text to parse
         fit_id: Optional fit ID to assign to parsed items
-        sde_engine: Optional SDE database engine. Uses default if None.
+        sde_engine: Optional SDE database engine. If None, names are resolved
+            through the process-wide SDE index.
 
     Returns:
         FitParseResult with parsed items, ship info, and any missing types
     """
-    if sde_engine is None:
-        sde_engine = _sde_db.engine
+    # Without an explicit engine, names resolve through the in-memory SDE
+    # index and no connection is held open for the whole parse.
+    sde_context = nullcontext() if sde_engine is None else sde_engine.connect()
 
     items: List[Dict] = []
     missing: List[str] = []
@@ -121,7 +135,7 @@ def parse_eft_string(eft_text: str, fit_id: int = 0, sde_engine: Engine = None)
     fit_name = ""
     slot_counters = defaultdict(int)
 
-    with sde_engine.connect() as sde_conn:
+    with sde_context as sde_conn:
         for line in eft_text.strip().split('\n'):
             line = line.strip()
 
@@ -167,7 +181,12 @@ def parse_eft_string(eft_text: str, fit_id: int = 0, sde_engine: Engine = None)
             type_id = lookup_type_id(item_name, sde_conn)
             if type_id is None:
                 missing.append(item_name)
-                logger.warning(f"Unable to resolve type_id for '{item_name}' (fit {fit_id})")
+                hint = ""
+                if sde_engine is None:
+                    suggestions = suggest_type_names(item_name)
+                    if suggestions:
+                        hint = f"; did you mean {', '.join(repr(s) for s in suggestions)}?"
+                logger.warning(f"Unable to resolve type_id for '{item_name}' (fit {fit_id}){hint}")
                 continue
 
             items.append(
@@ -1,15 +1,24 @@
+import copy
 from dataclasses import dataclass, field
 
-from typing import Union
+import threading
+from typing import Iterable, Union
 from numpy._core.multiarray import RAISE
 from numpy.strings import isdigit, isnumeric
 from sqlalchemy.orm import query
 from mkts_backend.config.db_config import DatabaseConfig
-from sqlalchemy import false, text
+from sqlalchemy import bindparam, false, text
 from mkts_backend.config.logging_config import configure_logging
+from mkts_backend.db.sde_index import get_sde_index
 
 logger = configure_logging(__name__)
 
+# TypeInfo.bulk memo, shared by every caller until the SDE index changes
+_memo: dict[int, "TypeInfo"] = {}
+_memo_names: dict[str, int] = {}
+_memo_index = None
+_memo_lock = threading.Lock()
+
 @dataclass(init=false)
 class TypeInfo:
     type_id: int
@@ -35,6 +44,10 @@ class TypeInfo:
     def from_name(self, type_name) -> int:
 
         db = DatabaseConfig("sde")
+        type_id = get_sde_index(db).id_for_name(type_name)
+        if type_id is not None:
+            return type_id
+
         stmt = text("""
             SELECT typeID
             FROM inv_info
@@ -51,6 +64,17 @@ class TypeInfo:
 
     def _load_by_id(self) -> None:
         db = DatabaseConfig("sde")
+        sde_type = get_sde_index(db).get(self.type_id)
+        if sde_type is not None:
+            self.type_name = sde_type.type_name
+            self.group_name = sde_type.group_name
+            self.category_name = sde_type.category_name
+            self.category_id = sde_type.category_id
+            self.group_id = sde_type.group_id
+            self.volume = sde_type.volume
+            return
+
+        # Not in sdetypes: fall back to the inv_info view
         stmt = text("""
             SELECT
                 typeName,
@@ -76,6 +100,123 @@ class TypeInfo:
         self.group_id = row["groupID"]
         self.volume = row["volume"]
 
+    @classmethod
+    def bulk(cls, values: Iterable[Union[int, str]], strict: bool = True) -> list["TypeInfo"]:
+        """Resolve any number of type_ids and/or type names at once.
+
+        Hits come from the SDE type index; the rest are looked up in
+        ``inv_info`` with at most one query for ids and one for names.
+        Results are memoized per process (until the SDE changes) and
+        returned in input order.
+
+        Args:
+            values: type_ids (ints or numeric strings) and/or type names
+            strict: raise ValueError listing every unresolved value; when
+                False, unresolved values are logged and left out
+
+        Returns:
+            One TypeInfo per resolved value, in input order
+        """
+        global _memo_index
+        values = [v.strip() if isinstance(v, str) else v for v in values]
+        keys = []
+        for value in values:
+            if isinstance(value, int) or isnumeric(value):
+                keys.append(int(value))
+            elif isinstance(value, str):
+                keys.append(value)
+            else:
+                raise ValueError(f"TypeInfo requires an int or str value, got {value!r}")
+
+        db = DatabaseConfig("sde")
+        index = get_sde_index(db)
+        str_keys = {k for k in keys if isinstance(k, str)}
+        with _memo_lock:
+            if _memo_index is not index:
+                _memo.clear()
+                _memo_names.clear()
+                _memo_index = index
+            name_ids = {k: _memo_names[k] for k in str_keys if k in _memo_names}
+
+        # Resolve into local dicts and merge them into the memo under the
+        # lock at the end, so concurrent calls never see it half-filled.
+        new_names: dict[str, int] = {}
+        names = str_keys - name_ids.keys()
+        for name in list(names):
+            type_id = index.id_for_name(name)
+            if type_id is not None:
+                new_names[name] = type_id
+                names.discard(name)
+        if names:
+            stmt = text(
+                "SELECT typeName, typeID FROM inv_info WHERE typeName IN :names"
+            ).bindparams(bindparam("names", expanding=True))
+            with db.engine.connect() as conn:
+                for row in conn.execute(stmt, {"names": sorted(names)}):
+                    new_names.setdefault(row.typeName, int(row.typeID))
+        name_ids.update(new_names)
+
+        ids = {k if isinstance(k, int) else name_ids.get(k) for k in keys}
+        ids.discard(None)
+        with _memo_lock:
+            infos = {type_id: _memo[type_id] for type_id in ids if type_id in _memo}
+
+        new_infos: dict[int, "TypeInfo"] = {}
+        missing_ids = set()
+        for type_id in ids - infos.keys():
+            sde_type = index.get(type_id)
+            if sde_type is None:
+                missing_ids.add(type_id)
+                continue
+            new_infos[type_id] = cls._from_row(
+                type_id, sde_type.type_name, sde_type.group_name, sde_type.category_name,
+                sde_type.category_id, sde_type.group_id, sde_type.volume,
+            )
+        if missing_ids:
+            # Not in sdetypes: fall back to the inv_info view
+            stmt = text(
+                "SELECT typeID, typeName, groupName, categoryName, categoryID, groupID, volume "
+                "FROM inv_info WHERE typeID IN :ids"
+            ).bindparams(bindparam("ids", expanding=True))
+            with db.engine.connect() as conn:
+                for row in conn.execute(stmt, {"ids": sorted(missing_ids)}):
+                    new_infos[int(row.typeID)] = cls._from_row(int(row.typeID), *row[1:])
+        infos.update(new_infos)
+
+        with _memo_lock:
+            # Skip the merge if the SDE changed mid-call: these came from
+            # the old index.
+            if _memo_index is index:
+                _memo_names.update(new_names)
+                _memo.update(new_infos)
+
+        resolved, unresolved = [], []
+        for value, key in zip(values, keys):
+            type_id = key if isinstance(key, int) else name_ids.get(key)
+            info = infos.get(type_id) if type_id is not None else None
+            if info is None:
+                unresolved.append(value)
+            else:
+                # A copy: the memoized object is shared by every caller.
+                resolved.append(copy.copy(info))
+        if unresolved:
+            if strict:
+                raise ValueError(f"types not found: {unresolved}")
+            logger.warning(f"Skipping {len(unresolved)} unresolved types: {unresolved}")
+        return resolved
+
+    @classmethod
+    def _from_row(cls, type_id, type_name, group_name, category_name, category_id, group_id, volume) -> "TypeInfo":
+        info = cls.__new__(cls)
+        info.type_id = type_id
+        info.type_name = type_name
+        info.group_name = group_name
+        info.category_name = category_name
+        info.category_id = category_id
+        info.group_id = group_id
+        info.volume = volume
+        return info
+
     def to_dict(self):
         type_dict = {
             "type_id": self.type_id,
@@ -89,11 +230,7 @@ class TypeInfo:
         return type_dict
 
 def get_type_from_list(type_list: list[int]) -> list[TypeInfo]:
-    type_info_list = []
-    for type_id in type_list:
-        type_info = TypeInfo(type_id)
-        type_info_list.append(type_info)
-    return type_info_list
+    return TypeInfo.bulk(type_list)
 
 if __name__ == "__main__":
    pass 
@@ -2,21 +2,42 @@
 Jita price utilities for fetching and working with Jita market prices.
 
 Uses the Fuzzwork Market API for efficient bulk price lookups.
+
+Interactive commands go through :func:`get_jita_prices`, which is local
+first: the market DB's ``jita_prices`` table (written by ``update-markets``)
+and a ``jita_price_cache`` table in the local-only ``cli_cache.db``. Only
+ids missing from both, or older than ``[jita] ttl_minutes``, are fetched,
+and the results are written to ``cli_cache.db`` (never to the market DB,
+which may be a Turso-synced replica). In offline mode nothing is fetched
+and stale prices are returned flagged in ``JitaPriceLookup.stale``.
 """
 
-import requests
-from typing import Dict, List, Optional
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Dict, List, Optional, Set
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import SQLAlchemyError
 
 from mkts_backend.config.logging_config import configure_logging
+from mkts_backend.config.sqlite_pragmas import install_pragma_profile
+
+if TYPE_CHECKING:
+    from mkts_backend.config.market_context import MarketContext
 
 logger = configure_logging(__name__)
 
 # Fuzzwork Market API endpoint for aggregated market data
 FUZZWORK_API_URL = "https://market.fuzzwork.co.uk/aggregates/"
 
+# Type IDs per Fuzzwork request (avoids 414 URI Too Large)
+FUZZWORK_BATCH_SIZE = 250
+
 # The Forge region ID (Jita's region)
 JITA_REGION_ID = 10000002
 
+JITA_CACHE_DB_URL = "sqlite:///cli_cache.db"
+
 
 class JitaPrice:
     def __init__(self, type_id: int, price_data: dict):
@@ -40,6 +61,47 @@ class JitaPrice:
         }
 
 
+def _parse_sell_percentile(price_data) -> Optional[float]:
+    """Sell percentile from one Fuzzwork entry; None if missing or zero."""
+    try:
+        sell_percentile = float(price_data['sell']['percentile'])
+    except (KeyError, ValueError, TypeError):
+        return None
+    return sell_percentile if sell_percentile > 0 else None
+
+
+def _fetch_sell_prices(type_ids: List[int]) -> Optional[Dict[int, Optional[float]]]:
+    """
+    Fuzzwork sell percentiles for ``type_ids``, batched.
+
+    Returns None if any request fails, so callers can tell "no price"
+    (a None value) from "no answer".
+    """
+    # requests is only needed on a cache miss; keep it off the CLI import path.
+    import requests
+
+    headers = {
+        'Accept': 'application/json',
+    }
+    results: Dict[int, Optional[float]] = {}
+    for start in range(0, len(type_ids), FUZZWORK_BATCH_SIZE):
+        chunk = type_ids[start:start + FUZZWORK_BATCH_SIZE]
+        params = {
+            'region': JITA_REGION_ID,
+            'types': ",".join(str(tid) for tid in chunk),
+        }
+        try:
+            response = requests.get(FUZZWORK_API_URL, headers=headers, params=params, timeout=30)
+            response.raise_for_status()
+            data = response.json()
+        except requests.exceptions.RequestException as e:
+            logger.warning(f"Failed to fetch Jita prices: {e}")
+            return None
+        for type_id in chunk:
+            results[type_id] = _parse_sell_percentile(data.get(str(type_id)))
+    return results
+
+
 def fetch_jita_prices(type_ids: List[int]) -> Dict[int, Optional[float]]:
     """
     Fetch Jita sell prices for a list of type IDs using Fuzzwork Market API.
@@ -56,51 +118,191 @@ def fetch_jita_prices(type_ids: List[int]) -> Dict[int, Optional[float]]:
     if not type_ids:
         return {}
 
-    results = {}
+    results = _fetch_sell_prices(list(type_ids))
+    if results is None:
+        # Return None for all type_ids on failure
+        return {type_id: None for type_id in type_ids}
+    return results
 
-    # Fuzzwork API accepts comma-separated type IDs
-    type_ids_str = ",".join(str(tid) for tid in type_ids)
 
-    headers = {
-        'Accept': 'application/json',
-    }
+@dataclass
+class JitaPriceLookup:
+    """Jita sell prices from :func:`get_jita_prices`.
+
+    ``stale`` holds the ids whose price is older than the TTL (served
+    because the lookup was offline or the fetch failed); ``fetched`` counts
+    the ids that went to the network.
+    """
+
+    prices: Dict[int, Optional[float]]
+    stale: Set[int] = field(default_factory=set)
+    fetched: int = 0
+
+    def get(self, type_id: int) -> Optional[float]:
+        return self.prices.get(type_id)
+
+
+_cache_engine = None
+
 
+def _get_cache_engine():
+    """Engine for the local-only ``jita_price_cache`` table in cli_cache.db."""
+    global _cache_engine
+    if _cache_engine is None:
+        _cache_engine = create_engine(JITA_CACHE_DB_URL)
+        install_pragma_profile(_cache_engine, "local_cache")
+        with _cache_engine.begin() as conn:
+            conn.execute(text("""
+                CREATE TABLE IF NOT EXISTS jita_price_cache (
+                    type_id    INTEGER PRIMARY KEY,
+                    sell_price REAL,
+                    fetched_at TEXT NOT NULL
+                )
+            """))
+    return _cache_engine
+
+
+def _parse_timestamp(value) -> Optional[datetime]:
+    """A stored timestamp as an aware UTC datetime (naive values are UTC)."""
+    if value is None:
+        return None
+    if not isinstance(value, datetime):
+        try:
+            value = datetime.fromisoformat(str(value))
+        except ValueError:
+            return None
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def _in_clause(type_ids: List[int]) -> tuple:
+    placeholders = ", ".join(f":id_{i}" for i in range(len(type_ids)))
+    return placeholders, {f"id_{i}": tid for i, tid in enumerate(type_ids)}
+
+
+def _read_local_prices(
+    type_ids: List[int],
+    market_ctx: Optional["MarketContext"] = None,
+) -> Dict[int, tuple]:
+    """
+    ``{type_id: (sell_price, updated_at)}`` from the market DB's jita_prices
+    table and the local cache, keeping the newer row when both have one.
+    """
+    from mkts_backend.config.db_config import DatabaseConfig
+
+    placeholders, params = _in_clause(type_ids)
+    rows = []
+    db_alias = market_ctx.database_alias if market_ctx else "wcmkt"
     try:
-        params = {
-            'region': JITA_REGION_ID,
-            'types': type_ids_str,
-        }
+        with DatabaseConfig(db_alias).engine.connect() as conn:
+            rows += conn.execute(
+                text(
+                    "SELECT type_id, sell_price, last_updated FROM jita_prices "
+                    f"WHERE type_id IN ({placeholders})"
+                ),
+                params,
+            ).fetchall()
+    except SQLAlchemyError as e:
+        logger.debug(f"Could not read jita_prices from {db_alias}: {e}")
+    with _get_cache_engine().connect() as conn:
+        rows += conn.execute(
+            text(
+                "SELECT type_id, sell_price, fetched_at FROM jita_price_cache "
+                f"WHERE type_id IN ({placeholders})"
+            ),
+            params,
+        ).fetchall()
+
+    local: Dict[int, tuple] = {}
+    for type_id, sell_price, updated in rows:
+        updated_at = _parse_timestamp(updated)
+        if updated_at is None:
+            continue
+        price = float(sell_price) if sell_price and sell_price > 0 else None
+        current = local.get(type_id)
+        if current is None or updated_at > current[1]:
+            local[type_id] = (price, updated_at)
+    return local
+
+
+def _write_cache(prices: Dict[int, Optional[float]], fetched_at: datetime) -> None:
+    rows = [
+        {"type_id": type_id, "sell_price": price, "fetched_at": fetched_at.isoformat()}
+        for type_id, price in prices.items()
+    ]
+    with _get_cache_engine().begin() as conn:
+        conn.execute(
+            text("""
+                INSERT OR REPLACE INTO jita_price_cache (type_id, sell_price, fetched_at)
+                VALUES (:type_id, :sell_price, :fetched_at)
+            """),
+            rows,
+        )
+
+
+def get_jita_prices(
+    type_ids: List[int],
+    market_ctx: Optional["MarketContext"] = None,
+    ttl_minutes: Optional[int] = None,
+    offline: Optional[bool] = None,
+) -> JitaPriceLookup:
+    """
+    Jita sell prices for interactive commands, local first.
 
-        response = requests.get(FUZZWORK_API_URL, headers=headers, params=params, timeout=30)
-        response.raise_for_status()
-
-        data = response.json()
-
-        for type_id_str, price_data in data.items():
-            type_id = int(type_id_str)
-            try:
-                # Use sell percentile (5th percentile) as the reference Jita price
-                sell_percentile = float(price_data['sell']['percentile'])
-                # Only use valid prices (non-zero)
-                if sell_percentile > 0:
-                    results[type_id] = sell_percentile
-                else:
-                    results[type_id] = None
-            except (KeyError, ValueError, TypeError):
-                results[type_id] = None
-
-    except requests.exceptions.RequestException as e:
-        logger.warning(f"Failed to fetch Jita prices: {e}")
-        # Return None for all type_ids on failure
-        for type_id in type_ids:
-            results[type_id] = None
+    Args:
+        type_ids: Type IDs to price
+        market_ctx: Market whose jita_prices table to read (default: primary)
+        ttl_minutes: Max age of a local price (default: ``[jita] ttl_minutes``)
+        offline: Never fetch (default: ``[jita] offline`` / ``MKTS_JITA_OFFLINE``)
 
-    # Fill in any missing type_ids with None
-    for type_id in type_ids:
-        if type_id not in results:
-            results[type_id] = None
+    Returns:
+        JitaPriceLookup; ``.get(type_id)`` works like the dict from
+        :func:`fetch_jita_prices`
+    """
+    ids = list(dict.fromkeys(int(t) for t in type_ids))
+    if not ids:
+        return JitaPriceLookup(prices={})
 
-    return results
+    if ttl_minutes is None or offline is None:
+        from mkts_backend.config.settings_service import SettingsService
+
+        settings = SettingsService()
+        ttl_minutes = settings.jita_ttl_minutes if ttl_minutes is None else ttl_minutes
+        offline = settings.jita_offline if offline is None else offline
+
+    now = datetime.now(timezone.utc)
+    cutoff = now - timedelta(minutes=ttl_minutes)
+    local = _read_local_prices(ids, market_ctx)
+
+    prices: Dict[int, Optional[float]] = {type_id: None for type_id in ids}
+    missing = []
+    for type_id in ids:
+        entry = local.get(type_id)
+        if entry is not None and entry[1] >= cutoff:
+            prices[type_id] = entry[0]
+        else:
+            missing.append(type_id)
+
+    fetched = 0
+    if missing and not offline:
+        network = _fetch_sell_prices(missing)
+        if network is not None:
+            _write_cache(network, now)
+            prices.update(network)
+            fetched = len(network)
+            missing = []
+
+    stale = set()
+    for type_id in missing:
+        entry = local.get(type_id)
+        if entry is not None and entry[0] is not None:
+            prices[type_id] = entry[0]
+            stale.add(type_id)
+
+    logger.info(
+        f"Jita prices: {len(ids) - len(missing) - fetched} local, {fetched} fetched, "
+        f"{len(stale)} stale"
+    )
+    return JitaPriceLookup(prices=prices, stale=stale, fetched=fetched)
 
 
 def fetch_jita_price_data(type_ids: List[int]) -> List[dict]:
@@ -117,16 +319,20 @@ def fetch_jita_price_data(type_ids: List[int]) -> List[dict]:
     from datetime import datetime, timezone
     import os
 
+    import requests
+
     now = datetime.now(timezone.utc)
     results = {}
     failed_ids = []
 
     # --- Primary: Fuzzwork (batched to avoid 414 URI Too Large) ---
-    BATCH_SIZE = 250
     headers = {
         'Accept': 'application/json',
     }
-    chunks = [type_ids[i:i + BATCH_SIZE] for i in range(0, len(type_ids), BATCH_SIZE)]
+    chunks = [
+        type_ids[i:i + FUZZWORK_BATCH_SIZE]
+        for i in range(0, len(type_ids), FUZZWORK_BATCH_SIZE)
+    ]
 
     for chunk_idx, chunk in enumerate(chunks):
         type_ids_str = ",".join(str(tid) for tid in chunk)
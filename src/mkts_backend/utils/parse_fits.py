@@ -11,6 +11,7 @@ import pandas as pd
 
 from mkts_backend.config.logging_config import configure_logging
 from mkts_backend.config import DatabaseConfig
+from mkts_backend.db.sde_index import get_sde_index
 from mkts_backend.utils.doctrine_update import (
     DoctrineFit,
     upsert_doctrine_fits,
@@ -66,6 +67,9 @@ class FittingItem:
                 self.fit_name = f"Default {self.ship_type_name} fit"
 
     def get_type_id(self) -> int:
+        type_id = get_sde_index(_sde_db).name_index().lookup(self.type_name)
+        if type_id is not None:
+            return type_id
         engine = _sde_db.engine
         query = text("SELECT typeID FROM inv_info WHERE typeName = :type_name")
         with engine.connect() as conn:
@@ -136,6 +140,11 @@ def slot_yielder() -> Generator[str, None, None]:
 
 
 def _lookup_type_id(type_name: str, conn) -> Optional[int]:
+    # The in-memory name index answers almost every line; inv_info on the
+    # caller's connection covers anything that is not in sdetypes.
+    type_id = get_sde_index(_sde_db).name_index().lookup(type_name)
+    if type_id is not None:
+        return type_id
     result = conn.execute(
         text("SELECT typeID FROM inv_info WHERE typeName = :type_name"),
         {"type_name": type_name},
@@ -144,11 +153,7 @@ def _lookup_type_id(type_name: str, conn) -> Optional[int]:
 
 
 def _resolve_ship_type_id(ship_name: str, conn) -> Optional[int]:
-    result = conn.execute(
-        text("SELECT typeID FROM inv_info WHERE typeName = :type_name"),
-        {"type_name": ship_name},
-    ).fetchone()
-    return result[0] if result else None
+    return _lookup_type_id(ship_name, conn)
 
 
 def parse_eft_fit_file(fit_file: str, fit_id: int, sde_engine) -> FitParseResult:
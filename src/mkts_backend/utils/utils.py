@@ -11,15 +11,29 @@ from mkts_backend.config.db_config import DatabaseConfig
 from mkts_backend.config.esi_config import ESIConfig
 from mkts_backend.config.logging_config import configure_logging
 from mkts_backend.db.models import Watchlist
+from mkts_backend.db.sde_index import get_sde_index
 from sqlalchemy.orm import Session
 from datetime import datetime, timezone
 logger = configure_logging(__name__)
 
-sde_db = DatabaseConfig("sde")
-fittings_db = DatabaseConfig("fittings")
-wcmkt_db = DatabaseConfig("wcmkt")
+# Shared handles, built on first use by _shared_db() (not at import, which
+# would resolve database routing for every importer of this module).
+sde_db: DatabaseConfig | None = None
+fittings_db: DatabaseConfig | None = None
+wcmkt_db: DatabaseConfig | None = None
+
+_SHARED_DB_ALIASES = {"sde_db": "sde", "fittings_db": "fittings", "wcmkt_db": "wcmkt"}
+
+
+def _shared_db(name: str) -> DatabaseConfig:
+    db = globals()[name]
+    if db is None:
+        db = globals()[name] = DatabaseConfig(_SHARED_DB_ALIASES[name])
+    return db
+
 
 def get_type_names_from_df(df: pd.DataFrame) -> pd.DataFrame:
+    sde_db = _shared_db("sde_db")
     verify_db_exists = sde_db.verify_db_exists()
     if not verify_db_exists:
         logger.error("SDE database is not up to date. Exiting...")
@@ -30,14 +44,12 @@ def get_type_names_from_df(df: pd.DataFrame) -> pd.DataFrame:
     cols = ["typeID", "typeName", "groupName", "categoryName", "categoryID"]
     out_cols = ["type_id", "type_name", "group_name", "category_name", "category_id"]
 
-    engine = sde_db.engine
-    with engine.connect() as conn:
-        stmt = text("SELECT typeID, typeName, groupName, categoryName, categoryID FROM sdetypes")
-        res = conn.execute(stmt)
-        result = pd.DataFrame(res.fetchall(), columns=cols).rename(columns=rename_map)
-
-        missing = input_type_ids - set(result["type_id"])
-        if missing:
+    index = get_sde_index(sde_db)
+    result = index.frame(input_type_ids)
+    missing = {tid for tid in input_type_ids if tid not in index}
+    if missing:
+        engine = sde_db.engine
+        with engine.connect() as conn:
             placeholders = ','.join([f':id_{i}' for i in range(len(missing))])
             params = {f'id_{i}': int(tid) for i, tid in enumerate(missing)}
             fallback_stmt = text(f"""
@@ -52,17 +64,14 @@ def get_type_names_from_df(df: pd.DataFrame) -> pd.DataFrame:
             if not fb_df.empty:
                 logger.info(f"Resolved {len(fb_df)} type names from invTypes fallback")
                 result = pd.concat([result, fb_df], ignore_index=True)
-    engine.dispose()
     return result[out_cols]
 
 def get_type_name(type_id: int) -> str:
-    db = DatabaseConfig("sde")
-    engine = db.engine
-    with engine.connect() as conn:
-        stmt = text("SELECT typeName FROM sdetypes WHERE typeID = :type_id")
-        res = conn.execute(stmt, {"type_id": type_id})
-        type_name = res.fetchone()[0]
-    engine.dispose()
+    type_name = get_sde_index(DatabaseConfig("sde")).name(type_id)
+    if type_name is None:
+        # Callers have always seen a TypeError for unknown ids (it used to
+        # come from fetchone()[0] on an empty result).
+        raise TypeError(f"type_id {type_id} not found in sdetypes")
     return type_name
 
 def get_type_names_from_esi(df: pd.DataFrame) -> pd.DataFrame:
@@ -125,7 +134,7 @@ def convert_datetime_columns(df, datetime_columns):
 
 def get_fit_items(fit_id: int) -> pd.DataFrame:
     table_list_stmt = "SELECT type_id, quantity FROM fittings_fittingitem WHERE fit_id = (:fit_id)"
-    engine = create_engine(fittings_db.url)
+    engine = create_engine(_shared_db("fittings_db").url)
     fit_items = []
     with engine.connect() as conn:
         result = conn.execute(text(table_list_stmt), {"fit_id": fit_id})
@@ -159,7 +168,7 @@ def update_watchlist_data(esi: ESIConfig, watchlist_csv: str = "data/watchlist.c
             "would DELETE all rows and insert nothing"
         )
 
-    engine = wcmkt_db.engine
+    engine = _shared_db("wcmkt_db").engine
     with engine.begin() as conn:
         conn.execute(text("DELETE FROM watchlist"))
         for i in range(0, len(rows), 500):
@@ -167,29 +176,35 @@ def update_watchlist_data(esi: ESIConfig, watchlist_csv: str = "data/watchlist.c
     logger.info(f"Watchlist updated: {len(df)} items")
     return True
 
+def _init_database(db: DatabaseConfig):
+    db.verify_db_exists()
+    if db.needs_init():
+        logger.info(f"initializing database {db.alias}")
+        return db.sync()
+    logger.info(f"Database {db.alias} verified")
+
+
 def init_databases(aliases: str | list[str] | None = None) -> None:
+    """Verify (and pull, if missing) the shared databases, concurrently."""
+    from mkts_backend.config.sync_orchestrator import get_sync_orchestrator
+
     if aliases is None:
         aliases = ["sde", "fittings"]
     elif isinstance(aliases, str):
         aliases = [aliases]
-    
+
+    dbs = []
     for alias in aliases:
         logger.debug(f"connecting to database {alias}")
         try:
-            db = DatabaseConfig(alias)
-            db.verify_db_exists()
-        except Exception as e:
-            logger.warning(f"Error initializing database {alias}: {e}")
-            continue
-        try:
-            if db.needs_init():
-                logger.info(f"initializing database {alias}")
-                db.sync()
-            else:
-                logger.info(f"Database {alias} verified")
+            dbs.append(DatabaseConfig(alias))
         except Exception as e:
             logger.warning(f"Error initializing database {alias}: {e}")
 
+    for result in get_sync_orchestrator().run_all(dbs, "init", _init_database):
+        if not result.ok:
+            logger.warning(f"Error initializing database {result.alias}: {result.error}")
+
 def insert_type_data(data: list[dict]):
     db = DatabaseConfig("sde")
     engine = db.engine
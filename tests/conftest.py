@@ -12,6 +12,20 @@ from unittest.mock import patch, MagicMock
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
+# The shared log handlers are installed on first use; point them outside the
+# repo before any test imports the package.
+os.environ.setdefault("MKTS_LOG_DIR", tempfile.mkdtemp(prefix="mkts-test-logs-"))
+
+
+@pytest.fixture(autouse=True)
+def _scratch_cwd(tmp_path, monkeypatch):
+    """Run every test from its own tmp_path.
+
+    Code that writes relative paths (``data/*.json``, ``cli_cache.db``,
+    ``token_*.json``, local market DBs) then leaves the repo tree clean.
+    """
+    monkeypatch.chdir(tmp_path)
+
 
 @pytest.fixture(autouse=True)
 def _settings_cache_isolation():
@@ -26,6 +40,24 @@ def _settings_cache_isolation():
     clear_cache()
 
 
+@pytest.fixture(autouse=True)
+def _no_sync_metrics(monkeypatch):
+    """Give each test a fresh sync orchestrator that doesn't write cli_cache.db."""
+    from mkts_backend.config import sync_orchestrator
+
+    monkeypatch.setattr(
+        sync_orchestrator, "_orchestrator", sync_orchestrator.SyncOrchestrator(metrics_url=None)
+    )
+
+
+@pytest.fixture(autouse=True)
+def _no_result_cache(monkeypatch):
+    """Keep CLI read commands from caching results in cli_cache.db."""
+    from mkts_backend.cli_tools import result_cache
+
+    monkeypatch.setattr(result_cache, "_result_cache", result_cache.ResultCache(url=None))
+
+
 @pytest.fixture
 def primary_market_context(monkeypatch):
     """Create a primary market context for testing (forces development mode)."""
@@ -0,0 +1,57 @@
+"""Tests for the sqlite3-vs-turso benchmark script."""
+from __future__ import annotations
+
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+SCRIPTS = Path(__file__).resolve().parent.parent / "scripts"
+
+
+def _load_bench_module():
+    """Load scripts/bench_engines.py as a module without scripts being a package."""
+    src = SCRIPTS / "bench_engines.py"
+    spec = importlib.util.spec_from_file_location("bench_engines", src)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["bench_engines"] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+bench = _load_bench_module()
+
+
+@pytest.fixture(scope="module")
+def synthetic_dbs(tmp_path_factory):
+    tmp = tmp_path_factory.mktemp("bench")
+    market, sde = tmp / "market.db", tmp / "sde.db"
+    bench.build_synthetic_market_db(market, n_types=120, orders_per_type=4, history_days=10)
+    module_type_id = bench.add_synthetic_doctrines(market, n_fits=5, items_per_fit=6)
+    bench.build_synthetic_sde_db(sde, n_types=50, attrs_per_type=5)
+    return {"market": str(market), "sde": str(sde)}, module_type_id
+
+
+def test_engines_agree_on_every_query(synthetic_dbs):
+    paths, module_type_id = synthetic_dbs
+    for query in bench.bench_queries(module_type_id):
+        counts = {
+            engine: bench.time_query(engine, paths[query.db], query.sql, query.params, repeat=1)[1]
+            for engine in bench.ENGINES
+        }
+        assert counts["sqlite3"] == counts["turso"] > 0, (query.name, counts)
+
+
+def test_failures_flags_ratio_mismatch_and_timeout():
+    ok = bench.QueryResult("ok", {"sqlite3": 0.1, "turso": 0.2}, {"sqlite3": 5, "turso": 5})
+    slow = bench.QueryResult("slow", {"sqlite3": 0.1, "turso": 5.0}, {"sqlite3": 5, "turso": 5})
+    wrong = bench.QueryResult("wrong", {"sqlite3": 0.1, "turso": 0.1}, {"sqlite3": 5, "turso": 4})
+    hung = bench.QueryResult(
+        "hung", {"sqlite3": 0.1, "turso": None}, {"sqlite3": 5, "turso": None}, "turso exceeded 1s"
+    )
+
+    assert bench.failures([ok], max_ratio=10) == []
+    problems = bench.failures([ok, slow, wrong, hung], max_ratio=10)
+    assert [p.split(":")[0] for p in problems] == ["slow", "wrong", "hung"]
+    assert "50.0x" in problems[0]
@@ -28,8 +28,10 @@ def patched_runner():
         patch.object(runner_module, "init_buildcost_tables") as mock_init,
         patch.object(runner_module, "read_build_watchlist") as mock_read_watchlist,
         patch.object(runner_module, "read_jita_prices") as mock_read_prices,
+        patch.object(runner_module, "read_builder_cost_state") as mock_read_state,
         patch.object(runner_module, "run_async_fetch_builder_costs") as mock_fetch,
         patch.object(runner_module, "upsert_builder_costs") as mock_upsert,
+        patch.object(runner_module, "upsert_builder_cost_refresh") as mock_upsert_refresh,
         patch.object(runner_module, "delete_orphan_builder_costs") as mock_prune,
         patch.object(runner_module, "log_buildcost_update") as mock_log,
     ):
@@ -39,11 +41,14 @@ def patched_runner():
             {"type_id": 34, "type_name": "Tritanium", "group_name": "Mineral", "category_id": 4},
         ]
         mock_read_prices.return_value = {34: 5.0}
+        mock_read_state.return_value = {}
         summary = MagicMock(
             attempted=1,
             failed=0,
             filtered_unbuildable=0,
             filtered_out_of_scope=0,
+            fresh=0,
+            deferred=0,
             records=[{"type_id": 34}],
         )
         mock_fetch.return_value = summary
@@ -55,8 +60,10 @@ def patched_runner():
             "init": mock_init,
             "read_watchlist": mock_read_watchlist,
             "read_prices": mock_read_prices,
+            "read_state": mock_read_state,
             "fetch": mock_fetch,
             "upsert": mock_upsert,
+            "upsert_refresh": mock_upsert_refresh,
             "prune": mock_prune,
             "log": mock_log,
         }
@@ -128,11 +135,44 @@ class TestHappyPath:
         assert result.pruned == 0
 
 
+class TestIncrementalRefresh:
+    def test_refresh_state_passed_to_fetch_and_prices_recorded(self, patched_runner):
+        state = {34: MagicMock()}
+        patched_runner["read_state"].return_value = state
+
+        run()
+
+        kwargs = patched_runner["fetch"].call_args.kwargs
+        assert kwargs["state"] is state
+        assert kwargs["policy"] is not None
+        patched_runner["upsert_refresh"].assert_called_once()
+        _, records, prices = patched_runner["upsert_refresh"].call_args.args
+        assert records == [{"type_id": 34}] and prices == {34: 5.0}
+
+    def test_full_treats_every_item_as_due(self, patched_runner):
+        run(full=True)
+
+        patched_runner["read_state"].assert_not_called()
+        assert patched_runner["fetch"].call_args.kwargs["state"] == {}
+
+    def test_refresh_snapshot_failure_does_not_block_log_stamp(self, patched_runner):
+        patched_runner["upsert_refresh"].side_effect = OperationalError(
+            "snapshot failed", None, None
+        )
+
+        result = run()
+
+        assert patched_runner["log"].call_count == 1
+        assert result.success is True
+
+
 class TestEarlyReturnsSkipLog:
     """All four early-return paths in ``run()`` must NOT invoke the log writer.
 
     Stamping when nothing was actually upserted would advance the frontend's
-    freshness signal without any new data behind it.
+    freshness signal without any new data behind it. The one exception is a
+    run with nothing due that still pruned removed items (see
+    ``TestNothingDue``).
     """
 
     def test_db_verify_fails(self, patched_runner):
@@ -161,6 +201,8 @@ class TestEarlyReturnsSkipLog:
             failed=0,
             filtered_unbuildable=1,
             filtered_out_of_scope=0,
+            fresh=3,
+            deferred=0,
             records=[],
         )
 
@@ -171,6 +213,7 @@ class TestEarlyReturnsSkipLog:
         assert patched_runner["log"].call_count == 0
         assert result.success is True
         assert result.log_stamped is False
+        assert result.fresh == 3
 
     def test_summary_records_empty_after_failures(self, patched_runner):
         patched_runner["fetch"].return_value = MagicMock(
@@ -178,6 +221,8 @@ class TestEarlyReturnsSkipLog:
             failed=5,
             filtered_unbuildable=0,
             filtered_out_of_scope=0,
+            fresh=0,
+            deferred=0,
             records=[],
         )
 
@@ -186,3 +231,49 @@ class TestEarlyReturnsSkipLog:
         assert patched_runner["log"].call_count == 0
         assert result.success is False
         assert result.log_stamped is False
+
+
+class TestNothingDue:
+    """Every item fresh: no fetch, but watchlist removals are still pruned."""
+
+    @pytest.fixture
+    def all_fresh(self, patched_runner):
+        patched_runner["fetch"].return_value = MagicMock(
+            attempted=0,
+            failed=0,
+            filtered_unbuildable=0,
+            filtered_out_of_scope=0,
+            fresh=1,
+            deferred=0,
+            records=[],
+        )
+        return patched_runner
+
+    def test_removed_item_pruned_and_stamped(self, all_fresh):
+        all_fresh["prune"].return_value = 1
+
+        result = run()
+
+        assert all_fresh["upsert"].call_count == 0
+        assert all_fresh["prune"].call_count == 1
+        assert all_fresh["log"].call_count == 1
+        assert result.success is True
+        assert result.pruned == 1
+        assert result.log_stamped is True
+
+    def test_nothing_pruned_skips_stamp(self, all_fresh):
+        result = run()
+
+        assert all_fresh["prune"].call_count == 1
+        assert all_fresh["log"].call_count == 0
+        assert result.success is True
+        assert result.log_stamped is False
+
+    def test_stamp_failure_after_prune_reports_failure(self, all_fresh):
+        all_fresh["prune"].return_value = 2
+        all_fresh["log"].side_effect = OperationalError("stamp failed", None, None)
+
+        result = run()
+
+        assert result.success is False
+        assert result.pruned == 2
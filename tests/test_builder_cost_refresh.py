@@ -0,0 +1,206 @@
+"""Tests for the incremental builder-costs refresh: staleness tiers, the
+price-move trigger, the time budget, and the builder_cost_refresh snapshot.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine
+
+from mkts_backend.builder_costs.refresh_policy import (
+    HIGH_VALUE_TIER,
+    LOW_VALUE_TIER,
+    REASON_AGE,
+    REASON_NEW,
+    REASON_PRICE,
+    CostState,
+    RefreshPolicy,
+    budget_item_count,
+    refresh_tier,
+    select_due,
+)
+
+NOW = datetime(2026, 10, 1, 12, tzinfo=timezone.utc)
+
+
+def _ago(**kwargs) -> datetime:
+    return NOW - timedelta(**kwargs)
+
+
+class TestRefreshTier:
+    def test_t2_ships_and_expensive_items_are_high_value(self):
+        assert refresh_tier(2, 7, 1_000_000) == HIGH_VALUE_TIER
+        assert refresh_tier(1, 6, 1_000_000) == HIGH_VALUE_TIER
+        assert refresh_tier(1, 7, 500_000_000) == HIGH_VALUE_TIER
+
+    def test_cheap_t1_is_low_value(self):
+        assert refresh_tier(1, 7, 1_000_000) == LOW_VALUE_TIER
+        assert refresh_tier(1, 7, None) == LOW_VALUE_TIER
+
+
+class TestSelectDue:
+    # 10: T2 module, 11: cheap T1 module, 12: T1 hull
+    META = {10: 2, 11: 1, 12: 1}
+    CATEGORIES = {10: 7, 11: 7, 12: 6}
+    PRICES = {10: 5_000_000.0, 11: 100_000.0, 12: 2_000_000.0}
+
+    def _due(self, state, prices=None, policy=RefreshPolicy()):
+        return select_due(
+            [10, 11, 12], self.META, self.CATEGORIES, prices or self.PRICES, state, policy, now=NOW
+        )
+
+    def test_tiers_refresh_on_their_own_schedule(self):
+        state = {
+            10: CostState(_ago(hours=30), 5_000_000.0),  # high value, > 1 day
+            11: CostState(_ago(days=3), 100_000.0),      # low value, < 1 week
+            12: CostState(_ago(hours=2), 2_000_000.0),   # high value, fresh
+        }
+        assert [d.type_id for d in self._due(state)] == [10]
+
+        state[11] = CostState(_ago(days=8), 100_000.0)
+        due = self._due(state)
+        assert {d.type_id: d.reason for d in due} == {10: REASON_AGE, 11: REASON_AGE}
+
+    def test_price_move_triggers_immediate_refresh(self):
+        state = {
+            10: CostState(_ago(hours=1), 5_000_000.0),
+            11: CostState(_ago(hours=1), 100_000.0),
+            12: CostState(_ago(hours=1), 2_000_000.0),
+        }
+        moved = {**self.PRICES, 11: 115_000.0, 12: 2_100_000.0}  # +15%, +5%
+
+        due = self._due(state, prices=moved)
+
+        assert [(d.type_id, d.reason) for d in due] == [(11, REASON_PRICE)]
+
+    def test_naive_timestamps_and_missing_snapshot(self):
+        # SQLite reads DateTime back naive; rows fetched before the snapshot
+        # table existed have no price and fall back to their age tier.
+        state = {
+            10: CostState(_ago(hours=30).replace(tzinfo=None)),
+            11: CostState(_ago(days=1)),
+            12: CostState(_ago(hours=20)),
+        }
+        assert [(d.type_id, d.reason) for d in self._due(state)] == [(10, REASON_AGE)]
+
+    def test_order_new_then_price_moved_then_most_overdue(self):
+        state = {
+            10: CostState(_ago(days=3), 5_000_000.0),    # 3x overdue
+            11: CostState(_ago(hours=1), 50_000.0),      # price doubled
+        }
+        due = self._due(state)
+
+        assert [(d.type_id, d.reason) for d in due] == [
+            (12, REASON_NEW), (11, REASON_PRICE), (10, REASON_AGE),
+        ]
+
+    def test_budget_item_count(self):
+        assert budget_item_count(RefreshPolicy(time_budget_seconds=120), 300) == 600
+        assert budget_item_count(RefreshPolicy(time_budget_seconds=0.01), 300) == 1
+        assert budget_item_count(RefreshPolicy(time_budget_seconds=0), 300) is None
+
+
+class TestAsyncFetchWithPolicy:
+    WATCHLIST = {
+        34: {"category_id": 7, "group_name": "Shield Extender", "type_name": "Large Shield Extender I"},
+        35: {"category_id": 7, "group_name": "Shield Extender", "type_name": "Large Shield Extender I"},
+    }
+
+    @staticmethod
+    def _record(type_id):
+        return {
+            "type_id": type_id,
+            "total_cost_per_unit": 1.0,
+            "time_per_unit": 1.0,
+            "me": 10,
+            "runs": 10,
+            "fetched_at": NOW,
+        }
+
+    @pytest.mark.asyncio
+    async def test_fresh_items_are_skipped(self, in_memory_sde_db):
+        from mkts_backend.esi import async_everref
+
+        engine = create_engine(f"sqlite:///{in_memory_sde_db}")
+        state = {34: CostState(datetime.now(timezone.utc), 1_000_000.0)}
+
+        with patch.object(async_everref, "_fetch_one", side_effect=[self._record(35)]) as fetch:
+            try:
+                summary = await async_everref.async_fetch_builder_costs(
+                    [34, 35],
+                    {34: 1_000_000, 35: 1_000_000},
+                    engine,
+                    watchlist_metadata=self.WATCHLIST,
+                    state=state,
+                    policy=RefreshPolicy(),
+                )
+            finally:
+                engine.dispose()
+
+        assert fetch.call_count == 1
+        assert fetch.call_args.args[3] == 35
+        assert (summary.attempted, summary.fresh, summary.deferred) == (1, 1, 0)
+        assert [r["type_id"] for r in summary.records] == [35]
+
+    @pytest.mark.asyncio
+    async def test_past_deadline_items_are_deferred_not_failed(self, in_memory_sde_db):
+        from mkts_backend.esi import async_everref
+
+        engine = create_engine(f"sqlite:///{in_memory_sde_db}")
+        with patch.object(
+            async_everref, "_fetch_one", side_effect=[self._record(34), async_everref.DEFERRED]
+        ):
+            try:
+                summary = await async_everref.async_fetch_builder_costs(
+                    [34, 35],
+                    {34: 1_000_000, 35: 1_000_000},
+                    engine,
+                    watchlist_metadata=self.WATCHLIST,
+                    state={},
+                    policy=RefreshPolicy(),
+                )
+            finally:
+                engine.dispose()
+
+        assert summary.attempted == 1
+        assert summary.failed == 0
+        assert summary.deferred == 1
+
+
+def test_refresh_snapshot_round_trip(tmp_path):
+    from mkts_backend.builder_costs import repository
+    from mkts_backend.db.build_cost_models import BuildCostBase
+
+    db_path = tmp_path / "buildcost.db"
+    engine = create_engine(f"sqlite:///{db_path}")
+    BuildCostBase.metadata.create_all(engine)
+
+    class _Stub:
+        alias = "buildcost"
+        turso_url = None
+
+        @property
+        def engine(self):
+            return engine
+
+    db = _Stub()
+    records = [
+        {"type_id": type_id, "total_cost_per_unit": 1.0, "time_per_unit": 1.0,
+         "me": 10, "runs": 10, "fetched_at": NOW}
+        for type_id in (34, 35)
+    ]
+    try:
+        with patch.object(repository, "get_sync_orchestrator"):
+            repository.upsert_builder_costs(db, records)
+            repository.upsert_builder_cost_refresh(db, records[:1], {34: 5.0, 35: 6.0})
+
+            state = repository.read_builder_cost_state(db)
+    finally:
+        engine.dispose()
+
+    assert state[34].jita_price == 5.0
+    assert state[35].jita_price is None
+    assert state[34].fetched_at.replace(tzinfo=timezone.utc) == NOW
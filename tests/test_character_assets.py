@@ -0,0 +1,217 @@
+"""
+Tests for the concurrent, conditional character asset fetcher and the
+location index it maintains.
+"""
+import asyncio
+import json
+import time
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from mkts_backend.config.character_config import CharacterConfig
+from mkts_backend.esi import asset_cache, character_assets, esi_auth
+
+
+ALICE = CharacterConfig(key="alice", name="Alice", char_id=1001, token_env="ALICE_TOKEN", short_name="A")
+BOB = CharacterConfig(key="bob", name="Bob", char_id=1002, token_env="BOB_TOKEN", short_name="B")
+
+STRUCTURE = 1035466617946
+STATION = 60003760
+
+
+def _item(item_id, type_id, quantity, location_id, flag="Hangar", singleton=False):
+    return {
+        "item_id": item_id, "type_id": type_id, "quantity": quantity,
+        "location_id": location_id, "location_flag": flag, "is_singleton": singleton,
+    }
+
+
+def _pages(char_id):
+    """Three pages; page 2's item sits in a container listed on page 1."""
+    container = char_id * 1000 + 1
+    return {
+        1: [
+            _item(container, 999, 1, STRUCTURE, singleton=True),
+            _item(container + 1, 101, 10, STRUCTURE),
+        ],
+        2: [_item(container + 2, 102, 20, container, flag="Unlocked")],
+        3: [_item(container + 3, 103, 30, STATION)],
+    }
+
+
+# char_id -> page -> items
+PAGES = {char.char_id: _pages(char.char_id) for char in (ALICE, BOB)}
+
+
+class FakeESI:
+    """Async client stand-in serving PAGES with one ETag per page."""
+
+    def __init__(self, fail=()):
+        self.fail = set(fail)
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def get(self, url, headers=None, timeout=None):
+        char_id = int(url.split("/characters/")[1].split("/")[0])
+        page = int(url.rsplit("page=", 1)[1])
+        self.requests.append((char_id, page, headers.get("If-None-Match")))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+
+        etag = f'"{char_id}-{page}"'
+        response = MagicMock()
+        response.headers = {"X-Pages": "3", "ETag": etag}
+        if (char_id, page) in self.fail:
+            response.status_code = 500
+        elif headers.get("If-None-Match") == etag:
+            response.status_code = 304
+        else:
+            response.status_code = 200
+            response.json.return_value = PAGES[char_id][page]
+        return response
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+@pytest.fixture
+def esi(monkeypatch, tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'cli_cache.db'}")
+    monkeypatch.setattr(asset_cache, "_engine", engine)
+    monkeypatch.setattr(
+        character_assets, "get_token_for_character",
+        lambda key, refresh_token, scope: {"access_token": f"token-{key}"},
+    )
+    monkeypatch.setattr(character_assets, "get_all_characters", lambda: [ALICE, BOB])
+    fake = FakeESI()
+    monkeypatch.setattr(character_assets.httpx, "AsyncClient", lambda **kwargs: fake)
+    yield fake
+    engine.dispose()
+
+
+def _expire_cache():
+    with asset_cache._get_engine().begin() as conn:
+        conn.execute(text("UPDATE character_asset_cache SET cached_at = '2000-01-01T00:00:00+00:00'"))
+
+
+def test_fetches_all_characters_and_pages_concurrently(esi):
+    results = character_assets.fetch_all_character_assets()
+
+    assert [char for char, _ in results] == [ALICE, BOB]
+    for _, assets in results:
+        assert assets == {101: 10, 102: 20, 103: 30}
+    assert len(esi.requests) == 6
+    assert all(etag is None for _, _, etag in esi.requests)
+    # Both characters' page 1, then four later pages, in flight together.
+    assert esi.max_in_flight >= 4
+    assert asset_cache.read_pages(ALICE.char_id)[3] == {
+        "etag": f'"{ALICE.char_id}-3"', "last_modified": None,
+        "items": [[ALICE.char_id * 1000 + 4, 103, 30, STATION, "Hangar", False]],
+    }
+
+
+def test_refresh_after_ttl_is_conditional(esi, capsys):
+    character_assets.fetch_all_character_assets()
+    esi.requests.clear()
+
+    # Within the TTL: no requests at all.
+    assert character_assets.fetch_all_character_assets(type_ids=[102])[0][1] == {102: 20}
+    assert esi.requests == []
+    assert "[cache] Using cached assets for Alice" in capsys.readouterr().out
+
+    _expire_cache()
+    results = character_assets.fetch_all_character_assets()
+    assert len(esi.requests) == 6
+    assert all(etag is not None for _, _, etag in esi.requests)
+    assert results[1][1] == {101: 10, 102: 20, 103: 30}
+    # The all-304 refresh re-stamps the cache, so the TTL starts over.
+    assert asset_cache.read_cache(BOB.char_id) == {101: 10, 102: 20, 103: 30}
+
+
+def test_partial_fetch_is_not_cached(esi):
+    esi.fail = {(ALICE.char_id, 2)}
+    results = character_assets.fetch_all_character_assets()
+
+    assert results[0][1] == {101: 10, 103: 30}
+    assert asset_cache.read_cache(ALICE.char_id) is None
+    assert asset_cache.read_pages(ALICE.char_id) == {}
+    assert asset_cache.read_cache(BOB.char_id) == {101: 10, 102: 20, 103: 30}
+
+
+def test_index_resolves_containers_across_pages():
+    rows = character_assets._compact([item for page in _pages(7).values() for item in page])
+    index = {row["item_id"]: row for row in character_assets.index_asset_locations(rows)}
+
+    in_container = index[7003]
+    assert in_container["container_id"] == 7001
+    assert in_container["location_flag"] == "Unlocked"
+    assert in_container["root_location_id"] == STRUCTURE
+    assert index[7002]["container_id"] is None
+    assert index[7002]["root_location_id"] == STRUCTURE
+    assert index[7004]["root_location_id"] == STATION
+
+
+def test_stock_queries_read_the_location_index(esi):
+    character_assets.fetch_all_character_assets()
+    esi.requests.clear()
+
+    assert asset_cache.stock_at_structure(STRUCTURE) == {101: 20, 102: 40}
+    assert asset_cache.stock_at_structure(STRUCTURE, type_ids=[102]) == {102: 40}
+    assert asset_cache.stock_at_structure(STRUCTURE, include_singletons=True)[999] == 2
+    assert asset_cache.stock_by_location(type_ids=[103], char_ids=[BOB.char_id]) == {(STATION, 103): 30}
+    assert esi.requests == []
+
+    asset_cache.invalidate_cache(ALICE.char_id)
+    assert asset_cache.stock_at_structure(STRUCTURE) == {101: 10, 102: 20}
+
+
+def test_fit_check_nets_out_on_hand_stock():
+    from mkts_backend.cli_tools.fit_check import FitCheckResult
+
+    result = FitCheckResult(
+        fit_name="Test Fit",
+        ship_name="Test Ship",
+        ship_type_id=12345,
+        market_data=[
+            {"type_id": 101, "type_name": "Module A", "fits": 50.0, "fit_qty": 2},
+            {"type_id": 102, "type_name": "Module B", "fits": 80.0, "fit_qty": 1},
+        ],
+        total_fit_cost=0,
+        min_fits=50.0,
+        target=100,
+        market_name="primary",
+        on_hand={101: 30, 102: 25},
+    )
+    missing = {m["type_name"]: m for m in result.missing_for_target}
+    assert missing["Module A"]["qty_needed"] == 70  # (100 - 50) * 2 - 30
+    assert missing["Module A"]["on_hand"] == 30
+    assert missing["Module B"]["qty_needed"] == 0
+    assert result.to_multibuy() == "Module A 70"
+
+
+def test_character_token_reused_until_near_expiry(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(esi_auth, "CLIENT_ID", "client")
+    monkeypatch.setattr(esi_auth, "SECRET_KEY", "secret")
+    refreshed = {"access_token": "new", "refresh_token": "rt", "expires_at": time.time() + 1200}
+    session = MagicMock()
+    session.return_value.refresh_token.return_value = refreshed
+    monkeypatch.setattr(esi_auth, "OAuth2Session", session)
+
+    cached = {"access_token": "old", "refresh_token": "rt", "expires_at": time.time() + 600}
+    (tmp_path / "token_alice.json").write_text(json.dumps(cached))
+    assert esi_auth.get_token_for_character("alice", "", "scope")["access_token"] == "old"
+    session.assert_not_called()
+
+    cached["expires_at"] = time.time() + 10  # inside the expiry margin
+    (tmp_path / "token_alice.json").write_text(json.dumps(cached))
+    assert esi_auth.get_token_for_character("alice", "", "scope")["access_token"] == "new"
+    assert json.loads((tmp_path / "token_alice.json").read_text())["access_token"] == "new"
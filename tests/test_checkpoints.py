@@ -0,0 +1,167 @@
+"""Tests for pipeline checkpoints, input freshness and ``update-markets --resume``."""
+
+import threading
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, text, update
+
+from mkts_backend.db.models import PipelineCheckpoint, UpdateLog, Watchlist
+from mkts_backend.processing.checkpoints import PARTIAL, CheckpointStore
+from mkts_backend.processing.stage_graph import run_stages
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'market.db'}")
+    for model in (UpdateLog, Watchlist):
+        model.__table__.create(engine)
+    return engine
+
+
+def _store(engine, resume=True, **kwargs):
+    return CheckpointStore(engine, "primary", resume=resume, **kwargs)
+
+
+def _run_stage(store, stage):
+    """What the pipeline does: check freshness, then record on success."""
+    fresh = store.is_fresh(stage)
+    if not fresh:
+        store.record(stage)
+    return fresh
+
+
+def _touch(engine, table, minutes_ago=0):
+    ts = datetime.now(timezone.utc) - timedelta(minutes=minutes_ago)
+    with engine.begin() as conn:
+        conn.execute(
+            text("INSERT OR REPLACE INTO updatelog (table_name, timestamp) VALUES (:t, :ts)"),
+            {"t": table, "ts": ts.isoformat()},
+        )
+
+
+def test_esi_stages_only_skipped_on_resume(engine):
+    store = _store(engine, resume=False)
+    store.record("orders_write")
+    assert not store.is_fresh("orders_write")
+    assert _store(engine).is_fresh("orders_write")
+
+
+def test_helper_stages_follow_their_owner(engine):
+    _store(engine).record("orders_write")
+    store = _store(engine)
+    assert store.is_fresh("orders_cache")
+    assert store.is_fresh("orders_fetch")
+    assert not store.is_fresh("watchlist")
+
+
+def test_unchanged_inputs_skip_without_resume(engine):
+    _touch(engine, "marketorders", minutes_ago=5)
+    store = _store(engine, resume=False)
+    assert not _run_stage(store, "stats")
+    _touch(engine, "marketstats")
+    assert not _run_stage(store, "doctrines")
+
+    quiet = _store(engine, resume=False)
+    assert quiet.is_fresh("stats")
+    assert quiet.is_fresh("doctrines")
+    assert not _store(engine, resume=False, force=True).is_fresh("stats")
+
+
+def test_changed_inputs_rerun_downstream(engine):
+    store = _store(engine, resume=False)
+    for stage in ("stats", "doctrines", "sheets"):
+        _run_stage(store, stage)
+    assert _store(engine, resume=False).is_fresh("stats")
+
+    _touch(engine, "marketorders")
+    store = _store(engine, resume=False)
+    assert not store.is_fresh("stats")
+    assert not store.is_fresh("sheets")
+    assert store.is_fresh("doctrines")  # marketstats not rewritten yet
+
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO watchlist (type_id, group_id, type_name, group_name, "
+                "category_id, category_name) VALUES (34, 18, 'Tritanium', 'Mineral', 4, 'Material')"
+            )
+        )
+    assert not _store(engine, resume=False).is_fresh("stats")
+
+
+def test_old_esi_checkpoints_expire(engine):
+    store = _store(engine)
+    store.record("orders_write")
+    _run_stage(store, "stats")
+    with engine.begin() as conn:
+        conn.execute(
+            update(PipelineCheckpoint).values(
+                completed_at=datetime.now(timezone.utc) - timedelta(hours=2)
+            )
+        )
+    store = _store(engine, max_age_minutes=60)
+    assert not store.is_fresh("orders_write")
+    assert store.is_fresh("stats")  # inputs unchanged, age is irrelevant
+
+
+def test_partial_history_marker(engine):
+    _store(engine).record("history", PARTIAL, {"done_through": 35, "total": 4})
+    store = _store(engine)
+    assert not store.is_fresh("history")
+    assert store.partial("history") == {"done_through": 35, "total": 4}
+    assert _store(engine, resume=False).partial("history") == {}
+
+
+class TestHistoryResume:
+    def _run(self, engine, fail_type=None):
+        from mkts_backend import cli
+
+        ctx = SimpleNamespace(
+            alias="primary", name="Primary", region_id=1, structure_id=2, database_alias="wcmkt"
+        )
+        db = MagicMock()
+        db.get_watchlist.return_value = pd.DataFrame({"type_id": [40, 10, 30, 20]})
+        fetched = []
+
+        def fake_history(batch, **kwargs):
+            fetched.append(list(batch))
+            return [
+                {"type_id": t, "status": 503 if t == fail_type else 200} for t in batch
+            ]
+
+        store = _store(engine)
+        lane = threading.Lock()
+        with patch("mkts_backend.db.db_handlers.load_orders_cache", return_value={}), \
+             patch("mkts_backend.db.db_handlers.load_esi_cache", return_value={}), \
+             patch.object(cli, "_fetch_orders", return_value={"status": 304}), \
+             patch.object(cli, "_write_orders", return_value=True), \
+             patch.object(cli, "run_async_history", side_effect=fake_history), \
+             patch.object(cli, "_write_history", return_value=True), \
+             patch.object(cli, "process_market_stats", return_value=True), \
+             patch.object(cli, "process_doctrine_stats", return_value=True), \
+             patch.object(cli, "process_needed_items", return_value=True), \
+             patch.object(cli.SettingsService, "gsheets_enabled", False), \
+             patch.object(cli.SettingsService, "pipeline_history_batch_size", 2):
+            stages = cli._build_market_stages(ctx, MagicMock(), db, True, store, lane)
+            results, _ = run_stages(stages, db_lane=lane)
+        return fetched, results
+
+    def test_history_checkpoints_each_batch_and_resumes(self, engine):
+        fetched, _ = self._run(engine)
+        assert fetched == [[10, 20], [30, 40]]
+        assert _store(engine).partial("history") == {"done_through": 40, "total": 4}
+
+        _store(engine).record("history", PARTIAL, {"done_through": 20, "total": 4})
+        fetched, results = self._run(engine)
+        assert fetched == [[30, 40]]
+        assert results["history"] == {"types": 2, "failed": 0}
+
+    def test_marker_stops_before_first_failed_type(self, engine):
+        fetched, results = self._run(engine, fail_type=30)
+        assert fetched == [[10, 20], [30, 40]]
+        assert results["history"]["failed"] == 1
+        assert _store(engine).partial("history") == {"done_through": 29, "total": 4}
@@ -138,7 +138,7 @@ class TestArgsParserRouting:
             parse_args(["update-builder-costs"])
 
         assert exc_info.value.code == 0
-        mock_run.assert_called_once_with()
+        mock_run.assert_called_once_with(full=False)
 
     def test_update_builder_costs_help_reaches_subcommand_help(self, capsys):
         from mkts_backend.cli_tools.args_parser import parse_args
@@ -7,6 +7,8 @@ Covers the core calculation pipeline:
   - fill_nulls_from_history
   - calculate_doctrine_stats
 """
+import json
+
 import pytest
 import pandas as pd
 import numpy as np
@@ -272,6 +274,34 @@ class TestCalculateMarketStats:
         expected_cols = set(MarketStats.__table__.columns.keys())
         assert set(result.columns) == expected_cols
 
+    def test_equiv_totals(self, in_memory_market_db):
+        """Grouped types share their group's stock; others keep their own."""
+        from sqlalchemy import text as sa_text
+
+        engine = create_engine(f"sqlite:///{in_memory_market_db}")
+        with engine.begin() as conn:
+            conn.execute(sa_text(
+                "CREATE TABLE module_equivalents (id INTEGER PRIMARY KEY, "
+                "equiv_group_id INTEGER, type_id INTEGER, type_name TEXT)"
+            ))
+            conn.execute(sa_text("""
+                INSERT INTO module_equivalents (equiv_group_id, type_id, type_name) VALUES
+                (7, 34, 'Tritanium'), (7, 36, 'Mexallon')
+            """))
+        engine.dispose()
+
+        mock_db = _MockDB(in_memory_market_db)
+        with patch("mkts_backend.processing.data_processing._get_db", return_value=mock_db):
+            import mkts_backend.processing.data_processing as dp
+            dp._wcmkt_db = None
+            result = dp.calculate_market_stats().set_index("type_id")
+
+        assert result["equiv_group_id"].to_dict() == {34: 7, 35: 0, 36: 7}
+        group_stock = result.loc[34, "total_volume_remain"] + result.loc[36, "total_volume_remain"]
+        assert result.loc[34, "equiv_total_stock"] == group_stock
+        assert result.loc[36, "equiv_total_stock"] == group_stock
+        assert result.loc[35, "equiv_total_stock"] == result.loc[35, "total_volume_remain"]
+
     def test_handles_zero_volume(self, in_memory_market_db):
         """When avg_volume is 0 or NULL, days_remaining should default to 30."""
         # Mexallon (type_id=36) has no orders and no history → avg_volume=NULL
@@ -380,3 +410,139 @@ class TestCalculateMarketStats:
         assert row["price"] == 0.0
         assert isinstance(row["price"], float)
         assert str(result["price"].dtype) == "float64"
+
+
+# ===== calculate_needed_items ===============================================
+
+class TestCalculateNeededItems:
+
+    @pytest.fixture
+    def needed_db(self, in_memory_market_db):
+        """Rifter (fit 1, target 20) and Drake (fit 2, target 30).
+
+        Equivalence groups: {34, 36} and {35, 37}. The Drake fit also uses 36.
+        Doctrine stats are recalculated so ``equiv_stock`` is filled in.
+        """
+        from sqlalchemy import text as sa_text
+
+        engine = create_engine(f"sqlite:///{in_memory_market_db}")
+        with engine.begin() as conn:
+            conn.execute(sa_text("""
+                INSERT INTO doctrines
+                VALUES (4,2,24690,'Drake',0,36,'Mexallon',1000,0,0,0,0,0,18,'Mineral',4,'Material',NULL)
+            """))
+            conn.execute(sa_text("ALTER TABLE marketstats ADD COLUMN equiv_group_id INTEGER"))
+            conn.execute(sa_text("ALTER TABLE marketstats ADD COLUMN equiv_total_stock INTEGER"))
+            conn.execute(sa_text("""
+                INSERT INTO marketstats (type_id, total_volume_remain, type_name)
+                VALUES (36, 600, 'Mexallon'), (37, 250, 'Isogen')
+            """))
+            conn.execute(sa_text("""
+                UPDATE marketstats SET
+                    equiv_group_id = CASE WHEN type_id IN (34, 36) THEN 1 ELSE 2 END,
+                    equiv_total_stock = CASE WHEN type_id IN (34, 36) THEN 6100 ELSE 750 END
+            """))
+            conn.execute(sa_text(
+                "CREATE TABLE ship_targets (fit_id INTEGER PRIMARY KEY, fit_name TEXT, "
+                "ship_id INTEGER, ship_name TEXT, ship_target INTEGER, created_at TEXT)"
+            ))
+            conn.execute(sa_text("""
+                INSERT INTO ship_targets VALUES
+                (1, 'Rifter Fleet', 587, 'Rifter', 20, NULL),
+                (2, 'Drake Fleet', 24690, 'Drake', 30, NULL)
+            """))
+            conn.execute(sa_text(
+                "CREATE TABLE module_equivalents (id INTEGER PRIMARY KEY, "
+                "equiv_group_id INTEGER, type_id INTEGER, type_name TEXT)"
+            ))
+            conn.execute(sa_text("""
+                INSERT INTO module_equivalents (equiv_group_id, type_id, type_name) VALUES
+                (1, 34, 'Tritanium'), (1, 36, 'Mexallon'), (2, 35, 'Pyerite'), (2, 37, 'Isogen')
+            """))
+
+        with patch("mkts_backend.processing.data_processing._get_db",
+                   return_value=_MockDB(in_memory_market_db)):
+            from mkts_backend.processing.data_processing import calculate_doctrine_stats
+            doctrines = calculate_doctrine_stats()
+        doctrines.to_sql("doctrines", engine, if_exists="replace", index=False)
+        engine.dispose()
+        return in_memory_market_db
+
+    def test_doctrine_equiv_stock_excludes_group_members_in_the_fit(self, needed_db):
+        engine = create_engine(f"sqlite:///{needed_db}")
+        doctrines = pd.read_sql_query("SELECT * FROM doctrines", engine).set_index("id")
+        engine.dispose()
+
+        # Rifter: Tritanium gains Mexallon's 600, Pyerite gains Isogen's 250.
+        # Drake uses Tritanium and Mexallon, so neither adds the other.
+        assert doctrines["equiv_stock"].to_dict() == {1: 600, 2: 250, 3: 0, 4: 0}
+        assert doctrines.loc[2, "fits_on_mkt"] == 15.0
+        assert doctrines.loc[2, "total_stock"] == 500
+
+    def test_folds_in_equivalents_not_used_by_the_fit(self, needed_db):
+        mock_db = _MockDB(needed_db)
+        with patch("mkts_backend.processing.data_processing._get_db", return_value=mock_db):
+            from mkts_backend.processing.data_processing import calculate_needed_items
+            result = calculate_needed_items()
+
+        rows = [
+            (r.ship_name, r.type_id, r.total_stock, r.equiv_stock, r.qty_needed, r.targ_perc)
+            for r in result.itertuples()
+        ]
+        # Rifter Tritanium: 5500 + 600 Mexallon = 61 fits, at target.
+        # Drake Tritanium/Mexallon: the fit uses both, so neither adds the other.
+        assert rows == [
+            ("Drake", 36, 600, 0, 29400, 0.02),
+            ("Drake", 34, 5500, 0, 500, 0.92),
+            ("Rifter", 35, 750, 250, 250, 0.75),
+        ]
+        assert result.iloc[2]["equiv_items"] == (
+            '[{"type_id": 37, "type_name": "Isogen", "stock": 250}]'
+        )
+
+    def test_needed_command_reads_table_with_filters(self, needed_db):
+        from mkts_backend.cli_tools.fit_check_needed import _query_needed_data
+        from mkts_backend.db.models import NeededItems
+
+        mock_db = _MockDB(needed_db)
+        with patch("mkts_backend.processing.data_processing._get_db", return_value=mock_db):
+            from mkts_backend.processing.data_processing import calculate_needed_items
+            needed = calculate_needed_items()
+        engine = create_engine(f"sqlite:///{needed_db}")
+        NeededItems.__table__.create(engine)
+        needed.to_sql("needed_items", engine, if_exists="append", index=False)
+
+        with patch("mkts_backend.cli_tools.fit_check_needed.DatabaseConfig", return_value=mock_db), \
+             patch("mkts_backend.cli_tools.fit_check.get_equiv_candidates") as live:
+            drake = _query_needed_data(ship_filter=["Drake"], targ_perc_filter=0.5)
+            rifter = _query_needed_data(fit_filter=[1])
+        live.assert_not_called()
+        assert [(r["type_id"], r["qty_needed"]) for r in drake] == [(36, 29400)]
+        assert rifter[0]["equiv_items"] == [{"type_id": 37, "type_name": "Isogen", "stock": 250}]
+
+    def test_live_and_materialized_equivalents_agree(self, needed_db):
+        """A well-stocked module the fit also uses is never an equivalent.
+
+        Tritanium (34) joins the Pyerite group; the Rifter fit uses it but
+        has enough of it, so the live rows (filtered to qty_needed > 0)
+        must still exclude it from Pyerite's equivalents.
+        """
+        from sqlalchemy import text as sa_text
+        from mkts_backend.cli_tools.fit_check_needed import _query_needed_data
+
+        engine = create_engine(f"sqlite:///{needed_db}")
+        with engine.begin() as conn:
+            conn.execute(sa_text("UPDATE marketstats SET equiv_group_id = 2 WHERE type_id = 34"))
+        engine.dispose()
+
+        mock_db = _MockDB(needed_db)
+        with patch("mkts_backend.processing.data_processing._get_db", return_value=mock_db):
+            from mkts_backend.processing.data_processing import calculate_needed_items
+            materialized = calculate_needed_items()
+        with patch("mkts_backend.cli_tools.fit_check_needed.DatabaseConfig", return_value=mock_db), \
+             patch("mkts_backend.cli_tools.fit_check.DatabaseConfig", return_value=mock_db):
+            live = _query_needed_data(fit_filter=[1], live=True)
+
+        isogen = [{"type_id": 37, "type_name": "Isogen", "stock": 250}]
+        assert json.loads(materialized.iloc[2]["equiv_items"]) == isogen
+        assert [(r["type_id"], r["equiv_items"]) for r in live] == [(35, isogen)]
@@ -0,0 +1,102 @@
+"""Tests for model-declared secondary indexes and the ``indexes`` helpers."""
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from mkts_backend.db.db_indexes import (
+    HOT_QUERIES,
+    create_indexes,
+    drop_indexes,
+    explain_hot_queries,
+    index_status,
+    is_full_scan,
+    managed_indexes,
+)
+from mkts_backend.db.models import Base
+
+
+@pytest.fixture
+def legacy_engine(tmp_path):
+    """Market DB shaped like the deployed ones: tables present, no secondary indexes."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    Base.metadata.create_all(engine)
+    drop_indexes(engine)
+    yield engine
+    engine.dispose()
+
+
+def test_models_declare_hot_path_indexes():
+    declared = {
+        (ix.table.name, tuple(c.name for c in ix.columns)) for ix in managed_indexes()
+    }
+    assert ("marketorders", ("type_id", "is_buy_order", "price")) in declared
+    assert ("doctrines", ("fit_id",)) in declared
+    assert ("doctrines", ("type_id",)) in declared
+    assert ("ship_targets", ("ship_id",)) in declared
+    assert ("module_equivalents", ("type_id",)) in declared
+    assert ("module_equivalents", ("equiv_group_id",)) in declared
+    assert ("marketstats", ("equiv_group_id",)) in declared
+    assert ("market_history", ("type_id", "date")) in declared
+    assert ("needed_items", ("ship_name",)) in declared
+
+
+def test_create_all_builds_indexes(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'fresh.db'}")
+    Base.metadata.create_all(engine)
+    assert all(s.ok for s in index_status(engine))
+
+
+def test_create_verify_drop_roundtrip(legacy_engine):
+    assert {s.state for s in index_status(legacy_engine)} == {"missing"}
+
+    created = create_indexes(legacy_engine)
+    assert set(created) == {str(ix.name) for ix in managed_indexes()}
+    assert all(s.ok for s in index_status(legacy_engine))
+    assert create_indexes(legacy_engine) == []  # idempotent
+
+    dropped = drop_indexes(legacy_engine)
+    assert set(dropped) == set(created)
+    assert not any(s.present for s in index_status(legacy_engine))
+
+
+def test_create_skips_missing_tables(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'partial.db'}")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE ship_targets (fit_id INTEGER PRIMARY KEY, ship_id INTEGER)"))
+    assert create_indexes(engine) == ["ix_ship_targets_ship_id"]
+    states = {s.name: s.state for s in index_status(engine)}
+    assert states["ix_ship_targets_ship_id"] == "ok"
+    assert states["ix_doctrines_fit_id"] == "no table"
+
+
+def test_mismatched_columns_reported(legacy_engine):
+    with legacy_engine.begin() as conn:
+        conn.execute(text("CREATE INDEX ix_doctrines_fit_id ON doctrines (ship_id)"))
+    states = {s.name: s.state for s in index_status(legacy_engine)}
+    assert states["ix_doctrines_fit_id"] == "mismatch"
+
+
+def test_indexes_remove_full_scans_from_point_lookups(legacy_engine):
+    point_lookups = {
+        "fit_check_fallback",
+        "fit_check_doctrine",
+        "ship_target_lookup",
+        "equiv_group_members",
+        "history_by_type",
+        "needed_items_by_ship",
+    }
+    before = explain_hot_queries(legacy_engine)
+    assert all(is_full_scan(before[name]) for name in point_lookups)
+
+    create_indexes(legacy_engine)
+    after = explain_hot_queries(legacy_engine)
+    for name in point_lookups:
+        assert not is_full_scan(after[name]), (name, after[name])
+    assert any("ix_doctrines_type_id" in line for line in after["module_usage"])
+
+
+def test_explain_reports_missing_tables(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'empty.db'}")
+    plans = explain_hot_queries(engine)
+    assert set(plans) == {q.name for q in HOT_QUERIES}
+    assert all(p[0].startswith("<unavailable") for p in plans.values())
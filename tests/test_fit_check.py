@@ -34,17 +34,19 @@ class TestFitCheckMarketData:
                 group_id INTEGER,
                 group_name TEXT,
                 category_id INTEGER,
-                category_name TEXT
+                category_name TEXT,
+                equiv_group_id INTEGER,
+                equiv_total_stock INTEGER
             )
         """)
 
-        # Insert test data
+        # Insert test data (519 and 3841 share an equivalence group)
         conn.execute("""
             INSERT INTO marketstats VALUES
-            (33157, 'Hurricane Fleet Issue', 250000000, 245000000, 260000000, 50, 100, 30.5, '2025-01-01', 6, 'Battlecruiser', 6, 'Ship'),
-            (2048, 'Damage Control II', 1500000, 1400000, 1600000, 500, 5000, 45.2, '2025-01-01', 7, 'Damage Control', 7, 'Module'),
-            (519, 'Gyrostabilizer II', 2000000, 1900000, 2100000, 300, 3000, 40.0, '2025-01-01', 8, 'Gyrostabilizer', 7, 'Module'),
-            (3841, 'Large Shield Extender II', 3500000, 3400000, 3600000, 200, 2000, 35.0, '2025-01-01', 9, 'Shield Extender', 7, 'Module')
+            (33157, 'Hurricane Fleet Issue', 250000000, 245000000, 260000000, 50, 100, 30.5, '2025-01-01', 6, 'Battlecruiser', 6, 'Ship', 0, 100),
+            (2048, 'Damage Control II', 1500000, 1400000, 1600000, 500, 5000, 45.2, '2025-01-01', 7, 'Damage Control', 7, 'Module', 0, 5000),
+            (519, 'Gyrostabilizer II', 2000000, 1900000, 2100000, 300, 3000, 40.0, '2025-01-01', 8, 'Gyrostabilizer', 7, 'Module', 1, 5000),
+            (3841, 'Large Shield Extender II', 3500000, 3400000, 3600000, 200, 2000, 35.0, '2025-01-01', 9, 'Shield Extender', 7, 'Module', 1, 5000)
         """)
 
         # Create marketorders table for fallback testing
@@ -66,6 +68,10 @@ class TestFitCheckMarketData:
             (3, 99999, 1200000, 75, 0)
         """)
 
+        # 587 (Rifter) is a ship only ship_targets knows about
+        conn.execute("CREATE TABLE ship_targets (ship_id INTEGER, ship_target INTEGER)")
+        conn.execute("INSERT INTO ship_targets VALUES (587, 10)")
+
         conn.commit()
         conn.close()
 
@@ -102,59 +108,81 @@ class TestFitCheckMarketData:
 
         return db_path
 
-    def test_get_marketstats_data(self, temp_market_db, tmp_path):
+    @staticmethod
+    def _load(type_ids, market_db, sde_db):
+        """``_load_fit_item_data`` against the temporary market and SDE dbs."""
+        from types import SimpleNamespace
+        from sqlalchemy import create_engine
+        from mkts_backend.cli_tools.fit_check import _load_fit_item_data
+        from mkts_backend.db.sde_index import clear_sde_index
+
+        market = MagicMock()
+        market.engine = create_engine(f"sqlite:///{market_db}")
+        sde = SimpleNamespace(path=str(sde_db), engine=create_engine(f"sqlite:///{sde_db}"))
+
+        clear_sde_index()
+        try:
+            with patch('mkts_backend.cli_tools.fit_check.DatabaseConfig',
+                       side_effect=lambda alias: sde if alias == "sde" else market):
+                return _load_fit_item_data(type_ids, market_ctx=None)
+        finally:
+            clear_sde_index()
+
+    def test_load_marketstats_data(self, temp_market_db, temp_sde_db):
         """Test retrieving data from marketstats."""
-        from mkts_backend.cli_tools.fit_check import _get_marketstats_data
-
-        with patch('mkts_backend.cli_tools.fit_check.DatabaseConfig') as mock_db_config:
-            # Setup mock
-            mock_instance = MagicMock()
-            mock_db_config.return_value = mock_instance
-
-            from sqlalchemy import create_engine
-            mock_instance.engine = create_engine(f"sqlite:///{temp_market_db}")
+        data = self._load([33157, 2048], temp_market_db, temp_sde_db)
 
-            # Test the function
-            with patch('mkts_backend.config.market_context.MarketContext') as mock_ctx:
-                mock_ctx.database_alias = "wcmkt"
-                results = _get_marketstats_data([33157, 2048], market_ctx=None)
+        assert 33157 in data.marketstats
+        assert data.marketstats[33157]["type_name"] == "Hurricane Fleet Issue"
+        assert data.marketstats[33157]["price"] == 250000000
+        assert data.fallback == {}
 
-            assert 33157 in results
-            assert results[33157]["type_name"] == "Hurricane Fleet Issue"
-            assert results[33157]["price"] == 250000000
-
-    def test_get_fallback_data(self, temp_market_db, tmp_path):
+    def test_load_fallback_data(self, temp_market_db, temp_sde_db):
         """Test fallback data retrieval from marketorders."""
-        from mkts_backend.cli_tools.fit_check import _get_fallback_data
-
-        with patch('mkts_backend.cli_tools.fit_check.DatabaseConfig') as mock_db_config:
-            mock_instance = MagicMock()
-            mock_db_config.return_value = mock_instance
-
-            from sqlalchemy import create_engine
-            mock_instance.engine = create_engine(f"sqlite:///{temp_market_db}")
-
-            result = _get_fallback_data(99999, market_ctx=None)
-
-            assert result is not None
-            assert result["type_id"] == 99999
-            assert result["total_volume_remain"] == 225  # 100 + 50 + 75
-            assert result["is_fallback"] == True
-
-    def test_get_fallback_data_no_orders(self, temp_market_db):
-        """Test fallback returns None when no orders exist."""
-        from mkts_backend.cli_tools.fit_check import _get_fallback_data
-
-        with patch('mkts_backend.cli_tools.fit_check.DatabaseConfig') as mock_db_config:
-            mock_instance = MagicMock()
-            mock_db_config.return_value = mock_instance
-
-            from sqlalchemy import create_engine
-            mock_instance.engine = create_engine(f"sqlite:///{temp_market_db}")
-
-            result = _get_fallback_data(88888, market_ctx=None)  # Non-existent type
-
-            assert result is None
+        data = self._load([99999], temp_market_db, temp_sde_db)
+
+        result = data.fallback[99999]
+        assert result["type_id"] == 99999
+        assert result["total_volume_remain"] == 225  # 100 + 50 + 75
+        assert result["is_fallback"] == True
+
+    def test_load_fit_item_data_is_set_based(self, temp_market_db, temp_sde_db):
+        """One query per source, however many items the fit has."""
+        from types import SimpleNamespace
+        from sqlalchemy import create_engine, event
+        from mkts_backend.cli_tools.fit_check import _load_fit_item_data
+        from mkts_backend.db.sde_index import clear_sde_index
+
+        market = MagicMock()
+        market.engine = create_engine(f"sqlite:///{temp_market_db}")
+        sde = SimpleNamespace(path=str(temp_sde_db), engine=create_engine(f"sqlite:///{temp_sde_db}"))
+        statements = []
+        event.listen(market.engine, "before_cursor_execute", lambda *a: statements.append(a[2]))
+
+        clear_sde_index()
+        with patch('mkts_backend.cli_tools.fit_check.DatabaseConfig',
+                   side_effect=lambda alias: sde if alias == "sde" else market):
+            data = _load_fit_item_data([33157, 2048, 519, 3841, 99999, 587, 12345], market_ctx=None)
+        clear_sde_index()
+
+        assert len(statements) == 4
+        assert set(data.marketstats) == {33157, 2048, 519, 3841}
+        assert data.equivs == {
+            519: [{"type_id": 3841, "type_name": "Large Shield Extender II", "stock": 2000}],
+            3841: [{"type_id": 519, "type_name": "Gyrostabilizer II", "stock": 3000}],
+        }
+        assert set(data.fallback) == {99999}
+        assert data.fallback[99999]["total_volume_remain"] == 225
+        assert data.fallback[99999]["price"] == 1000000
+        assert data.ship_type_ids == {33157, 587}
+        assert data.sde_names == {99999: "Fallback Item"}
+
+    def test_load_fallback_data_no_orders(self, temp_market_db, temp_sde_db):
+        """Test an item with neither stats nor orders gets no fallback."""
+        data = self._load([88888], temp_market_db, temp_sde_db)  # Non-existent type
+
+        assert 88888 not in data.marketstats
+        assert 88888 not in data.fallback
 
 
 class TestFitCheckDisplay:
@@ -266,8 +294,9 @@ class TestGetFitMarketStatus:
 
     def test_calculates_fits_correctly(self):
         """Test that fits are calculated correctly."""
-        from mkts_backend.cli_tools.fit_check import get_fit_market_status
+        from mkts_backend.cli_tools.fit_check import FitItemData, get_fit_market_status
         from mkts_backend.utils.eft_parser import FitParseResult
+        from mkts_backend.utils.jita import JitaPriceLookup
 
         # Create a mock parse result
         parse_result = FitParseResult(
@@ -280,34 +309,39 @@ class TestGetFitMarketStatus:
             missing_types=[],
         )
 
-        with patch('mkts_backend.cli_tools.fit_check._get_marketstats_data') as mock_stats:
+        with patch('mkts_backend.cli_tools.fit_check._load_fit_item_data') as mock_data, \
+             patch('mkts_backend.cli_tools.fit_check.get_jita_prices', return_value=JitaPriceLookup(prices={})):
             with patch('mkts_backend.cli_tools.fit_check._get_target_for_fit') as mock_target:
-                with patch('mkts_backend.cli_tools.fit_check._is_ship') as mock_is_ship:
-                    mock_target.return_value = None
-                    mock_stats.return_value = {
+                mock_target.return_value = None
+                # Ship type_id 200 is a ship, module 100 is not
+                mock_data.return_value = FitItemData(
+                    marketstats={
                         100: {"type_name": "Test Module", "price": 1000000, "avg_price": 1100000, "total_volume_remain": 100},
                         200: {"type_name": "Test Ship", "price": 50000000, "avg_price": 55000000, "total_volume_remain": 10},
-                    }
-                    # Ship type_id 200 is a ship, module 100 is not
-                    mock_is_ship.side_effect = lambda tid, cat, ctx: tid == 200
+                    },
+                    fallback={},
+                    ship_type_ids={200},
+                    sde_names={},
+                )
 
-                    result = get_fit_market_status(parse_result, market_ctx=None)
+                result = get_fit_market_status(parse_result, market_ctx=None)
 
-                    # Find the module entry
-                    module_entry = next(e for e in result.market_data if e["type_id"] == 100)
-                    assert module_entry["fits"] == 50.0  # 100 stock / 2 qty
+                # Find the module entry
+                module_entry = next(e for e in result.market_data if e["type_id"] == 100)
+                assert module_entry["fits"] == 50.0  # 100 stock / 2 qty
 
-                    # Find the ship entry
-                    ship_entry = next(e for e in result.market_data if e["type_id"] == 200)
-                    assert ship_entry["fits"] == 10.0  # 10 stock / 1 qty
+                # Find the ship entry
+                ship_entry = next(e for e in result.market_data if e["type_id"] == 200)
+                assert ship_entry["fits"] == 10.0  # 10 stock / 1 qty
 
-                    # Verify ship is first in the sorted list
-                    assert result.market_data[0]["type_id"] == 200
+                # Verify ship is first in the sorted list
+                assert result.market_data[0]["type_id"] == 200
 
     def test_calculates_fit_price(self):
         """Test that fit price is calculated correctly."""
-        from mkts_backend.cli_tools.fit_check import get_fit_market_status
+        from mkts_backend.cli_tools.fit_check import FitItemData, get_fit_market_status
         from mkts_backend.utils.eft_parser import FitParseResult
+        from mkts_backend.utils.jita import JitaPriceLookup
 
         parse_result = FitParseResult(
             items=[
@@ -319,21 +353,26 @@ class TestGetFitMarketStatus:
             missing_types=[],
         )
 
-        with patch('mkts_backend.cli_tools.fit_check._get_marketstats_data') as mock_stats:
+        with patch('mkts_backend.cli_tools.fit_check._load_fit_item_data') as mock_data, \
+             patch('mkts_backend.cli_tools.fit_check.get_jita_prices', return_value=JitaPriceLookup(prices={})):
             with patch('mkts_backend.cli_tools.fit_check._get_target_for_fit') as mock_target:
-                with patch('mkts_backend.cli_tools.fit_check._is_ship') as mock_is_ship:
-                    mock_target.return_value = None
-                    mock_stats.return_value = {
+                mock_target.return_value = None
+                # Ship type_id 200 is a ship, module 100 is not
+                mock_data.return_value = FitItemData(
+                    marketstats={
                         100: {"type_name": "Test Module", "price": 1000000, "avg_price": 1100000, "total_volume_remain": 100},
                         200: {"type_name": "Test Ship", "price": 50000000, "avg_price": 55000000, "total_volume_remain": 10},
-                    }
-                    mock_is_ship.side_effect = lambda tid, cat, ctx: tid == 200
+                    },
+                    fallback={},
+                    ship_type_ids={200},
+                    sde_names={},
+                )
 
-                    result = get_fit_market_status(parse_result, market_ctx=None)
+                result = get_fit_market_status(parse_result, market_ctx=None)
 
-                    # Find the module entry
-                    module_entry = next(e for e in result.market_data if e["type_id"] == 100)
-                    assert module_entry["fit_price"] == 5000000  # 5 * 1000000
+                # Find the module entry
+                module_entry = next(e for e in result.market_data if e["type_id"] == 100)
+                assert module_entry["fit_price"] == 5000000  # 5 * 1000000
 
 
 class TestFitCheckResult:
@@ -622,10 +661,11 @@ class TestFitCheckByFitId:
     def test_fit_check_command_with_fit_id(self, temp_doctrine_db):
         """Test fit-check command with fit_id argument."""
         from mkts_backend.cli_tools.fit_check import fit_check_command
+        from mkts_backend.utils.jita import JitaPriceLookup
 
         with patch('mkts_backend.cli_tools.fit_check.DatabaseConfig') as mock_db_config:
             with patch('mkts_backend.cli_tools.fit_check.MarketContext') as mock_ctx:
-                with patch('mkts_backend.cli_tools.fit_check.fetch_jita_prices') as mock_jita:
+                with patch('mkts_backend.cli_tools.fit_check.get_jita_prices') as mock_jita:
                     mock_instance = MagicMock()
                     mock_db_config.return_value = mock_instance
 
@@ -637,7 +677,7 @@ class TestFitCheckByFitId:
                         database_alias="wcmkt"
                     )
 
-                    mock_jita.return_value = {}
+                    mock_jita.return_value = JitaPriceLookup(prices={})
 
                     result = fit_check_command(
                         fit_id=42,
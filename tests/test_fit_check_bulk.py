@@ -0,0 +1,94 @@
+"""Tests for bulk fit-check (--dir, --doctrine, --all-fits)."""
+
+import sqlite3
+from unittest.mock import MagicMock, patch
+
+import pytest
+from sqlalchemy import create_engine, event
+
+from mkts_backend.cli_tools import fit_check_bulk
+from mkts_backend.cli_tools.fit_check import FitItemData
+from mkts_backend.utils.eft_parser import FitParseResult
+from mkts_backend.utils.jita import JitaPriceLookup
+
+
+def _fit(name, ship_id, items):
+    return FitParseResult(
+        items=[{"type_id": t, "type_name": f"Type {t}", "quantity": q} for t, q in items],
+        ship_name=f"Ship {ship_id}",
+        ship_type_id=ship_id,
+        fit_name=name,
+        missing_types=[],
+    )
+
+
+ITEM_DATA = FitItemData(
+    marketstats={
+        587: {"type_name": "Rifter", "total_volume_remain": 10, "price": 1.0, "avg_price": 1.0},
+        2048: {"type_name": "Damage Control II", "total_volume_remain": 12, "price": 2.0, "avg_price": 2.0},
+        519: {"type_name": "Gyrostabilizer II", "total_volume_remain": 30, "price": 3.0, "avg_price": 3.0},
+    },
+    fallback={},
+    ship_type_ids={587},
+    sde_names={},
+)
+
+
+@pytest.fixture
+def loaders():
+    with patch.object(fit_check_bulk, "_load_fit_item_data", return_value=ITEM_DATA) as item_data, \
+         patch.object(fit_check_bulk, "get_jita_prices", return_value=JitaPriceLookup(prices={})) as jita:
+        yield item_data, jita
+
+
+def test_check_fits_loads_market_data_once(loaders):
+    fits = [
+        (_fit("A", 587, [(2048, 1)]), 10, 1),
+        (_fit("B", 587, [(2048, 1), (519, 3)]), 20, 2),
+    ]
+    results = fit_check_bulk.check_fits(fits)
+
+    for loader in loaders:
+        loader.assert_called_once()
+        assert sorted(loader.call_args.args[0]) == [519, 587, 2048]
+    assert [(r.fit_id, r.target, r.min_fits) for r in results] == [(1, 10, 10), (2, 20, 10)]
+
+
+def test_aggregate_multibuy_shares_stock_between_fits(loaders):
+    fits = [
+        (_fit("A", 587, [(2048, 1)]), 10, 1),
+        (_fit("B", 587, [(2048, 1), (519, 3)]), 5, 2),
+        (_fit("C", 587, [(519, 1)]), None, 3),
+    ]
+    multibuy = fit_check_bulk.aggregate_multibuy(fit_check_bulk.check_fits(fits))
+
+    # DC II: 10 + 5 needed, 12 in stock; Rifter: 15 vs 10; Gyros: 15 vs 30.
+    # Fit C has no target and adds nothing.
+    assert multibuy.splitlines() == ["Damage Control II 3", "Rifter 5"]
+
+
+def test_load_doctrine_fits_is_two_queries(tmp_path):
+    db_path = tmp_path / "market.db"
+    conn = sqlite3.connect(db_path)
+    conn.executescript("""
+        CREATE TABLE doctrine_fits (fit_id INTEGER, fit_name TEXT, ship_type_id INTEGER,
+                                    ship_name TEXT, target INTEGER, doctrine_id INTEGER);
+        CREATE TABLE doctrines (fit_id INTEGER, type_id INTEGER, type_name TEXT, fit_qty INTEGER);
+        INSERT INTO doctrine_fits VALUES (1, 'A', 587, 'Rifter', 10, 7),
+                                         (2, 'B', 587, 'Rifter', 20, 7),
+                                         (3, 'C', 587, 'Rifter', 30, 8);
+        INSERT INTO doctrines VALUES (1, 587, 'Rifter', 1), (1, 2048, 'Damage Control II', 1),
+                                     (2, 587, 'Rifter', 1), (2, 519, 'Gyrostabilizer II', 3),
+                                     (3, 587, 'Rifter', 1);
+    """)
+    conn.close()
+
+    engine = create_engine(f"sqlite:///{db_path}")
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *a: statements.append(a[2]))
+    with patch.object(fit_check_bulk, "DatabaseConfig", return_value=MagicMock(engine=engine)):
+        fits = fit_check_bulk.load_doctrine_fits(doctrine_id=7)
+
+    assert len(statements) == 2
+    assert [(p.fit_name, target, fit_id) for p, target, fit_id in fits] == [("A", 10, 1), ("B", 20, 2)]
+    assert {i["type_id"]: i["quantity"] for i in fits[1][0].items} == {587: 1, 519: 3}
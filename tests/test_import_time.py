@@ -0,0 +1,51 @@
+"""Tests for the startup-time benchmark and the lazy imports it guards."""
+from __future__ import annotations
+
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+SCRIPTS = Path(__file__).resolve().parent.parent / "scripts"
+
+
+def _load_bench_module():
+    """Load scripts/bench_startup.py as a module without scripts being a package."""
+    src = SCRIPTS / "bench_startup.py"
+    spec = importlib.util.spec_from_file_location("bench_startup", src)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["bench_startup"] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+bench = _load_bench_module()
+
+
+def test_parse_importtime_keeps_top_level_imports():
+    stderr = "\n".join([
+        "import time: self [us] | cumulative | imported package",
+        "import time:       100 |        100 |   _io",
+        "import time:       300 |        500 | mkts_backend.cli_tools.launcher",
+        "import time:        50 |         50 |     rich.box",
+        "import time:        20 |         20 | gc",
+    ])
+    assert bench.parse_importtime(stderr) == {"mkts_backend.cli_tools.launcher": 500, "gc": 20}
+    assert bench.loaded_modules(stderr) == {"_io", "mkts_backend.cli_tools.launcher", "rich.box", "gc"}
+
+
+@pytest.mark.parametrize("scenario", bench.SCENARIOS, ids=lambda s: s.name)
+def test_entry_points_do_not_import_heavy_modules(scenario, tmp_path):
+    result = bench.measure(scenario, baseline=set(), cwd=str(tmp_path), repeat=1)
+    assert result.exit_code == 0
+    assert result.heavy == []
+
+
+def test_failures_report_budget_and_heavy_modules():
+    over = bench.Result("slow", import_ms=300, wall_ms=400, budget_ms=250)
+    heavy = bench.Result("heavy", import_ms=10, wall_ms=80, budget_ms=250, heavy=["pandas"])
+    problems = bench.failures([over, heavy])
+    assert any("slow" in p and "budget 250" in p for p in problems)
+    assert any("heavy: imports pandas" in p for p in problems)
+    assert bench.failures([over], scale=2.0) == []
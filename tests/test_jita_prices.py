@@ -0,0 +1,62 @@
+"""Tests for local-first Jita price lookups (utils.jita.get_jita_prices)."""
+
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from mkts_backend.utils import jita
+from mkts_backend.utils.jita import get_jita_prices
+
+
+@pytest.fixture
+def local(tmp_path):
+    """Market DB with a fresh price for 34 and a day-old one for 35."""
+    market = create_engine(f"sqlite:///{tmp_path / 'market.db'}")
+    now = datetime.now(timezone.utc)
+    with market.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE jita_prices (type_id INTEGER PRIMARY KEY, sell_price REAL, "
+            "buy_price REAL, last_updated DATETIME)"
+        ))
+        conn.execute(
+            text("INSERT INTO jita_prices VALUES (34, 5.0, 4.0, :fresh), (35, 9.0, 8.0, :old)"),
+            {
+                "fresh": (now - timedelta(minutes=5)).replace(tzinfo=None).isoformat(sep=" "),
+                "old": (now - timedelta(days=1)).isoformat(),
+            },
+        )
+    jita._cache_engine = None
+    with patch.object(jita, "JITA_CACHE_DB_URL", f"sqlite:///{tmp_path / 'cli_cache.db'}"), \
+         patch("mkts_backend.config.db_config.DatabaseConfig",
+               return_value=SimpleNamespace(engine=market)):
+        yield
+    jita._cache_engine = None
+
+
+def test_fetches_only_missing_and_stale_ids_then_caches(local):
+    with patch.object(jita, "_fetch_sell_prices", return_value={35: 10.0, 36: None}) as fetch:
+        lookup = get_jita_prices([34, 35, 36], ttl_minutes=60, offline=False)
+    fetch.assert_called_once_with([35, 36])
+    assert lookup.prices == {34: 5.0, 35: 10.0, 36: None}
+    assert lookup.stale == set() and lookup.fetched == 2
+
+    # The fetched rows (including "no price") now satisfy the TTL locally
+    with patch.object(jita, "_fetch_sell_prices") as fetch:
+        again = get_jita_prices([34, 35, 36], ttl_minutes=60, offline=False)
+    fetch.assert_not_called()
+    assert again.get(35) == 10.0 and again.get(36) is None
+
+
+def test_offline_and_failed_fetch_serve_stale_prices(local):
+    with patch.object(jita, "_fetch_sell_prices") as fetch:
+        offline = get_jita_prices([34, 35, 36], ttl_minutes=60, offline=True)
+    fetch.assert_not_called()
+    assert offline.prices == {34: 5.0, 35: 9.0, 36: None}
+    assert offline.stale == {35}
+
+    with patch.object(jita, "_fetch_sell_prices", return_value=None):
+        failed = get_jita_prices([35], ttl_minutes=60, offline=False)
+    assert failed.get(35) == 9.0 and failed.stale == {35}
@@ -0,0 +1,82 @@
+"""Tests for the shared, queue-backed logging setup and ProgressReporter."""
+
+import logging
+
+from mkts_backend.config import logging_config
+from mkts_backend.config.logging_config import (
+    PACKAGE_LOGGER,
+    ProgressReporter,
+    configure_logging,
+    market_log_context,
+)
+
+
+def _package_queue_handlers():
+    return [
+        h for h in logging.getLogger(PACKAGE_LOGGER).handlers
+        if isinstance(h, logging.handlers.QueueHandler)
+    ]
+
+
+def test_one_shared_handler_set_however_many_loggers():
+    for i in range(20):
+        logger = configure_logging(f"mkts_backend.test_shared_{i}")
+        assert logger.handlers == []
+        assert logger.propagate
+    assert len(_package_queue_handlers()) == 1
+
+    outside = configure_logging("test_outside_package")
+    configure_logging("test_outside_package")
+    assert outside.handlers == _package_queue_handlers()
+
+
+def test_records_cross_the_queue_with_their_market_tag():
+    listener = logging_config._listener
+    assert listener is not None
+    records = []
+
+    class _Capture(logging.Handler):
+        def emit(self, record):
+            records.append(self.format(record))
+
+    capture = _Capture()
+    capture.setFormatter(logging.Formatter(logging_config.FILE_FORMAT))
+    original = listener.handlers
+    listener.handlers = original + (capture,)
+    try:
+        logger = configure_logging("mkts_backend.test_queue_tag")
+        with market_log_context("deployment"):
+            logger.warning("inside")
+        logger.warning("outside")
+        listener.stop()  # drains the queue
+    finally:
+        listener.handlers = original
+        listener.start()
+
+    assert records[0].endswith("> [deployment] inside")
+    assert records[1].endswith("> outside")
+
+
+def test_progress_reporter_is_rate_limited(capsys, caplog, monkeypatch):
+    monkeypatch.setenv("MKTS_QUIET", "0")
+    logger = configure_logging("mkts_backend.test_progress")
+    progress = ProgressReporter(logger, "upserting marketstats", total=5000, interval=60, log_interval=60)
+    with caplog.at_level(logging.INFO, logger=PACKAGE_LOGGER):
+        for _ in range(5000):
+            progress.update()
+        progress.finish()
+
+    out = capsys.readouterr().out
+    assert out.count("\r") == 2  # first draw + final line
+    assert "5000/5000 (100.0%)" in out
+    messages = [r.getMessage() for r in caplog.records if r.name == "mkts_backend.test_progress"]
+    assert len(messages) == 1 and messages[0].startswith("upserting marketstats: 5000/5000")
+
+
+def test_progress_reporter_quiet(capsys, monkeypatch):
+    monkeypatch.setenv("MKTS_QUIET", "1")
+    progress = ProgressReporter(logging.getLogger("mkts_backend.test_quiet"), "fetching", total=3)
+    for _ in range(3):
+        progress.update()
+    progress.finish()
+    assert capsys.readouterr().out == ""
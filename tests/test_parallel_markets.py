@@ -0,0 +1,156 @@
+"""Tests for concurrent market pipelines and the shared ESI governor."""
+
+import logging
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from mkts_backend.config.logging_config import (
+    FILE_FORMAT,
+    _MarketTagFilter,
+    configure_logging,
+    market_log_context,
+)
+from mkts_backend.esi.esi_governor import EsiGovernor
+
+
+class TestEsiGovernor:
+    def test_bucket_allows_burst_then_waits(self):
+        governor = EsiGovernor(rate=3, period=60.0)
+        assert [governor._reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+        wait = governor._reserve()
+        assert 19 < wait <= 20  # one token per 20s
+
+    def test_refund_returns_a_token(self):
+        governor = EsiGovernor(rate=1, period=60.0)
+        assert governor._reserve() == 0.0
+        governor.refund()
+        assert governor._reserve() == 0.0
+
+    def test_low_error_budget_pauses_everyone(self):
+        governor = EsiGovernor()
+        governor.observe(200, {"X-ESI-Error-Limit-Remain": "5", "X-ESI-Error-Limit-Reset": "30"})
+        assert 29 < governor.paused_for <= 30
+        assert governor._reserve() > 29
+
+    def test_healthy_budget_does_not_pause(self):
+        governor = EsiGovernor()
+        governor.observe(200, {"X-ESI-Error-Limit-Remain": "90", "X-ESI-Error-Limit-Reset": "30"})
+        assert governor.paused_for == 0
+
+    def test_429_honours_retry_after_and_pause_never_shortens(self):
+        governor = EsiGovernor()
+        governor.observe(420, {"X-ESI-Error-Limit-Reset": "40"})
+        governor.observe(429, {"Retry-After": "2"})
+        assert governor.paused_for > 39
+
+    def test_shared_across_threads(self):
+        governor = EsiGovernor(rate=10, period=60.0)
+        taken = []
+
+        def worker():
+            taken.append(sum(governor._reserve() == 0.0 for _ in range(10)))
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert sum(taken) == 10
+
+
+def test_market_log_context_tags_records(tmp_path):
+    logger = configure_logging("mkts_backend.test_market_tag")
+    records: list[str] = []
+
+    class _Capture(logging.Handler):
+        def emit(self, record):
+            records.append(self.format(record))
+
+    capture = _Capture()
+    capture.setFormatter(logging.Formatter(FILE_FORMAT))
+    capture.addFilter(_MarketTagFilter())
+    logger.addHandler(capture)
+
+    with market_log_context("deployment"):
+        logger.warning("inside")
+    logger.warning("outside")
+
+    assert records[0].endswith("> [deployment] inside")
+    assert records[1].endswith("> outside")
+
+
+def _contexts(*aliases):
+    return [SimpleNamespace(alias=a, name=a) for a in aliases]
+
+
+class TestRunMarketPipelines:
+    def test_failure_is_isolated(self):
+        from mkts_backend import cli
+
+        ran = []
+
+        def fake_pipeline(ctx, history=False, resume=False, force=False):
+            ran.append(ctx.alias)
+            if ctx.alias == "deployment":
+                raise cli.MarketPipelineError("boom")
+
+        with patch.object(cli, "_run_market_pipeline", side_effect=fake_pipeline):
+            results = cli._run_market_pipelines(
+                _contexts("primary", "deployment", "market3"), history=False, workers=1
+            )
+
+        assert ran == ["primary", "deployment", "market3"]
+        assert results == {"primary": True, "deployment": False, "market3": True}
+
+    def test_workers_run_markets_concurrently(self):
+        from mkts_backend import cli
+
+        barrier = threading.Barrier(3, timeout=5)
+        tags = {}
+
+        def fake_pipeline(ctx, history=False, resume=False, force=False):
+            from mkts_backend.config.logging_config import _market_tag
+
+            tags[ctx.alias] = _market_tag.get()
+            barrier.wait()  # only passes if all three run at the same time
+            if ctx.alias == "market3":
+                raise ValueError("unexpected")
+
+        with patch.object(cli, "_run_market_pipeline", side_effect=fake_pipeline):
+            start = time.perf_counter()
+            results = cli._run_market_pipelines(
+                _contexts("primary", "deployment", "market3"), history=True, workers=3
+            )
+
+        assert time.perf_counter() - start < 5
+        assert results == {"primary": True, "deployment": True, "market3": False}
+        assert tags == {"primary": "primary", "deployment": "deployment", "market3": "market3"}
+
+    @pytest.mark.parametrize("workers", [None, 2])
+    def test_run_market_update_reports_failed_markets(self, workers, monkeypatch):
+        from mkts_backend import cli
+
+        monkeypatch.setenv("MKTS_PIPELINE_WORKERS", "1")
+        contexts = {c.alias: c for c in _contexts("primary", "deployment")}
+        calls = {}
+
+        def fake_run(ctxs, history, n, resume=False, force=False):
+            calls["workers"] = n
+            return {"primary": True, "deployment": False}
+
+        with patch.object(cli, "validate_all", return_value={"is_valid": True}), \
+             patch.object(cli, "init_databases"), \
+             patch.object(cli.MarketContext, "from_settings", side_effect=contexts.get), \
+             patch.object(cli, "DatabaseConfig") as mock_db, \
+             patch.object(cli, "process_jita_prices", return_value=True), \
+             patch.object(cli, "_run_market_pipelines", side_effect=fake_run), \
+             patch("mkts_backend.cli_tools.market_args.expand_market_alias",
+                   return_value=["primary", "deployment"]):
+            mock_db.return_value.needs_init.return_value = False
+            assert cli.run_market_update(market_alias="all", workers=workers) is False
+
+        assert calls["workers"] == (workers or 1)
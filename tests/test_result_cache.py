@@ -0,0 +1,120 @@
+"""Tests for the data-version-keyed CLI result cache."""
+
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from mkts_backend.cli_tools import result_cache
+from mkts_backend.cli_tools.result_cache import ResultCache
+
+
+@pytest.fixture
+def market_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'market.db'}")
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE updatelog (id INTEGER PRIMARY KEY, table_name TEXT UNIQUE, timestamp TEXT)"
+        ))
+        conn.execute(text("INSERT INTO updatelog (table_name, timestamp) VALUES ('doctrines', '2026-10-19 10:00:00')"))
+        conn.execute(text("CREATE TABLE doctrine_fits (fit_id INTEGER, doctrine_id INTEGER, target INTEGER)"))
+        conn.execute(text("INSERT INTO doctrine_fits VALUES (1, 7, 20)"))
+    with patch("mkts_backend.config.db_config.DatabaseConfig",
+               return_value=SimpleNamespace(engine=engine)):
+        yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ResultCache(f"sqlite:///{tmp_path / 'cli_cache.db'}")
+
+
+def _counting(value):
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return value
+    return compute, calls
+
+
+def test_repeat_lookup_is_a_hit(market_engine, store):
+    compute, calls = _counting([{"fit_id": 1}])
+    first = store.get_or_compute("module", {"type_id": 2048}, "wcmkt", compute)
+    second = store.get_or_compute("module", {"type_id": 2048}, "wcmkt", compute)
+    other = store.get_or_compute("module", {"type_id": 519}, "wcmkt", compute)
+
+    assert first == second == other == [{"fit_id": 1}]
+    assert len(calls) == 2
+    assert (store.hits, store.misses) == (1, 2)
+    assert store.stats() == [{"command": "module", "hits": 1, "misses": 2, "entries": 2}]
+
+
+@pytest.mark.parametrize("change", [
+    "UPDATE updatelog SET timestamp = '2026-10-19 11:00:00' WHERE table_name = 'doctrines'",
+    "UPDATE doctrine_fits SET target = 30",
+])
+def test_restamp_or_fit_edit_invalidates(market_engine, store, change):
+    compute, calls = _counting("rows")
+    store.get_or_compute("module", {"type_id": 2048}, "wcmkt", compute)
+    with market_engine.begin() as conn:
+        conn.execute(text(change))
+    store.get_or_compute("module", {"type_id": 2048}, "wcmkt", compute)
+    assert len(calls) == 2
+
+
+def test_max_age_expires_entries(market_engine, store):
+    compute, calls = _counting("priced")
+    store.get_or_compute("fitcheck_fit", {"fit_id": 1}, "wcmkt", compute, max_age_minutes=60)
+    assert store.lookup(
+        result_cache.cache_key("fitcheck_fit", {"fit_id": 1}, "wcmkt"),
+        result_cache.data_version(market_engine, result_cache.COMMAND_DEPS["fitcheck_fit"]),
+        max_age=timedelta(0),
+    ) == (False, None)
+    store.get_or_compute("fitcheck_fit", {"fit_id": 1}, "wcmkt", compute, max_age_minutes=60)
+    assert len(calls) == 1
+
+
+def test_disabled_cache_always_computes(market_engine):
+    compute, calls = _counting(None)
+    disabled = ResultCache(url=None)
+    disabled.get_or_compute("list_fits", {}, "wcmkt", compute)
+    disabled.get_or_compute("list_fits", {}, "wcmkt", compute)
+    assert len(calls) == 2
+
+
+@pytest.mark.parametrize("blob", [
+    b"\x80\x05\x95",  # truncated: EOFError
+    b"\x80\x04c__main__\nGoneResult\n.",  # class no longer exists: AttributeError
+])
+def test_unreadable_entry_is_dropped_and_recomputed(market_engine, store, blob):
+    compute, calls = _counting(["rows"])
+    store.get_or_compute("list_fits", {}, "wcmkt", compute)
+    with store._get_engine().begin() as conn:
+        conn.execute(text("UPDATE result_cache SET value = :blob"), {"blob": blob})
+
+    assert store.get_or_compute("list_fits", {}, "wcmkt", compute) == ["rows"]
+    assert len(calls) == 2
+    assert store.get_or_compute("list_fits", {}, "wcmkt", compute) == ["rows"]
+    assert len(calls) == 2
+
+
+def test_cache_format_is_part_of_the_key(monkeypatch):
+    before = result_cache.cache_key("list_fits", {}, "wcmkt")
+    monkeypatch.setattr(result_cache, "CACHE_FORMAT", result_cache.CACHE_FORMAT + 1)
+    assert result_cache.cache_key("list_fits", {}, "wcmkt") != before
+
+
+def test_store_if_skips_stale_results(market_engine, store):
+    from mkts_backend.cli_tools.fit_check import _jita_fresh
+
+    stale = SimpleNamespace(market_data=[{"type_id": 1, "jita_stale": True}])
+    compute, calls = _counting(stale)
+    args = {"fit_id": 1, "target": None, "jita_offline": True}
+    store.get_or_compute("fitcheck_fit", args, "wcmkt", compute, store_if=_jita_fresh)
+    store.get_or_compute("fitcheck_fit", args, "wcmkt", compute, store_if=_jita_fresh)
+    assert len(calls) == 2
+    assert store.stats()[0]["entries"] == 0
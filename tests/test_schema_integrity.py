@@ -296,3 +296,26 @@ def test_upsert_marketstats_preserves_pk(base_engine, monkeypatch):
     with base_engine.connect() as conn:
         ids = conn.execute(text("SELECT type_id FROM marketstats")).fetchall()
     assert [r.type_id for r in ids] == [12345]
+
+
+def test_ensure_model_columns_migrates_old_marketstats(tmp_path, monkeypatch):
+    """A marketstats table from before the equivalence columns gains them."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE marketstats (type_id INTEGER PRIMARY KEY, total_volume_remain INTEGER)"
+        ))
+    fake = _FakeDB(engine, alias="wcmkt")
+    monkeypatch.setattr(
+        "mkts_backend.db.db_handlers._get_db",
+        lambda market_ctx=None: fake,
+    )
+
+    from mkts_backend.db.db_handlers import ensure_model_columns
+
+    added = ensure_model_columns(MarketStats)
+    assert {"equiv_group_id", "equiv_total_stock", "price"} <= set(added)
+    assert ensure_model_columns(MarketStats) == []
+    with engine.connect() as conn:
+        indexes = {r.name for r in conn.execute(text("PRAGMA index_list(marketstats)"))}
+    assert "ix_marketstats_equiv_group_id" in indexes
@@ -0,0 +1,159 @@
+"""Tests for the process-wide in-memory SDE type index."""
+
+import os
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, text
+
+from mkts_backend.db import sde_index
+from mkts_backend.db.sde_index import SdeTypeIndex, clear_sde_index, get_sde_index
+
+
+@pytest.fixture(autouse=True)
+def _fresh_index():
+    clear_sde_index()
+    yield
+    clear_sde_index()
+
+
+def _sde(db_path):
+    return SimpleNamespace(path=str(db_path), engine=create_engine(f"sqlite:///{db_path}"))
+
+
+def test_lookups(in_memory_sde_db):
+    index = get_sde_index(_sde(in_memory_sde_db))
+    assert len(index) == 3 and 34 in index and 37 not in index
+    assert index.name(35) == "Pyerite"
+    assert index.id_for_name("Mexallon") == 36
+    assert index.id_for_name("mexallon") is None  # exact match, like the old SQL
+    assert index.category_id(34) == 4
+    row = index.get(34)
+    assert (row.group_name, row.category_name, row.volume, row.meta_group_name) == (
+        "Mineral", "Material", 0.01, "Tech I"
+    )
+    assert index.names([34, 36, 99]) == {34: "Tritanium", 36: "Mexallon"}
+    frame = index.frame([36, 34])
+    assert list(frame["type_name"]) == ["Mexallon", "Tritanium"]
+
+
+def test_index_is_shared_until_the_file_changes(in_memory_sde_db):
+    sde = _sde(in_memory_sde_db)
+    first = get_sde_index(sde)
+    assert get_sde_index(sde) is first
+
+    with sde.engine.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO sdetypes VALUES (38,'Nocxium',18,'Mineral',4,'Material',0.01,1,'Tech I')"
+        ))
+    st = os.stat(in_memory_sde_db)
+    os.utime(in_memory_sde_db, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+    reloaded = get_sde_index(sde)
+    assert reloaded is not first
+    assert reloaded.name(38) == "Nocxium"
+
+
+def test_missing_columns_read_as_none(tmp_path):
+    db_path = tmp_path / "old_sde.db"
+    engine = create_engine(f"sqlite:///{db_path}")
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE sdetypes (typeID INTEGER PRIMARY KEY, typeName TEXT, "
+            "groupID INTEGER, groupName TEXT, categoryID INTEGER, categoryName TEXT)"
+        ))
+        conn.execute(text("INSERT INTO sdetypes VALUES (34,'Tritanium',18,'Mineral',4,'Material')"))
+    row = SdeTypeIndex.from_engine(engine).get(34)
+    assert row.volume is None and row.meta_group_id is None
+    assert row.category_name == "Material"
+
+
+def test_fileless_database_is_not_cached(in_memory_sde_db):
+    sde = SimpleNamespace(engine=create_engine(f"sqlite:///{in_memory_sde_db}"))
+    assert get_sde_index(sde) is not get_sde_index(sde)
+    assert sde_index._index is None
+
+
+def test_call_sites_share_one_load(in_memory_sde_db):
+    from mkts_backend.db import equiv_handlers
+    from mkts_backend.utils import utils
+
+    sde = _sde(in_memory_sde_db)
+    with patch.object(SdeTypeIndex, "from_engine", wraps=SdeTypeIndex.from_engine) as load, \
+         patch("mkts_backend.utils.utils.DatabaseConfig", return_value=sde), \
+         patch.object(utils, "sde_db", sde), \
+         patch.object(equiv_handlers, "_get_sde_db", return_value=sde):
+        sde.verify_db_exists = lambda: True
+        assert utils.get_type_name(34) == "Tritanium"
+        assert equiv_handlers.resolve_type_name(36) == "Mexallon"
+        assert equiv_handlers.resolve_type_id("Pyerite") == [(35, "Pyerite")]
+        names = utils.get_type_names_from_df(pd.DataFrame({"type_id": [34, 35]}))
+    assert load.call_count == 1
+    assert set(names["type_name"]) == {"Tritanium", "Pyerite"}
+
+
+class TestSnapshot:
+    def test_round_trip(self, in_memory_sde_db, tmp_path):
+        from mkts_backend.db.sde_snapshot import load_snapshot, write_snapshot
+
+        built = SdeTypeIndex.from_engine(create_engine(f"sqlite:///{in_memory_sde_db}"))
+        path = str(tmp_path / "sde.types.snap")
+        write_snapshot(built, path, (1, 2))
+
+        mapped = load_snapshot(path, (1, 2))
+        assert len(mapped) == 3
+        assert mapped.get(34) == built.get(34)
+        assert mapped.id_for_name("Pyerite") == 35
+        assert mapped.is_manufactured(35) and not mapped.is_manufactured(36)  # fixture blueprints
+        assert len(mapped.columns.strings) == 6  # names interned once
+        assert load_snapshot(path, (1, 3)) is None  # stale source
+        assert load_snapshot(str(tmp_path / "missing.snap")) is None
+
+    def test_get_sde_index_writes_then_maps_snapshot(self, in_memory_sde_db):
+        from mkts_backend.db.sde_snapshot import snapshot_path
+
+        sde = _sde(in_memory_sde_db)
+        get_sde_index(sde)
+        assert os.path.exists(snapshot_path(str(in_memory_sde_db)))
+
+        clear_sde_index()
+        with patch.object(SdeTypeIndex, "from_engine", side_effect=AssertionError("queried")):
+            index = get_sde_index(sde)
+        assert isinstance(index.columns.type_ids, memoryview)
+        assert index.name(36) == "Mexallon"
+
+    def test_second_open_reuses_snapshot_despite_wal_activity(self, in_memory_sde_db):
+        from mkts_backend.db.sde_snapshot import snapshot_path
+
+        sde = _sde(in_memory_sde_db)
+        with sde.engine.begin() as conn:
+            conn.execute(text("PRAGMA journal_mode=WAL"))
+        get_sde_index(sde)
+        snap = snapshot_path(str(in_memory_sde_db))
+        written = os.stat(snap).st_mtime_ns
+
+        # A later process opens the SDE (touching the WAL) before looking up.
+        clear_sde_index()
+        with sde.engine.connect() as conn:
+            conn.execute(text("SELECT COUNT(*) FROM sdetypes"))
+        wal = f"{in_memory_sde_db}-wal"
+        if os.path.exists(wal):
+            st = os.stat(wal)
+            os.utime(wal, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        with patch.object(SdeTypeIndex, "from_engine", side_effect=AssertionError("queried")):
+            index = get_sde_index(sde)
+        assert index.name(35) == "Pyerite"
+        assert os.stat(snap).st_mtime_ns == written
+
+    def test_sde_compile_command(self, in_memory_sde_db):
+        from mkts_backend.cli_tools.sde_command import sde_command
+        from mkts_backend.db.sde_snapshot import snapshot_path
+
+        sde = _sde(in_memory_sde_db)
+        with patch("mkts_backend.cli_tools.sde_command.DatabaseConfig", return_value=sde):
+            assert not sde_command(["status"])
+            assert sde_command(["compile"])
+            assert sde_command(["status"])
+        assert os.path.exists(snapshot_path(str(in_memory_sde_db)))
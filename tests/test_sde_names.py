@@ -0,0 +1,105 @@
+"""Tests for the in-memory type-name index (case-folded, prefix, fuzzy)."""
+
+from unittest.mock import patch
+
+import pytest
+
+from mkts_backend.db.sde_names import NameIndex, edit_distance
+
+PAIRS = [
+    (34, "Tritanium"),
+    (35, "Pyerite"),
+    (2048, "Damage Control II"),
+    (2046, "Damage Control I"),
+    (2047, "Damage Control I Blueprint"),
+    (11379, "Multispectrum Energized Membrane II"),
+    (3841, "Large Shield Extender II"),
+]
+
+
+@pytest.fixture
+def names():
+    return NameIndex(PAIRS)
+
+
+def test_exact_then_casefolded_lookup(names):
+    assert names.lookup("Pyerite") == 35
+    assert names.lookup("  damage control ii ") == 2048
+    assert names.lookup("Damage Contro") is None
+
+
+def test_prefix_and_substring_search(names):
+    assert [n for _, n in names.prefix("damage control i")] == [
+        "Damage Control I", "Damage Control I Blueprint", "Damage Control II"
+    ]
+    assert names.search("shield", limit=5) == [(3841, "Large Shield Extender II")]
+    not_bp = lambda t: t != 2047  # noqa: E731
+    assert 2047 not in {t for t, _ in names.search("Damage", where=not_bp)}
+
+
+def test_suggestions_for_typos(names):
+    assert names.suggest("Tritanuim")[0] == (34, "Tritanium")
+    assert names.suggest("Multispectrum Energised Membrane II")[0][0] == 11379
+    assert names.suggest("Large Sheild Extendr II")[0][0] == 3841
+    assert names.suggest("Completely unrelated name") == []
+
+
+def test_edit_distance_is_bounded():
+    assert edit_distance("kitten", "sitting", 3) == 3
+    assert edit_distance("kitten", "sitting", 2) is None
+    assert edit_distance("abc", "abcdef", 2) is None
+
+
+def _sde_index():
+    from mkts_backend.db.sde_index import SdeTypeIndex
+
+    return SdeTypeIndex([
+        (tid, name, 1, "g", 9 if "Blueprint" in name else 7, "c", 1.0, None, None)
+        for tid, name in PAIRS
+    ])
+
+
+def test_equiv_resolve_type_id_keeps_suggestions_separate():
+    from mkts_backend.db import equiv_handlers
+
+    with patch.object(equiv_handlers, "get_sde_index", return_value=_sde_index()):
+        assert equiv_handlers.resolve_type_id("damage control ii") == [(2048, "Damage Control II")]
+        assert [t for t, _ in equiv_handlers.resolve_type_id("Damage Control")] == [2046, 2048]
+        assert equiv_handlers.resolve_type_id("Damage Contrl II") == []
+        assert equiv_handlers.suggest_type_names("Damage Contrl II")[0][0] == 2048
+
+
+def test_equiv_find_never_acts_on_a_typo(capsys):
+    from mkts_backend.cli_tools import equiv_manager
+    from mkts_backend.db import equiv_handlers
+
+    with patch.object(equiv_handlers, "get_sde_index", return_value=_sde_index()), \
+         patch.object(equiv_manager, "find_equiv_by_attributes") as find, \
+         patch.object(equiv_manager, "add_equiv_group") as add:
+        ok = equiv_manager._equiv_find(["find", "Damage Contrl II", "--add"], ["primary"])
+
+    out = capsys.readouterr().out
+    assert ok is False
+    assert "Matched" not in out
+    assert "Did you mean?" in out and "Damage Control II (2048)" in out
+    find.assert_not_called()
+    add.assert_not_called()
+
+
+def test_type_name_completer():
+    from prompt_toolkit.document import Document
+
+    from mkts_backend.cli_tools.prompter import TypeNameCompleter
+    from mkts_backend.db.sde_index import SdeTypeIndex
+
+    index = SdeTypeIndex((tid, name, None, None, None, None, None, None, None) for tid, name in PAIRS)
+    completer = TypeNameCompleter()
+
+    def complete(text):
+        return [c.text for c in completer.get_completions(Document(text), None)]
+
+    with patch("mkts_backend.db.sde_index.get_sde_index", return_value=index):
+        assert complete("Damage Control II\nlarge sh") == ["Large Shield Extender II"]
+        assert complete("[Pyer") == ["Pyerite"]
+        assert complete("[Drake, PvE") == []
+        assert complete("Tritanium x100") == []
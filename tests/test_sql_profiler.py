@@ -0,0 +1,124 @@
+"""Tests for the opt-in SQL profiler."""
+
+import json
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from mkts_backend.config.sql_profiler import (
+    SqlProfiler,
+    column_affinity,
+    find_affinity_mismatches,
+    instrument_engine,
+)
+
+SCHEMA = {
+    "marketorders": {"type_id": "INTEGER", "price": "FLOAT", "is_buy_order": "BOOLEAN"},
+    "market_history": {"type_id": "VARCHAR(10)", "average": "FLOAT", "date": "DATETIME"},
+    "watchlist": {"type_id": "INTEGER", "type_name": "VARCHAR"},
+}
+
+MISMATCHED_JOIN = """
+    SELECT o.type_id, h.avg_price
+    FROM marketorders o
+    LEFT JOIN (
+        SELECT type_id, AVG(average) AS avg_price
+        FROM market_history
+        GROUP BY type_id
+    ) h ON o.type_id = h.type_id
+"""
+
+CAST_JOIN = """
+    SELECT o.type_id, h.avg_price
+    FROM marketorders o
+    LEFT JOIN (
+        SELECT CAST(type_id AS INTEGER) AS type_id, AVG(average) AS avg_price
+        FROM market_history
+        GROUP BY type_id
+    ) h ON o.type_id = h.type_id
+"""
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'profiled.db'}")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE marketorders (type_id INTEGER, price FLOAT, is_buy_order BOOLEAN)"))
+        conn.execute(text("CREATE TABLE market_history (type_id VARCHAR(10), average FLOAT)"))
+        conn.execute(
+            text("INSERT INTO marketorders VALUES (:t, :p, 0)"),
+            [{"t": t, "p": float(t)} for t in range(1, 21)],
+        )
+    yield engine
+    engine.dispose()
+
+
+@pytest.mark.parametrize(
+    "declared, expected",
+    [("INTEGER", "INTEGER"), ("VARCHAR(10)", "TEXT"), ("FLOAT", "REAL"),
+     ("BOOLEAN", "NUMERIC"), ("DATETIME", "NUMERIC"), ("", "BLOB")],
+)
+def test_column_affinity(declared, expected):
+    assert column_affinity(declared) == expected
+
+
+def test_detects_varchar_history_join():
+    mismatches = find_affinity_mismatches(MISMATCHED_JOIN, SCHEMA.__getitem__)
+    assert len(mismatches) == 1
+    assert "market_history.type_id VARCHAR(10)" in mismatches[0]
+
+
+def test_cast_join_is_clean():
+    assert find_affinity_mismatches(CAST_JOIN, SCHEMA.__getitem__) == []
+
+
+def test_plain_join_between_tables():
+    sql = "SELECT * FROM watchlist w JOIN market_history mh ON w.type_id = mh.type_id"
+    assert len(find_affinity_mismatches(sql, SCHEMA.__getitem__)) == 1
+    sql = "SELECT * FROM watchlist w JOIN marketorders mo ON w.type_id = mo.type_id"
+    assert find_affinity_mismatches(sql, SCHEMA.__getitem__) == []
+
+
+def test_records_time_rows_and_call_site(engine):
+    profiler = SqlProfiler(threshold_ms=0)
+    profiler.instrument(engine, "testdb")
+
+    with engine.connect() as conn:
+        rows = conn.execute(text("SELECT type_id FROM marketorders WHERE price > :p"), {"p": 5}).fetchall()
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE marketorders SET price = price + 1 WHERE type_id <= 3"))
+
+    assert len(rows) == 15
+    by_sql = {s.statement.split()[0]: s for s in profiler.statements()}
+    select, update = by_sql["SELECT"], by_sql["UPDATE"]
+    assert select.calls == 1 and select.rows == 15
+    assert update.rows == 3
+    assert select.db_alias == "testdb"
+    assert select.total_ms >= 0
+    # The statement ran from this test file, outside the package.
+    assert list(select.call_sites) == ["<outside mkts_backend>"]
+    assert select.query_plan and any("marketorders" in line for line in select.query_plan)
+
+
+def test_flags_mismatch_from_live_schema_and_writes_report(engine, tmp_path):
+    profiler = SqlProfiler(threshold_ms=10_000)
+    profiler.instrument(engine, "testdb")
+    with engine.connect() as conn:
+        conn.execute(text(MISMATCHED_JOIN)).fetchall()
+        conn.execute(text(CAST_JOIN)).fetchall()
+
+    path = profiler.write_report(tmp_path / "profile.json")
+    report = json.loads(path.read_text())
+    assert report["total_statements"] == 2
+    assert report["slow_statements"] == []
+    assert len(report["affinity_mismatches"]) == 1
+    assert "AVG(average) AS avg_price FROM market_history" in report["affinity_mismatches"][0]["statement"]
+
+
+def test_instrument_engine_is_opt_in(engine, monkeypatch):
+    import mkts_backend.config.sql_profiler as sql_profiler
+
+    monkeypatch.delenv("MKTS_PROFILE_SQL", raising=False)
+    monkeypatch.setattr(sql_profiler, "_profiler", None)
+    instrument_engine(engine, "testdb")
+    assert sql_profiler._profiler is None
@@ -0,0 +1,112 @@
+"""Tests for connect-time SQLite pragma profiles."""
+
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from mkts_backend.config.sqlite_pragmas import (
+    LOCAL_ONLY_PRAGMAS,
+    PRAGMA_PROFILES,
+    current_pragma_profile,
+    install_pragma_profile,
+    pragmas_for,
+    use_pragma_profile,
+)
+
+
+def _pragma(engine, name: str):
+    with engine.connect() as conn:
+        return conn.execute(text(f"PRAGMA {name}")).scalar()
+
+
+def test_unknown_profile_raises():
+    with pytest.raises(ValueError, match="Unknown SQLite pragma profile"):
+        pragmas_for("turbo")
+
+
+@pytest.mark.parametrize("profile", sorted(PRAGMA_PROFILES))
+def test_sync_managed_profiles_never_touch_journaling(profile):
+    pragmas = pragmas_for(profile, sync_managed=True)
+    assert not set(pragmas) & LOCAL_ONLY_PRAGMAS
+
+
+def test_local_profiles_keep_synchronous():
+    assert pragmas_for("bulk")["synchronous"] == "OFF"
+    assert pragmas_for("local_cache")["synchronous"] == "NORMAL"
+
+
+def test_install_applies_on_every_connection(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'bulk.db'}")
+    install_pragma_profile(engine, "bulk")
+    assert _pragma(engine, "cache_size") == -262144
+    assert _pragma(engine, "synchronous") == 0  # OFF
+    assert _pragma(engine, "temp_store") == 2  # MEMORY
+    assert _pragma(engine, "busy_timeout") == 30000
+
+
+def test_install_on_turso_dialect(tmp_path):
+    engine = create_engine(f"sqlite+turso:///{tmp_path / 'read.db'}")
+    install_pragma_profile(engine, "read")
+    assert _pragma(engine, "cache_size") == -65536
+    assert _pragma(engine, "temp_store") == 2
+
+
+def test_sync_managed_install_skips_synchronous(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'sync.db'}")
+    applied = install_pragma_profile(engine, "bulk", sync_managed=True)
+    assert "synchronous" not in applied
+    assert _pragma(engine, "synchronous") == 2  # sqlite default FULL, untouched
+    assert _pragma(engine, "cache_size") == -262144
+
+
+def test_use_pragma_profile_nests_and_restores():
+    assert current_pragma_profile() is None
+    with use_pragma_profile("bulk"):
+        assert current_pragma_profile() == "bulk"
+        with use_pragma_profile("read"):
+            assert current_pragma_profile() == "read"
+        assert current_pragma_profile() == "bulk"
+    assert current_pragma_profile() is None
+
+
+def test_use_pragma_profile_validates_name():
+    with pytest.raises(ValueError):
+        with use_pragma_profile("turbo"):
+            pass
+    assert current_pragma_profile() is None
+
+
+class TestDatabaseConfigProfile:
+    @pytest.fixture
+    def db(self, tmp_path):
+        from mkts_backend.config.db_config import DatabaseConfig
+
+        with patch.object(DatabaseConfig, "__init__", lambda self, *a, **kw: None):
+            db = DatabaseConfig()
+            db.alias = "test"
+            db.path = str(tmp_path / "test.db")
+            db.url = f"sqlite+turso:///{db.path}"
+            db.turso_url = None
+            db.token = None
+            db._engine = None
+            yield db
+
+    def test_defaults_to_settings_profile(self, db, monkeypatch):
+        monkeypatch.delenv("MKTS_SQLITE_PROFILE", raising=False)
+        assert db.resolved_pragma_profile == "read"
+
+    def test_env_override(self, db, monkeypatch):
+        monkeypatch.setenv("MKTS_SQLITE_PROFILE", "default")
+        assert db.resolved_pragma_profile == "default"
+
+    def test_active_block_beats_settings(self, db, monkeypatch):
+        monkeypatch.delenv("MKTS_SQLITE_PROFILE", raising=False)
+        with use_pragma_profile("bulk"):
+            assert db.resolved_pragma_profile == "bulk"
+            assert _pragma(db.engine, "synchronous") == 0
+
+    def test_explicit_profile_wins(self, db):
+        db.pragma_profile = "local_cache"
+        with use_pragma_profile("bulk"):
+            assert db.resolved_pragma_profile == "local_cache"
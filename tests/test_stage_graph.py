@@ -0,0 +1,189 @@
+"""Tests for the per-market stage-graph executor."""
+
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+import pytest
+
+from mkts_backend.processing.stage_graph import Stage, StageFailed, run_stages
+
+
+def _record(log, name, value=None, sleep=0.0):
+    def fn(results):
+        log.append(("start", name))
+        time.sleep(sleep)
+        log.append(("end", name))
+        return value
+    return fn
+
+
+def test_dependencies_are_respected_and_results_shared():
+    log = []
+    stages = [
+        Stage("a", _record(log, "a", 1)),
+        Stage("b", lambda r: r["a"] + 1, deps=("a",)),
+        Stage("c", lambda r: r["b"] * 10, deps=("b",), kind="network"),
+    ]
+    results, report = run_stages(stages)
+    assert results == {"a": 1, "b": 2, "c": 20}
+    assert {t.status for t in report.timings.values()} == {"ok"}
+
+
+def test_network_overlaps_db_but_db_stages_serialize():
+    active_db = []
+    peak = []
+    lock = threading.Lock()
+    network_running = threading.Event()
+    overlapped = []
+
+    def db_stage(results):
+        with lock:
+            active_db.append(1)
+            peak.append(len(active_db))
+        overlapped.append(network_running.is_set())
+        time.sleep(0.05)
+        with lock:
+            active_db.pop()
+
+    def network_stage(results):
+        network_running.set()
+        time.sleep(0.2)
+        network_running.clear()
+
+    stages = [
+        Stage("fetch", network_stage, kind="network"),
+        Stage("write1", db_stage),
+        Stage("write2", db_stage),
+        Stage("write3", db_stage),
+    ]
+    _, report = run_stages(stages)
+    assert max(peak) == 1
+    assert any(overlapped)
+    assert report.total_seconds < report.serial_seconds
+
+
+def test_required_failure_stops_unstarted_stages():
+    ran = []
+    stages = [
+        Stage("a", lambda r: (_ for _ in ()).throw(ValueError("boom"))),
+        Stage("b", lambda r: ran.append("b"), deps=("a",)),
+    ]
+    with pytest.raises(StageFailed) as exc_info:
+        run_stages(stages)
+    assert exc_info.value.stage == "a"
+    assert isinstance(exc_info.value.__cause__, ValueError)
+    assert exc_info.value.report.timings["b"].status == "not run"
+    assert ran == []
+
+
+def test_optional_failure_lets_dependents_run():
+    def boom(results):
+        raise RuntimeError("optional")
+
+    stages = [
+        Stage("opt", boom, kind="network", required=False),
+        Stage("after", lambda r: "opt" in r, deps=("opt",)),
+    ]
+    results, report = run_stages(stages)
+    assert results["after"] is False
+    assert report.timings["opt"].status == "failed"
+
+
+@pytest.mark.parametrize(
+    "stages, message",
+    [
+        ([Stage("a", print, deps=("b",)), Stage("b", print, deps=("a",))], "cycle"),
+        ([Stage("a", print, deps=("missing",))], "unknown"),
+        ([Stage("a", print), Stage("a", print)], "Duplicate"),
+    ],
+)
+def test_invalid_graphs_rejected(stages, message):
+    with pytest.raises(ValueError, match=message):
+        run_stages(stages)
+
+
+def test_skipped_stages_release_dependents():
+    completed = []
+    stages = [
+        Stage("a", lambda r: 1),
+        Stage("b", lambda r: 2, deps=("a",)),
+        Stage("c", lambda r: r["b"], deps=("b",)),
+    ]
+    results, report = run_stages(
+        stages,
+        should_skip=lambda stage: stage.name in ("a", "b"),
+        on_complete=lambda stage, result: completed.append(stage.name),
+    )
+    assert results == {"a": None, "b": None, "c": None}
+    assert report.timings["b"].status == "skipped"
+    assert completed == ["c"]
+
+
+def test_market_log_tag_reaches_stage_threads():
+    from mkts_backend.config.logging_config import _market_tag, market_log_context
+
+    with market_log_context("deployment"):
+        results, _ = run_stages([Stage("tag", lambda r: _market_tag.get(), kind="network")])
+    assert results["tag"] == "deployment"
+
+
+class TestMarketPipelineStages:
+    def _ctx(self):
+        return SimpleNamespace(
+            alias="primary", name="Primary", region_id=1, structure_id=2, database_alias="wcmkt"
+        )
+
+    def _run(self, history, **overrides):
+        from mkts_backend import cli
+
+        calls = []
+        db = MagicMock()
+        db.get_watchlist.return_value = pd.DataFrame({"type_id": [34, 35]})
+        db.push.side_effect = lambda: calls.append("push")
+
+        def track(name, value=True):
+            def fn(*args, **kwargs):
+                calls.append(name)
+                return overrides.get(name, value)
+            return fn
+
+        with patch("mkts_backend.db.db_handlers.load_orders_cache", return_value={}), \
+             patch("mkts_backend.db.db_handlers.load_esi_cache", return_value={}), \
+             patch.object(cli, "_fetch_orders", side_effect=track("orders_fetch", {"status": 304})), \
+             patch.object(cli, "_write_orders", side_effect=track("orders_write")), \
+             patch.object(cli, "run_async_history", side_effect=track("history_fetch", [{"type_id": 34, "status": 200}])), \
+             patch.object(cli, "_write_history", side_effect=track("history_write")), \
+             patch.object(cli, "process_market_stats", side_effect=track("stats")), \
+             patch.object(cli, "process_doctrine_stats", side_effect=track("doctrines")), \
+             patch.object(cli, "process_needed_items", side_effect=track("needed")), \
+             patch.object(cli.SettingsService, "gsheets_enabled", False):
+            stages = cli._build_market_stages(self._ctx(), MagicMock(), db, history)
+            results, report = run_stages(stages)
+        return calls, report
+
+    def test_stats_wait_for_orders_and_history(self):
+        calls, report = self._run(history=True)
+        assert calls.index("stats") > calls.index("orders_write")
+        assert calls.index("stats") > calls.index("history_write")
+        assert calls[-4:] == ["stats", "doctrines", "needed", "push"]
+        assert set(report.timings) >= {"orders_fetch", "history", "push", "sheets"}
+
+    def test_no_history_stages_without_history(self):
+        calls, report = self._run(history=False)
+        assert "history" not in report.timings
+        assert "history_fetch" not in calls
+
+    def test_failed_history_is_not_fatal(self):
+        calls, report = self._run(history=True, history_write=False)
+        assert report.timings["history"].status == "failed"
+        assert "push" in calls
+
+    def test_failed_orders_write_is_fatal(self):
+        from mkts_backend import cli
+
+        with pytest.raises(StageFailed) as exc_info:
+            self._run(history=False, orders_write=False)
+        assert isinstance(exc_info.value.__cause__, cli.MarketPipelineError)
@@ -0,0 +1,121 @@
+"""Tests for push coalescing, concurrent syncs and sync metrics."""
+
+import json
+import threading
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from mkts_backend.config.sync_orchestrator import SyncOrchestrator, get_sync_orchestrator
+
+
+def _db(alias, push=None, sync=None):
+    db = MagicMock()
+    db.alias = alias
+    if push is not None:
+        db.push.side_effect = push
+    if sync is not None:
+        db.sync.side_effect = sync
+    return db
+
+
+def test_request_push_outside_batch_is_immediate():
+    orch = SyncOrchestrator(metrics_url=None)
+    db = _db("buildcost")
+    orch.request_push(db)
+    assert db.push.call_count == 1
+    assert orch.pending == []
+
+
+def test_batch_coalesces_to_one_push_per_db():
+    orch = SyncOrchestrator(metrics_url=None)
+    buildcost, primary = _db("buildcost"), _db("primary")
+    with orch.batch() as batch:
+        for _ in range(3):
+            orch.request_push(buildcost)
+        orch.request_push(primary)
+        with orch.batch():  # nested scopes flush with the outermost
+            orch.request_push(primary)
+        assert buildcost.push.call_count == 0
+        assert orch.pending == ["buildcost", "primary"]
+    assert buildcost.push.call_count == 1
+    assert primary.push.call_count == 1
+    assert batch.ok and {r.alias for r in batch.results} == {"buildcost", "primary"}
+
+
+def test_push_now_clears_pending_request():
+    orch = SyncOrchestrator(metrics_url=None)
+    db = _db("buildcost")
+    with orch.batch() as batch:
+        orch.request_push(db)
+        orch.push_now(db)
+    assert db.push.call_count == 1
+    assert batch.results == []
+
+
+def test_failed_deferred_push_marks_batch_not_ok():
+    orch = SyncOrchestrator(metrics_url=None)
+
+    def boom():
+        raise ConnectionError("remote down")
+
+    good, bad = _db("primary"), _db("buildcost", push=boom)
+    with orch.batch() as batch:
+        orch.request_push(good)
+        orch.request_push(bad)
+    assert good.push.call_count == 1
+    assert not batch.ok
+    failed = [r for r in batch.results if not r.ok]
+    assert failed[0].alias == "buildcost" and "remote down" in failed[0].error
+
+
+def test_pulls_run_concurrently():
+    orch = SyncOrchestrator(metrics_url=None)
+    barrier = threading.Barrier(3, timeout=5)
+    dbs = [_db(a, sync=lambda: barrier.wait()) for a in ("sde", "fittings", "primary")]
+    results = orch.pull_all(dbs)
+    assert [r.alias for r in results] == ["sde", "fittings", "primary"]
+    assert all(r.ok for r in results)
+
+
+def test_metrics_recorded_with_stats(tmp_path):
+    url = f"sqlite:///{tmp_path / 'cli_cache.db'}"
+    orch = SyncOrchestrator(metrics_url=url)
+    stats = SimpleNamespace(cdc_operations=7, network_sent_bytes=1024, revision="abc")
+    orch.push_now(_db("primary", push=lambda: stats))
+    with pytest.raises(ConnectionError):
+        orch.push_now(_db("buildcost", push=MagicMock(side_effect=ConnectionError("x"))))
+
+    with create_engine(url).connect() as conn:
+        rows = conn.execute(
+            text("SELECT alias, op, ok, error, stats FROM sync_metrics ORDER BY id")
+        ).fetchall()
+    assert [(r.alias, r.op, r.ok) for r in rows] == [("primary", "push", 1), ("buildcost", "push", 0)]
+    assert json.loads(rows[0].stats) == {
+        "cdc_operations": 7, "network_sent_bytes": 1024, "revision": "abc"
+    }
+    assert "ConnectionError" in rows[1].error
+
+
+def test_builder_cost_writes_share_one_push(tmp_path):
+    from mkts_backend.builder_costs.repository import log_buildcost_update, upsert_builder_costs
+    from mkts_backend.db.build_cost_models import BuilderCosts, UpdateLog
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'buildcost.db'}")
+    for model in (BuilderCosts, UpdateLog):
+        model.__table__.create(engine)
+    db = _db("buildcost")
+    db.engine = engine
+    record = {
+        "type_id": 34, "total_cost_per_unit": 1.0, "time_per_unit": 2.0,
+        "me": 10, "runs": 1, "fetched_at": datetime.now(timezone.utc),
+    }
+
+    with get_sync_orchestrator().batch():
+        upsert_builder_costs(db, [record])
+        log_buildcost_update(db)
+        assert db.push.call_count == 0
+    assert db.push.call_count == 1
@@ -0,0 +1,90 @@
+"""Tests for precomputed attribute fingerprints and equivalence discovery."""
+
+import os
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from mkts_backend.db import equiv_handlers, type_fingerprints
+from mkts_backend.db.sde_index import clear_sde_index
+from mkts_backend.db.type_fingerprints import FingerprintStore, fingerprint_hash
+
+# Two hardener families with identical stats inside each family, a lone
+# module, and a charge that happens to share the first family's attributes.
+MODULES = [
+    (13984, "Thermal Armor Hardener II", 2),
+    (17838, "Imperial Navy Thermal Armor Hardener", 4),
+    (15705, "Corpum A-Type Thermal Armor Hardener", 6),
+    (2301, "EM Armor Hardener II", 2),
+    (14065, "Ammatar Navy EM Armor Hardener", 4),
+    (3841, "Large Shield Extender II", 2),
+]
+ATTRS = {
+    13984: [(974, 50), (6, 1)],
+    17838: [(6, 1), (974, 50)],
+    15705: [(974, 55), (6, 1)],
+    2301: [(984, 50), (6, 1)],
+    14065: [(984, 50), (6, 1)],
+    3841: [(72, 2600)],
+    34: [(974, 50), (6, 1)],  # Tritanium: not a module
+}
+
+
+@pytest.fixture
+def sde(in_memory_sde_db, tmp_path):
+    engine = create_engine(f"sqlite:///{in_memory_sde_db}")
+    with engine.begin() as conn:
+        for type_id, name, meta in MODULES:
+            conn.execute(
+                text("INSERT INTO sdetypes VALUES (:t, :n, 77, 'Armor Hardener', 7, 'Module', 5, :m, :mn)"),
+                {"t": type_id, "n": name, "m": meta, "mn": f"Meta {meta}"},
+            )
+        conn.execute(text(
+            "CREATE TABLE dgmTypeAttributes (typeID INTEGER, attributeID INTEGER, "
+            "valueInt INTEGER, valueFloat REAL)"
+        ))
+        for type_id, attrs in ATTRS.items():
+            for attribute_id, value in attrs:
+                conn.execute(
+                    text("INSERT INTO dgmTypeAttributes VALUES (:t, :a, :v, NULL)"),
+                    {"t": type_id, "a": attribute_id, "v": value},
+                )
+            conn.execute(
+                text("INSERT INTO dgmTypeAttributes VALUES (:t, 9, NULL, 1.5)"), {"t": type_id}
+            )
+    db = SimpleNamespace(path=str(in_memory_sde_db), engine=engine)
+    store = FingerprintStore(f"sqlite:///{tmp_path / 'cli_cache.db'}")
+    clear_sde_index()
+    with patch.object(equiv_handlers, "_get_sde_db", return_value=db), \
+         patch.object(type_fingerprints, "_store", store):
+        yield db, store
+    clear_sde_index()
+
+
+def test_fingerprint_ignores_attribute_order():
+    assert fingerprint_hash([(974, 50), (6, 1)]) == fingerprint_hash([(6, 1), (974, 50)])
+    assert fingerprint_hash([(974, 50)]) != fingerprint_hash([(974, 55)])
+
+
+def test_find_is_a_point_lookup_built_once_per_sde_version(sde):
+    db, store = sde
+    with patch.object(store, "build", wraps=store.build) as build:
+        found = equiv_handlers.find_equiv_by_attributes(13984)
+        assert {r["typeID"] for r in found} == {34, 13984, 17838}
+        assert equiv_handlers.find_equiv_by_attributes(3841)[0]["typeName"] == "Large Shield Extender II"
+        assert equiv_handlers.find_equiv_by_attributes(999) == []
+        assert build.call_count == 1
+
+        st = os.stat(db.path)
+        os.utime(db.path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        equiv_handlers.find_equiv_by_attributes(13984)
+        assert build.call_count == 2
+
+
+def test_discover_clusters_watchlisted_modules(sde):
+    groups = equiv_handlers.discover_equiv_groups([13984, 2301, 3841, 34, 35])
+    # Tritanium shares the thermal family's attributes but is not a module
+    assert [[r["typeID"] for r in g] for g in groups] == [[2301, 14065], [13984, 17838]]
+    assert [r["metaGroupName"] for r in groups[0]] == ["Meta 2", "Meta 4"]
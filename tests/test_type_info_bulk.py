@@ -0,0 +1,84 @@
+"""Tests for TypeInfo.bulk: set-based id/name resolution with a shared memo."""
+
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine, event, text
+
+from mkts_backend.db.sde_index import clear_sde_index
+from mkts_backend.utils import get_type_info
+from mkts_backend.utils.get_type_info import TypeInfo, get_type_from_list
+
+
+@pytest.fixture
+def sde(in_memory_sde_db):
+    """SDE with an inv_info view; Isogen (37) is only in inv_info."""
+    engine = create_engine(f"sqlite:///{in_memory_sde_db}")
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE inv_info (typeID INTEGER PRIMARY KEY, typeName TEXT, groupID INTEGER, "
+            "groupName TEXT, categoryID INTEGER, categoryName TEXT, volume REAL)"
+        ))
+        conn.execute(text(
+            "INSERT INTO inv_info VALUES (37, 'Isogen', 18, 'Mineral', 4, 'Material', 0.01)"
+        ))
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *a: statements.append(a[2]))
+    db = SimpleNamespace(path=str(in_memory_sde_db), engine=engine, statements=statements)
+
+    clear_sde_index()
+    get_type_info._memo_index = None
+    with patch.object(get_type_info, "DatabaseConfig", return_value=db):
+        yield db
+    clear_sde_index()
+    get_type_info._memo_index = None
+
+
+def _inv_info_queries(db):
+    return [s for s in db.statements if "inv_info" in s]
+
+
+def test_resolves_ids_names_and_numeric_strings_in_order(sde):
+    infos = TypeInfo.bulk([36, "Tritanium", " 35 ", "Isogen", 37])
+    assert [i.type_id for i in infos] == [36, 34, 35, 37, 37]
+    assert infos[1].group_name == "Mineral" and infos[1].category_id == 4
+    # Isogen is resolved by one name query and one id query, not per value
+    assert len(_inv_info_queries(sde)) == 2
+
+
+def test_memo_is_shared_across_calls(sde):
+    first = TypeInfo.bulk([34, 37])
+    sde.statements.clear()
+    again = get_type_from_list([37, 34])
+    assert again[0] == first[1] and again[1] == first[0]
+    assert sde.statements == []
+
+
+def test_callers_get_copies_of_memoized_entries(sde):
+    first = TypeInfo.bulk([34])[0]
+    first.type_name = "mutated"
+    assert TypeInfo.bulk([34])[0].type_name == "Tritanium"
+
+
+def test_concurrent_calls_and_index_swaps(sde):
+    from concurrent.futures import ThreadPoolExecutor
+
+    batches = [[34, "Pyerite", 36, "Isogen"], ["Tritanium", 35, 37], [36, 34]] * 30
+
+    def resolve(i, batch):
+        if i % 7 == 0:
+            get_type_info._memo_index = None  # as if the SDE were reloaded
+        return [info.type_id for info in TypeInfo.bulk(batch)]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(resolve, range(len(batches)), batches))
+
+    assert results[:3] == [[34, 35, 36, 37], [34, 35, 37], [36, 34]]
+    assert all(r == results[i % 3] for i, r in enumerate(results))
+
+
+def test_unresolved_values(sde):
+    with pytest.raises(ValueError, match="Unobtainium"):
+        TypeInfo.bulk([34, "Unobtainium", 999999])
+    assert [i.type_id for i in TypeInfo.bulk([34, 999999], strict=False)] == [34]
@@ -275,10 +275,17 @@ class TestDeleteOrphanBuilderCosts:
         add_to_build_watchlist(buildcost_db, sde_db, [34, 35])
         self._seed_builder_costs(buildcost_db, [34, 35, 99, 19810])
 
-        deleted = delete_orphan_builder_costs(buildcost_db)
+        from unittest.mock import patch
+
+        from mkts_backend.builder_costs import repository
+
+        with patch.object(repository, "get_sync_orchestrator") as orchestrator:
+            deleted = delete_orphan_builder_costs(buildcost_db)
 
         assert deleted == 2
         assert self._read_builder_costs_ids(buildcost_db) == {34, 35}
+        # The updatelog stamp that follows a prune carries the push.
+        orchestrator.assert_not_called()
 
     def test_no_orphans_returns_zero(self, buildcost_db, sde_db):
         from mkts_backend.builder_costs.repository import (